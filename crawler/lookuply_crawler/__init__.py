@@ -13,7 +13,13 @@ from . import extractors
 from . import spiders
 from . import pipelines
 from . import middleware
+from . import handlers
+from . import resolver
+from . import serialization
 from . import storage
+from . import cache
+from . import dedupe
+from . import canonicalize
 from . import utils
 
 __all__ = [
@@ -22,6 +28,12 @@ __all__ = [
     'spiders',
     'pipelines',
     'middleware',
+    'handlers',
+    'resolver',
+    'serialization',
     'storage',
+    'cache',
+    'dedupe',
+    'canonicalize',
     'utils',
 ]
@@ -0,0 +1,17 @@
+"""
+Cache package for Lookuply Crawler.
+"""
+
+from .lru import LRUCache
+from .robots_cache import RobotsCache, FileRobotsCache, RedisRobotsCache, create_robots_cache
+from .scheduled import ScheduledUrlCache, create_scheduled_url_cache
+
+__all__ = [
+    'LRUCache',
+    'RobotsCache',
+    'FileRobotsCache',
+    'RedisRobotsCache',
+    'create_robots_cache',
+    'ScheduledUrlCache',
+    'create_scheduled_url_cache',
+]
@@ -0,0 +1,159 @@
+"""
+LRU Cache Module
+Bounded in-memory cache with optional expiry and on-disk persistence.
+"""
+
+import os
+import json
+import time
+import logging
+from collections import OrderedDict
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class LRUCache:
+    """
+    Bounded least-recently-used mapping.
+
+    Entries may carry an expiry time; expired entries behave as missing.
+    Keys must be strings and values JSON-serializable to use save()/load().
+    """
+
+    def __init__(self, maxsize: int = 10000, ttl: Optional[float] = None):
+        """
+        Initialize cache.
+
+        Args:
+            maxsize: Maximum number of entries (least recently used are evicted)
+            ttl: Default time to live in seconds (None = never expire)
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Get value for key and mark it as recently used.
+
+        Args:
+            key: Cache key
+            default: Value returned on miss
+
+        Returns:
+            Cached value or default
+        """
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+
+        value, expires_at = entry
+        if expires_at is not None and expires_at < time.time():
+            del self._data[key]
+            self.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        """
+        Store value for key.
+
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl: Time to live in seconds (defaults to the cache ttl)
+        """
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.time() + ttl if ttl is not None else None
+
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: str, default: Any = None) -> Any:
+        """Remove key and return its value."""
+        entry = self._data.pop(key, None)
+        return entry[0] if entry is not None else default
+
+    def clear(self):
+        """Remove all entries."""
+        self._data.clear()
+
+    def __contains__(self, key: str) -> bool:
+        entry = self._data.get(key)
+        if entry is None:
+            return False
+        expires_at = entry[1]
+        return expires_at is None or expires_at >= time.time()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def save(self, path: str):
+        """
+        Persist non-expired entries to a JSON file.
+
+        Args:
+            path: File path (written atomically)
+        """
+        now = time.time()
+        entries = [
+            [key, value, expires_at]
+            for key, (value, expires_at) in self._data.items()
+            if expires_at is None or expires_at >= now
+        ]
+
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entries, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+
+        except Exception as e:
+            logger.error(f"Failed to save cache to {path}: {e}")
+
+    def load(self, path: str) -> int:
+        """
+        Load entries from a JSON file written by save().
+
+        Args:
+            path: File path
+
+        Returns:
+            int: Number of entries loaded
+        """
+        if not os.path.exists(path):
+            return 0
+
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+        except Exception as e:
+            logger.error(f"Failed to load cache from {path}: {e}")
+            return 0
+
+        now = time.time()
+        loaded = 0
+        for key, value, expires_at in entries[-self.maxsize:]:
+            if expires_at is not None and expires_at < now:
+                continue
+            self._data[key] = (value, expires_at)
+            loaded += 1
+
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+        return loaded
@@ -0,0 +1,203 @@
+"""
+Robots.txt Cache Module
+Share fetched robots.txt files between crawler processes and restarts.
+"""
+
+import os
+import json
+import time
+import logging
+from pathlib import Path
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class RobotsCache:
+    """
+    Base class for robots.txt cache backends.
+    Entries are keyed by host (netloc) and expire after `ttl` seconds.
+    Server errors (5xx) are not cached: they are usually transient and
+    their body is not the host's rules.
+    """
+
+    def __init__(self, ttl: int = 86400):
+        """
+        Initialize cache.
+
+        Args:
+            ttl: Time to live for cached entries in seconds
+        """
+        self.ttl = ttl
+
+    def get(self, netloc: str) -> Optional[Dict]:
+        """
+        Get cached robots.txt entry for a host.
+
+        Args:
+            netloc: Host (netloc) of the robots.txt URL
+
+        Returns:
+            dict: Entry with body, status and fetched_at, or None if missing or expired
+        """
+        entry = self._read(netloc)
+        if entry is None:
+            return None
+
+        if time.time() - entry.get('fetched_at', 0) > self.ttl:
+            return None
+
+        # Server errors cached by earlier versions
+        if entry.get('status', 200) >= 500:
+            return None
+
+        return entry
+
+    def set(self, netloc: str, body: bytes, status: int = 200) -> bool:
+        """
+        Store robots.txt body for a host.
+
+        Args:
+            netloc: Host (netloc) of the robots.txt URL
+            body: Raw robots.txt body
+            status: HTTP status of the robots.txt response
+
+        Returns:
+            bool: True if the entry was stored (never for server errors)
+        """
+        if status >= 500:
+            return False
+
+        entry = {
+            'netloc': netloc,
+            'status': status,
+            'body': body.decode('utf-8', errors='ignore'),
+            'fetched_at': time.time(),
+        }
+        try:
+            self._write(netloc, entry)
+        except Exception as e:
+            logger.error(f"Failed to cache robots.txt for {netloc}: {e}")
+            return False
+        return True
+
+    @staticmethod
+    def rules(entry: Dict) -> bytes:
+        """
+        Robots.txt rules of a cached entry.
+
+        Args:
+            entry: Entry returned by get()
+
+        Returns:
+            bytes: Cached body, or no rules (allow all) for a client error such as 404
+        """
+        if entry.get('status', 200) >= 400:
+            return b''
+        return entry['body'].encode('utf-8')
+
+    def _read(self, netloc: str) -> Optional[Dict]:
+        raise NotImplementedError
+
+    def _write(self, netloc: str, entry: Dict):
+        raise NotImplementedError
+
+
+class FileRobotsCache(RobotsCache):
+    """
+    On-disk robots.txt cache, one small JSON file per host.
+    Files are replaced atomically so several processes can share a directory.
+    """
+
+    def __init__(self, cache_dir: str = './data/cache/robots', ttl: int = 86400):
+        """
+        Initialize file cache.
+
+        Args:
+            cache_dir: Directory for cached robots.txt entries
+            ttl: Time to live for cached entries in seconds
+        """
+        super().__init__(ttl)
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, netloc: str) -> Path:
+        return self.cache_dir / f"{netloc.replace(':', '_')}.json"
+
+    def _read(self, netloc: str) -> Optional[Dict]:
+        try:
+            with open(self._path(netloc), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable robots.txt cache entry for {netloc}: {e}")
+            return None
+
+    def _write(self, netloc: str, entry: Dict):
+        path = self._path(netloc)
+        tmp_path = path.with_suffix(f'.{os.getpid()}.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+
+class RedisRobotsCache(RobotsCache):
+    """
+    Redis-backed robots.txt cache.
+    Expiry is delegated to Redis so stale entries disappear on their own.
+    """
+
+    KEY_PREFIX = 'lookuply:robots:'
+
+    def __init__(self, redis_url: str = 'redis://localhost:6379', ttl: int = 86400):
+        """
+        Initialize Redis cache.
+
+        Args:
+            redis_url: Redis connection URL
+            ttl: Time to live for cached entries in seconds
+        """
+        super().__init__(ttl)
+
+        import redis
+        self.client = redis.Redis.from_url(redis_url)
+
+    def _read(self, netloc: str) -> Optional[Dict]:
+        try:
+            value = self.client.get(self.KEY_PREFIX + netloc)
+        except Exception as e:
+            logger.warning(f"Redis robots.txt cache lookup failed for {netloc}: {e}")
+            return None
+
+        if value is None:
+            return None
+        return json.loads(value)
+
+    def _write(self, netloc: str, entry: Dict):
+        self.client.set(self.KEY_PREFIX + netloc, json.dumps(entry, ensure_ascii=False), ex=self.ttl)
+
+
+def create_robots_cache(settings) -> Optional[RobotsCache]:
+    """
+    Create robots.txt cache backend from crawler settings.
+
+    Args:
+        settings: Scrapy settings
+
+    Returns:
+        RobotsCache: Configured backend, or None if caching is disabled
+    """
+    backend = settings.get('ROBOTSTXT_CACHE_BACKEND')
+    ttl = settings.getint('ROBOTSTXT_CACHE_TTL', 86400)
+
+    if not backend:
+        return None
+
+    if backend == 'file':
+        return FileRobotsCache(settings.get('ROBOTSTXT_CACHE_DIR', './data/cache/robots'), ttl)
+
+    if backend == 'redis':
+        return RedisRobotsCache(settings.get('REDIS_URL', 'redis://localhost:6379'), ttl)
+
+    raise ValueError(f"Unknown robots.txt cache backend: {backend}")
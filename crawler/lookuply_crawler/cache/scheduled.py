@@ -0,0 +1,106 @@
+"""
+Scheduled URL Cache Module
+Per-host memory of recently scheduled URLs, checked before a Request is built.
+"""
+
+import logging
+from collections import OrderedDict
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ScheduledUrlCache:
+    """
+    Remember URLs recently scheduled for crawling, per host.
+
+    Navigation links repeat on every page of a site, so most links found
+    on a page were already scheduled from an earlier one and would be
+    dropped by the dupefilter after a Request (and its meta dict) had been
+    built for them. Checking this cache first skips those allocations.
+
+    URLs are kept as 64-bit hashes (xxhash, or blake2b without xxhash) in
+    one small LRU per host; hosts are themselves kept in an LRU. A URL that
+    was evicted is scheduled again and left to the dupefilter, so the cache
+    never drops a URL the dupefilter would have let through.
+    """
+
+    def __init__(self, max_hosts: int = 1000, urls_per_host: int = 500, hash_name: str = 'auto'):
+        """
+        Initialize cache.
+
+        Args:
+            max_hosts: Maximum number of hosts remembered
+            urls_per_host: Maximum number of URLs remembered per host
+            hash_name: 'xxhash', 'blake2b' or 'auto' (xxhash if installed)
+        """
+        from ..dedupe import get_hash64
+
+        self.max_hosts = max_hosts
+        self.urls_per_host = urls_per_host
+        self.hash_url = get_hash64(hash_name)
+        # Host -> {URL hash: None}, both in least recently used first order
+        self.hosts = OrderedDict()
+
+        self.stats = {
+            'checked': 0,
+            'skipped': 0,
+            'hosts_evicted': 0,
+        }
+
+    def schedule(self, url: str, host: str) -> bool:
+        """
+        Check a URL and remember it as scheduled.
+
+        Args:
+            url: Normalized URL
+            host: URL host (e.g., link['domain'])
+
+        Returns:
+            bool: True if the URL was not scheduled recently (build the Request)
+        """
+        self.stats['checked'] += 1
+        key = self.hash_url(url.encode('utf-8', 'surrogatepass'))
+
+        urls = self.hosts.get(host)
+        if urls is None:
+            urls = self.hosts[host] = {}
+            if len(self.hosts) > self.max_hosts:
+                self.hosts.popitem(last=False)
+                self.stats['hosts_evicted'] += 1
+        else:
+            self.hosts.move_to_end(host)
+
+        # Plain dicts keep insertion order: re-inserting marks a URL as recently seen
+        seen = urls.pop(key, False) is None
+        urls[key] = None
+        if seen:
+            self.stats['skipped'] += 1
+            return False
+
+        if len(urls) > self.urls_per_host:
+            del urls[next(iter(urls))]
+        return True
+
+    def __len__(self) -> int:
+        return sum(len(urls) for urls in self.hosts.values())
+
+
+def create_scheduled_url_cache(settings) -> Optional[ScheduledUrlCache]:
+    """
+    Create scheduled URL cache from crawler settings.
+
+    Args:
+        settings: Scrapy settings
+
+    Returns:
+        ScheduledUrlCache: Configured cache, or None if disabled
+    """
+    if not settings.getbool('SCHEDULED_URL_CACHE_ENABLED', True):
+        return None
+
+    return ScheduledUrlCache(
+        max_hosts=settings.getint('SCHEDULED_URL_CACHE_HOSTS', 1000),
+        urls_per_host=settings.getint('SCHEDULED_URL_CACHE_URLS_PER_HOST', 500),
+        hash_name=settings.get('SCHEDULED_URL_CACHE_HASH', 'auto'),
+    )
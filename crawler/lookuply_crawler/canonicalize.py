@@ -0,0 +1,290 @@
+"""
+URL Canonicalization Module
+Rewrite URLs to one canonical form before they are fingerprinted and scheduled.
+"""
+
+import re
+import logging
+from typing import Dict, Iterable, Optional
+from urllib.parse import quote, unquote, urlsplit
+
+logger = logging.getLogger(__name__)
+
+# Tracking parameters stripped from every URL (matched case-insensitively)
+TRACKING_PARAMS = [
+    'fbclid', 'gclid', 'gclsrc', 'dclid', 'gbraid', 'wbraid', 'msclkid', 'yclid', 'twclid', 'ttclid',
+    'igshid', 'mkt_tok', '_ga', '_gl', '_hsenc', '_hsmi', '_openstat', 'ref_src', 'vero_id',
+    'oly_anon_id', 'oly_enc_id',
+]
+TRACKING_PARAM_PREFIXES = ['utm_', 'pk_', 'mtm_', 'hsa_', 'mc_']
+
+# Session ID parameters, stripped from the query and from ;name=value path parameters
+SESSION_PARAMS = [
+    'jsessionid', 'phpsessid', 'aspsessionid', 'sessionid', 'session_id', 'sessid', 'cfid', 'cftoken',
+    'zenid', 'oscsid',
+]
+
+# Directory index files: /docs/index.html -> /docs/ (only without a query:
+# index.php?title=... is a different resource than the directory)
+INDEX_FILES = [
+    'index.html', 'index.htm', 'index.shtml', 'index.php', 'index.asp', 'index.aspx',
+    'default.htm', 'default.html', 'default.asp', 'default.aspx',
+]
+
+TRAILING_SLASH_RULES = ('keep', 'strip', 'add')
+
+DEFAULT_PORTS = {'http': ':80', 'https': ':443'}
+
+# Escapes of unreserved characters are decoded, other escapes get uppercase hex
+PERCENT_ESCAPE_PATTERN = re.compile(r'%([0-9A-Fa-f]{2})')
+UNRESERVED_CHARS = frozenset('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-._~')
+
+# Characters that must be percent-encoded in a path or query (spaces, non-ASCII, ...)
+UNSAFE_PATH_PATTERN = re.compile(r"[^A-Za-z0-9\-._~!$&'()*+,;=:@/%]")
+UNSAFE_QUERY_PATTERN = re.compile(r"[^A-Za-z0-9\-._~!$&'()*+,;=:@/?%]")
+PATH_SAFE_CHARS = "/%:@!$&'()*+,;=-._~"
+QUERY_SAFE_CHARS = "/?%:@!$&'()*+,;=-._~"
+
+
+def _normalize_escape(match) -> str:
+    """Decode an escaped unreserved character, uppercase any other escape."""
+    char = chr(int(match.group(1), 16))
+    return char if char in UNRESERVED_CHARS else '%' + match.group(1).upper()
+
+
+class UrlCanonicalizer:
+    """
+    Rewrite URLs to a canonical form so one page is crawled under one URL.
+
+    Rules, in order: lowercase scheme and host, drop the default port, a
+    trailing dot of the host and the fragment; remove session path
+    parameters (;jsessionid=...); normalize percent-encoding; strip
+    tracking and session query parameters (or keep only whitelisted
+    parameters for hosts in host_params) and sort the rest; drop
+    directory index files if no query is left and apply the trailing
+    slash rule.
+
+    Canonical forms of recently seen URLs are memoized in an LRUCache:
+    navigation links repeat on every page of a site.
+    """
+
+    def __init__(self, strip_params: Iterable[str] = (), strip_param_prefixes: Iterable[str] = (),
+                 sort_query: bool = True, normalize_encoding: bool = True, trailing_slash: str = 'keep',
+                 strip_index: bool = True, host_params: Optional[Dict[str, Iterable[str]]] = None,
+                 memo_size: int = 100000):
+        """
+        Initialize canonicalizer.
+
+        Args:
+            strip_params: Query parameters stripped, besides TRACKING_PARAMS and SESSION_PARAMS
+            strip_param_prefixes: Query parameter prefixes stripped, besides TRACKING_PARAM_PREFIXES
+            sort_query: Sort query parameters
+            normalize_encoding: Normalize percent-encoding of path and query
+            trailing_slash: One of TRAILING_SLASH_RULES ('add' only to paths whose last segment has no '.')
+            strip_index: Drop INDEX_FILES from the end of paths without a query
+            host_params: Host (and its subdomains) -> the only query parameters kept
+            memo_size: Memoized URLs (0 = no memo)
+        """
+        from .cache import LRUCache
+
+        if trailing_slash not in TRAILING_SLASH_RULES:
+            raise ValueError(f"Unknown trailing slash rule: {trailing_slash}")
+
+        self.strip_params = frozenset(
+            name.lower() for name in (*TRACKING_PARAMS, *SESSION_PARAMS, *strip_params)
+        )
+        self.strip_param_prefixes = tuple(
+            prefix.lower() for prefix in (*TRACKING_PARAM_PREFIXES, *strip_param_prefixes)
+        )
+        self.sort_query = sort_query
+        self.normalize_encoding = normalize_encoding
+        self.trailing_slash = trailing_slash
+        self.strip_index = strip_index
+        self.host_params = {
+            host.lower(): frozenset(name.lower() for name in names)
+            for host, names in (host_params or {}).items()
+        }
+        self.memo = LRUCache(maxsize=memo_size) if memo_size else None
+
+        self.session_path_pattern = re.compile(
+            r';(?:' + '|'.join(re.escape(name) for name in SESSION_PARAMS) + r')=[^/;]*',
+            re.IGNORECASE,
+        )
+        self.index_files = frozenset(INDEX_FILES)
+
+        self.stats = {
+            'urls': 0,
+            'memo_hits': 0,
+            'rewritten': 0,
+            'params_stripped': 0,
+        }
+
+    def canonicalize(self, url: str) -> str:
+        """
+        Get the canonical form of a URL.
+
+        Args:
+            url: Absolute URL
+
+        Returns:
+            str: Canonical URL (the URL itself if it cannot be parsed)
+        """
+        self.stats['urls'] += 1
+        if self.memo is not None:
+            canonical = self.memo.get(url)
+            if canonical is not None:
+                self.stats['memo_hits'] += 1
+                return canonical
+
+        try:
+            canonical = self._canonicalize(url)
+        except ValueError as e:
+            logger.debug(f"Cannot canonicalize {url}: {e}")
+            return url
+
+        if canonical != url:
+            self.stats['rewritten'] += 1
+        if self.memo is not None:
+            self.memo.set(url, canonical)
+        return canonical
+
+    def _canonicalize(self, url: str) -> str:
+        """Apply the rules to one URL."""
+        scheme, netloc, path, query, _ = urlsplit(url)
+        scheme = scheme.lower()
+
+        # Host: lowercase, no trailing dot, no default port
+        userinfo, _, host = netloc.rpartition('@')
+        host = host.lower()
+        default_port = DEFAULT_PORTS.get(scheme)
+        if default_port and host.endswith(default_port):
+            host = host[:-len(default_port)]
+        if host.endswith('.'):
+            host = host[:-1]
+        netloc = f'{userinfo}@{host}' if userinfo else host
+
+        # Path
+        if ';' in path:
+            path = self.session_path_pattern.sub('', path)
+        if self.normalize_encoding:
+            path = self._normalize_encoding(path, UNSAFE_PATH_PATTERN, PATH_SAFE_CHARS)
+        if not path:
+            path = '/'
+
+        # Query
+        if query:
+            query = self._canonicalize_query(query, host)
+
+        directory, _, filename = path.rpartition('/')
+        if self.strip_index and not query and filename.lower() in self.index_files:
+            path = directory + '/'
+        elif self.trailing_slash == 'strip' and not filename and directory:
+            path = directory
+        elif self.trailing_slash == 'add' and filename and '.' not in filename:
+            path += '/'
+
+        return f'{scheme}://{netloc}{path}?{query}' if query else f'{scheme}://{netloc}{path}'
+
+    def _canonicalize_query(self, query: str, host: str) -> str:
+        """Strip unwanted parameters from a query string and sort the rest."""
+        allowed = self._get_host_params(host) if self.host_params else None
+
+        params = []
+        for param in query.split('&'):
+            if not param:
+                continue
+
+            name = param.partition('=')[0]
+            if '%' in name or '+' in name:
+                name = unquote(name.replace('+', ' '))
+            name = name.lower()
+
+            if allowed is not None:
+                strip = name not in allowed
+            else:
+                strip = name in self.strip_params or name.startswith(self.strip_param_prefixes)
+            if strip:
+                self.stats['params_stripped'] += 1
+                continue
+
+            if self.normalize_encoding:
+                param = self._normalize_encoding(param, UNSAFE_QUERY_PATTERN, QUERY_SAFE_CHARS)
+            params.append(param)
+
+        if self.sort_query:
+            params.sort()
+        return '&'.join(params)
+
+    def _get_host_params(self, host: str) -> Optional[frozenset]:
+        """Whitelisted parameters of a host or its closest listed parent domain."""
+        while True:
+            allowed = self.host_params.get(host)
+            if allowed is not None:
+                return allowed
+            _, dot, host = host.partition('.')
+            if not dot:
+                return None
+
+    @staticmethod
+    def _normalize_encoding(value: str, unsafe_pattern, safe: str) -> str:
+        """Normalize existing escapes, then escape unsafe characters."""
+        if '%' in value:
+            value = PERCENT_ESCAPE_PATTERN.sub(_normalize_escape, value)
+        if unsafe_pattern.search(value):
+            value = quote(value, safe=safe)
+        return value
+
+
+# Canonicalizer with the default rules
+_canonicalizer = None
+
+
+def get_url_canonicalizer() -> UrlCanonicalizer:
+    """
+    Get the canonicalizer with the default rules.
+
+    Returns:
+        UrlCanonicalizer: Shared canonicalizer
+    """
+    global _canonicalizer
+    if _canonicalizer is None:
+        _canonicalizer = UrlCanonicalizer()
+    return _canonicalizer
+
+
+def create_url_canonicalizer(settings) -> Optional[UrlCanonicalizer]:
+    """
+    Create URL canonicalizer from crawler settings.
+
+    Args:
+        settings: Scrapy settings
+
+    Returns:
+        UrlCanonicalizer: Configured canonicalizer, or None if disabled
+    """
+    if not settings.getbool('URL_CANONICALIZATION_ENABLED', True):
+        return None
+
+    return UrlCanonicalizer(
+        strip_params=settings.getlist('CANONICAL_STRIP_PARAMS'),
+        strip_param_prefixes=settings.getlist('CANONICAL_STRIP_PARAM_PREFIXES'),
+        sort_query=settings.getbool('CANONICAL_SORT_QUERY', True),
+        normalize_encoding=settings.getbool('CANONICAL_NORMALIZE_ENCODING', True),
+        trailing_slash=settings.get('CANONICAL_TRAILING_SLASH', 'keep'),
+        strip_index=settings.getbool('CANONICAL_STRIP_INDEX', True),
+        host_params=settings.getdict('CANONICAL_HOST_PARAMS'),
+        memo_size=settings.getint('CANONICAL_MEMO_SIZE', 100000),
+    )
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Get the canonical form of a URL with the default rules.
+
+    Args:
+        url: Absolute URL
+
+    Returns:
+        str: Canonical URL
+    """
+    return get_url_canonicalizer().canonicalize(url)
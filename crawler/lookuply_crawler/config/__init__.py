@@ -21,6 +21,9 @@ from .domain_filters import (
     GLOBAL_BLOCKED_DOMAINS,
     PREFERRED_DOMAINS,
     BLOCKED_EXTENSIONS,
+    DomainFilter,
+    get_domain_filter,
+    create_domain_filter,
     is_domain_allowed,
     should_prioritize_domain,
 )
@@ -40,6 +43,9 @@ __all__ = [
     'GLOBAL_BLOCKED_DOMAINS',
     'PREFERRED_DOMAINS',
     'BLOCKED_EXTENSIONS',
+    'DomainFilter',
+    'get_domain_filter',
+    'create_domain_filter',
     'is_domain_allowed',
     'should_prioritize_domain',
 ]
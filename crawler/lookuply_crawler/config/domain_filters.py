@@ -3,6 +3,16 @@ Domain Filtering Configuration
 Define allowed and blocked domains per language and globally.
 """
 
+import re
+import gzip
+import logging
+from typing import Iterable, List
+
+logger = logging.getLogger(__name__)
+
+# Host and path of an absolute URL (userinfo and port skipped)
+URL_HOST_PATH_PATTERN = re.compile(r'[a-zA-Z][a-zA-Z0-9+.-]*://(?:[^@/?#]*@)?(\[[^\]/?#]*\]|[^:/?#]*)(?::[^/?#]*)?([^?#]*)')
+
 # Global blocked domains (spam, adult content, etc.)
 GLOBAL_BLOCKED_DOMAINS = [
     # Add spam/malicious domains here
@@ -48,6 +58,221 @@ BLOCKED_EXTENSIONS = [
 ]
 
 
+class DomainFilter:
+    """
+    Compiled outlink filter for blocked domains and file extensions.
+
+    Blocked domains are kept as a sorted numpy array of 64-bit hashes
+    (8 bytes per domain), so blocklists of millions of domains stay
+    small. A host is blocked when it or one of its parent domains is
+    listed: blocking example.com blocks www.example.com, but not
+    notexample.com. Links are checked in batches; each distinct host of
+    a batch is looked up once, in one vectorized search.
+    """
+
+    # Domain hashes buffered in a list before they are moved to an array
+    CHUNK_SIZE = 65536
+
+    def __init__(self, domains: Iterable[str] = (), extensions: Iterable[str] = (), hash_name: str = 'auto'):
+        """
+        Initialize filter.
+
+        Args:
+            domains: Blocked domains
+            extensions: Blocked file extensions (without dot)
+            hash_name: Domain hash (see dedupe.get_hash64)
+        """
+        import numpy as np
+        from ..dedupe import get_hash64
+
+        self.hash_func = get_hash64(hash_name)
+        self.extensions = frozenset(extension.lower().lstrip('.') for extension in extensions)
+        self._hashes = np.empty(0, dtype=np.uint64)
+        self._pending = []  # Hashes added since the last chunk
+        self._chunks = []  # Arrays of hashes added since the last compile
+
+        self.stats = {
+            'checked': 0,
+            'blocked_domain': 0,
+            'blocked_extension': 0,
+        }
+
+        self.add_domains(domains)
+
+    @property
+    def size(self) -> int:
+        """Number of blocked domains."""
+        self._compile()
+        return len(self._hashes)
+
+    def add_domains(self, domains: Iterable[str]) -> int:
+        """
+        Add blocked domains.
+
+        Args:
+            domains: Domains or blocklist lines ('example.com', '*.example.com',
+                hosts file '0.0.0.0 example.com', '#' comments)
+
+        Returns:
+            int: Number of domains added
+        """
+        import numpy as np
+
+        added = 0
+        for line in domains:
+            for domain in self._parse_line(line):
+                self._pending.append(self.hash_func(domain.encode('utf-8')))
+                added += 1
+            # Keep large blocklists in arrays, not lists of Python ints
+            if len(self._pending) >= self.CHUNK_SIZE:
+                self._chunks.append(np.array(self._pending, dtype=np.uint64))
+                self._pending = []
+        return added
+
+    def load(self, path: str) -> int:
+        """
+        Add blocked domains from a blocklist file (plain or .gz).
+
+        Args:
+            path: Blocklist file path
+
+        Returns:
+            int: Number of domains added
+        """
+        try:
+            opener = gzip.open if path.endswith('.gz') else open
+            with opener(path, 'rt', encoding='utf-8', errors='ignore') as f:
+                added = self.add_domains(f)
+            self._compile()
+            logger.info(f"Loaded {added} blocked domains from {path}")
+            return added
+        except Exception as e:
+            logger.error(f"Failed to load blocklist {path}: {e}")
+            return 0
+
+    def allows(self, url: str) -> bool:
+        """Check whether a single URL may be followed."""
+        return self.filter([url])[0]
+
+    def filter(self, urls: List[str]) -> List[bool]:
+        """
+        Check a batch of URLs (e.g. the links of a page).
+
+        Args:
+            urls: URLs to check
+
+        Returns:
+            list: True for each URL that may be followed
+        """
+        allowed = [True] * len(urls)
+        hosts = {}  # host -> indexes of its URLs
+
+        for i, url in enumerate(urls):
+            match = URL_HOST_PATH_PATTERN.match(url)
+            host, path = match.groups() if match else ('', '')
+
+            # Check file extension of the last path segment
+            dot = path.rfind('.')
+            if dot > path.rfind('/') and path[dot + 1:].lower() in self.extensions:
+                allowed[i] = False
+                self.stats['blocked_extension'] += 1
+                continue
+
+            hosts.setdefault(host.lower().rstrip('.'), []).append(i)
+
+        for host in self._blocked_hosts(list(hosts)):
+            for i in hosts[host]:
+                allowed[i] = False
+                self.stats['blocked_domain'] += 1
+
+        self.stats['checked'] += len(urls)
+        return allowed
+
+    def _blocked_hosts(self, hosts: List[str]) -> set:
+        """Hosts that are blocked themselves or by a parent domain."""
+        import numpy as np
+
+        self._compile()
+        if not len(self._hashes) or not hosts:
+            return set()
+
+        # Hash of every host and each of its parent domains
+        keys, owners = [], []
+        for k, host in enumerate(hosts):
+            labels = host.split('.')
+            for i in range(len(labels)):
+                keys.append(self.hash_func('.'.join(labels[i:]).encode('utf-8')))
+                owners.append(k)
+
+        query = np.array(keys, dtype=np.uint64)
+        index = np.minimum(np.searchsorted(self._hashes, query), len(self._hashes) - 1)
+        found = np.flatnonzero(self._hashes[index] == query)
+        return {hosts[owners[j]] for j in found}
+
+    def _compile(self):
+        """Merge domain hashes added since the last compile into the sorted array."""
+        import numpy as np
+
+        if self._pending:
+            self._chunks.append(np.array(self._pending, dtype=np.uint64))
+            self._pending = []
+        if self._chunks:
+            self._hashes = np.unique(np.concatenate([self._hashes] + self._chunks))
+            self._chunks = []
+
+    @staticmethod
+    def _parse_line(line: str) -> List[str]:
+        """Domains of a blocklist line."""
+        line = line.split('#', 1)[0].strip().lower()
+        if not line:
+            return []
+
+        names = line.split()
+        # Hosts file format: address followed by host names
+        if len(names) > 1:
+            names = names[1:]
+        return [name.lstrip('*.').rstrip('.') for name in names if name.lstrip('*.').rstrip('.')]
+
+
+# Filter of GLOBAL_BLOCKED_DOMAINS and BLOCKED_EXTENSIONS (created on first use)
+_domain_filter = None
+
+
+def get_domain_filter() -> DomainFilter:
+    """
+    Get the default domain filter (singleton pattern).
+
+    Returns:
+        DomainFilter: Filter of GLOBAL_BLOCKED_DOMAINS and BLOCKED_EXTENSIONS
+    """
+    global _domain_filter
+
+    if _domain_filter is None:
+        _domain_filter = DomainFilter(GLOBAL_BLOCKED_DOMAINS, BLOCKED_EXTENSIONS)
+
+    return _domain_filter
+
+
+def create_domain_filter(settings) -> DomainFilter:
+    """
+    Create domain filter from crawler settings.
+
+    Args:
+        settings: Scrapy settings
+
+    Returns:
+        DomainFilter: GLOBAL_BLOCKED_DOMAINS, BLOCKED_DOMAINS and the
+        BLOCKED_DOMAINS_FILES blocklists, with BLOCKED_EXTENSIONS
+    """
+    domain_filter = DomainFilter(
+        GLOBAL_BLOCKED_DOMAINS + settings.getlist('BLOCKED_DOMAINS'),
+        BLOCKED_EXTENSIONS,
+    )
+    for path in settings.getlist('BLOCKED_DOMAINS_FILES'):
+        domain_filter.load(path)
+    return domain_filter
+
+
 def is_domain_allowed(url: str, language_code: str = None) -> bool:
     """
     Check if a domain is allowed for crawling.
@@ -59,23 +284,7 @@ def is_domain_allowed(url: str, language_code: str = None) -> bool:
     Returns:
         bool: True if domain is allowed, False otherwise
     """
-    from urllib.parse import urlparse
-
-    parsed = urlparse(url)
-    domain = parsed.netloc.lower()
-
-    # Check global blocklist
-    for blocked in GLOBAL_BLOCKED_DOMAINS:
-        if blocked in domain:
-            return False
-
-    # Check file extensions
-    path = parsed.path.lower()
-    for ext in BLOCKED_EXTENSIONS:
-        if path.endswith(f'.{ext}'):
-            return False
-
-    return True
+    return get_domain_filter().allows(url)
 
 
 def should_prioritize_domain(url: str, language_code: str) -> bool:
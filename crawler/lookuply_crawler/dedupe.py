@@ -0,0 +1,205 @@
+"""
+Deduplication Module
+Fast content hashes and SimHash near-duplicate detection.
+"""
+
+import re
+import hashlib
+import logging
+import importlib.util
+from collections import deque
+from itertools import combinations
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+FINGERPRINT_BITS = 64
+
+
+def get_hash64(name: str = 'auto'):
+    """
+    Get a fast, stable 64-bit hash function for bytes.
+
+    Args:
+        name: 'xxhash' (pip install xxhash), 'blake2b' or 'auto' (xxhash if installed)
+
+    Returns:
+        Function bytes -> int
+    """
+    if name == 'auto':
+        name = 'xxhash' if importlib.util.find_spec('xxhash') is not None else 'blake2b'
+
+    if name == 'xxhash':
+        try:
+            import xxhash
+        except ImportError:
+            logger.error("xxhash not installed. Run: pip install xxhash")
+            raise
+        return xxhash.xxh3_64_intdigest
+
+    if name == 'blake2b':
+        return lambda data: int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'little')
+
+    raise ValueError(f"Unknown hash: {name}")
+
+
+def simhash(text: str, shingle_size: int = 3, hash_func=None) -> int:
+    """
+    Compute the 64-bit SimHash of a text.
+
+    Features are overlapping word shingles, so texts that share most of
+    their sentences get fingerprints a few bits apart. Words are hashed
+    once; shingle hashes are combined from word hashes with numpy.
+
+    Args:
+        text: Text (e.g., extracted page text)
+        shingle_size: Words per shingle
+        hash_func: 64-bit hash function (default: get_hash64())
+
+    Returns:
+        int: Fingerprint (0 for texts without words)
+    """
+    import numpy as np
+
+    hash_func = hash_func or get_hash64()
+    tokens = TOKEN_PATTERN.findall(text.lower())
+    if not tokens:
+        return 0
+
+    words = np.fromiter((hash_func(token.encode('utf-8')) for token in tokens), dtype=np.uint64, count=len(tokens))
+    count = max(len(tokens) - shingle_size + 1, 1)
+    hashes = words[:count].copy()
+    for offset in range(1, min(shingle_size, len(tokens))):
+        hashes = (hashes << np.uint64(1) | hashes >> np.uint64(63)) ^ words[offset:offset + count]
+
+    # murmur3 finalizer, so shingles differing in one word differ in about half the bits
+    hashes ^= hashes >> np.uint64(33)
+    hashes *= np.uint64(0xff51afd7ed558ccd)
+    hashes ^= hashes >> np.uint64(33)
+    hashes *= np.uint64(0xc4ceb9fe1a85ec53)
+    hashes ^= hashes >> np.uint64(33)
+
+    # Bit i of the fingerprint is set when most feature hashes have it set
+    ones = np.unpackbits(hashes.view(np.uint8)).reshape(-1, FINGERPRINT_BITS).sum(axis=0, dtype=np.int64)
+    return int.from_bytes(np.packbits(ones * 2 > count).tobytes(), 'big')
+
+
+class SimHashIndex:
+    """
+    Find stored fingerprints within a Hamming distance of a query.
+
+    Fingerprints are split into bands; if two fingerprints differ in at
+    most max_distance bits, one band differs in at most
+    max_distance // bands bits. Lookups probe each band's value with
+    that many bits flipped, so only entries sharing a (probed) band value
+    are compared. With the defaults (distance 5, three 21-bit bands) a
+    lookup is 66 dict probes and almost no comparisons at a million
+    entries.
+
+    Bounded: beyond maxsize entries the oldest are forgotten.
+    """
+
+    def __init__(self, max_distance: int = 5, maxsize: int = 500000, bands: int = 3):
+        """
+        Initialize index.
+
+        Args:
+            max_distance: Maximum differing bits for a match
+            maxsize: Maximum number of stored fingerprints
+            bands: Number of bands (more bands: fewer probes, more memory)
+        """
+        self.max_distance = max_distance
+        self.maxsize = maxsize
+
+        radius = max_distance // bands
+        self._bands = []
+        shift = 0
+        for i in range(bands):
+            width = (FINGERPRINT_BITS - shift) // (bands - i)
+            probes = [0]
+            for flipped in range(1, radius + 1):
+                probes.extend(sum(1 << bit for bit in bits) for bits in combinations(range(width), flipped))
+            self._bands.append((shift, (1 << width) - 1, probes))
+            shift += width
+
+        # Band value -> fingerprint, or list of fingerprints sharing it
+        self._buckets = [{} for _ in self._bands]
+        self._values = {}
+        self._order = deque()
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def find(self, fingerprint: int):
+        """
+        Find a stored fingerprint within max_distance bits.
+
+        Args:
+            fingerprint: Query fingerprint
+
+        Returns:
+            tuple: (stored fingerprint, value) or None
+        """
+        value = self._values.get(fingerprint)
+        if value is not None:
+            return fingerprint, value
+
+        for (shift, mask, probes), buckets in zip(self._bands, self._buckets):
+            key = (fingerprint >> shift) & mask
+            for probe in probes:
+                bucket = buckets.get(key ^ probe)
+                if bucket is None:
+                    continue
+                for candidate in bucket if isinstance(bucket, list) else (bucket,):
+                    if (candidate ^ fingerprint).bit_count() <= self.max_distance:
+                        return candidate, self._values[candidate]
+
+        return None
+
+    def add(self, fingerprint: int, value):
+        """
+        Store a fingerprint.
+
+        Args:
+            fingerprint: Fingerprint
+            value: Value returned by find() (not None)
+        """
+        if fingerprint in self._values:
+            self._values[fingerprint] = value
+            return
+
+        self._values[fingerprint] = value
+        self._order.append(fingerprint)
+        for (shift, mask, _), buckets in zip(self._bands, self._buckets):
+            key = (fingerprint >> shift) & mask
+            bucket = buckets.get(key)
+            if bucket is None:
+                buckets[key] = fingerprint
+            elif isinstance(bucket, list):
+                bucket.append(fingerprint)
+            else:
+                buckets[key] = [bucket, fingerprint]
+
+        while len(self._order) > self.maxsize:
+            self._remove(self._order.popleft())
+
+    def get(self, fingerprint: int):
+        """Get the value stored for an exact fingerprint."""
+        return self._values.get(fingerprint)
+
+    def values(self):
+        """Iterate over stored values."""
+        return self._values.values()
+
+    def _remove(self, fingerprint):
+        del self._values[fingerprint]
+        for (shift, mask, _), buckets in zip(self._bands, self._buckets):
+            key = (fingerprint >> shift) & mask
+            bucket = buckets[key]
+            if not isinstance(bucket, list):
+                del buckets[key]
+                continue
+            bucket.remove(fingerprint)
+            if len(bucket) == 1:
+                buckets[key] = bucket[0]
@@ -5,10 +5,21 @@ Extractors package for Lookuply Crawler.
 from .language_detector import LanguageDetector, get_detector
 from .content_extractor import ContentExtractor
 from .metadata_extractor import MetadataExtractor
+from .host_cache import TemplateCache, SelectorCache, create_template_cache, create_selector_cache
+from .parse_budget import ParseBudget, create_parse_budget
+from .profiles import EXTRACTION_PROFILES, get_profile_fields
 
 __all__ = [
     'LanguageDetector',
     'get_detector',
     'ContentExtractor',
     'MetadataExtractor',
+    'TemplateCache',
+    'SelectorCache',
+    'create_template_cache',
+    'create_selector_cache',
+    'ParseBudget',
+    'create_parse_budget',
+    'EXTRACTION_PROFILES',
+    'get_profile_fields',
 ]
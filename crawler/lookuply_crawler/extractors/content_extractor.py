@@ -6,7 +6,10 @@ Extracts clean text content from HTML pages.
 import logging
 import re
 from typing import Optional, Dict
-from bs4 import BeautifulSoup, Comment
+from urllib.parse import urljoin, urlparse
+from bs4 import BeautifulSoup, Comment, NavigableString
+
+from ..utils import normalize_url, parse_html
 
 logger = logging.getLogger(__name__)
 
@@ -30,22 +33,50 @@ class ContentExtractor:
         r'comment', r'related', r'recommended', r'trending'
     ]
 
-    def __init__(self, min_text_length: int = 100):
+    # Main content detection: 'heuristic' (content containers, else body)
+    # or 'density' (block scoring by text and link density)
+    MODES = ('heuristic', 'density')
+
+    # Density mode: minimum direct (non-link) text of a block
+    MIN_BLOCK_TEXT = 25
+
+    # Keys of the item's (main content) links; page links also have 'in_content'
+    LINK_FIELDS = ('url', 'text', 'domain', 'internal')
+
+    def __init__(self, min_text_length: int = 100, template_cache=None, selector_cache=None,
+                 mode: str = 'heuristic', parse_budget=None, canonicalizer=None):
         """
         Initialize content extractor.
 
         Args:
             min_text_length: Minimum length of text to consider valid content
+            template_cache: TemplateCache for learned per-host boilerplate (optional)
+            selector_cache: SelectorCache for learned per-host content containers (optional)
+            mode: Main content detection, one of MODES
+            parse_budget: ParseBudget for pathological pages (optional)
+            canonicalizer: UrlCanonicalizer for link URLs (default: normalize_url)
         """
-        self.min_text_length = min_text_length
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown content extraction mode: {mode}")
 
-    def extract(self, html: str, url: str = None) -> Dict[str, any]:
+        self.min_text_length = min_text_length
+        self.mode = mode
+        self.template_cache = template_cache
+        self.selector_cache = selector_cache
+        self.parse_budget = parse_budget
+        self.canonicalizer = canonicalizer
+
+    def extract(self, html, url: str = None, encoding: Optional[str] = None,
+                deadline: Optional[float] = None, parts=None) -> Dict[str, any]:
         """
         Extract content from HTML.
 
         Args:
-            html: HTML content
+            html: HTML content (str, or bytes such as response.body)
             url: URL of the page (for logging)
+            encoding: Encoding of bytes input (None = detect)
+            deadline: Parse budget deadline (time.perf_counter, default: from now)
+            parts: Structural parts to extract ('paragraphs', 'headings', 'links'; None = all)
 
         Returns:
             Dict containing extracted content:
@@ -53,47 +84,148 @@ class ContentExtractor:
                 - text_length: Length of extracted text
                 - paragraphs: List of paragraphs
                 - headings: List of headings
-                - links: List of internal links
+                - links: Links in the main content
+                - page_links: Every link of the page, with 'in_content' (for following)
+                - degraded: Exceeded parse budget, or None
         """
         try:
-            soup = BeautifulSoup(html, 'lxml')
+            budget = self.parse_budget
+            if budget is not None:
+                exceeded = budget.check(html)
+                if exceeded:
+                    return self._extract_degraded(html, url, encoding, exceeded)
+                if deadline is None:
+                    deadline = budget.deadline()
 
-            # Remove boilerplate elements
-            self._remove_boilerplate(soup)
+            soup = parse_html(html, encoding)
 
-            # Extract main content
-            main_content = self._find_main_content(soup)
+            # Collect every link before boilerplate (navigation) is removed
+            page_links, anchors = self._collect_links(soup, url)
 
-            # Extract text
-            text = self._extract_text(main_content)
+            # Remove boilerplate elements
+            self._remove_boilerplate(soup, url, deadline)
+
+            # Out of time: text of the whole body, no structure
+            if budget is not None and budget.expired(deadline):
+                text = self._extract_text(soup.find('body') or soup)[:budget.text_chars]
+                return self._result(text, page_links=page_links, degraded=budget.exceeded('max_seconds'))
+
+            # Extract main content (host's remembered container first)
+            main_content = None
+            body = soup.find('body')
+            host = urlparse(url).netloc if url else None
+            if self.selector_cache is not None and body is not None and host:
+                main_content = self.selector_cache.find(body, host)
+
+            if main_content is not None:
+                text = self._extract_text(main_content)
+                valid = len(text) >= self.min_text_length
+                if valid and self.selector_cache.should_verify(host):
+                    main_content, text = self._verify_selector(soup, body, host, main_content, text)
+                else:
+                    self.selector_cache.confirm(host, valid)
+                if not valid:
+                    main_content = None
+
+            if main_content is None:
+                main_content = self._find_main_content(soup)
+                text = self._extract_text(main_content)
+                # The body fallback is not a container worth remembering
+                if (self.selector_cache is not None and body is not None and host and main_content is not body
+                        and len(text) >= self.min_text_length):
+                    self.selector_cache.remember(body, host, main_content)
+
+            self._mark_content_links(main_content, anchors)
+
+            if budget is not None and budget.expired(deadline):
+                return self._result(text[:budget.text_chars], page_links=page_links,
+                                    degraded=budget.exceeded('max_seconds'))
 
             # Extract structural elements
-            paragraphs = self._extract_paragraphs(main_content)
-            headings = self._extract_headings(main_content)
-            links = self._extract_links(main_content, url)
-
-            return {
-                'text': text,
-                'text_length': len(text),
-                'paragraphs': paragraphs,
-                'headings': headings,
-                'links': links,
-                'is_valid': len(text) >= self.min_text_length
-            }
+            paragraphs = self._extract_paragraphs(main_content) if parts is None or 'paragraphs' in parts else []
+            headings = self._extract_headings(main_content) if parts is None or 'headings' in parts else []
+            links = self._content_links(page_links) if parts is None or 'links' in parts else []
+
+            return self._result(text, paragraphs, headings, links, page_links)
 
         except Exception as e:
             logger.error(f"Content extraction failed for {url}: {e}")
-            return {
-                'text': '',
-                'text_length': 0,
-                'paragraphs': [],
-                'headings': [],
-                'links': [],
-                'is_valid': False
-            }
+            return self._result('')
+
+    def _verify_selector(self, soup: BeautifulSoup, body, host: str, cached, cached_text: str) -> tuple:
+        """
+        Check the host's remembered container against the heuristics.
 
-    def _remove_boilerplate(self, soup: BeautifulSoup):
-        """Remove boilerplate elements from soup."""
+        Returns:
+            tuple: (container, text), the heuristics' container if they pick
+            another one with enough text (the host's path is then replaced)
+        """
+        found = self._find_main_content(soup)
+        if found is not cached and found is not body:
+            text = self._extract_text(found)
+            if len(text) >= self.min_text_length:
+                self.selector_cache.replace(body, host, found)
+                return found, text
+
+        self.selector_cache.confirm(host, True)
+        return cached, cached_text
+
+    def _result(self, text: str, paragraphs: list = None, headings: list = None, links: list = None,
+                page_links: list = None, degraded: Optional[str] = None) -> Dict[str, any]:
+        """Build the extraction result."""
+        return {
+            'text': text,
+            'text_length': len(text),
+            'paragraphs': paragraphs or [],
+            'headings': headings or [],
+            'links': links or [],
+            'page_links': page_links or [],
+            'is_valid': len(text) >= self.min_text_length,
+            'degraded': degraded,
+        }
+
+    def _extract_degraded(self, html, url: Optional[str], encoding: Optional[str], exceeded: str) -> Dict[str, any]:
+        """
+        Fast path for pages over the parse budget.
+
+        Text of the first max_bytes of the page, parsed with lxml directly
+        (no BeautifulSoup tree, boilerplate tags dropped), truncated to
+        text_chars characters.
+        """
+        import lxml.etree
+        import lxml.html
+
+        html = self.parse_budget.truncate(html)
+        if isinstance(html, bytes):
+            parser = lxml.html.HTMLParser(encoding=encoding)
+            root = lxml.html.document_fromstring(html, parser=parser)
+        else:
+            root = lxml.html.document_fromstring(html)
+
+        # Links for following (none are flagged as main content)
+        links = {}
+        base = root.find('.//base[@href]')
+        base_url = urljoin(url, base.get('href').strip()) if url and base is not None else url
+        page_host = urlparse(url).netloc.lower() if url else ''
+        for a in root.iter('a'):
+            href = a.get('href')
+            if href:
+                self._add_link(links, href, a.text_content, base_url, page_host)
+
+        lxml.etree.strip_elements(root, lxml.etree.Comment, *self.BOILERPLATE_TAGS, with_tail=False)
+        body = root.find('body')
+        lines = (line.strip() for line in (body if body is not None else root).itertext())
+        text = '\n'.join(line for line in lines if line)
+
+        return self._result(text[:self.parse_budget.text_chars], page_links=list(links.values()), degraded=exceeded)
+
+    def _remove_boilerplate(self, soup: BeautifulSoup, url: Optional[str] = None, deadline: Optional[float] = None):
+        """
+        Remove boilerplate elements from soup.
+        Removes the host's learned template blocks first, then matches class/id
+        patterns on what is left of the page (per-page blocks such as comments),
+        and stops matching patterns once the parse budget deadline has passed.
+        """
         # Remove by tag name
         for tag in self.BOILERPLATE_TAGS:
             for element in soup.find_all(tag):
@@ -103,8 +235,16 @@ class ContentExtractor:
         for comment in soup.find_all(string=lambda text: isinstance(text, Comment)):
             comment.extract()
 
+        # Remove learned template blocks (removed subtrees are not matched below)
+        if self.template_cache is not None and url:
+            root = soup.find('body') or soup
+            self.template_cache.remove_boilerplate(root, urlparse(url).netloc, self.min_text_length)
+
         # Remove by class/id patterns
         for pattern in self.BOILERPLATE_PATTERNS:
+            if self.parse_budget is not None and self.parse_budget.expired(deadline):
+                return
+
             regex = re.compile(pattern, re.IGNORECASE)
 
             for element in soup.find_all(class_=regex):
@@ -118,6 +258,9 @@ class ContentExtractor:
         Find the main content area of the page.
         Tries common content containers first, falls back to body.
         """
+        if self.mode == 'density':
+            return self._find_main_content_by_density(soup)
+
         # Try common main content selectors
         selectors = [
             ('article', None),
@@ -140,6 +283,60 @@ class ContentExtractor:
         # Fallback to body
         return soup.find('body') or soup
 
+    def _find_main_content_by_density(self, soup: BeautifulSoup) -> BeautifulSoup:
+        """
+        Find the main content area by text and link density.
+
+        Blocks with at least MIN_BLOCK_TEXT characters of direct, non-link
+        text score their length for their parent and half of it for their
+        grandparent; each candidate's score is scaled by the share of its
+        text that is not link text. One pass over the DOM, children before
+        parents.
+        """
+        root = soup.find('body') or soup
+
+        text_length = {}  # id(element) -> characters of text
+        link_length = {}  # id(element) -> characters of link text
+        direct_length = {}  # id(element) -> characters of its own strings
+        scores = {}
+        elements = {}
+
+        for node in reversed(list(root.descendants)):
+            parent = id(node.parent)
+            if isinstance(node, NavigableString):
+                if type(node) is NavigableString:
+                    length = len(node.strip())
+                    text_length[parent] = text_length.get(parent, 0) + length
+                    direct_length[parent] = direct_length.get(parent, 0) + length
+                continue
+
+            key = id(node)
+            length = text_length.get(key, 0)
+            links = length if node.name == 'a' else link_length.get(key, 0)
+            text_length[parent] = text_length.get(parent, 0) + length
+            if links:
+                link_length[key] = links
+                link_length[parent] = link_length.get(parent, 0) + links
+
+            direct = direct_length.get(key, 0)
+            if node.name != 'a' and direct >= self.MIN_BLOCK_TEXT:
+                scores[parent] = scores.get(parent, 0) + direct
+                elements[parent] = node.parent
+                grandparent = node.parent.parent
+                if node.parent is not root and grandparent is not None:
+                    scores[id(grandparent)] = scores.get(id(grandparent), 0) + direct / 2
+                    elements[id(grandparent)] = grandparent
+
+        best, best_score = root, 0
+        for key, score in scores.items():
+            length = text_length.get(key, 0)
+            if length:
+                score *= 1 - link_length.get(key, 0) / length
+            if score > best_score:
+                best, best_score = elements[key], score
+
+        return best
+
     def _extract_text(self, element: BeautifulSoup) -> str:
         """Extract clean text from element."""
         if not element:
@@ -185,40 +382,94 @@ class ContentExtractor:
 
         return headings
 
-    def _extract_links(self, element: BeautifulSoup, base_url: Optional[str] = None) -> list:
-        """Extract links from element."""
-        if not element:
-            return []
+    def _collect_links(self, soup: BeautifulSoup, url: Optional[str] = None) -> tuple:
+        """
+        Collect every http(s) link of the page in one pass.
 
-        from urllib.parse import urljoin, urlparse
+        Links are resolved against the page URL (or its <base href>),
+        normalized and deduplicated, and classified as internal (same
+        host as the page) or external.
 
-        links = []
-        for a in element.find_all('a', href=True):
-            href = a['href'].strip()
-            text = a.get_text().strip()
+        Returns:
+            (page_links, anchors): link dicts in page order, and
+            (element, link) pairs for _mark_content_links
+        """
+        links = {}
+        anchors = []
 
-            # Skip empty or anchor-only links
-            if not href or href.startswith('#'):
-                continue
+        base = soup.find('base', href=True)
+        base_url = urljoin(url, base['href'].strip()) if url and base is not None else url
+        page_host = urlparse(url).netloc.lower() if url else ''
 
-            # Convert to absolute URL if base_url provided
-            if base_url:
-                href = urljoin(base_url, href)
+        for a in soup.find_all('a', href=True):
+            link = self._add_link(links, a['href'], a.get_text, base_url, page_host)
+            if link is not None:
+                anchors.append((a, link))
 
-            # Parse URL
-            parsed = urlparse(href)
+        return list(links.values()), anchors
 
-            # Skip non-http(s) links
-            if parsed.scheme not in ['http', 'https']:
-                continue
+    def _add_link(self, links: dict, href: str, get_text, base_url: Optional[str], page_host: str) -> Optional[dict]:
+        """
+        Add an anchor's link to `links` (canonical URL -> link).
 
-            links.append({
-                'url': href,
-                'text': text,
-                'domain': parsed.netloc
-            })
+        Args:
+            links: Links collected so far
+            href: Anchor href
+            get_text: Callable returning the anchor text (only called when needed)
+            base_url: URL relative links are resolved against
+            page_host: Host of the page, for internal/external
 
-        return links
+        Returns:
+            The link dict, or None if the href is not an http(s) link
+        """
+        href = href.strip()
+
+        # Skip empty or anchor-only links
+        if not href or href.startswith('#'):
+            return None
+
+        # Convert to absolute URL if base_url provided
+        if base_url:
+            href = urljoin(base_url, href)
+
+        # Skip non-http(s) links
+        if not href[:8].lower().startswith(('http://', 'https://')):
+            return None
+
+        if self.canonicalizer is not None:
+            canonical = self.canonicalizer.canonicalize(href)
+        else:
+            canonical = normalize_url(href)
+        link = links.get(canonical)
+        if link is None:
+            domain = urlparse(canonical).netloc
+            link = links[canonical] = {
+                'url': canonical,
+                'text': get_text().strip(),
+                'domain': domain,
+                'internal': domain == page_host,
+                'in_content': False,
+            }
+        elif not link['text']:
+            link['text'] = get_text().strip()
+        return link
+
+    def _mark_content_links(self, element: BeautifulSoup, anchors: list):
+        """Flag the links whose anchors are inside the main content element."""
+        if not element or not anchors:
+            return
+
+        content_anchors = {id(a) for a in element.find_all('a', href=True)}
+        for a, link in anchors:
+            if id(a) in content_anchors:
+                link['in_content'] = True
+
+    def _content_links(self, page_links: list) -> list:
+        """Links in the main content, in the item's link format."""
+        return [
+            {field: link[field] for field in self.LINK_FIELDS}
+            for link in page_links if link['in_content']
+        ]
 
     def extract_main_text_only(self, html: str) -> str:
         """
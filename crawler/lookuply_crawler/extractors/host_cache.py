@@ -0,0 +1,393 @@
+"""
+Host Cache Module
+Per-host extraction knowledge learned from earlier pages of the same site.
+"""
+
+import logging
+from typing import Optional
+from bs4 import NavigableString, Tag
+
+from ..cache import LRUCache
+from ..dedupe import get_hash64
+
+logger = logging.getLogger(__name__)
+
+
+class TemplateCache:
+    """
+    Learn each host's page template as fingerprints of repeated DOM subtrees.
+
+    A subtree fingerprint covers its tag names, classes and text, so the
+    navigation, footer, cookie banner or sidebar widgets of a site get the
+    same fingerprint on every page. Once `min_pages` pages of a host have
+    been seen, subtrees found on at least `min_ratio` of them are template
+    boilerplate and are removed in one pass over the page.
+
+    Bounded: at most `max_hosts` hosts (least recently used are evicted)
+    and `max_blocks` fingerprints per host. Persisted with save()/load().
+    """
+
+    def __init__(self, max_hosts: int = 2000, min_pages: int = 5, min_ratio: float = 0.5,
+                 max_blocks: int = 300, min_block_chars: int = 20, cache_file: Optional[str] = None):
+        """
+        Initialize cache.
+
+        Args:
+            max_hosts: Maximum number of hosts
+            min_pages: Pages of a host to see before using its template
+            min_ratio: Share of a host's pages a subtree must appear on to be boilerplate
+            max_blocks: Maximum fingerprints kept per host (most frequent)
+            min_block_chars: Minimum text length of a subtree to fingerprint
+            cache_file: JSON file to persist the cache across runs (optional)
+        """
+        self.min_pages = min_pages
+        self.min_ratio = min_ratio
+        self.max_blocks = max_blocks
+        self.min_block_chars = min_block_chars
+        self.cache_file = cache_file
+        self.hash_func = get_hash64()
+
+        # Host -> [pages seen, {fingerprint (hex): pages containing it}]
+        self.hosts = LRUCache(max_hosts)
+        # Host -> (pages seen when computed, boilerplate fingerprints)
+        self._boilerplate = {}
+
+        self.stats = {
+            'pages': 0,
+            'applied': 0,
+            'blocks_removed': 0,
+            'fallbacks': 0,
+        }
+
+        if cache_file:
+            loaded = self.hosts.load(cache_file)
+            logger.info(f"Loaded {loaded} host templates from {cache_file}")
+
+    def remove_boilerplate(self, root: Tag, host: str, min_text_length: int = 0) -> bool:
+        """
+        Record a page's subtrees and remove the host's template boilerplate.
+
+        Args:
+            root: Page root (e.g., body), modified in place
+            host: Host (netloc) of the page
+            min_text_length: Keep the page as it is if less text would remain
+
+        Returns:
+            bool: True if the learned template was applied
+        """
+        blocks, text_length = self._fingerprint(root)
+
+        entry = self.hosts.get(host)
+        if entry is None:
+            entry = [0, {}]
+            self.hosts.set(host, entry)
+        self._observe(entry, blocks)
+        self.stats['pages'] += 1
+
+        boilerplate = self._template(host, entry)
+        if not boilerplate:
+            return False
+
+        # Outermost matching subtrees, top-down
+        matches = []
+        stack = [root]
+        while stack:
+            element = stack.pop()
+            fingerprint, length = blocks.get(id(element), (None, 0))
+            if fingerprint in boilerplate and element is not root:
+                matches.append((element, length))
+                continue
+            stack.extend(child for child in element.contents if isinstance(child, Tag))
+
+        if text_length - sum(length for _, length in matches) < min_text_length:
+            self.stats['fallbacks'] += 1
+            return False
+
+        for element, _ in matches:
+            element.decompose()
+
+        self.stats['applied'] += 1
+        self.stats['blocks_removed'] += len(matches)
+        return True
+
+    def save(self):
+        """Persist cache to disk (if a cache file is configured)."""
+        if self.cache_file:
+            self.hosts.save(self.cache_file)
+
+    def _fingerprint(self, root):
+        """
+        Fingerprint all subtrees of root, children before parents.
+
+        Returns:
+            tuple: ({id(element): (fingerprint hex, text length)}, root text length)
+        """
+        blocks = {}
+        for element in list(reversed(list(root.descendants))) + [root]:
+            if not isinstance(element, Tag):
+                continue
+
+            parts = [element.name, ' '.join(element.get('class') or ())]
+            length = 0
+            for child in element.contents:
+                if isinstance(child, Tag):
+                    child_fingerprint, child_length = blocks[id(child)]
+                    parts.append(child_fingerprint)
+                    length += child_length
+                elif isinstance(child, NavigableString):
+                    text = ' '.join(child.split())
+                    if text:
+                        parts.append(text)
+                        length += len(text)
+
+            fingerprint = f"{self.hash_func(chr(31).join(parts).encode('utf-8')):x}"
+            blocks[id(element)] = (fingerprint, length)
+
+        return blocks, blocks[id(root)][1]
+
+    def _observe(self, entry, blocks):
+        entry[0] += 1
+        counts = entry[1]
+        for fingerprint in {fingerprint for fingerprint, length in blocks.values() if length >= self.min_block_chars}:
+            counts[fingerprint] = counts.get(fingerprint, 0) + 1
+
+        if len(counts) > self.max_blocks:
+            # Forget the rarest half (page-specific subtrees)
+            keep = sorted(counts.items(), key=lambda item: item[1], reverse=True)[:self.max_blocks // 2]
+            entry[1] = dict(keep)
+
+    def _template(self, host, entry):
+        pages, counts = entry
+        if pages < self.min_pages:
+            return None
+
+        cached = self._boilerplate.get(host)
+        if cached is not None and pages - cached[0] < self.min_pages:
+            return cached[1]
+
+        threshold = pages * self.min_ratio
+        boilerplate = {fingerprint for fingerprint, count in counts.items() if count >= threshold}
+        if len(self._boilerplate) >= self.hosts.maxsize:
+            self._boilerplate.clear()
+        self._boilerplate[host] = (pages, boilerplate)
+        return boilerplate
+
+
+class SelectorCache:
+    """
+    Remember, per host, the element path of the main content container.
+
+    The path is the (tag, classes) of each element from body down to the
+    container ContentExtractor found with its heuristics; pages where the
+    heuristics fall back to the whole body are not remembered. On later
+    pages of the host the path is followed child by child, which skips the
+    searches over the whole document; the extractor falls back to the
+    heuristics when the path is missing or yields too little text.
+
+    The first `verify_pages` uses of a path, and every `verify_every`-th
+    after that, are checked against the heuristics, and the path is
+    replaced when they pick another container.
+
+    Bounded: at most `max_hosts` hosts (least recently used are evicted).
+    Persisted with save()/load().
+    """
+
+    def __init__(self, max_hosts: int = 10000, verify_pages: int = 2, verify_every: int = 10,
+                 cache_file: Optional[str] = None):
+        """
+        Initialize cache.
+
+        Args:
+            max_hosts: Maximum number of hosts
+            verify_pages: Uses of a new path checked against the heuristics
+            verify_every: Check every n-th use after that (0 = never)
+            cache_file: JSON file to persist the cache across runs (optional)
+        """
+        self.verify_pages = verify_pages
+        self.verify_every = verify_every
+        self.cache_file = cache_file
+
+        # Host -> [[tag, [classes]], ...] from body to the content container
+        self.hosts = LRUCache(max_hosts)
+        # Host -> uses of its path (not persisted: paths are checked again after a restart)
+        self._uses = {}
+
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'invalid': 0,
+            'verified': 0,
+            'replaced': 0,
+        }
+
+        if cache_file:
+            loaded = self.hosts.load(cache_file)
+            logger.info(f"Loaded {loaded} content selectors from {cache_file}")
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of lookups that produced valid content."""
+        lookups = self.stats['hits'] + self.stats['misses']
+        return self.stats['hits'] / lookups if lookups else 0.0
+
+    def find(self, body: Tag, host: str) -> Optional[Tag]:
+        """
+        Follow the host's remembered path.
+
+        Args:
+            body: Page body
+            host: Host (netloc) of the page
+
+        Returns:
+            Content container, or None if the host has no path or it does not match
+            (pass the result to confirm())
+        """
+        path = self.hosts.get(host)
+        if not path:
+            # Body paths ([]) stored by earlier versions are not containers
+            if path is not None:
+                self.hosts.pop(host)
+            self.stats['misses'] += 1
+            return None
+
+        element = body
+        for name, classes in path:
+            element = next((
+                child for child in element.contents
+                if isinstance(child, Tag) and child.name == name and (child.get('class') or []) == classes
+            ), None)
+            if element is None:
+                self.stats['misses'] += 1
+                return None
+
+        return element
+
+    def remember(self, body: Tag, host: str, element: Tag) -> bool:
+        """
+        Store the path from body to a content container that produced valid content.
+
+        Args:
+            body: Page body
+            host: Host (netloc) of the page
+            element: Content container (a descendant of body)
+
+        Returns:
+            bool: True if a path was stored (never for body itself)
+        """
+        path = []
+        while element is not body:
+            if element is None or element.name == '[document]':
+                return False
+            path.append([element.name, list(element.get('class') or [])])
+            element = element.parent
+
+        if not path:
+            return False
+
+        self.hosts.set(host, path[::-1])
+        self._uses.pop(host, None)
+        return True
+
+    def should_verify(self, host: str) -> bool:
+        """
+        Count a use of the host's path and tell whether to check it against the heuristics.
+
+        Args:
+            host: Host (netloc) of the page
+
+        Returns:
+            bool: True if the heuristics should be run as well
+        """
+        if len(self._uses) >= self.hosts.maxsize:
+            self._uses.clear()
+        uses = self._uses.get(host, 0) + 1
+        self._uses[host] = uses
+
+        verify = uses <= self.verify_pages or (self.verify_every > 0 and uses % self.verify_every == 0)
+        if verify:
+            self.stats['verified'] += 1
+        return verify
+
+    def replace(self, body: Tag, host: str, element: Tag) -> bool:
+        """
+        Replace the host's path with the container the heuristics found instead.
+
+        Args:
+            body: Page body
+            host: Host (netloc) of the page
+            element: Content container found by the heuristics
+
+        Returns:
+            bool: True if the path was replaced (False: it was forgotten)
+        """
+        self.stats['replaced'] += 1
+        if self.remember(body, host, element):
+            return True
+
+        self.hosts.pop(host)
+        return False
+
+    def confirm(self, host: str, valid: bool):
+        """
+        Record whether the container found with find() produced valid content.
+        Invalid paths are forgotten.
+
+        Args:
+            host: Host (netloc) of the page
+            valid: Container text reached the minimum length
+        """
+        if valid:
+            self.stats['hits'] += 1
+            return
+
+        self.hosts.pop(host)
+        self.stats['misses'] += 1
+        self.stats['invalid'] += 1
+
+    def save(self):
+        """Persist cache to disk (if a cache file is configured)."""
+        if self.cache_file:
+            self.hosts.save(self.cache_file)
+
+
+def create_template_cache(settings) -> Optional[TemplateCache]:
+    """
+    Create template cache from crawler settings.
+
+    Args:
+        settings: Scrapy settings
+
+    Returns:
+        TemplateCache, or None if TEMPLATE_CACHE_ENABLED is off
+    """
+    if not settings.getbool('TEMPLATE_CACHE_ENABLED', True):
+        return None
+
+    return TemplateCache(
+        max_hosts=settings.getint('TEMPLATE_CACHE_HOSTS', 2000),
+        min_pages=settings.getint('TEMPLATE_CACHE_MIN_PAGES', 5),
+        min_ratio=settings.getfloat('TEMPLATE_CACHE_MIN_RATIO', 0.5),
+        max_blocks=settings.getint('TEMPLATE_CACHE_BLOCKS', 300),
+        cache_file=settings.get('TEMPLATE_CACHE_FILE'),
+    )
+
+
+def create_selector_cache(settings) -> Optional[SelectorCache]:
+    """
+    Create content selector cache from crawler settings.
+
+    Args:
+        settings: Scrapy settings
+
+    Returns:
+        SelectorCache, or None if SELECTOR_CACHE_ENABLED is off
+    """
+    if not settings.getbool('SELECTOR_CACHE_ENABLED', True):
+        return None
+
+    return SelectorCache(
+        max_hosts=settings.getint('SELECTOR_CACHE_HOSTS', 10000),
+        verify_pages=settings.getint('SELECTOR_CACHE_VERIFY_PAGES', 2),
+        verify_every=settings.getint('SELECTOR_CACHE_VERIFY_EVERY', 10),
+        cache_file=settings.get('SELECTOR_CACHE_FILE'),
+    )
@@ -156,20 +156,21 @@ class LanguageDetector:
 
         return (False, lang_code, confidence)
 
-    def detect_from_html(self, html: str) -> Tuple[str, float]:
+    def detect_from_html(self, html, encoding: Optional[str] = None) -> Tuple[str, float]:
         """
         Detect language from HTML content by extracting text first.
 
         Args:
-            html: HTML content
+            html: HTML content (str, or bytes such as response.body)
+            encoding: Encoding of bytes input (None = detect)
 
         Returns:
             Tuple of (language_code, confidence_score)
         """
         try:
-            from bs4 import BeautifulSoup
+            from ..utils import parse_html
 
-            soup = BeautifulSoup(html, 'lxml')
+            soup = parse_html(html, encoding)
 
             # Remove script and style elements
             for script in soup(['script', 'style', 'noscript']):
@@ -8,6 +8,8 @@ from typing import Dict, Optional, List
 from bs4 import BeautifulSoup
 from urllib.parse import urlparse
 
+from ..utils import parse_html
+
 logger = logging.getLogger(__name__)
 
 
@@ -17,34 +19,41 @@ class MetadataExtractor:
     Handles Open Graph, Twitter Cards, and standard meta tags.
     """
 
-    def extract(self, html: str, url: str = None) -> Dict[str, any]:
+    def extract(self, html, url: str = None, encoding: Optional[str] = None, keys=None) -> Dict[str, any]:
         """
         Extract all metadata from HTML.
 
         Args:
-            html: HTML content
+            html: HTML content (str, or bytes such as response.body)
             url: URL of the page
+            encoding: Encoding of bytes input (None = detect)
+            keys: Metadata keys to extract (None = all); the others keep their empty value
 
         Returns:
             Dict containing metadata
         """
         try:
-            soup = BeautifulSoup(html, 'lxml')
-
-            metadata = {
-                'title': self._extract_title(soup),
-                'description': self._extract_description(soup),
-                'keywords': self._extract_keywords(soup),
-                'author': self._extract_author(soup),
-                'language': self._extract_language(soup),
-                'canonical_url': self._extract_canonical_url(soup, url),
-                'og': self._extract_open_graph(soup),
-                'twitter': self._extract_twitter_card(soup),
-                'published_date': self._extract_published_date(soup),
-                'modified_date': self._extract_modified_date(soup),
-                'favicon': self._extract_favicon(soup, url),
+            soup = parse_html(html, encoding)
+
+            extractors = {
+                'title': lambda: self._extract_title(soup),
+                'description': lambda: self._extract_description(soup),
+                'keywords': lambda: self._extract_keywords(soup),
+                'author': lambda: self._extract_author(soup),
+                'language': lambda: self._extract_language(soup),
+                'canonical_url': lambda: self._extract_canonical_url(soup, url),
+                'og': lambda: self._extract_open_graph(soup),
+                'twitter': lambda: self._extract_twitter_card(soup),
+                'published_date': lambda: self._extract_published_date(soup),
+                'modified_date': lambda: self._extract_modified_date(soup),
+                'favicon': lambda: self._extract_favicon(soup, url),
             }
 
+            metadata = self._empty_metadata()
+            for key, extract in extractors.items():
+                if keys is None or key in keys:
+                    metadata[key] = extract()
+
             return metadata
 
         except Exception as e:
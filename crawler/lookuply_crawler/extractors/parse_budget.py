@@ -0,0 +1,128 @@
+"""
+Parse Budget Module
+Limits on the work spent extracting one page.
+"""
+
+import time
+import logging
+from typing import Optional
+
+from ..utils import get_html_head
+
+logger = logging.getLogger(__name__)
+
+
+class ParseBudget:
+    """
+    Budgets for parsing and extracting one page.
+
+    - max_bytes: documents larger than this are not parsed in full
+    - max_nodes: neither are documents with more elements than this
+      (estimated before parsing by counting start tags)
+    - max_seconds: wall time for content and metadata extraction; stages
+      after the deadline are skipped
+
+    A page over budget gets the degraded fast path: metadata from the
+    document head only and text of its first max_bytes, truncated to
+    text_chars characters, without paragraphs, headings or links. A limit
+    of 0 disables that budget.
+    """
+
+    BUDGETS = ('max_bytes', 'max_nodes', 'max_seconds')
+
+    def __init__(self, max_bytes: int = 1024 * 1024, max_nodes: int = 50000, max_seconds: float = 1.0,
+                 text_chars: int = 20000):
+        """
+        Initialize budget.
+
+        Args:
+            max_bytes: Maximum document size parsed in full
+            max_nodes: Maximum number of elements parsed in full
+            max_seconds: Maximum extraction wall time per page
+            text_chars: Maximum text length of degraded pages
+        """
+        self.max_bytes = max_bytes
+        self.max_nodes = max_nodes
+        self.max_seconds = max_seconds
+        self.text_chars = text_chars
+
+        self.stats = {'pages': 0, 'degraded': 0}
+        self.stats.update((budget, 0) for budget in self.BUDGETS)
+
+    def check(self, html) -> Optional[str]:
+        """
+        Check a document against the size budgets before parsing it.
+
+        Args:
+            html: HTML content (str or bytes)
+
+        Returns:
+            Name of the exceeded budget, or None
+        """
+        self.stats['pages'] += 1
+
+        if self.max_bytes and len(html) > self.max_bytes:
+            return self.exceeded('max_bytes')
+
+        if self.max_nodes:
+            tags = html.count(b'<') - html.count(b'</') if isinstance(html, bytes) else html.count('<') - html.count('</')
+            if tags > self.max_nodes:
+                return self.exceeded('max_nodes')
+
+        return None
+
+    def deadline(self) -> Optional[float]:
+        """Deadline (time.perf_counter) of an extraction starting now, or None without a time budget."""
+        if not self.max_seconds:
+            return None
+        return time.perf_counter() + self.max_seconds
+
+    @staticmethod
+    def expired(deadline: Optional[float]) -> bool:
+        """Whether a deadline from deadline() has passed."""
+        return deadline is not None and time.perf_counter() > deadline
+
+    def exceeded(self, budget: str) -> str:
+        """Count a page degraded because of `budget`; returns the budget name."""
+        self.stats[budget] += 1
+        self.stats['degraded'] += 1
+        return budget
+
+    def truncate(self, html):
+        """First max_bytes of a document (str or bytes)."""
+        if self.max_bytes and len(html) > self.max_bytes:
+            return html[:self.max_bytes]
+        return html
+
+    def get_head(self, html):
+        """
+        Document head of an HTML document within max_bytes, for head-only metadata.
+
+        Args:
+            html: HTML content (str or bytes)
+
+        Returns:
+            Start of the document up to the end of its head (same type as html)
+        """
+        return get_html_head(self.truncate(html))
+
+
+def create_parse_budget(settings) -> Optional[ParseBudget]:
+    """
+    Create parse budget from crawler settings.
+
+    Args:
+        settings: Scrapy settings
+
+    Returns:
+        ParseBudget, or None if PARSE_BUDGET_ENABLED is off
+    """
+    if not settings.getbool('PARSE_BUDGET_ENABLED', True):
+        return None
+
+    return ParseBudget(
+        max_bytes=settings.getint('PARSE_MAX_BYTES', 1024 * 1024),
+        max_nodes=settings.getint('PARSE_MAX_NODES', 50000),
+        max_seconds=settings.getfloat('PARSE_MAX_SECONDS', 1.0),
+        text_chars=settings.getint('PARSE_DEGRADED_TEXT_CHARS', 20000),
+    )
@@ -0,0 +1,79 @@
+"""
+Extraction Profiles Module
+Named sets of item fields to extract, so deployments skip the work for fields they do not use.
+"""
+
+from typing import FrozenSet, Optional
+
+# Fields every profile extracts (identity, language and the flags the pipelines filter on)
+MINIMAL_FIELDS = frozenset({
+    'url', 'domain', 'title', 'text', 'text_length',
+    'language_code', 'language_confidence', 'language_name',
+    'status_code', 'crawled_at', 'is_valid', 'is_eu_language', 'parse_degraded',
+})
+
+# Fields for search indexing and link discovery
+SEARCH_FIELDS = MINIMAL_FIELDS | frozenset({
+    'canonical_url', 'description', 'headings', 'keywords', 'author',
+    'published_date', 'modified_date', 'links', 'internal_links_count', 'external_links_count',
+    'content_type', 'encoding', 'crawl_depth', 'referrer',
+})
+
+# Profile name -> item fields (None = every field)
+EXTRACTION_PROFILES = {
+    'minimal': MINIMAL_FIELDS,
+    'search': SEARCH_FIELDS,
+    'full': None,
+}
+
+# Item field -> ContentExtractor part computing it (text is always extracted)
+CONTENT_PARTS = {
+    'paragraphs': 'paragraphs',
+    'headings': 'headings',
+    'links': 'links',
+    'internal_links_count': 'links',
+    'external_links_count': 'links',
+}
+
+# Item field -> MetadataExtractor key
+METADATA_KEYS = {
+    'title': 'title',
+    'description': 'description',
+    'keywords': 'keywords',
+    'author': 'author',
+    'canonical_url': 'canonical_url',
+    'og_metadata': 'og',
+    'twitter_metadata': 'twitter',
+    'published_date': 'published_date',
+    'modified_date': 'modified_date',
+    'favicon': 'favicon',
+}
+
+
+def get_profile_fields(profile: str) -> Optional[FrozenSet[str]]:
+    """
+    Get the item fields of an extraction profile.
+
+    Args:
+        profile: Profile name, one of EXTRACTION_PROFILES
+
+    Returns:
+        frozenset: Item fields, or None for every field
+    """
+    if profile not in EXTRACTION_PROFILES:
+        raise ValueError(f"Unknown extraction profile: {profile}")
+    return EXTRACTION_PROFILES[profile]
+
+
+def get_content_parts(fields: Optional[FrozenSet[str]]) -> Optional[FrozenSet[str]]:
+    """ContentExtractor parts needed for item fields (None = all)."""
+    if fields is None:
+        return None
+    return frozenset(CONTENT_PARTS[field] for field in fields if field in CONTENT_PARTS)
+
+
+def get_metadata_keys(fields: Optional[FrozenSet[str]]) -> Optional[FrozenSet[str]]:
+    """MetadataExtractor keys needed for item fields (None = all)."""
+    if fields is None:
+        return None
+    return frozenset(METADATA_KEYS[field] for field in fields if field in METADATA_KEYS)
@@ -0,0 +1,252 @@
+"""
+Download Handlers - Connection Pooling and HTTP/2
+Reuse connections to large hosts and report connection metrics.
+"""
+
+import logging
+from urllib.parse import urlparse
+from twisted.internet import defer
+from twisted.python.failure import Failure
+from twisted.web.client import HTTPConnectionPool, ResponseFailed
+from scrapy.core.downloader.handlers.http11 import HTTP11DownloadHandler
+from scrapy.exceptions import NotConfigured
+
+logger = logging.getLogger(__name__)
+
+
+class InstrumentedConnectionPool(HTTPConnectionPool):
+    """
+    HTTP/1.1 connection pool that counts new (handshaking) and reused connections.
+    """
+
+    def __init__(self, reactor, persistent=True, stats=None):
+        super().__init__(reactor, persistent)
+        self.stats = stats
+        self.new_connections = 0
+        self.reused_connections = 0
+
+    def getConnection(self, key, endpoint):
+        new_before = self.new_connections
+        d = super().getConnection(key, endpoint)
+
+        # _newConnection() is called synchronously when nothing could be reused
+        if self.new_connections == new_before:
+            self.reused_connections += 1
+            self._inc_stat('downloader/connections/reused')
+
+        return d
+
+    def _newConnection(self, key, endpoint):
+        self.new_connections += 1
+        self._inc_stat('downloader/connections/new')
+        return super()._newConnection(key, endpoint)
+
+    def _inc_stat(self, key):
+        if self.stats is not None:
+            self.stats.inc_value(key)
+
+
+class PooledHTTPDownloadHandler(HTTP11DownloadHandler):
+    """
+    HTTP/1.1 download handler with tunable keep-alive and per-host pool limits.
+
+    Settings:
+    - DOWNLOAD_POOL_MAXSIZE_PER_HOST: Idle connections kept per host
+      (default: CONCURRENT_REQUESTS_PER_DOMAIN)
+    - DOWNLOAD_KEEPALIVE_TIMEOUT: Seconds an idle connection is kept open
+    """
+
+    def __init__(self, settings, crawler=None):
+        super().__init__(settings, crawler)
+
+        from twisted.internet import reactor
+
+        stats = crawler.stats if crawler else None
+        self._pool = InstrumentedConnectionPool(reactor, persistent=True, stats=stats)
+        self._pool.maxPersistentPerHost = (
+            settings.getint('DOWNLOAD_POOL_MAXSIZE_PER_HOST')
+            or settings.getint('CONCURRENT_REQUESTS_PER_DOMAIN')
+        )
+        self._pool.cachedConnectionTimeout = settings.getint('DOWNLOAD_KEEPALIVE_TIMEOUT', 240)
+        self._pool._factory.noisy = False
+
+
+class HTTP2DownloadHandler:
+    """
+    HTTPS download handler that multiplexes requests over HTTP/2.
+
+    Opt-in with DOWNLOAD_HTTP2_ENABLED (requires the `h2` package).
+    Servers without HTTP/2 do not select h2 over ALPN and drop the
+    connection on the HTTP/2 preface, so a host whose connection failed
+    after the TLS handshake negotiated another protocol (or none) is marked
+    as HTTP/1.1-only; it is then served by the pooled HTTP/1.1 handler, as
+    are proxied requests. Other failures (timeouts, resets) are returned
+    for retrying and keep the host on HTTP/2. Installed by
+    DownloadHandlersAddon; if installed with HTTP/2 disabled, every request
+    goes through the pooled HTTP/1.1 handler.
+    """
+
+    lazy = False
+
+    def __init__(self, settings, crawler=None):
+        """
+        Initialize handler.
+
+        Args:
+            settings: Scrapy settings
+            crawler: Scrapy crawler (for stats)
+        """
+        self.stats = crawler.stats if crawler else None
+        self.http11 = PooledHTTPDownloadHandler(settings, crawler)
+        self.http2 = None
+        self.http2_hosts = set()
+        self.http11_hosts = set()
+
+        if settings.getbool('DOWNLOAD_HTTP2_ENABLED', False):
+            try:
+                self.http2 = self._create_http2_handler(settings, crawler)
+            except ImportError:
+                logger.error("HTTP/2 download mode requires h2. Run: pip install 'Twisted[http2]'")
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        """Create handler from crawler."""
+        return cls(crawler.settings, crawler)
+
+    def _create_http2_handler(self, settings, crawler):
+        from collections import deque
+        from twisted.internet import reactor
+        from twisted.internet.protocol import connectionDone
+        from scrapy.core.downloader.handlers.http2 import H2DownloadHandler
+        from scrapy.core.http2.agent import H2ConnectionPool
+        from scrapy.core.http2.protocol import PROTOCOL_NAME, H2ClientFactory, H2ClientProtocol
+
+        stats = self.stats
+
+        class ALPNCheckingH2ClientProtocol(H2ClientProtocol):
+            """HTTP/2 client protocol that reports connections lost without h2 negotiated over ALPN."""
+
+            negotiated_protocol = None
+            handshake_completed = False
+
+            def handshakeCompleted(self):
+                self.handshake_completed = True
+                self.negotiated_protocol = self.transport.negotiatedProtocol
+                super().handshakeCompleted()
+
+            def connectionLost(self, reason=connectionDone):
+                if self.handshake_completed and self.negotiated_protocol != PROTOCOL_NAME:
+                    self._conn_lost_errors.append(HTTP2NotNegotiated(self.negotiated_protocol))
+                super().connectionLost(reason)
+
+        class ALPNCheckingH2ClientFactory(H2ClientFactory):
+            def buildProtocol(self, addr):
+                return ALPNCheckingH2ClientProtocol(self.uri, self.settings, self.conn_lost_deferred)
+
+        class InstrumentedH2ConnectionPool(H2ConnectionPool):
+            """HTTP/2 pool counting connections and multiplexed streams."""
+
+            def get_connection(self, key, uri, endpoint):
+                if stats is not None:
+                    stats.inc_value('downloader/http2/streams')
+                return super().get_connection(key, uri, endpoint)
+
+            def _new_connection(self, key, uri, endpoint):
+                if stats is not None:
+                    stats.inc_value('downloader/http2/connections/new')
+
+                # As H2ConnectionPool._new_connection, with the ALPN checking protocol
+                self._pending_requests[key] = deque()
+                conn_lost_deferred = defer.Deferred()
+                conn_lost_deferred.addCallback(self._remove_connection, key)
+                factory = ALPNCheckingH2ClientFactory(uri, self.settings, conn_lost_deferred)
+                conn_d = endpoint.connect(factory)
+                conn_d.addCallback(self.put_connection, key)
+
+                d = defer.Deferred()
+                self._pending_requests[key].append(d)
+                return d
+
+        handler = H2DownloadHandler(settings, crawler)
+        handler._pool = InstrumentedH2ConnectionPool(reactor, settings)
+        return handler
+
+    def download_request(self, request, spider):
+        """Download request over HTTP/2 when possible."""
+        host = urlparse(request.url).netloc
+
+        if self.http2 is None or host in self.http11_hosts or request.meta.get('proxy'):
+            return self.http11.download_request(request, spider)
+
+        d = self.http2.download_request(request, spider)
+        d.addCallbacks(self._http2_succeeded, self._fallback_to_http11,
+                       callbackArgs=(host,), errbackArgs=(host, request, spider))
+        return d
+
+    def _http2_succeeded(self, response, host):
+        self.http2_hosts.add(host)
+        return response
+
+    def _fallback_to_http11(self, failure, host, request, spider):
+        if host in self.http2_hosts or not _is_http2_not_negotiated(failure):
+            return failure
+
+        if host not in self.http11_hosts:
+            self.http11_hosts.add(host)
+            logger.debug(f"HTTP/2 not supported by {host}, using HTTP/1.1")
+            if self.stats is not None:
+                self.stats.inc_value('downloader/http2/fallback_hosts')
+
+        return self.http11.download_request(request, spider)
+
+    def close(self):
+        """Close all pooled connections."""
+        if self.http2 is not None:
+            self.http2.close()
+        return defer.maybeDeferred(self.http11.close)
+
+
+class DownloadHandlersAddon:
+    """
+    Install the pooled HTTP/1.1 and HTTP/2 download handlers.
+
+    Scrapy's stock handlers are kept unless DOWNLOAD_HTTP2_ENABLED is set.
+    An add-on runs after every settings source (including -s) is applied,
+    so the opt-in flag decides which handlers are used.
+    """
+
+    HANDLERS = {
+        'http': 'lookuply_crawler.handlers.PooledHTTPDownloadHandler',
+        'https': 'lookuply_crawler.handlers.HTTP2DownloadHandler',
+    }
+
+    def update_settings(self, settings):
+        """Add the handlers to DOWNLOAD_HANDLERS when HTTP/2 mode is enabled."""
+        if not settings.getbool('DOWNLOAD_HTTP2_ENABLED', False):
+            raise NotConfigured
+
+        handlers = dict(self.HANDLERS)
+        handlers.update(settings.getdict('DOWNLOAD_HANDLERS'))
+        settings.set('DOWNLOAD_HANDLERS', handlers, priority='addon')
+
+
+class HTTP2NotNegotiated(Exception):
+    """The server did not select h2 over ALPN (it offered another protocol, or none)."""
+
+    def __init__(self, negotiated_protocol=None):
+        super().__init__(f"Expected b'h2', received {negotiated_protocol!r}")
+        self.negotiated_protocol = negotiated_protocol
+
+
+def _is_http2_not_negotiated(failure):
+    """Check whether a download failed because the server does not speak HTTP/2."""
+    from scrapy.core.http2.protocol import InvalidNegotiatedProtocol
+
+    if not failure.check(ResponseFailed):
+        return False
+
+    for reason in failure.value.reasons:
+        error = reason.value if isinstance(reason, Failure) else reason
+        if isinstance(error, (HTTP2NotNegotiated, InvalidNegotiatedProtocol)):
+            return True
+    return False
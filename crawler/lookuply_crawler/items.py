@@ -23,6 +23,10 @@ class WebPageItem(scrapy.Item):
     text_length = Field()
     paragraphs = Field()
     headings = Field()
+    paragraph_spans = Field()  # Compact schema: [start, end] offsets into text
+    heading_spans = Field()  # Compact schema: [level, start, end]
+    simhash = Field()  # NearDuplicatePipeline: 64-bit text fingerprint (hex)
+    near_duplicate_of = Field()  # NearDuplicatePipeline flag mode: URL of the first similar page
 
     # Language
     language_code = Field()
@@ -58,6 +62,7 @@ class WebPageItem(scrapy.Item):
     # Flags
     is_valid = Field()
     is_eu_language = Field()
+    parse_degraded = Field()  # Exceeded parse budget (max_bytes, max_nodes, max_seconds): head-only metadata, truncated text
 
 
 class LinkItem(scrapy.Item):
@@ -2,11 +2,14 @@
 Scrapy Middleware - Custom Request/Response Processing
 """
 
+import time
 import logging
 import random
 from scrapy import signals
-from scrapy.http import HtmlResponse
-from scrapy.exceptions import IgnoreRequest
+from scrapy.http import HtmlResponse, Request
+from scrapy.exceptions import IgnoreRequest, NotConfigured
+from scrapy.downloadermiddlewares.robotstxt import RobotsTxtMiddleware
+from scrapy.utils.httpobj import urlparse_cached
 
 logger = logging.getLogger(__name__)
 
@@ -40,12 +43,14 @@ class LanguageDetectionMiddleware:
         if isinstance(response, HtmlResponse):
             # Add language hint to meta for spider
             from .extractors import get_detector
+            from .utils import get_declared_encoding
 
             try:
                 detector = get_detector()
-                lang_code, confidence = detector.detect_from_html(response.text)
-                response.meta['detected_language'] = lang_code
-                response.meta['language_confidence'] = confidence
+                lang_code, confidence = detector.detect_from_html(response.body, get_declared_encoding(response))
+                # response.meta is not available before the engine ties the response to its request
+                request.meta['detected_language'] = lang_code
+                request.meta['language_confidence'] = confidence
             except Exception as e:
                 logger.error(f"Language detection middleware error: {e}")
 
@@ -76,6 +81,74 @@ class ContentTypeFilterMiddleware:
         return response
 
 
+class ContentDedupeMiddleware:
+    """
+    Ignore HTML responses whose body is byte-identical to one seen before.
+
+    Mirrors, print views and URL variants often serve the same page. They
+    are dropped here, before language detection and content extraction.
+    Body hashes (64-bit xxhash, or blake2b without xxhash) are kept in a
+    bounded LRUCache of CONTENT_DEDUPE_SIZE entries.
+    Requests with meta 'dont_dedupe_content' are never ignored.
+    """
+
+    def __init__(self, stats, maxsize=100000, hash_name='auto'):
+        """
+        Initialize middleware.
+
+        Args:
+            stats: Scrapy stats collector
+            maxsize: Maximum number of remembered body hashes
+            hash_name: 'xxhash', 'blake2b' or 'auto' (xxhash if installed)
+        """
+        from .cache import LRUCache
+        from .dedupe import get_hash64
+
+        self.stats = stats
+        self.seen = LRUCache(maxsize=maxsize)
+        self.hash_body = get_hash64(hash_name)
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        """Create middleware from crawler settings."""
+        settings = crawler.settings
+        if not settings.getbool('CONTENT_DEDUPE_ENABLED', True):
+            raise NotConfigured
+
+        middleware = cls(
+            crawler.stats,
+            maxsize=settings.getint('CONTENT_DEDUPE_SIZE', 100000),
+            hash_name=settings.get('CONTENT_DEDUPE_HASH', 'auto'),
+        )
+        crawler.signals.connect(middleware.spider_closed, signal=signals.spider_closed)
+        return middleware
+
+    def process_response(self, request, response, spider):
+        """Ignore response if its body was seen before."""
+        if not isinstance(response, HtmlResponse) or response.status != 200 or request.meta.get('dont_dedupe_content'):
+            return response
+
+        started = time.process_time()
+        key = self.hash_body(response.body)
+        self.stats.inc_value('contentdedupe/hash_cpu_seconds', time.process_time() - started)
+
+        if self.seen.get(key) is not None:
+            self.stats.inc_value('contentdedupe/skipped')
+            self.stats.inc_value('contentdedupe/skipped_bytes', len(response.body))
+            raise IgnoreRequest(f"Duplicate content: {response.url}")
+
+        self.seen.set(key, True)
+        return response
+
+    def spider_closed(self, spider):
+        """Estimate the extraction CPU time saved by skipped responses."""
+        skipped = self.stats.get_value('contentdedupe/skipped', 0)
+        pages = self.stats.get_value('extraction/pages', 0)
+        if skipped and pages:
+            cpu_per_page = self.stats.get_value('extraction/cpu_seconds', 0) / pages
+            self.stats.set_value('contentdedupe/saved_cpu_seconds_est', round(skipped * cpu_per_page, 3))
+
+
 class DepthLimitMiddleware:
     """
     Limit crawl depth per domain.
@@ -138,3 +211,66 @@ class RobotsTxtEnforcementMiddleware:
         """Log robots.txt violations."""
         if 'robots.txt' in str(exception).lower():
             logger.warning(f"Robots.txt blocked: {request.url}")
+
+
+class CachedRobotsTxtMiddleware(RobotsTxtMiddleware):
+    """
+    robots.txt middleware backed by a shared, persistent cache.
+
+    Rules fetched by any crawler process are reused by the others (and after
+    restarts) until they expire. Seed hosts are prefetched concurrently when
+    the spider opens, so the first request to each host does not wait.
+    """
+
+    def __init__(self, crawler):
+        super().__init__(crawler)
+
+        from .cache import create_robots_cache
+        self.cache = create_robots_cache(crawler.settings)
+        self.prefetch = crawler.settings.getbool('ROBOTSTXT_PREFETCH', True)
+
+        crawler.signals.connect(self.spider_opened, signal=signals.spider_opened)
+
+    def robot_parser(self, request, spider):
+        """Return parser for request host, consulting the shared cache first."""
+        netloc = urlparse_cached(request).netloc
+
+        if netloc not in self._parsers and self.cache is not None:
+            entry = self.cache.get(netloc)
+            if entry is not None:
+                self.crawler.stats.inc_value('robotstxt/cache_hit')
+                self._parsers[netloc] = self._parserimpl.from_crawler(self.crawler, self.cache.rules(entry))
+            else:
+                self.crawler.stats.inc_value('robotstxt/cache_miss')
+
+        return super().robot_parser(request, spider)
+
+    def _parse_robots(self, response, netloc, spider):
+        super()._parse_robots(response, netloc, spider)
+
+        if self.cache is not None and not self.cache.set(netloc, response.body, response.status):
+            self.crawler.stats.inc_value('robotstxt/cache_not_stored')
+
+    def spider_opened(self, spider):
+        """Prefetch robots.txt for all seed hosts of the spider's languages."""
+        if not self.prefetch:
+            return
+
+        from .config import get_start_urls, get_all_start_urls
+
+        languages = getattr(spider, 'target_languages', None)
+        if languages:
+            seed_urls = [url for lang in languages for url in get_start_urls(lang)]
+        else:
+            seed_urls = get_all_start_urls()
+
+        hosts = set()
+        for url in seed_urls:
+            request = Request(url)
+            netloc = urlparse_cached(request).netloc
+            if netloc in hosts:
+                continue
+            hosts.add(netloc)
+            self.robot_parser(request, spider)
+
+        logger.info(f"Prefetching robots.txt for {len(hosts)} seed hosts")
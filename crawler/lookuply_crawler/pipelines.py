@@ -4,11 +4,13 @@ Process and store crawled items.
 """
 
 import logging
-import json
 import os
+import time
 from datetime import datetime
 from itemadapter import ItemAdapter
+from twisted.internet.threads import deferToThread
 from scrapy.exceptions import DropItem
+from scrapy.utils.defer import maybe_deferred_to_future
 
 logger = logging.getLogger(__name__)
 
@@ -100,59 +102,608 @@ class DuplicatesPipeline:
             return item
 
 
+class NearDuplicatePipeline:
+    """
+    Drop or flag pages whose text is a near-duplicate of an earlier page
+    (NEAR_DUPLICATE_ENABLED), using 64-bit SimHash fingerprints and one
+    bounded SimHashIndex per language.
+    """
+
+    def __init__(self, action='drop', max_distance=5, index_size=500000, crawler_stats=None):
+        """
+        Initialize pipeline.
+
+        Args:
+            action: 'drop' (DropItem) or 'flag' (set near_duplicate_of and keep)
+            max_distance: Maximum differing fingerprint bits for a near-duplicate
+            index_size: Maximum fingerprints remembered per language
+            crawler_stats: Scrapy stats collector
+        """
+        from .dedupe import get_hash64
+
+        if action not in ('drop', 'flag'):
+            raise ValueError(f"Unknown near-duplicate action: {action}")
+
+        self.action = action
+        self.max_distance = max_distance
+        self.index_size = index_size
+        self.crawler_stats = crawler_stats
+        self.hash_func = get_hash64()
+        self.indexes = {}
+
+        self.duplicates = 0
+        self.fingerprint_seconds = 0.0
+        self.lookup_seconds = 0.0
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        """Create pipeline from crawler settings."""
+        from scrapy.exceptions import NotConfigured
+
+        settings = crawler.settings
+        if not settings.getbool('NEAR_DUPLICATE_ENABLED', False):
+            raise NotConfigured
+
+        return cls(
+            action=settings.get('NEAR_DUPLICATE_ACTION', 'drop'),
+            max_distance=settings.getint('NEAR_DUPLICATE_DISTANCE', 5),
+            index_size=settings.getint('NEAR_DUPLICATE_INDEX_SIZE', 500000),
+            crawler_stats=crawler.stats,
+        )
+
+    def process_item(self, item, spider):
+        """Fingerprint item text and check it against earlier pages."""
+        from .dedupe import SimHashIndex, simhash
+
+        adapter = ItemAdapter(item)
+        text = adapter.get('text')
+        if not text:
+            return item
+
+        started = time.perf_counter()
+        fingerprint = simhash(text, hash_func=self.hash_func)
+        self.fingerprint_seconds += time.perf_counter() - started
+        adapter['simhash'] = f'{fingerprint:016x}'
+
+        language_code = adapter.get('language_code', 'unknown')
+        index = self.indexes.get(language_code)
+        if index is None:
+            index = SimHashIndex(self.max_distance, self.index_size)
+            self.indexes[language_code] = index
+
+        started = time.perf_counter()
+        match = index.find(fingerprint)
+        self.lookup_seconds += time.perf_counter() - started
+
+        if match is None:
+            # [first URL, near-duplicates seen]
+            index.add(fingerprint, [adapter['url'], 0])
+            return item
+
+        cluster = match[1]
+        cluster[1] += 1
+        self.duplicates += 1
+        if self.crawler_stats is not None:
+            self.crawler_stats.inc_value('nearduplicate/duplicates')
+
+        if self.action == 'drop':
+            raise DropItem(f"Near-duplicate of {cluster[0]}: {adapter['url']}")
+
+        adapter['near_duplicate_of'] = cluster[0]
+        return item
+
+    def close_spider(self, spider):
+        """Report duplicate cluster statistics."""
+        clusters = sorted(
+            (cluster for index in self.indexes.values() for cluster in index.values() if cluster[1]),
+            key=lambda cluster: cluster[1], reverse=True,
+        )
+        fingerprints = sum(len(index) for index in self.indexes.values())
+
+        if self.crawler_stats is not None:
+            self.crawler_stats.set_value('nearduplicate/fingerprints', fingerprints)
+            self.crawler_stats.set_value('nearduplicate/clusters', len(clusters))
+            self.crawler_stats.set_value('nearduplicate/largest_cluster', clusters[0][1] + 1 if clusters else 0)
+            self.crawler_stats.set_value('nearduplicate/fingerprint_cpu_seconds', round(self.fingerprint_seconds, 3))
+            self.crawler_stats.set_value('nearduplicate/lookup_seconds', round(self.lookup_seconds, 3))
+
+        logger.info(
+            f"Near-duplicates: {self.duplicates} pages in {len(clusters)} clusters "
+            f"({fingerprints} fingerprints in {len(self.indexes)} languages)"
+        )
+        for url, count in clusters[:10]:
+            logger.info(f"  {count + 1} pages like {url}")
+
+
+class LinkGraphPipeline:
+    """
+    Add each page's links to the binary link graph under LINK_GRAPH_DIR
+    (LINK_GRAPH_ENABLED), see LinkGraphWriter.
+    Runs before CompactItemPipeline, which removes links from items.
+    """
+
+    def __init__(self, graph_dir, async_writes=False, background_writer=None, crawler_stats=None):
+        """
+        Initialize pipeline.
+
+        Args:
+            graph_dir: Link graph directory
+            async_writes: Write from the thread pool instead of the reactor thread
+            background_writer: BackgroundWriter to hand writes to (optional)
+            crawler_stats: Scrapy stats collector
+        """
+        self.graph_dir = graph_dir
+        self.async_writes = async_writes
+        self.background_writer = background_writer
+        self.crawler_stats = crawler_stats
+        self.graph = None
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        """Create pipeline from crawler settings."""
+        from scrapy.exceptions import NotConfigured
+
+        settings = crawler.settings
+        if not settings.getbool('LINK_GRAPH_ENABLED', False):
+            raise NotConfigured
+
+        background_writer = None
+        if settings.getbool('PIPELINE_BACKGROUND_WRITER', False):
+            background_writer = create_background_writer(crawler, 'linkgraph')
+        return cls(
+            settings.get('LINK_GRAPH_DIR', './data/graph'),
+            settings.getbool('PIPELINE_ASYNC_WRITES', False),
+            background_writer,
+            crawler.stats,
+        )
+
+    def open_spider(self, spider):
+        """Open link graph."""
+        from .storage import LinkGraphWriter
+
+        self.graph = LinkGraphWriter(self.graph_dir)
+        logger.info(f"Link graph directory: {self.graph_dir} ({self.graph.url_count} known URLs)")
+
+        if self.background_writer is not None:
+            self.background_writer.start()
+
+    def close_spider(self, spider):
+        """Flush and close link graph."""
+        if self.background_writer is not None:
+            d = deferToThread(self.background_writer.close)
+            d.addCallback(lambda _: self._close_graph())
+            return d
+
+        self._close_graph()
+
+    def _close_graph(self):
+        self.graph.close()
+
+        if self.crawler_stats is not None:
+            self.crawler_stats.set_value('linkgraph/urls_added', self.graph.urls_added)
+            self.crawler_stats.set_value('linkgraph/edges_added', self.graph.edges_added)
+            self.crawler_stats.set_value('linkgraph/duplicate_edges', self.graph.duplicate_edges)
+            if self.background_writer is not None:
+                report_background_writer(self.crawler_stats, self.background_writer)
+
+        logger.info(
+            f"Link graph: {self.graph.edges_added} new edges, "
+            f"{self.graph.urls_added} new URLs ({self.graph.url_count} total)"
+        )
+
+    async def process_item(self, item, spider):
+        """Add item links to the graph."""
+        adapter = ItemAdapter(item)
+        links = [(link['url'], link.get('text')) for link in adapter.get('links') or []]
+        if not links:
+            return item
+
+        args = (adapter['url'], links, adapter.get('language_code', 'unknown'))
+        if self.background_writer is not None:
+            self.background_writer.submit(self.graph.add_links, *args)
+            record_queue_depth(self.crawler_stats, self.background_writer)
+        elif self.async_writes:
+            await run_blocking(self.graph.add_links, *args)
+        else:
+            self.graph.add_links(*args)
+
+        return item
+
+
+class CompactItemPipeline:
+    """
+    Convert items to the compact schema (ITEM_SCHEMA = 'compact').
+
+    - paragraphs and headings are replaced by offsets into text
+      (paragraph_spans: [start, end], heading_spans: [level, start, end])
+    - links are removed from the item and written to a separate edge
+      output under LINKS_DIR (one LinkItem-shaped JSON line per link;
+      None = no edge output, e.g. when LinkGraphPipeline stores them)
+    - fields in ITEM_FIELD_MAX_LENGTHS are capped with truncate_text
+      ('anchor_text' caps edge anchor texts)
+
+    Runs before the storage pipelines, so all of them store compact items.
+    """
+
+    def __init__(self, links_dir, max_lengths=None, writer_options=None, async_writes=False,
+                 background_writer=None, crawler_stats=None, serializer=None):
+        """
+        Initialize pipeline.
+
+        Args:
+            links_dir: Directory for edge output files
+            max_lengths: Field name -> maximum length
+            writer_options: Keyword arguments for JsonLinesWriter
+            async_writes: Write from the thread pool instead of the reactor thread
+            background_writer: BackgroundWriter to hand writes to (optional)
+            crawler_stats: Scrapy stats collector
+            serializer: Serializer from get_serializer() (default: fastest installed)
+        """
+        from .serialization import get_serializer
+
+        self.links_dir = links_dir
+        self.max_lengths = max_lengths or {}
+        self.writer_options = writer_options or {}
+        self.async_writes = async_writes
+        self.background_writer = background_writer
+        self.crawler_stats = crawler_stats
+        self.serializer = serializer or get_serializer()
+        self.writers = {}
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        """Create pipeline from crawler settings (disabled unless ITEM_SCHEMA = 'compact')."""
+        from scrapy.exceptions import NotConfigured
+        from .serialization import get_serializer
+
+        settings = crawler.settings
+        schema = settings.get('ITEM_SCHEMA', 'full')
+        if schema == 'full':
+            raise NotConfigured
+        if schema != 'compact':
+            raise ValueError(f"Unknown item schema: {schema}")
+
+        background_writer = None
+        if settings.getbool('PIPELINE_BACKGROUND_WRITER', False):
+            background_writer = create_background_writer(crawler, 'links')
+        return cls(
+            settings.get('LINKS_DIR', './data/links'),
+            settings.getdict('ITEM_FIELD_MAX_LENGTHS'),
+            jsonl_writer_options(settings),
+            settings.getbool('PIPELINE_ASYNC_WRITES', False),
+            background_writer,
+            crawler.stats,
+            get_serializer(settings.get('SERIALIZER', 'auto')),
+        )
+
+    def open_spider(self, spider):
+        """Initialize when spider opens."""
+        if self.background_writer is not None:
+            self.background_writer.start()
+
+    def close_spider(self, spider):
+        """Flush and close edge output."""
+        if self.background_writer is not None:
+            d = deferToThread(self.background_writer.close)
+            d.addCallback(lambda _: self._close_writers())
+            return d
+
+        self._close_writers()
+
+    def _close_writers(self):
+        for writer in self.writers.values():
+            writer.close()
+
+        if self.background_writer is not None and self.crawler_stats is not None:
+            report_background_writer(self.crawler_stats, self.background_writer)
+
+    def compact(self, adapter):
+        """
+        Convert an item to the compact schema in place.
+
+        Args:
+            adapter: ItemAdapter of a WebPageItem
+
+        Returns:
+            list: Edge records for the item's links
+        """
+        from .utils import find_text_spans, truncate_text
+
+        for field, max_length in self.max_lengths.items():
+            value = adapter.get(field)
+            if isinstance(value, str) and len(value) > max_length:
+                adapter[field] = truncate_text(value, max_length)
+                self._inc_stat('compact/fields_truncated')
+
+        # Offsets are taken after truncation, so they always lie within text
+        text = adapter.get('text') or ''
+        paragraphs = adapter.get('paragraphs') or []
+        headings = adapter.get('headings') or []
+
+        paragraph_spans = find_text_spans(text, paragraphs)
+        heading_spans = find_text_spans(text, [heading['text'] for heading in headings], ordered=False)
+
+        adapter['paragraph_spans'] = [list(span) for span in paragraph_spans if span]
+        adapter['heading_spans'] = [
+            [heading['level'], *span] for heading, span in zip(headings, heading_spans) if span
+        ]
+        unmatched = paragraph_spans.count(None) + heading_spans.count(None)
+        if unmatched:
+            self._inc_stat('compact/unmatched_spans', unmatched)
+
+        anchor_length = self.max_lengths.get('anchor_text')
+        domain = adapter.get('domain')
+        edges = [
+            {
+                'source_url': adapter.get('url'),
+                'target_url': link['url'],
+                'anchor_text': truncate_text(link.get('text'), anchor_length) if anchor_length else link.get('text'),
+                'link_type': 'internal' if link.get('internal', link.get('domain') == domain) else 'external',
+                'discovered_at': adapter.get('crawled_at'),
+            }
+            for link in adapter.get('links') or []
+        ]
+
+        for field in ('paragraphs', 'headings', 'links'):
+            if field in adapter:
+                del adapter[field]
+
+        return edges
+
+    async def process_item(self, item, spider):
+        """Compact item and write its links to the edge output."""
+        from .storage import JsonLinesWriter
+
+        adapter = ItemAdapter(item)
+        edges = self.compact(adapter)
+        self._inc_stat('compact/items')
+
+        if edges and self.links_dir:
+            lang_code = adapter.get('language_code', 'unknown')
+            if lang_code not in self.writers:
+                self.writers[lang_code] = JsonLinesWriter(self.links_dir, lang_code, **self.writer_options)
+
+            lines = [self.serializer.dumps(edge) for edge in edges]
+            if self.background_writer is not None:
+                self.background_writer.submit(self._write_lines, self.writers[lang_code], lines)
+                record_queue_depth(self.crawler_stats, self.background_writer)
+            elif self.async_writes:
+                await run_blocking(self._write_lines, self.writers[lang_code], lines)
+            else:
+                self._write_lines(self.writers[lang_code], lines)
+            self._inc_stat('compact/edges_written', len(edges))
+
+        return item
+
+    @staticmethod
+    def _write_lines(writer, lines):
+        for line in lines:
+            writer.write(line)
+
+    def _inc_stat(self, key, count=1):
+        if self.crawler_stats is not None:
+            self.crawler_stats.inc_value(key, count)
+
+
+async def run_blocking(func, *args):
+    """
+    Run a blocking call in the reactor thread pool and await its result.
+
+    Works with both the default Twisted reactor and the asyncio reactor.
+
+    Args:
+        func: Blocking callable
+        *args: Arguments for func
+
+    Returns:
+        Result of func
+    """
+    return await maybe_deferred_to_future(deferToThread(func, *args))
+
+
+def create_background_writer(crawler, name):
+    """
+    Create a background writer whose backpressure pauses the crawl engine.
+
+    Args:
+        crawler: Scrapy crawler
+        name: Writer name, used in stats keys (writer/<name>/...)
+
+    Returns:
+        BackgroundWriter (not started)
+    """
+    from twisted.internet import reactor
+    from .storage import BackgroundWriter
+
+    def pause():
+        logger.warning(f"{name} writer queue is full, pausing crawl engine")
+        crawler.stats.inc_value(f'writer/{name}/backpressure_pauses')
+        crawler.engine.pause()
+
+    def resume():
+        logger.info(f"{name} writer queue drained, resuming crawl engine")
+        reactor.callFromThread(crawler.engine.unpause)
+
+    return BackgroundWriter(
+        name,
+        maxsize=crawler.settings.getint('PIPELINE_WRITER_QUEUE_SIZE', 10000),
+        on_full=pause,
+        on_drained=resume,
+    )
+
+
+def record_queue_depth(stats, writer):
+    """
+    Record the current background writer queue depth in the crawler stats.
+
+    Args:
+        stats: Scrapy stats collector (None = skip)
+        writer: BackgroundWriter
+    """
+    if stats is not None:
+        stats.set_value(f'writer/{writer.name}/queue_depth', writer.depth)
+
+
+def report_background_writer(stats, writer):
+    """
+    Record background writer statistics in the crawler stats.
+
+    Args:
+        stats: Scrapy stats collector
+        writer: BackgroundWriter
+    """
+    prefix = f'writer/{writer.name}'
+    stats.set_value(f'{prefix}/writes', writer.writes)
+    stats.set_value(f'{prefix}/errors', writer.errors)
+    stats.set_value(f'{prefix}/queue_max_depth', writer.max_depth)
+    for pct, value in writer.latency_percentiles().items():
+        stats.set_value(f'{prefix}/write_latency_p{pct}_ms', round(value, 2))
+
+
+def jsonl_writer_options(settings):
+    """
+    Get JsonLinesWriter keyword arguments from the JSONL_* settings.
+
+    Args:
+        settings: Scrapy settings
+
+    Returns:
+        dict: Writer options
+    """
+    return {
+        'buffer_size': settings.getint('JSONL_BUFFER_SIZE', 65536),
+        'flush_interval': settings.getfloat('JSONL_FLUSH_INTERVAL', 5.0),
+        'fsync': settings.getbool('JSONL_FSYNC', False),
+        'rotate_bytes': settings.getint('JSONL_ROTATE_BYTES', 0),
+        'rotate_seconds': settings.getfloat('JSONL_ROTATE_SECONDS', 0),
+        'compression': settings.get('JSONL_COMPRESSION'),
+        'compression_level': (
+            settings.getint('JSONL_COMPRESSION_LEVEL')
+            if settings.get('JSONL_COMPRESSION_LEVEL') is not None else None
+        ),
+    }
+
+
 class JsonLinesPipeline:
     """
     Store items as JSON Lines format.
     One JSON object per line, organized by language.
+    Buffering, flushing, rotation and compression are handled by JsonLinesWriter.
     """
 
-    def __init__(self, output_dir):
+    def __init__(self, output_dir, async_writes=False, writer_options=None,
+                 background_writer=None, crawler_stats=None, serializer=None):
         """
         Initialize pipeline.
 
         Args:
             output_dir: Directory to store output files
+            async_writes: Write from the thread pool instead of the reactor thread
+            writer_options: Keyword arguments for JsonLinesWriter
+            background_writer: BackgroundWriter to hand writes to (optional)
+            crawler_stats: Scrapy stats collector for writer statistics
+            serializer: Serializer from get_serializer() (default: fastest installed)
         """
+        from .serialization import get_serializer
+
         self.output_dir = output_dir
-        self.files = {}
+        self.async_writes = async_writes
+        self.writer_options = writer_options or {}
+        self.serializer = serializer or get_serializer()
+        self.background_writer = background_writer
+        self.crawler_stats = crawler_stats
+        self.writers = {}
         self.stats = {}
+        self.flush_task = None
 
     @classmethod
     def from_crawler(cls, crawler):
         """Create pipeline from crawler settings."""
-        output_dir = crawler.settings.get('OUTPUT_DIR', './data/crawled')
-        return cls(output_dir)
+        from .serialization import get_serializer
+
+        settings = crawler.settings
+        output_dir = settings.get('OUTPUT_DIR', './data/crawled')
+        async_writes = settings.getbool('PIPELINE_ASYNC_WRITES', False)
+        writer_options = jsonl_writer_options(settings)
+        background_writer = None
+        if settings.getbool('PIPELINE_BACKGROUND_WRITER', False):
+            background_writer = create_background_writer(crawler, 'jsonl')
+        serializer = get_serializer(settings.get('SERIALIZER', 'auto'))
+        return cls(output_dir, async_writes, writer_options, background_writer, crawler.stats, serializer)
 
     def open_spider(self, spider):
         """Initialize when spider opens."""
         os.makedirs(self.output_dir, exist_ok=True)
         logger.info(f"Output directory: {self.output_dir}")
 
+        if self.background_writer is not None:
+            self.background_writer.start()
+
+        # Flush periodically so buffered lines reach disk even when items are sparse
+        flush_interval = self.writer_options.get('flush_interval')
+        if flush_interval:
+            from twisted.internet import task
+            self.flush_task = task.LoopingCall(self._flush_due_writers)
+            self.flush_task.start(flush_interval, now=False)
+
     def close_spider(self, spider):
         """Clean up when spider closes."""
-        # Close all open files
-        for file_handle in self.files.values():
-            file_handle.close()
+        if self.flush_task is not None and self.flush_task.running:
+            self.flush_task.stop()
+
+        if self.background_writer is not None:
+            # Drain the queue off the reactor thread, then close the writers
+            d = deferToThread(self.background_writer.close)
+            d.addCallback(lambda _: self._close_writers())
+            return d
+
+        self._close_writers()
+
+    def _close_writers(self):
+        # Flush and close all writers
+        for writer in self.writers.values():
+            writer.close()
+
+        if self.background_writer is not None and self.crawler_stats is not None:
+            report_background_writer(self.crawler_stats, self.background_writer)
 
         # Log statistics
         logger.info("Crawl statistics by language:")
         for lang, count in sorted(self.stats.items()):
             logger.info(f"  {lang}: {count} pages")
 
-    def process_item(self, item, spider):
+    def _flush_due_writers(self):
+        for writer in self.writers.values():
+            if self.background_writer is not None:
+                # Keep flushes ordered with writes and off the reactor thread
+                self.background_writer.submit(writer.maybe_flush)
+                continue
+            try:
+                writer.maybe_flush()
+            except Exception as e:
+                logger.error(f"Failed to flush {writer.path}: {e}")
+
+    async def process_item(self, item, spider):
         """Store item to appropriate language file."""
+        from .storage import JsonLinesWriter
+
         adapter = ItemAdapter(item)
         lang_code = adapter.get('language_code', 'unknown')
 
-        # Get or create file handle for this language
-        if lang_code not in self.files:
-            filename = os.path.join(self.output_dir, f'{lang_code}.jsonl')
-            self.files[lang_code] = open(filename, 'a', encoding='utf-8')
+        # Get or create writer for this language
+        if lang_code not in self.writers:
+            self.writers[lang_code] = JsonLinesWriter(self.output_dir, lang_code, **self.writer_options)
             self.stats[lang_code] = 0
 
         # Write item as JSON line
-        line = json.dumps(dict(adapter), ensure_ascii=False) + '\n'
-        self.files[lang_code].write(line)
+        line = self.serializer.dumps(dict(adapter))
+        if self.background_writer is not None:
+            self.background_writer.submit(self.writers[lang_code].write, line)
+            record_queue_depth(self.crawler_stats, self.background_writer)
+        elif self.async_writes:
+            await run_blocking(self.writers[lang_code].write, line)
+        else:
+            self.writers[lang_code].write(line)
 
         # Update statistics
         self.stats[lang_code] += 1
@@ -160,6 +711,172 @@ class JsonLinesPipeline:
         return item
 
 
+class FileStoragePipeline:
+    """
+    Store each item as a page in page storage (STORAGE_BACKEND).
+    Pages are organized by language and date.
+    """
+
+    def __init__(self, storage, async_writes=False, background_writer=None, crawler_stats=None):
+        """
+        Initialize pipeline.
+
+        Args:
+            storage: SegmentStorage or FileStorage
+            async_writes: Write from the thread pool instead of the reactor thread
+            background_writer: BackgroundWriter to hand writes to (optional)
+            crawler_stats: Scrapy stats collector for writer statistics
+        """
+        self.storage = storage
+        self.async_writes = async_writes
+        self.background_writer = background_writer
+        self.crawler_stats = crawler_stats
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        """Create pipeline from crawler settings."""
+        from .storage import create_storage
+
+        background_writer = None
+        if crawler.settings.getbool('PIPELINE_BACKGROUND_WRITER', False):
+            background_writer = create_background_writer(crawler, 'storage')
+        return cls(
+            storage=create_storage(crawler.settings),
+            async_writes=crawler.settings.getbool('PIPELINE_ASYNC_WRITES', False),
+            background_writer=background_writer,
+            crawler_stats=crawler.stats,
+        )
+
+    def open_spider(self, spider):
+        """Start the background writer."""
+        if self.background_writer is not None:
+            self.background_writer.start()
+
+    def close_spider(self, spider):
+        """Write any queued pages, then close storage."""
+        if self.background_writer is not None:
+            d = deferToThread(self.background_writer.close)
+            d.addCallback(lambda _: self._close_storage())
+            return d
+
+        self._close_storage()
+
+    def _close_storage(self):
+        self.storage.close()
+
+        if self.background_writer is not None and self.crawler_stats is not None:
+            report_background_writer(self.crawler_stats, self.background_writer)
+
+    async def process_item(self, item, spider):
+        """Save item to storage."""
+        adapter = ItemAdapter(item)
+        lang_code = adapter.get('language_code', 'unknown')
+        page_data = dict(adapter)
+
+        if self.background_writer is not None:
+            self.background_writer.submit(self.storage.save_page, page_data, lang_code)
+            record_queue_depth(self.crawler_stats, self.background_writer)
+        elif self.async_writes:
+            await run_blocking(self.storage.save_page, page_data, lang_code)
+        else:
+            self.storage.save_page(page_data, lang_code)
+
+        return item
+
+
+class ParquetPipeline:
+    """
+    Store items in a columnar Parquet dataset (requires pyarrow).
+    Partitioned by language and crawl date, see ParquetDatasetWriter.
+    """
+
+    def __init__(self, output_dir, async_writes=False, writer_options=None,
+                 background_writer=None, crawler_stats=None):
+        """
+        Initialize pipeline.
+
+        Args:
+            output_dir: Dataset root directory
+            async_writes: Write from the thread pool instead of the reactor thread
+            writer_options: Keyword arguments for ParquetDatasetWriter
+            background_writer: BackgroundWriter to hand writes to (optional)
+            crawler_stats: Scrapy stats collector for writer statistics
+        """
+        self.output_dir = output_dir
+        self.async_writes = async_writes
+        self.writer_options = writer_options or {}
+        self.background_writer = background_writer
+        self.crawler_stats = crawler_stats
+        self.writer = None
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        """Create pipeline from crawler settings."""
+        settings = crawler.settings
+        writer_options = {
+            'row_group_size': settings.getint('PARQUET_ROW_GROUP_SIZE', 1000),
+            'rows_per_file': settings.getint('PARQUET_ROWS_PER_FILE', 100000),
+            'compression': settings.get('PARQUET_COMPRESSION', 'zstd'),
+        }
+        background_writer = None
+        if settings.getbool('PIPELINE_BACKGROUND_WRITER', False):
+            background_writer = create_background_writer(crawler, 'parquet')
+        return cls(
+            settings.get('PARQUET_DIR', './data/parquet'),
+            settings.getbool('PIPELINE_ASYNC_WRITES', False),
+            writer_options,
+            background_writer,
+            crawler.stats,
+        )
+
+    def open_spider(self, spider):
+        """Open dataset writer."""
+        from .storage import ParquetDatasetWriter
+
+        self.writer = ParquetDatasetWriter(self.output_dir, **self.writer_options)
+        logger.info(f"Parquet output directory: {self.output_dir}")
+
+        if self.background_writer is not None:
+            self.background_writer.start()
+
+    def close_spider(self, spider):
+        """Write remaining rows and finish all files."""
+        if self.background_writer is not None:
+            d = deferToThread(self.background_writer.close)
+            d.addCallback(lambda _: self._close_writer())
+            return d
+
+        self._close_writer()
+
+    def _close_writer(self):
+        self.writer.close()
+
+        if self.crawler_stats is not None:
+            self.crawler_stats.set_value('parquet/rows_written', self.writer.rows_written)
+            self.crawler_stats.set_value('parquet/dropped_records', self.writer.records_dropped)
+            if self.background_writer is not None:
+                report_background_writer(self.crawler_stats, self.background_writer)
+
+        logger.info(
+            f"Wrote {self.writer.rows_written} rows to Parquet dataset {self.output_dir}"
+            f" ({self.writer.records_dropped} records dropped)"
+        )
+
+    async def process_item(self, item, spider):
+        """Add item to its language/date partition."""
+        record = dict(ItemAdapter(item))
+
+        if self.background_writer is not None:
+            self.background_writer.submit(self.writer.write, record)
+            record_queue_depth(self.crawler_stats, self.background_writer)
+        elif self.async_writes:
+            await run_blocking(self.writer.write, record)
+        else:
+            self.writer.write(record)
+
+        return item
+
+
 class StatisticsPipeline:
     """
     Collect crawl statistics.
@@ -0,0 +1,250 @@
+"""
+DNS Resolver Module
+Caching, prefetching DNS resolver for the crawl frontier.
+"""
+
+import time
+import logging
+from collections import deque
+from twisted.internet import defer
+from twisted.internet.abstract import isIPAddress, isIPv6Address
+from twisted.internet.base import ThreadedResolver
+from twisted.internet.error import DNSLookupError
+from twisted.internet.interfaces import IResolverSimple
+from zope.interface.declarations import implementer
+from scrapy import signals
+from scrapy.exceptions import NotConfigured
+from scrapy.utils.httpobj import urlparse_cached
+
+from .cache import LRUCache
+from .utils import calculate_percentiles
+
+logger = logging.getLogger(__name__)
+
+
+@implementer(IResolverSimple)
+class CachingResolver(ThreadedResolver):
+    """
+    DNS resolver with a bounded, TTL-aware and persistent cache.
+
+    Features:
+    - LRU cache bounded by DNSCACHE_SIZE, entries expire after their TTL
+    - Negative caching of failed lookups (short TTL)
+    - Concurrent lookups for the same host share one query
+    - prefetch() to resolve hosts before their first request is downloaded
+    - Lookup latency percentiles
+
+    The actual lookup is done by `lookup`, a callable taking a host name and
+    returning an address, an (address, ttl) tuple or a Deferred of either.
+    It defaults to the system resolver; tests can pass a local stub.
+    """
+
+    def __init__(self, reactor, cache_size=10000, timeout=10.0, ttl=3600,
+                 negative_ttl=60, cache_file=None, lookup=None):
+        """
+        Initialize resolver.
+
+        Args:
+            reactor: Twisted reactor
+            cache_size: Maximum number of cached hosts
+            timeout: Lookup timeout in seconds
+            ttl: Default TTL for resolved addresses in seconds
+            negative_ttl: TTL for failed lookups in seconds
+            cache_file: JSON file to persist the cache across runs (optional)
+            lookup: Lookup callable (default: system resolver)
+        """
+        super().__init__(reactor)
+        self.cache = LRUCache(cache_size, ttl)
+        self.timeout = timeout
+        self.negative_ttl = negative_ttl
+        self.cache_file = cache_file
+        self.lookup = lookup or self._system_lookup
+
+        self._pending = {}
+        self.latencies = deque(maxlen=10000)
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'negative_hits': 0,
+            'prefetches': 0,
+            'failures': 0,
+        }
+
+        if cache_file:
+            loaded = self.cache.load(cache_file)
+            logger.info(f"Loaded {loaded} cached DNS entries from {cache_file}")
+
+    @classmethod
+    def from_crawler(cls, crawler, reactor):
+        """Create resolver from crawler settings."""
+        settings = crawler.settings
+        if settings.getbool('DNSCACHE_ENABLED', True):
+            cache_size = settings.getint('DNSCACHE_SIZE', 10000)
+        else:
+            cache_size = 0
+
+        resolver = cls(
+            reactor,
+            cache_size=cache_size,
+            timeout=settings.getfloat('DNS_TIMEOUT', 10.0),
+            ttl=settings.getint('DNSCACHE_TTL', 3600),
+            negative_ttl=settings.getint('DNSCACHE_NEGATIVE_TTL', 60),
+            cache_file=settings.get('DNSCACHE_FILE'),
+        )
+
+        global _resolver_instance
+        _resolver_instance = resolver
+        return resolver
+
+    def install_on_reactor(self):
+        """Install as the reactor's name resolver."""
+        self.reactor.installResolver(self)
+
+    def getHostByName(self, name, timeout=None):
+        """Resolve host name, serving from cache when possible."""
+        address = self.cache.get(name)
+
+        if address is not None:
+            if not address:
+                self.stats['negative_hits'] += 1
+                return defer.fail(DNSLookupError(name))
+            self.stats['hits'] += 1
+            return defer.succeed(address)
+
+        self.stats['misses'] += 1
+        return self._resolve(name)
+
+    def prefetch(self, name):
+        """
+        Start resolving a host in the background if it is not cached.
+
+        Args:
+            name: Host name
+        """
+        if not name or name in self.cache or name in self._pending:
+            return
+        if isIPAddress(name) or isIPv6Address(name):
+            return
+
+        self.stats['prefetches'] += 1
+        self._resolve(name).addErrback(lambda failure: None)
+
+    def latency_percentiles(self):
+        """
+        Get lookup latency percentiles.
+
+        Returns:
+            dict: Percentile -> latency in milliseconds
+        """
+        percentiles = calculate_percentiles(list(self.latencies))
+        return {pct: value * 1000 for pct, value in percentiles.items()}
+
+    def save(self):
+        """Persist cache to disk (if a cache file is configured)."""
+        if self.cache_file:
+            self.cache.save(self.cache_file)
+
+    def _resolve(self, name):
+        d = defer.Deferred()
+
+        waiters = self._pending.get(name)
+        if waiters is not None:
+            waiters.append(d)
+            return d
+
+        self._pending[name] = [d]
+        started = time.monotonic()
+
+        lookup_d = defer.maybeDeferred(self.lookup, name)
+        lookup_d.addCallbacks(
+            self._lookup_done, self._lookup_failed,
+            callbackArgs=(name, started), errbackArgs=(name, started),
+        )
+        return d
+
+    def _system_lookup(self, name):
+        # Enforce DNS_TIMEOUT regardless of the timeout passed by callers
+        return ThreadedResolver.getHostByName(self, name, (self.timeout,))
+
+    def _lookup_done(self, result, name, started):
+        self.latencies.append(time.monotonic() - started)
+
+        if isinstance(result, tuple):
+            address, ttl = result
+        else:
+            address, ttl = result, None
+
+        self.cache.set(name, address, ttl)
+        for d in self._pending.pop(name, []):
+            d.callback(address)
+
+    def _lookup_failed(self, failure, name, started):
+        self.latencies.append(time.monotonic() - started)
+        self.stats['failures'] += 1
+
+        if failure.check(DNSLookupError):
+            self.cache.set(name, '', self.negative_ttl)
+
+        for d in self._pending.pop(name, []):
+            d.errback(failure)
+
+
+class DnsPrefetchExtension:
+    """
+    Prefetch DNS for hosts as soon as their requests enter the scheduler.
+    Saves the resolver cache and reports DNS statistics when the spider closes.
+    """
+
+    def __init__(self, stats):
+        self.stats = stats
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        """Set up from crawler."""
+        if not crawler.settings.getbool('DNS_PREFETCH_ENABLED', True):
+            raise NotConfigured
+
+        extension = cls(crawler.stats)
+        crawler.signals.connect(extension.request_scheduled, signal=signals.request_scheduled)
+        crawler.signals.connect(extension.spider_closed, signal=signals.spider_closed)
+        return extension
+
+    @property
+    def resolver(self):
+        # Looked up lazily: the resolver is installed when the reactor starts,
+        # which can be after the spider has been opened
+        return get_resolver()
+
+    def request_scheduled(self, request, spider):
+        """Resolve the request host in the background."""
+        if self.resolver is not None:
+            self.resolver.prefetch(urlparse_cached(request).hostname)
+
+    def spider_closed(self, spider):
+        """Persist cache and report statistics."""
+        if self.resolver is None:
+            logger.warning("DNS prefetch was inactive: DNS_RESOLVER is not CachingResolver")
+            return
+
+        self.resolver.save()
+
+        percentiles = self.resolver.latency_percentiles()
+        for key, value in self.resolver.stats.items():
+            self.stats.set_value(f'dnscache/{key}', value)
+        for pct, value in percentiles.items():
+            self.stats.set_value(f'dnscache/lookup_latency_p{pct}_ms', round(value, 2))
+
+        logger.info(
+            f"DNS cache: {self.resolver.stats['hits']} hits, {self.resolver.stats['misses']} misses, "
+            f"{self.resolver.stats['prefetches']} prefetches | lookup latency "
+            f"p50={percentiles[50]:.1f}ms p90={percentiles[90]:.1f}ms p99={percentiles[99]:.1f}ms"
+        )
+
+
+# Global instance, set when Scrapy installs the resolver on the reactor
+_resolver_instance = None
+
+
+def get_resolver():
+    """Get the installed caching resolver (None if another resolver is used)."""
+    return _resolver_instance
@@ -0,0 +1,141 @@
+"""
+Serialization Module
+Pluggable JSON encoding for items and stored pages.
+"""
+
+import json
+import logging
+import importlib.util
+
+logger = logging.getLogger(__name__)
+
+# Preference order for SERIALIZER = 'auto'
+AUTO_ORDER = ['orjson', 'msgspec', 'json']
+
+
+class JsonSerializer:
+    """Standard library json (always available)."""
+
+    name = 'json'
+
+    def __init__(self, pretty: bool = False):
+        """
+        Initialize serializer.
+
+        Args:
+            pretty: Indented output instead of compact
+        """
+        layout = {'indent': 2} if pretty else {'separators': (',', ':')}
+        self.pretty = pretty
+        self._encoder = json.JSONEncoder(ensure_ascii=False, default=str, **layout)
+
+    def dumps(self, obj) -> bytes:
+        """Encode obj as UTF-8 JSON."""
+        return self._encoder.encode(obj).encode('utf-8')
+
+    def loads(self, data):
+        """Decode JSON from bytes or str."""
+        return json.loads(data)
+
+
+class OrjsonSerializer:
+    """orjson (pip install orjson)."""
+
+    name = 'orjson'
+
+    def __init__(self, pretty: bool = False):
+        """
+        Initialize serializer.
+
+        Args:
+            pretty: Indented output instead of compact
+        """
+        try:
+            import orjson
+        except ImportError:
+            logger.error("orjson not installed. Run: pip install orjson")
+            raise
+
+        self.pretty = pretty
+        self._orjson = orjson
+        self._option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+
+    def dumps(self, obj) -> bytes:
+        """Encode obj as UTF-8 JSON."""
+        return self._orjson.dumps(obj, default=str, option=self._option)
+
+    def loads(self, data):
+        """Decode JSON from bytes or str."""
+        return self._orjson.loads(data)
+
+
+class MsgspecSerializer:
+    """msgspec (pip install msgspec)."""
+
+    name = 'msgspec'
+
+    def __init__(self, pretty: bool = False):
+        """
+        Initialize serializer.
+
+        Args:
+            pretty: Indented output instead of compact
+        """
+        try:
+            import msgspec
+        except ImportError:
+            logger.error("msgspec not installed. Run: pip install msgspec")
+            raise
+
+        self.pretty = pretty
+        self._msgspec = msgspec
+        self._encoder = msgspec.json.Encoder(enc_hook=str)
+        self._decoder = msgspec.json.Decoder()
+
+    def dumps(self, obj) -> bytes:
+        """Encode obj as UTF-8 JSON."""
+        data = self._encoder.encode(obj)
+        return self._msgspec.json.format(data, indent=2) if self.pretty else data
+
+    def loads(self, data):
+        """Decode JSON from bytes or str (raises ValueError like json)."""
+        try:
+            return self._decoder.decode(data)
+        except self._msgspec.DecodeError as e:
+            raise ValueError(str(e)) from e
+
+
+SERIALIZERS = {
+    'json': JsonSerializer,
+    'orjson': OrjsonSerializer,
+    'msgspec': MsgspecSerializer,
+}
+
+_serializer_instances = {}
+
+
+def get_serializer(name: str = 'auto', pretty: bool = False):
+    """
+    Get or create a serializer.
+
+    All serializers write standard JSON, so data written with one can be
+    read with any other.
+
+    Args:
+        name: 'json', 'orjson', 'msgspec' or 'auto' (fastest installed)
+        pretty: Indented output instead of compact
+
+    Returns:
+        Serializer with dumps(obj) -> bytes and loads(data)
+    """
+    name = name or 'auto'
+    if name == 'auto':
+        name = next(n for n in AUTO_ORDER if n == 'json' or importlib.util.find_spec(n) is not None)
+
+    if name not in SERIALIZERS:
+        raise ValueError(f"Unknown serializer: {name}")
+
+    key = (name, pretty)
+    if key not in _serializer_instances:
+        _serializer_instances[key] = SERIALIZERS[name](pretty)
+    return _serializer_instances[key]
@@ -16,6 +16,15 @@ USER_AGENT = 'Mozilla/5.0 (compatible; LookuplyBot/1.0; +https://lookuply.info)'
 # Obey robots.txt rules
 ROBOTSTXT_OBEY = True
 
+# Share fetched robots.txt between crawler processes and restarts
+# Backend: 'file' (shared directory), 'redis' (uses REDIS_URL) or None (per-process only)
+ROBOTSTXT_CACHE_BACKEND = 'file'
+ROBOTSTXT_CACHE_DIR = './data/cache/robots'
+ROBOTSTXT_CACHE_TTL = 86400  # 24 hours
+
+# Fetch robots.txt for all seed hosts concurrently when the spider opens
+ROBOTSTXT_PREFETCH = True
+
 # Configure maximum concurrent requests performed by Scrapy
 CONCURRENT_REQUESTS = 32
 
@@ -51,7 +60,8 @@ SPIDER_MIDDLEWARES = {
 
 # Enable or disable downloader middlewares
 DOWNLOADER_MIDDLEWARES = {
-    'scrapy.downloadermiddlewares.robotstxt.RobotsTxtMiddleware': 100,
+    'scrapy.downloadermiddlewares.robotstxt.RobotsTxtMiddleware': None,  # Replaced by cached version
+    'lookuply_crawler.middleware.CachedRobotsTxtMiddleware': 100,
     'scrapy.downloadermiddlewares.httpauth.HttpAuthMiddleware': 300,
     'scrapy.downloadermiddlewares.downloadtimeout.DownloadTimeoutMiddleware': 350,
     'lookuply_crawler.middleware.RandomUserAgentMiddleware': 400,
@@ -68,6 +78,7 @@ DOWNLOADER_MIDDLEWARES = {
     'lookuply_crawler.middleware.ContentTypeFilterMiddleware': 543,
     'lookuply_crawler.middleware.LanguageDetectionMiddleware': 544,
     'lookuply_crawler.middleware.PolitenessPolicyMiddleware': 545,
+    'lookuply_crawler.middleware.ContentDedupeMiddleware': 560,  # Before language detection, after decompression
 }
 
 # Enable or disable extensions
@@ -75,6 +86,7 @@ EXTENSIONS = {
     'scrapy.extensions.logstats.LogStats': 500,
     'scrapy.extensions.memusage.MemoryUsage': 100,
     'scrapy.extensions.corestats.CoreStats': 0,
+    'lookuply_crawler.resolver.DnsPrefetchExtension': 600,
 }
 
 # Configure item pipelines
@@ -82,10 +94,31 @@ ITEM_PIPELINES = {
     'lookuply_crawler.pipelines.ValidationPipeline': 100,
     'lookuply_crawler.pipelines.LanguageFilterPipeline': 200,
     'lookuply_crawler.pipelines.DuplicatesPipeline': 300,
+    'lookuply_crawler.pipelines.NearDuplicatePipeline': 310,  # Only active with NEAR_DUPLICATE_ENABLED
+    'lookuply_crawler.pipelines.LinkGraphPipeline': 330,  # Only active with LINK_GRAPH_ENABLED
+    'lookuply_crawler.pipelines.CompactItemPipeline': 350,  # Only active with ITEM_SCHEMA = 'compact'
     'lookuply_crawler.pipelines.JsonLinesPipeline': 400,
+    # 'lookuply_crawler.pipelines.ParquetPipeline': 420,  # Columnar output under PARQUET_DIR (requires pyarrow)
+    # 'lookuply_crawler.pipelines.FileStoragePipeline': 450,  # Page storage under STORAGE_DIR
     'lookuply_crawler.pipelines.StatisticsPipeline': 500,
 }
 
+# Reactor: None = default Twisted reactor. Use the asyncio reactor to run
+# asyncio-native clients (e.g. redis.asyncio) in pipelines without blocking:
+# TWISTED_REACTOR = 'twisted.internet.asyncioreactor.AsyncioSelectorReactor'
+# (or run_crawler.py --asyncio)
+TWISTED_REACTOR = None
+
+# Perform pipeline disk writes in the reactor thread pool and await them,
+# instead of writing inline on the reactor thread
+PIPELINE_ASYNC_WRITES = False
+
+# Hand pipeline disk writes to a dedicated writer thread per pipeline
+# (takes precedence over PIPELINE_ASYNC_WRITES). The engine is paused while
+# the queue is 80% full and resumed once it has drained to 50%.
+PIPELINE_BACKGROUND_WRITER = False
+PIPELINE_WRITER_QUEUE_SIZE = 10000
+
 # Enable and configure the AutoThrottle extension (disabled by default)
 # See https://docs.scrapy.org/en/latest/topics/autothrottle.html
 AUTOTHROTTLE_ENABLED = True
@@ -114,6 +147,20 @@ HTTPCACHE_STORAGE = 'scrapy.extensions.httpcache.FilesystemCacheStorage'
 # Set download timeout
 DOWNLOAD_TIMEOUT = 30
 
+# Download handlers with connection reuse metrics (see handlers.py), installed by
+# this add-on only when DOWNLOAD_HTTP2_ENABLED is set; otherwise Scrapy's are used
+ADDONS = {
+    'lookuply_crawler.handlers.DownloadHandlersAddon': 0,
+}
+
+# Multiplex HTTPS requests over HTTP/2 where servers support it, falling back to
+# pooled HTTP/1.1 (opt-in, requires: pip install 'Twisted[http2]')
+DOWNLOAD_HTTP2_ENABLED = False
+
+# Idle HTTP/1.1 connections kept per host in HTTP/2 mode (None = CONCURRENT_REQUESTS_PER_DOMAIN)
+DOWNLOAD_POOL_MAXSIZE_PER_HOST = None
+DOWNLOAD_KEEPALIVE_TIMEOUT = 240  # Seconds an idle HTTP/1.1 connection is kept
+
 # Retry settings
 RETRY_ENABLED = True
 RETRY_TIMES = 3
@@ -136,6 +183,15 @@ REDIRECT_MAX_TIMES = 3
 # DNS timeout
 DNS_TIMEOUT = 10
 
+# Caching, prefetching DNS resolver (see resolver.py)
+DNS_RESOLVER = 'lookuply_crawler.resolver.CachingResolver'
+DNSCACHE_ENABLED = True
+DNSCACHE_SIZE = 10000
+DNSCACHE_TTL = 3600  # 1 hour
+DNSCACHE_NEGATIVE_TTL = 60  # Failed lookups
+DNSCACHE_FILE = './data/cache/dns.json'  # Persist across runs (None = in-memory only)
+DNS_PREFETCH_ENABLED = True  # Resolve hosts as soon as requests are scheduled
+
 # Compression
 COMPRESSION_ENABLED = True
 
@@ -154,6 +210,109 @@ STATS_CLASS = 'scrapy.statscollectors.MemoryStatsCollector'
 
 # Custom settings
 OUTPUT_DIR = './data/crawled'
+SERIALIZER = 'auto'  # JSON encoder for items and pages: 'json', 'orjson' (pip install orjson), 'msgspec' (pip install msgspec) or 'auto' (fastest installed)
+STORAGE_DIR = './data/pages'  # FileStoragePipeline
+STORAGE_BACKEND = 'segments'  # 'segments' (append-only segment files) or 'files' (one JSON file per page)
+STORAGE_SEGMENT_BYTES = 256 * 1024 * 1024  # Start new segment after N bytes
+STORAGE_FSYNC = False  # fsync segments when flushed
+STORAGE_INDEX = True  # SQLite URL hash -> location index (<STORAGE_DIR>/index.sqlite) for page lookups
+STORAGE_PRETTY_JSON = False  # Indent page files ('files' backend only; default compact)
+
+# Exact duplicate content (ContentDedupeMiddleware)
+CONTENT_DEDUPE_ENABLED = True  # Ignore HTML responses with a body identical to one already seen
+CONTENT_DEDUPE_SIZE = 100000  # Remembered body hashes (LRU)
+CONTENT_DEDUPE_HASH = 'auto'  # 'xxhash' (pip install xxhash), 'blake2b' or 'auto' (xxhash if installed)
+
+# Near-duplicate text (NearDuplicatePipeline, SimHash)
+NEAR_DUPLICATE_ENABLED = False  # Fingerprint item text and check it against earlier pages of the same language
+NEAR_DUPLICATE_ACTION = 'drop'  # 'drop' or 'flag' (keep, with near_duplicate_of set)
+NEAR_DUPLICATE_DISTANCE = 5  # Maximum differing bits of the 64-bit fingerprints (distinct pages: ~15+)
+NEAR_DUPLICATE_INDEX_SIZE = 500000  # Fingerprints remembered per language (oldest forgotten first)
+
+# Outlink filtering (config/domain_filters.py): links to blocked domains, their
+# subdomains and BLOCKED_EXTENSIONS file types are not followed
+BLOCKED_DOMAINS = []  # Added to GLOBAL_BLOCKED_DOMAINS
+BLOCKED_DOMAINS_FILES = []  # Blocklists: one domain per line or hosts file format, '#' comments, plain or .gz
+
+# URL canonicalization (canonicalize.py): seed and link URLs are rewritten before
+# they are fingerprinted and scheduled. Tracking (utm_*, fbclid, ...) and session
+# ID parameters are always stripped
+URL_CANONICALIZATION_ENABLED = True
+CANONICAL_STRIP_PARAMS = []  # More query parameters to strip
+CANONICAL_STRIP_PARAM_PREFIXES = []  # More query parameter prefixes to strip
+CANONICAL_SORT_QUERY = True  # Sort query parameters
+CANONICAL_NORMALIZE_ENCODING = True  # Decode escaped unreserved characters, uppercase other escapes
+CANONICAL_TRAILING_SLASH = 'keep'  # 'keep', 'strip' or 'add' (paths without a file extension)
+CANONICAL_STRIP_INDEX = True  # /docs/index.html -> /docs/ (not with a query: /w/index.php?title=...)
+CANONICAL_HOST_PARAMS = {}  # Host (and subdomains) -> only query parameters kept, e.g. {'youtube.com': ['v']}
+CANONICAL_MEMO_SIZE = 100000  # Memoized canonical URLs (LRU, 0 = none)
+
+# Recently scheduled URLs (cache/scheduled.py): links already scheduled from an
+# earlier page of the same host are skipped before a Request is built
+SCHEDULED_URL_CACHE_ENABLED = True
+SCHEDULED_URL_CACHE_HOSTS = 1000  # Hosts remembered (LRU)
+SCHEDULED_URL_CACHE_URLS_PER_HOST = 500  # URL hashes remembered per host (LRU)
+SCHEDULED_URL_CACHE_HASH = 'auto'  # 'xxhash' (pip install xxhash), 'blake2b' or 'auto' (xxhash if installed)
+
+# Item fields extracted per page: 'minimal' (url, title, text, language), 'search'
+# (adds description, headings, keywords, dates, links) or 'full' (adds paragraphs,
+# Open Graph/Twitter metadata, favicon); spiders can override with -a extraction_profile=...
+EXTRACTION_PROFILE = 'full'
+
+# Main content detection (ContentExtractor): 'heuristic' (article/main/content
+# containers, else the whole body) or 'density' (block scoring by text and link density)
+CONTENT_EXTRACTION_MODE = 'heuristic'
+
+# Per-host extraction caches (ContentExtractor, see extractors/host_cache.py)
+TEMPLATE_CACHE_ENABLED = True  # Remove subtrees repeated across a host's pages before matching class/id patterns
+TEMPLATE_CACHE_HOSTS = 2000  # Hosts remembered (LRU)
+TEMPLATE_CACHE_BLOCKS = 300  # Subtree fingerprints kept per host (most frequent)
+TEMPLATE_CACHE_MIN_PAGES = 5  # Pages of a host seen before its template is used
+TEMPLATE_CACHE_MIN_RATIO = 0.5  # Share of the host's pages a subtree must appear on
+TEMPLATE_CACHE_FILE = './data/cache/templates.json'  # Persist across runs (None = in-memory only)
+SELECTOR_CACHE_ENABLED = True  # Try each host's last main content container before the heuristics
+SELECTOR_CACHE_HOSTS = 10000  # Hosts remembered (LRU)
+SELECTOR_CACHE_VERIFY_PAGES = 2  # First uses of a host's container checked against the heuristics
+SELECTOR_CACHE_VERIFY_EVERY = 10  # Check every n-th use after that (0 = never)
+SELECTOR_CACHE_FILE = './data/cache/selectors.json'  # Persist across runs (None = in-memory only)
+
+# Parse budgets (ContentExtractor): pages over a budget get head-only metadata and
+# truncated text without paragraphs, headings or links (0 = no limit)
+PARSE_BUDGET_ENABLED = True
+PARSE_MAX_BYTES = 1024 * 1024  # Body size parsed in full
+PARSE_MAX_NODES = 50000  # Elements parsed in full (estimated by counting start tags)
+PARSE_MAX_SECONDS = 1.0  # Extraction wall time per page; later stages are skipped
+PARSE_DEGRADED_TEXT_CHARS = 20000  # Text kept from degraded pages
+
+# Item schema (CompactItemPipeline)
+ITEM_SCHEMA = 'full'  # 'full' or 'compact' (paragraph/heading offsets into text, links in LINKS_DIR)
+LINKS_DIR = './data/links'  # Compact schema edge output, one JSON line per link (None = none)
+ITEM_FIELD_MAX_LENGTHS = {  # Compact schema length caps (truncate_text); 'anchor_text' caps edge anchors
+    'title': 500,
+    'description': 1000,
+    'text': 100000,
+    'anchor_text': 200,
+}
+
+# Link graph (LinkGraphPipeline)
+LINK_GRAPH_ENABLED = False  # Store deduplicated links as binary URL ID pairs per language
+LINK_GRAPH_DIR = './data/graph'  # urls.txt/urls.fp dictionary, <lang>/edges.bin + anchors.txt
+
+# JSON Lines output (JsonLinesPipeline)
+JSONL_BUFFER_SIZE = 65536  # Bytes buffered per language before writing
+JSONL_FLUSH_INTERVAL = 5  # Max seconds lines stay buffered (0 = only when buffer is full)
+JSONL_FSYNC = False  # fsync after every flush
+JSONL_ROTATE_BYTES = 0  # Start new numbered segment after N uncompressed bytes (0 = never)
+JSONL_ROTATE_SECONDS = 0  # Start new numbered segment after N seconds (0 = never)
+JSONL_COMPRESSION = None  # None, 'gzip' or 'zstd' (requires: pip install zstandard); numbered segments, a new one per run
+JSONL_COMPRESSION_LEVEL = None  # None = library default
+
+# Parquet output (ParquetPipeline, requires: pip install pyarrow)
+PARQUET_DIR = './data/parquet'  # Partitioned as language_code=<lang>/crawl_date=<date>/
+PARQUET_ROW_GROUP_SIZE = 1000  # Records per row group
+PARQUET_ROWS_PER_FILE = 100000  # Finish file and start a new one after N records
+PARQUET_COMPRESSION = 'zstd'  # 'zstd', 'snappy', 'gzip' or 'none'
+
 ALLOWED_LANGUAGES = None  # None = all languages, or list of language codes
 MIN_LANGUAGE_CONFIDENCE = 0.5
 EU_LANGUAGES_ONLY = True  # Only keep EU language pages
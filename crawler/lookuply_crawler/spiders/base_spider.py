@@ -2,11 +2,12 @@
 Base Spider - Foundation for all Lookuply spiders
 """
 
+import time
 import logging
 from datetime import datetime
 from urllib.parse import urlparse
 import scrapy
-from scrapy.linkextractors import LinkExtractor
+from scrapy.exceptions import IgnoreRequest
 from scrapy.spidermiddlewares.httperror import HttpError
 from twisted.internet.error import DNSLookupError, TimeoutError, TCPTimedOutError
 
@@ -27,6 +28,10 @@ class BaseSpider(scrapy.Spider):
 
     name = 'base_spider'
 
+    # Extraction profile ('minimal', 'search' or 'full'; None = EXTRACTION_PROFILE
+    # setting), also settable with -a extraction_profile=...
+    extraction_profile = None
+
     # Custom settings that all spiders inherit
     custom_settings = {
         'ROBOTSTXT_OBEY': True,
@@ -64,16 +69,22 @@ class BaseSpider(scrapy.Spider):
             'lookuply_crawler.pipelines.ValidationPipeline': 100,
             'lookuply_crawler.pipelines.LanguageFilterPipeline': 200,
             'lookuply_crawler.pipelines.DuplicatesPipeline': 300,
+            'lookuply_crawler.pipelines.NearDuplicatePipeline': 310,
+            'lookuply_crawler.pipelines.LinkGraphPipeline': 330,
+            'lookuply_crawler.pipelines.CompactItemPipeline': 350,
             'lookuply_crawler.pipelines.JsonLinesPipeline': 400,
             'lookuply_crawler.pipelines.StatisticsPipeline': 500,
         },
 
         # Middleware
         'DOWNLOADER_MIDDLEWARES': {
+            'scrapy.downloadermiddlewares.robotstxt.RobotsTxtMiddleware': None,
+            'lookuply_crawler.middleware.CachedRobotsTxtMiddleware': 100,
             'lookuply_crawler.middleware.RandomUserAgentMiddleware': 400,
             'lookuply_crawler.middleware.ContentTypeFilterMiddleware': 543,
             'lookuply_crawler.middleware.LanguageDetectionMiddleware': 544,
             'lookuply_crawler.middleware.PolitenessPolicyMiddleware': 545,
+            'lookuply_crawler.middleware.ContentDedupeMiddleware': 560,
         },
 
         # Logging
@@ -94,18 +105,41 @@ class BaseSpider(scrapy.Spider):
             'errors': 0,
         }
 
-        # Link extractor for following links
-        self.link_extractor = LinkExtractor(
-            allow_domains=None,  # Set in subclass
-            deny_extensions=[
-                'pdf', 'doc', 'docx', 'xls', 'xlsx', 'ppt', 'pptx',
-                'zip', 'rar', 'tar', 'gz', '7z',
-                'mp3', 'mp4', 'avi', 'mov', 'wmv', 'flv',
-                'jpg', 'jpeg', 'png', 'gif', 'bmp', 'svg', 'ico',
-                'exe', 'dmg', 'pkg', 'deb', 'rpm',
-            ],
-            unique=True,
+        # Item fields to extract, main content detection mode, learned per-host
+        # templates and content containers, parse budget, URL canonicalizer,
+        # outlink filter and recently scheduled URLs (set in from_crawler)
+        self.extraction_fields = None
+        self.content_extraction_mode = 'heuristic'
+        self.template_cache = None
+        self.selector_cache = None
+        self.parse_budget = None
+        self.url_canonicalizer = None
+        self.link_filter = None
+        self.scheduled_urls = None
+
+    @classmethod
+    def from_crawler(cls, crawler, *args, **kwargs):
+        """Create spider and its extraction settings, per-host caches and parse budget from crawler settings."""
+        from ..cache import create_scheduled_url_cache
+        from ..canonicalize import create_url_canonicalizer
+        from ..config import create_domain_filter
+        from ..extractors import create_parse_budget, create_selector_cache, create_template_cache, get_profile_fields
+
+        spider = super(BaseSpider, cls).from_crawler(crawler, *args, **kwargs)
+        spider.extraction_profile = spider.extraction_profile or crawler.settings.get('EXTRACTION_PROFILE', 'full')
+        spider.extraction_fields = get_profile_fields(spider.extraction_profile)
+        spider.content_extraction_mode = crawler.settings.get('CONTENT_EXTRACTION_MODE', 'heuristic')
+        spider.template_cache = create_template_cache(crawler.settings)
+        spider.selector_cache = create_selector_cache(crawler.settings)
+        spider.parse_budget = create_parse_budget(crawler.settings)
+        spider.url_canonicalizer = create_url_canonicalizer(crawler.settings)
+        spider.link_filter = create_domain_filter(crawler.settings)
+        spider.scheduled_urls = create_scheduled_url_cache(crawler.settings)
+        logger.info(
+            f"Outlink filter: {spider.link_filter.size} blocked domains, "
+            f"{len(spider.link_filter.extensions)} blocked extensions"
         )
+        return spider
 
     def parse(self, response):
         """
@@ -121,18 +155,51 @@ class BaseSpider(scrapy.Spider):
             response: Scrapy response object
 
         Returns:
-            dict: Extracted content
+            dict: Extracted content (item fields, plus 'page_links': every
+            link of the page for extract_links)
         """
         from ..extractors import ContentExtractor, MetadataExtractor, get_detector
+        from ..extractors.profiles import get_content_parts, get_metadata_keys
+        from ..utils import get_declared_encoding, get_html_head
 
+        started = time.process_time()
         try:
             # Extract content
-            content_extractor = ContentExtractor()
-            content = content_extractor.extract(response.text, response.url)
-
-            # Extract metadata
+            content_extractor = ContentExtractor(
+                template_cache=self.template_cache,
+                selector_cache=self.selector_cache,
+                mode=self.content_extraction_mode,
+                parse_budget=self.parse_budget,
+                canonicalizer=self.url_canonicalizer,
+            )
+            # Parse the body bytes: lxml decodes them, no str copy of the page
+            body = response.body
+            encoding = get_declared_encoding(response)
+            budget = self.parse_budget
+            deadline = budget.deadline() if budget is not None else None
+            # Only the fields of the extraction profile
+            fields = self.extraction_fields
+            content = content_extractor.extract(body, response.url, encoding, deadline, get_content_parts(fields))
+
+            degraded = content['degraded']
+            if budget is not None and not degraded and budget.expired(deadline):
+                degraded = budget.exceeded('max_seconds')
+            if degraded:
+                logger.info(f"Parse budget {degraded} exceeded for {response.url}: head-only metadata, truncated text")
+
+            # Extract metadata (from the document head only when over budget or
+            # when the profile does not need every field)
             metadata_extractor = MetadataExtractor()
-            metadata = metadata_extractor.extract(response.text, response.url)
+            metadata_keys = get_metadata_keys(fields)
+            if degraded:
+                metadata = metadata_extractor.extract(budget.get_head(body), response.url, encoding, metadata_keys)
+            elif fields is not None:
+                metadata = metadata_extractor.extract(get_html_head(body), response.url, encoding, metadata_keys)
+                # Pages without <title> fall back to their first h1
+                if metadata['title'] is None and 'title' in metadata_keys:
+                    metadata['title'] = metadata_extractor.extract(body, response.url, encoding, ('title',))['title']
+            else:
+                metadata = metadata_extractor.extract(body, response.url, encoding)
 
             # Detect language
             detector = get_detector()
@@ -148,7 +215,7 @@ class BaseSpider(scrapy.Spider):
             lang_name = lang_info['name'] if lang_info else 'Unknown'
 
             # Combine all data
-            return {
+            data = {
                 'url': response.url,
                 'domain': urlparse(response.url).netloc,
                 'canonical_url': metadata['canonical_url'],
@@ -168,36 +235,48 @@ class BaseSpider(scrapy.Spider):
                 'og_metadata': metadata['og'],
                 'twitter_metadata': metadata['twitter'],
                 'links': content['links'],
-                'internal_links_count': len([l for l in content['links'] if urlparse(response.url).netloc in l['url']]),
-                'external_links_count': len([l for l in content['links'] if urlparse(response.url).netloc not in l['url']]),
+                'internal_links_count': sum(link['internal'] for link in content['links']),
+                'external_links_count': sum(not link['internal'] for link in content['links']),
                 'status_code': response.status,
                 'content_type': response.headers.get('Content-Type', b'').decode('utf-8', errors='ignore'),
-                'encoding': response.encoding,
+                'encoding': encoding or response.encoding,
                 'favicon': metadata['favicon'],
                 'crawled_at': datetime.utcnow().isoformat(),
                 'crawl_depth': response.meta.get('depth', 0),
                 'referrer': response.request.headers.get('Referer', b'').decode('utf-8', errors='ignore'),
                 'is_valid': content['is_valid'],
                 'is_eu_language': is_eu_lang,
+                'parse_degraded': degraded,
             }
+            if fields is not None:
+                data = {field: value for field, value in data.items() if field in fields}
+            data['page_links'] = content['page_links']
+            return data
 
         except Exception as e:
             logger.error(f"Content extraction failed for {response.url}: {e}")
             return None
 
-    def extract_links(self, response):
+        finally:
+            crawler = getattr(self, 'crawler', None)
+            if crawler is not None:
+                crawler.stats.inc_value('extraction/pages')
+                crawler.stats.inc_value('extraction/cpu_seconds', time.process_time() - started)
+
+    def extract_links(self, response, page_links):
         """
         Extract links from response for crawling.
 
         Args:
             response: Scrapy response object
+            page_links: Links of the page from extract_content
 
         Returns:
-            list: Extracted links
+            list: Link dicts to follow (url, text, domain, internal, in_content)
         """
         try:
-            links = self.link_extractor.extract_links(response)
-            return links
+            allowed = self._get_link_filter().filter([link['url'] for link in page_links])
+            return [link for link, follow in zip(page_links, allowed) if follow]
         except Exception as e:
             logger.error(f"Link extraction failed for {response.url}: {e}")
             return []
@@ -213,9 +292,13 @@ class BaseSpider(scrapy.Spider):
         Returns:
             bool: True if link should be followed
         """
-        from ..config import is_domain_allowed
+        return self._get_link_filter().allows(url)
 
-        return is_domain_allowed(url)
+    def _get_link_filter(self):
+        """Outlink filter from the settings, or the default one (spider created without a crawler)."""
+        from ..config import get_domain_filter
+
+        return self.link_filter if self.link_filter is not None else get_domain_filter()
 
     def errback_httpbin(self, failure):
         """
@@ -224,6 +307,11 @@ class BaseSpider(scrapy.Spider):
         Args:
             failure: Twisted failure object
         """
+        # Dropped on purpose by a downloader middleware (duplicate content, content type)
+        if failure.check(IgnoreRequest):
+            logger.debug(f'Ignored {failure.request.url}: {failure.value}')
+            return
+
         self.stats['errors'] += 1
 
         # Log errors
@@ -258,3 +346,54 @@ class BaseSpider(scrapy.Spider):
         logger.info(f"Items scraped: {self.stats['items_scraped']}")
         logger.info(f"Errors: {self.stats['errors']}")
         logger.info("=" * 60)
+
+        if self.template_cache is not None:
+            self.template_cache.save()
+            for key, value in self.template_cache.stats.items():
+                self.crawler.stats.set_value(f'extraction/template_{key}', value)
+            logger.info(
+                f"Host templates: {self.template_cache.stats['applied']} of "
+                f"{self.template_cache.stats['pages']} pages, "
+                f"{self.template_cache.stats['blocks_removed']} blocks removed, "
+                f"{len(self.template_cache.hosts)} hosts"
+            )
+
+        if self.selector_cache is not None:
+            self.selector_cache.save()
+            for key, value in self.selector_cache.stats.items():
+                self.crawler.stats.set_value(f'extraction/selector_{key}', value)
+            self.crawler.stats.set_value('extraction/selector_hit_rate', round(self.selector_cache.hit_rate, 3))
+            logger.info(
+                f"Content selectors: {self.selector_cache.hit_rate:.1%} hit rate, "
+                f"{self.selector_cache.stats['invalid']} invalidated, {len(self.selector_cache.hosts)} hosts"
+            )
+
+        if self.link_filter is not None:
+            for key, value in self.link_filter.stats.items():
+                self.crawler.stats.set_value(f'linkfilter/{key}', value)
+
+        if self.url_canonicalizer is not None:
+            for key, value in self.url_canonicalizer.stats.items():
+                self.crawler.stats.set_value(f'canonical/{key}', value)
+            logger.info(
+                f"URL canonicalization: {self.url_canonicalizer.stats['rewritten']} URLs rewritten, "
+                f"{self.url_canonicalizer.stats['params_stripped']} parameters stripped, "
+                f"{self.url_canonicalizer.stats['memo_hits']} of {self.url_canonicalizer.stats['urls']} memoized"
+            )
+
+        if self.scheduled_urls is not None:
+            for key, value in self.scheduled_urls.stats.items():
+                self.crawler.stats.set_value(f'scheduledurls/{key}', value)
+            logger.info(
+                f"Scheduled URL cache: {self.scheduled_urls.stats['skipped']} of "
+                f"{self.scheduled_urls.stats['checked']} Requests avoided"
+            )
+
+        if self.parse_budget is not None:
+            for key, value in self.parse_budget.stats.items():
+                self.crawler.stats.set_value(f'extraction/budget_{key}', value)
+            logger.info(
+                f"Parse budget: {self.parse_budget.stats['degraded']} of {self.parse_budget.stats['pages']} pages degraded "
+                f"(max_bytes {self.parse_budget.stats['max_bytes']}, max_nodes {self.parse_budget.stats['max_nodes']}, "
+                f"max_seconds {self.parse_budget.stats['max_seconds']})"
+            )
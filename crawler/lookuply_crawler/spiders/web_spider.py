@@ -64,6 +64,9 @@ class WebSpider(BaseSpider):
             logger.info(f"Starting crawl for {lang_code}: {len(start_urls)} seed URLs")
 
             for url in start_urls:
+                if self.url_canonicalizer is not None:
+                    url = self.url_canonicalizer.canonicalize(url)
+
                 yield scrapy.Request(
                     url=url,
                     callback=self.parse,
@@ -96,7 +99,8 @@ class WebSpider(BaseSpider):
                 logger.warning(f"Failed to extract content from {response.url}")
                 return
 
-            # Create item
+            # Create item (the page's links are for following only)
+            page_links = data.pop('page_links')
             item = WebPageItem(**data)
 
             # Check language limit
@@ -114,19 +118,23 @@ class WebSpider(BaseSpider):
 
             # Extract and follow links
             if response.meta.get('depth', 0) < self.settings.get('DEPTH_LIMIT', 3):
-                for link in self.extract_links(response):
-                    if self.should_follow_link(link.url, response.url):
-                        self.stats['requests_sent'] += 1
-
-                        yield scrapy.Request(
-                            url=link.url,
-                            callback=self.parse,
-                            errback=self.errback_httpbin,
-                            meta={
-                                'depth': response.meta.get('depth', 0) + 1,
-                                'referrer': response.url,
-                            },
-                        )
+                # Links to blocked domains and file types are filtered out as a batch
+                for link in self.extract_links(response, page_links):
+                    # Skip links scheduled recently from another page of the host
+                    if self.scheduled_urls is not None and not self.scheduled_urls.schedule(link['url'], link['domain']):
+                        continue
+
+                    self.stats['requests_sent'] += 1
+
+                    yield scrapy.Request(
+                        url=link['url'],
+                        callback=self.parse,
+                        errback=self.errback_httpbin,
+                        meta={
+                            'depth': response.meta.get('depth', 0) + 1,
+                            'referrer': response.url,
+                        },
+                    )
 
         except Exception as e:
             logger.error(f"Error parsing {response.url}: {e}")
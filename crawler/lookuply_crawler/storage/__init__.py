@@ -3,5 +3,15 @@ Storage package for Lookuply Crawler.
 """
 
 from .file_storage import FileStorage
+from .segment_storage import SegmentStorage, create_storage
+from .jsonl_writer import JsonLinesWriter, find_jsonl_files, open_jsonl
+from .background_writer import BackgroundWriter
+from .parquet_writer import ParquetDatasetWriter
+from .link_graph import LinkGraphWriter, iter_edges, read_urls
 
-__all__ = ['FileStorage']
+__all__ = [
+    'FileStorage', 'SegmentStorage', 'create_storage',
+    'JsonLinesWriter', 'find_jsonl_files', 'open_jsonl',
+    'BackgroundWriter', 'ParquetDatasetWriter',
+    'LinkGraphWriter', 'iter_edges', 'read_urls',
+]
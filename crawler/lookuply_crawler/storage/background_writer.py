@@ -0,0 +1,131 @@
+"""
+Background Writer Module
+Run blocking storage writes on a dedicated thread fed by a bounded queue.
+"""
+
+import time
+import queue
+import logging
+import threading
+from collections import deque
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundWriter:
+    """
+    Dedicated writer thread draining a bounded queue of write calls.
+
+    submit() returns immediately while the queue has room. When the queue
+    depth reaches the high watermark `on_full` is called (from the
+    submitting thread) so the producer can pause; once the writer thread
+    has drained it to the low watermark `on_drained` is called (from the
+    writer thread). Writes run in submission order.
+    """
+
+    def __init__(self, name: str, maxsize: int = 10000,
+                 on_full: Optional[Callable] = None, on_drained: Optional[Callable] = None,
+                 high_watermark: float = 0.8, low_watermark: float = 0.5):
+        """
+        Initialize writer.
+
+        Args:
+            name: Name used for the thread and log messages
+            maxsize: Maximum number of queued writes
+            on_full: Called when queue depth reaches the high watermark
+            on_drained: Called when queue depth falls back to the low watermark
+            high_watermark: Fraction of maxsize that triggers on_full
+            low_watermark: Fraction of maxsize that triggers on_drained
+        """
+        self.name = name
+        self.queue = queue.Queue(maxsize)
+        self.high_watermark = max(int(maxsize * high_watermark), 1)
+        self.low_watermark = int(maxsize * low_watermark)
+        self.on_full = on_full
+        self.on_drained = on_drained
+
+        self.paused = False
+        self.max_depth = 0
+        self.writes = 0
+        self.errors = 0
+        self.latencies = deque(maxlen=10000)
+
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name=f'{name}-writer', daemon=True)
+
+    @property
+    def depth(self) -> int:
+        """Number of queued writes."""
+        return self.queue.qsize()
+
+    def start(self):
+        """Start the writer thread."""
+        self._thread.start()
+
+    def submit(self, func: Callable, *args):
+        """
+        Queue a write call.
+
+        Blocks only if the queue is completely full, which the on_full
+        backpressure callback is meant to prevent.
+
+        Args:
+            func: Blocking write callable
+            *args: Arguments for func
+        """
+        self.queue.put((func, args))
+
+        depth = self.queue.qsize()
+        self.max_depth = max(self.max_depth, depth)
+
+        if depth >= self.high_watermark:
+            with self._lock:
+                if self.paused:
+                    return
+                self.paused = True
+            if self.on_full:
+                self.on_full()
+
+    def close(self):
+        """Write everything still queued, then stop the thread."""
+        if self._thread.is_alive():
+            self.queue.put(None)
+            self._thread.join()
+
+    def latency_percentiles(self) -> Dict[int, float]:
+        """
+        Get write latency percentiles.
+
+        Returns:
+            dict: Percentile -> latency in milliseconds
+        """
+        from ..utils import calculate_percentiles
+
+        percentiles = calculate_percentiles(list(self.latencies))
+        return {pct: value * 1000 for pct, value in percentiles.items()}
+
+    def _run(self):
+        while True:
+            task = self.queue.get()
+            if task is None:
+                break
+
+            func, args = task
+            started = time.monotonic()
+            try:
+                func(*args)
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"{self.name} background write failed: {e}")
+
+            self.latencies.append(time.monotonic() - started)
+            self.writes += 1
+
+            if self.paused and self.queue.qsize() <= self.low_watermark:
+                with self._lock:
+                    if not self.paused:
+                        continue
+                    self.paused = False
+                if self.on_drained:
+                    self.on_drained()
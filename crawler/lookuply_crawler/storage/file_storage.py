@@ -4,8 +4,8 @@ Handle local file storage for crawled data.
 """
 
 import os
-import json
 import logging
+import sqlite3
 from datetime import datetime
 from pathlib import Path
 
@@ -16,17 +16,42 @@ class FileStorage:
     """
     Local file storage for crawled pages.
     Organizes files by language and date.
+    With index enabled, a PageIndex (<base_dir>/index.sqlite) maps URL
+    hashes to page files so lookups don't scan date directories.
+    Page counts and sizes are kept in a StorageManifest (<base_dir>/manifest.json).
+    Pages are written as compact JSON unless a pretty serializer is given.
     """
 
-    def __init__(self, base_dir='./data/crawled'):
+    def __init__(self, base_dir='./data/crawled', index=True, serializer=None):
         """
         Initialize file storage.
 
         Args:
             base_dir: Base directory for storage
+            index: Maintain a page lookup index
+            serializer: Serializer from get_serializer() (default: fastest installed, compact)
         """
+        from ..serialization import get_serializer
+
         self.base_dir = Path(base_dir)
         self.base_dir.mkdir(parents=True, exist_ok=True)
+        self.serializer = serializer or get_serializer()
+
+        from .manifest import StorageManifest
+        self.manifest = StorageManifest(self.base_dir / 'manifest.json')
+        if not self.manifest.exists:
+            self.manifest.create(self._count_pages)
+
+        self.index = None
+        if index:
+            from .page_index import PageIndex
+            self.index = PageIndex(self.base_dir / 'index.sqlite')
+
+            # A new store is fully indexed from the start; pages saved before
+            # the index existed are found by scanning until rebuild_index()
+            if self.index.get_meta('complete') is None and not any(p.is_dir() for p in self.base_dir.iterdir()):
+                self.index.set_meta('complete', 1)
+                self.index.commit()
 
     def save_page(self, page_data, language_code):
         """
@@ -55,9 +80,28 @@ class FileStorage:
             filename = f"{url_hash}.json"
             filepath = date_dir / filename
 
+            # Replacing a page saved earlier today
+            try:
+                previous_size = filepath.stat().st_size
+            except FileNotFoundError:
+                previous_size = None
+
             # Save as JSON
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(page_data, f, ensure_ascii=False, indent=2)
+            data = self.serializer.dumps(page_data)
+            with open(filepath, 'wb') as f:
+                f.write(data)
+
+            if previous_size is None:
+                self.manifest.add(language_code, date_str, 1, len(data))
+            else:
+                self.manifest.add(language_code, date_str, 0, len(data) - previous_size)
+
+            if self.index is not None:
+                try:
+                    self.index.add([(url_hash, language_code, f"{language_code}/{date_str}/{filename}", 0, 0)])
+                except sqlite3.Error as e:
+                    # The page is saved; its entry stays buffered for the next index write
+                    logger.warning(f"Failed to index page {page_data.get('url')}: {e}")
 
             logger.debug(f"Saved page to {filepath}")
             return str(filepath)
@@ -95,6 +139,14 @@ class FileStorage:
             dict: Page data or None if not found
         """
         try:
+            if self.index is not None:
+                found = self.index.get(url_hash, language_code)
+                if found is not None and (self.base_dir / found[1]).exists():
+                    with open(self.base_dir / found[1], 'rb') as f:
+                        return self.serializer.loads(f.read())
+                if self.index.get_meta('complete'):
+                    return None
+
             # Search for file with this hash
             lang_dir = self.base_dir / language_code
 
@@ -106,8 +158,8 @@ class FileStorage:
                 if date_dir.is_dir():
                     filepath = date_dir / f"{url_hash}.json"
                     if filepath.exists():
-                        with open(filepath, 'r', encoding='utf-8') as f:
-                            return json.load(f)
+                        with open(filepath, 'rb') as f:
+                            return self.serializer.loads(f.read())
 
             return None
 
@@ -115,44 +167,92 @@ class FileStorage:
             logger.error(f"Failed to load page {url_hash}: {e}")
             return None
 
+    def load_pages(self, url_hashes, language_code=None):
+        """
+        Load many pages at once.
+
+        Args:
+            url_hashes: List of URL hashes
+            language_code: Restrict to a language (None = any)
+
+        Returns:
+            dict: url_hash -> page data for the pages found
+        """
+        pages = {}
+
+        if self.index is not None:
+            for url_hash, (_, location, _, _) in self.index.get_many(url_hashes, language_code).items():
+                try:
+                    with open(self.base_dir / location, 'rb') as f:
+                        pages[url_hash] = self.serializer.loads(f.read())
+                except Exception as e:
+                    logger.error(f"Failed to load page {url_hash}: {e}")
+
+            if self.index.get_meta('complete'):
+                return pages
+
+        languages = [language_code] if language_code else sorted(
+            p.name for p in self.base_dir.iterdir() if p.is_dir()
+        )
+        for url_hash in url_hashes:
+            for lang in languages:
+                if url_hash in pages:
+                    break
+                page = self.load_page(lang, url_hash)
+                if page is not None:
+                    pages[url_hash] = page
+
+        return pages
+
+    def rebuild_index(self):
+        """
+        Rebuild the page lookup index from the page files.
+
+        Returns:
+            int: Number of indexed pages
+        """
+        if self.index is None:
+            return 0
+
+        self.index.clear()
+
+        for lang_dir in sorted(p for p in self.base_dir.iterdir() if p.is_dir()):
+            for date_dir in sorted(p for p in lang_dir.iterdir() if p.is_dir()):
+                self.index.add(
+                    (filepath.stem, lang_dir.name, f"{lang_dir.name}/{date_dir.name}/{filepath.name}", 0, 0)
+                    for filepath in date_dir.glob('*.json')
+                )
+
+        self.index.set_meta('complete', 1)
+        self.index.commit()
+
+        count = self.index.count()
+        logger.info(f"Rebuilt page index: {count} pages")
+        return count
+
     def get_stats(self):
         """
-        Get storage statistics.
+        Get storage statistics from the manifest.
 
         Returns:
             dict: Statistics about stored pages
         """
-        stats = {
-            'total_pages': 0,
-            'by_language': {},
-            'total_size_bytes': 0,
-        }
-
-        try:
-            for lang_dir in self.base_dir.iterdir():
-                if lang_dir.is_dir():
-                    lang_code = lang_dir.name
-                    page_count = 0
-                    lang_size = 0
+        return self.manifest.get_stats()
 
-                    # Count files in all date directories
-                    for date_dir in lang_dir.iterdir():
-                        if date_dir.is_dir():
-                            for filepath in date_dir.glob('*.json'):
-                                page_count += 1
-                                lang_size += filepath.stat().st_size
+    def rebuild_stats(self):
+        """
+        Recompute the statistics manifest by scanning all page files.
 
-                    stats['by_language'][lang_code] = {
-                        'pages': page_count,
-                        'size_bytes': lang_size,
-                    }
-                    stats['total_pages'] += page_count
-                    stats['total_size_bytes'] += lang_size
+        Returns:
+            dict: Statistics about stored pages
+        """
+        try:
+            self.manifest.replace(self._count_pages())
 
         except Exception as e:
-            logger.error(f"Failed to get storage stats: {e}")
+            logger.error(f"Failed to rebuild storage stats: {e}")
 
-        return stats
+        return self.manifest.get_stats()
 
     def cleanup_old_files(self, days=30):
         """
@@ -184,6 +284,9 @@ class FileStorage:
                                         deleted_count += 1
                                     # Remove empty directory
                                     date_dir.rmdir()
+                                    if self.index is not None:
+                                        self.index.remove_prefix(f"{lang_dir.name}/{date_dir.name}/")
+                                    self.manifest.remove_day(lang_dir.name, date_dir.name)
                                     logger.info(f"Deleted old directory: {date_dir}")
                             except ValueError:
                                 pass  # Skip directories with invalid date format
@@ -193,6 +296,19 @@ class FileStorage:
 
         return deleted_count
 
+    def flush(self):
+        """Save index and manifest changes (pages are written immediately)."""
+        if self.index is not None:
+            try:
+                self.index.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to write page index: {e}")
+        self.manifest.save()
+
+    def close(self):
+        """Save index and manifest changes (pages are written immediately)."""
+        self.flush()
+
     def export_to_jsonl(self, language_code, output_file):
         """
         Export all pages for a language to JSON Lines format.
@@ -204,6 +320,10 @@ class FileStorage:
         Returns:
             int: Number of pages exported
         """
+        from ..serialization import get_serializer
+
+        # One record per line, even if page files are indented
+        line_serializer = get_serializer(self.serializer.name)
         exported_count = 0
 
         try:
@@ -213,15 +333,15 @@ class FileStorage:
                 logger.warning(f"No data found for language: {language_code}")
                 return 0
 
-            with open(output_file, 'w', encoding='utf-8') as outfile:
+            with open(output_file, 'wb') as outfile:
                 # Process all date directories
                 for date_dir in sorted(lang_dir.iterdir()):
                     if date_dir.is_dir():
                         for filepath in sorted(date_dir.glob('*.json')):
                             try:
-                                with open(filepath, 'r', encoding='utf-8') as f:
-                                    page_data = json.load(f)
-                                    outfile.write(json.dumps(page_data, ensure_ascii=False) + '\n')
+                                with open(filepath, 'rb') as f:
+                                    page_data = self.serializer.loads(f.read())
+                                    outfile.write(line_serializer.dumps(page_data) + b'\n')
                                     exported_count += 1
                             except Exception as e:
                                 logger.error(f"Failed to export {filepath}: {e}")
@@ -232,3 +352,21 @@ class FileStorage:
         except Exception as e:
             logger.error(f"Failed to export to JSONL: {e}")
             return 0
+
+    def _count_pages(self):
+        """Page counts and sizes per language and day, from the page files."""
+        languages = {}
+
+        for lang_dir in self.base_dir.iterdir():
+            if lang_dir.is_dir():
+                days = languages.setdefault(lang_dir.name, {})
+
+                # Count files in all date directories
+                for date_dir in lang_dir.iterdir():
+                    if date_dir.is_dir():
+                        day = days.setdefault(date_dir.name, {'pages': 0, 'size_bytes': 0})
+                        for filepath in date_dir.glob('*.json'):
+                            day['pages'] += 1
+                            day['size_bytes'] += filepath.stat().st_size
+
+        return languages
@@ -0,0 +1,385 @@
+"""
+JSON Lines Writer Module
+Buffered, rotating and optionally compressed JSON Lines output.
+"""
+
+import io
+import os
+import re
+import gzip
+import time
+import zlib
+import logging
+import threading
+from pathlib import Path
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+COMPRESSION_EXTENSIONS = {
+    None: '',
+    'gzip': '.gz',
+    'zstd': '.zst',
+}
+
+
+class JsonLinesWriter:
+    """
+    Append JSON lines to a file with an explicit durability policy.
+
+    Features:
+    - Buffers complete lines in memory and writes them in one call, so a
+      crash never leaves a partially written line
+    - Flushes when the buffer is full or flush_interval has elapsed,
+      optionally followed by fsync
+    - Rotates into numbered segments by size and/or age
+    - Streaming gzip or zstd compression (each flush ends on a block
+      boundary, so every flushed line can be recovered after a crash)
+
+    Without rotation or compression the output file is `<name>.jsonl`
+    (a torn last line from a crash is removed before appending); otherwise
+    segments are `<name>.00001.jsonl[.gz|.zst]`, `<name>.00002...`.
+    Compressed output starts a new segment every time a writer opens:
+    appending to a compressed stream that a crash left unfinished would
+    make the whole file unreadable.
+    """
+
+    def __init__(self, directory: str, name: str, buffer_size: int = 65536,
+                 flush_interval: float = 5.0, fsync: bool = False,
+                 rotate_bytes: int = 0, rotate_seconds: float = 0,
+                 compression: Optional[str] = None, compression_level: Optional[int] = None):
+        """
+        Initialize writer.
+
+        Args:
+            directory: Output directory
+            name: Base file name (e.g., language code)
+            buffer_size: Bytes buffered before writing to disk
+            flush_interval: Maximum seconds data stays buffered (0 = only when full)
+            fsync: fsync after every flush
+            rotate_bytes: Start a new segment after this many uncompressed bytes (0 = never)
+            rotate_seconds: Start a new segment after this many seconds (0 = never)
+            compression: None, 'gzip' or 'zstd'
+            compression_level: Compression level (None = library default)
+        """
+        if compression not in COMPRESSION_EXTENSIONS:
+            raise ValueError(f"Unknown compression: {compression}")
+
+        self.directory = Path(directory)
+        self.name = name
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.rotate_bytes = rotate_bytes
+        self.rotate_seconds = rotate_seconds
+        self.compression = compression
+        self.compression_level = compression_level
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        self.path = None
+        self.segment = 0
+        self.segment_bytes = 0
+        self.segment_opened_at = 0.0
+        self.last_flush = time.monotonic()
+        self.lines_written = 0
+        self.bytes_written = 0
+
+        self._buffer = []
+        self._buffered_bytes = 0
+        self._raw = None
+        self._stream = None
+        self._lock = threading.Lock()
+
+        if self.segmented:
+            self.segment = self._last_segment() + 1
+
+        self._open()
+
+    @property
+    def rotating(self) -> bool:
+        """Whether segments are rotated by size or age."""
+        return bool(self.rotate_bytes or self.rotate_seconds)
+
+    @property
+    def segmented(self) -> bool:
+        """Whether output is split into numbered segments."""
+        return self.rotating or self.compression is not None
+
+    def write(self, line):
+        """
+        Buffer one JSON line.
+
+        Args:
+            line: Serialized record (str or UTF-8 bytes), with or without trailing newline
+        """
+        data = line.encode('utf-8') if isinstance(line, str) else line
+        if not data.endswith(b'\n'):
+            data += b'\n'
+
+        with self._lock:
+            if self._should_rotate():
+                self._rotate()
+
+            self._buffer.append(data)
+            self._buffered_bytes += len(data)
+            self.segment_bytes += len(data)
+            self.lines_written += 1
+
+            if self._buffered_bytes >= self.buffer_size or self._flush_due():
+                self._flush()
+
+    def flush(self):
+        """Write buffered lines to disk."""
+        with self._lock:
+            self._flush()
+
+    def maybe_flush(self):
+        """Flush if flush_interval has elapsed (for periodic calls)."""
+        with self._lock:
+            if self._buffer and self._flush_due():
+                self._flush()
+
+    def close(self):
+        """Flush remaining lines and close the file."""
+        with self._lock:
+            self._flush()
+            self._close_file()
+
+    def _flush_due(self) -> bool:
+        return bool(self.flush_interval) and time.monotonic() - self.last_flush >= self.flush_interval
+
+    def _should_rotate(self) -> bool:
+        if self.rotate_bytes and self.segment_bytes >= self.rotate_bytes:
+            return True
+        if self.rotate_seconds and time.time() - self.segment_opened_at >= self.rotate_seconds:
+            return True
+        return False
+
+    def _flush(self):
+        if self._buffer:
+            data = b''.join(self._buffer)
+            self._buffer = []
+            self._buffered_bytes = 0
+
+            self._stream.write(data)
+            self.bytes_written += len(data)
+
+            if self.compression == 'gzip':
+                self._stream.flush(zlib.Z_SYNC_FLUSH)
+            elif self.compression == 'zstd':
+                import zstandard
+                self._stream.flush(zstandard.FLUSH_BLOCK)
+
+            self._raw.flush()
+            if self.fsync:
+                os.fsync(self._raw.fileno())
+
+        self.last_flush = time.monotonic()
+
+    def _rotate(self):
+        self._flush()
+        self._close_file()
+        self.segment += 1
+        self._open()
+        logger.info(f"Rotated JSON Lines output to {self.path}")
+
+    def _segment_path(self, segment: int) -> Path:
+        extension = COMPRESSION_EXTENSIONS[self.compression]
+        if self.segmented:
+            return self.directory / f"{self.name}.{segment:05d}.jsonl{extension}"
+        return self.directory / f"{self.name}.jsonl{extension}"
+
+    def _last_segment(self) -> int:
+        pattern = re.compile(rf'^{re.escape(self.name)}\.(\d+)\.jsonl')
+        segments = [
+            int(match.group(1))
+            for match in (pattern.match(p.name) for p in self.directory.iterdir())
+            if match
+        ]
+        return max(segments, default=0)
+
+    def _open(self):
+        self.path = self._segment_path(self.segment)
+        self.segment_bytes = 0
+        self.segment_opened_at = time.time()
+
+        if self.compression is None:
+            _truncate_torn_line(self.path)
+
+        self._raw = open(self.path, 'ab')
+
+        if self.compression == 'gzip':
+            level = 6 if self.compression_level is None else self.compression_level
+            self._stream = gzip.GzipFile(fileobj=self._raw, mode='ab', compresslevel=level)
+        elif self.compression == 'zstd':
+            try:
+                import zstandard
+            except ImportError:
+                logger.error("zstandard not installed. Run: pip install zstandard")
+                raise
+            level = 3 if self.compression_level is None else self.compression_level
+            self._stream = zstandard.ZstdCompressor(level=level).stream_writer(self._raw, closefd=False)
+        else:
+            self._stream = self._raw
+
+    def _close_file(self):
+        if self._stream is not None and self._stream is not self._raw:
+            self._stream.close()
+        if self._raw is not None:
+            if self.fsync:
+                self._raw.flush()
+                os.fsync(self._raw.fileno())
+            self._raw.close()
+        self._stream = None
+        self._raw = None
+
+
+def _truncate_torn_line(path: Path):
+    """Remove a partial last line left by a crash in an uncompressed file."""
+    if not path.exists():
+        return
+
+    with open(path, 'rb+') as f:
+        size = f.seek(0, os.SEEK_END)
+        if size == 0:
+            return
+
+        # Scan backwards for the last newline
+        position = size
+        chunk_size = 65536
+        while position > 0:
+            start = max(position - chunk_size, 0)
+            f.seek(start)
+            chunk = f.read(position - start)
+            index = chunk.rfind(b'\n')
+            if index != -1:
+                end = start + index + 1
+                break
+            position = start
+        else:
+            end = 0
+
+        if end < size:
+            f.truncate(end)
+            logger.warning(f"Truncated {size - end} bytes of partial line from {path}")
+
+
+class _UnfinishedGzipReader(io.RawIOBase):
+    """
+    Binary reader of a gzip file that ends at the last flushed block when the
+    file is unfinished (a crashed writer) instead of raising EOFError.
+    Files of several gzip members are read member after member.
+    """
+
+    CHUNK_SIZE = 65536
+
+    def __init__(self, path: str):
+        self.path = path
+        self._raw = open(path, 'rb')
+        self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        self._pending = b''
+        self._started = False
+        self._stopped = False
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._pending:
+            if self._stopped:
+                return 0
+            if self._decompressor.eof:
+                data = self._decompressor.unused_data or self._raw.read(self.CHUNK_SIZE)
+                if not data:
+                    return 0
+                self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            else:
+                data = self._decompressor.unconsumed_tail or self._raw.read(self.CHUNK_SIZE)
+                if not data:
+                    if self._started:
+                        logger.warning(f"{self.path} is unfinished (crashed writer), read up to its last flush")
+                    return 0
+
+            self._started = True
+            decompressor = self._decompressor.copy()
+            try:
+                self._pending = self._decompressor.decompress(data, 16 * self.CHUNK_SIZE)
+            except zlib.error as e:
+                # Keep what precedes the corrupt data (e.g. a member appended after a crash)
+                logger.warning(f"Stopped reading {self.path} at corrupt data: {e}")
+                self._pending = self._salvage(decompressor, data)
+                self._stopped = True
+                if not self._pending:
+                    return 0
+
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+    @staticmethod
+    def _salvage(decompressor, data: bytes) -> bytes:
+        """Output of data up to the first byte the decompressor rejects."""
+        output = []
+        for i in range(len(data)):
+            try:
+                output.append(decompressor.decompress(data[i:i + 1]))
+            except zlib.error:
+                break
+        return b''.join(output)
+
+    def close(self):
+        if not self.closed:
+            self._raw.close()
+        super().close()
+
+
+def find_jsonl_files(directory: str, name: str) -> List[Path]:
+    """
+    Find all JSON Lines files written for a name (plain file and segments).
+
+    Args:
+        directory: Output directory
+        name: Base file name (e.g., language code)
+
+    Returns:
+        list: Paths sorted by segment (the unnumbered file first)
+    """
+    directory = Path(directory)
+    if not directory.exists():
+        return []
+
+    pattern = re.compile(rf'^{re.escape(name)}(?:\.(\d+))?\.jsonl(\.gz|\.zst)?$')
+    matches = ((pattern.match(p.name), p) for p in directory.iterdir())
+    return [
+        p for _, _, p in sorted(
+            (int(match.group(1) or 0), p.name, p) for match, p in matches if match
+        )
+    ]
+
+
+def open_jsonl(path):
+    """
+    Open a (possibly compressed) JSON Lines file for reading as text.
+    Lines of a compressed file left unfinished by a crash are read up to
+    its last flush.
+
+    Args:
+        path: File path ending in .jsonl, .jsonl.gz or .jsonl.zst
+
+    Returns:
+        Text file object
+    """
+    path = str(path)
+
+    if path.endswith('.gz'):
+        return io.TextIOWrapper(io.BufferedReader(_UnfinishedGzipReader(path)), encoding='utf-8')
+
+    if path.endswith('.zst'):
+        import zstandard
+        raw = open(path, 'rb')
+        reader = zstandard.ZstdDecompressor().stream_reader(raw, read_across_frames=True, closefd=True)
+        return io.TextIOWrapper(reader, encoding='utf-8')
+
+    return open(path, 'r', encoding='utf-8')
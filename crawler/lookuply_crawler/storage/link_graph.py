@@ -0,0 +1,438 @@
+"""
+Link Graph Module
+Append-only binary link graph: URL dictionary plus per-language edge lists.
+"""
+
+import os
+import sys
+import struct
+import logging
+import threading
+from array import array
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows: appends are not locked
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Edge: source URL ID, target URL ID
+EDGE_RECORD = struct.Struct('<II')
+
+# URL fingerprint: first 8 bytes of the URL hash
+FINGERPRINT_RECORD = struct.Struct('<Q')
+
+
+class LinkGraphWriter:
+    """
+    Store deduplicated links as pairs of integer URL IDs.
+
+    Layout:
+
+        <directory>/urls.txt             - one URL per line, line number = URL ID
+        <directory>/urls.fp              - uint64 fingerprint per URL ID
+        <directory>/<lang>/edges.bin     - (source ID, target ID) uint32 pairs
+        <directory>/<lang>/anchors.txt   - anchor text per edge, same order
+
+    URL IDs are shared by all languages; edges are partitioned by the
+    language of the source page. Each edge is stored once, with the anchor
+    text it was first seen with; self-links are skipped. The URL dictionary
+    and edge sets are kept in memory for deduplication.
+
+    Several crawler processes can share a directory: new URL IDs are
+    assigned, and buffered edges written, under a file lock after reading
+    what other processes appended (see _AppendFiles), so all processes
+    agree on URL IDs and edges stay deduplicated.
+
+    All files are append-only; files left out of step by a crash are cut
+    back to their common length.
+
+    Read back with read_urls() and iter_edges(), or e.g.
+    `numpy.fromfile('<lang>/edges.bin', dtype='<u4').reshape(-1, 2)`.
+    """
+
+    def __init__(self, directory: str, buffer_size: int = 65536):
+        """
+        Open (or create) link graph.
+
+        Args:
+            directory: Graph directory
+            buffer_size: Bytes of edges and anchors buffered per language before writing
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.buffer_size = buffer_size
+
+        self.urls_added = 0
+        self.edges_added = 0
+        self.duplicate_edges = 0
+
+        self._lock = threading.Lock()
+        self._url_ids = {}
+        self._partitions = {}
+
+        self._urls = _AppendFiles(self.directory / 'urls.txt', self.directory / 'urls.fp', FINGERPRINT_RECORD.size)
+        with self._urls.locked() as (first_id, data):
+            self._add_url_ids(first_id, data)
+
+    @property
+    def url_count(self) -> int:
+        """Number of URLs in the dictionary."""
+        return self._urls.count
+
+    def add_links(self, source_url: str, links, language_code: str) -> int:
+        """
+        Add a page's outgoing links.
+
+        Args:
+            source_url: Page URL
+            links: Iterable of (target URL, anchor text)
+            language_code: Language of the source page
+
+        Returns:
+            int: Number of new edges
+        """
+        links = list(links)
+
+        with self._lock:
+            partition = self._partition(language_code)
+            source_id, *target_ids = self._get_url_ids([source_url] + [target_url for target_url, _ in links])
+            added = 0
+
+            for (_, anchor_text), target_id in zip(links, target_ids):
+                if target_id == source_id:
+                    continue
+
+                if partition.add(source_id, target_id, anchor_text):
+                    added += 1
+                else:
+                    self.duplicate_edges += 1
+
+            self.edges_added += added
+            if partition.buffered >= self.buffer_size:
+                self._flush()
+            return added
+
+    def flush(self):
+        """Write buffered edges to disk."""
+        with self._lock:
+            self._flush()
+
+    def close(self):
+        """Flush and close all files."""
+        with self._lock:
+            self._flush()
+            for partition in self._partitions.values():
+                partition.close()
+            self._partitions = {}
+            self._urls.close()
+
+    def _get_url_ids(self, urls):
+        from ..utils import get_url_hash
+
+        fingerprints = [int(get_url_hash(url)[:16], 16) for url in urls]
+
+        if any(fingerprint not in self._url_ids for fingerprint in fingerprints):
+            with self._urls.locked() as (first_id, data):
+                # Other processes may have added some of the URLs meanwhile
+                self._add_url_ids(first_id, data)
+                new_urls = {}
+                for url, fingerprint in zip(urls, fingerprints):
+                    if fingerprint not in self._url_ids:
+                        new_urls.setdefault(fingerprint, url)
+
+                if new_urls:
+                    first_id = self._urls.count
+                    self._urls.append(
+                        b''.join(_single_line(url).encode('utf-8') + b'\n' for url in new_urls.values()),
+                        b''.join(FINGERPRINT_RECORD.pack(fingerprint) for fingerprint in new_urls),
+                        len(new_urls),
+                    )
+                    self._url_ids.update(zip(new_urls, range(first_id, first_id + len(new_urls))))
+                    self.urls_added += len(new_urls)
+
+        return [self._url_ids[fingerprint] for fingerprint in fingerprints]
+
+    def _add_url_ids(self, first_id, data):
+        fingerprints = array('Q')
+        fingerprints.frombytes(data)
+        if sys.byteorder == 'big':
+            fingerprints.byteswap()
+        self._url_ids.update(zip(fingerprints, range(first_id, first_id + len(fingerprints))))
+
+    def _partition(self, language_code):
+        partition = self._partitions.get(language_code)
+        if partition is None:
+            partition = _Partition(self.directory / language_code)
+            self._partitions[language_code] = partition
+        return partition
+
+    def _flush(self):
+        for partition in self._partitions.values():
+            # Edges another process stored since they were buffered
+            dropped = partition.flush()
+            self.edges_added -= dropped
+            self.duplicate_edges += dropped
+
+
+class _Partition:
+    """Edge and anchor files of one language, with the edge set for deduplication."""
+
+    def __init__(self, directory):
+        directory.mkdir(parents=True, exist_ok=True)
+
+        self.edges = set()
+        self.pending = {}
+        self.buffered = 0
+
+        self.files = _AppendFiles(directory / 'anchors.txt', directory / 'edges.bin', EDGE_RECORD.size)
+        with self.files.locked() as (_, data):
+            self.edges.update(source_id << 32 | target_id for source_id, target_id in _edge_pairs(data))
+
+    def add(self, source_id, target_id, anchor_text):
+        """
+        Buffer an edge.
+
+        Returns:
+            bool: False if the edge is already stored or buffered
+        """
+        key = source_id << 32 | target_id
+        if key in self.edges or key in self.pending:
+            return False
+
+        anchor = _single_line(anchor_text).encode('utf-8') + b'\n'
+        self.pending[key] = anchor
+        self.buffered += len(anchor) + EDGE_RECORD.size
+        return True
+
+    def flush(self):
+        """
+        Write buffered edges, except those another process stored meanwhile.
+
+        Returns:
+            int: Number of buffered edges dropped as duplicates
+        """
+        if not self.pending:
+            return 0
+
+        with self.files.locked() as (_, data):
+            self.edges.update(source_id << 32 | target_id for source_id, target_id in _edge_pairs(data))
+            keys = [key for key in self.pending if key not in self.edges]
+            self.files.append(
+                b''.join(self.pending[key] for key in keys),
+                b''.join(EDGE_RECORD.pack(key >> 32, key & 0xFFFFFFFF) for key in keys),
+                len(keys),
+            )
+
+        self.edges.update(keys)
+        dropped = len(self.pending) - len(keys)
+        self.pending = {}
+        self.buffered = 0
+        return dropped
+
+    def close(self):
+        self.flush()
+        self.files.close()
+
+
+class _AppendFiles:
+    """
+    A file of lines and a parallel file of fixed-size records, appended together.
+
+    Several processes may append to the same files. Appends take an
+    exclusive lock on the record file and write both files unbuffered,
+    lines first, before releasing it, so the files are in step whenever
+    the lock is free. Files left out of step by a crashed process are cut
+    back to their common length under the same lock.
+    """
+
+    def __init__(self, lines_path, records_path, record_size):
+        self.lines_path = lines_path
+        self.records_path = records_path
+        self.record_size = record_size
+
+        self.lines = open(lines_path, 'ab', buffering=0)
+        self.records = open(records_path, 'ab', buffering=0)
+        self.count = 0
+        self._lines_size = 0
+
+    @contextmanager
+    def locked(self):
+        """
+        Lock the files and catch up with records appended by other processes.
+
+        Yields:
+            tuple: (number of the first new record, new records as bytes)
+        """
+        if fcntl is None:
+            yield self._sync()
+            return
+        fcntl.flock(self.records.fileno(), fcntl.LOCK_EX)
+        try:
+            yield self._sync()
+        finally:
+            fcntl.flock(self.records.fileno(), fcntl.LOCK_UN)
+
+    def append(self, lines, records, count):
+        """Append count lines and their records (with the lock held)."""
+        _write_all(self.lines, lines)
+        _write_all(self.records, records)
+        self.count += count
+        self._lines_size += len(lines)
+
+    def close(self):
+        self.lines.close()
+        self.records.close()
+
+    def _sync(self):
+        lines_size = os.fstat(self.lines.fileno()).st_size
+        records_size = os.fstat(self.records.fileno()).st_size
+        if lines_size == self._lines_size and records_size == self.count * self.record_size:
+            return self.count, b''
+
+        # Complete appends of other processes only add whole records and lines
+        count = records_size // self.record_size
+        in_step = records_size % self.record_size == 0 and count >= self.count and lines_size >= self._lines_size
+        if in_step:
+            with open(self.lines_path, 'rb') as f:
+                f.seek(self._lines_size)
+                tail = f.read(lines_size - self._lines_size)
+            in_step = tail.count(b'\n') == count - self.count and tail.endswith(b'\n')
+
+        if not in_step:
+            count = _align_files((self.lines_path, None), (self.records_path, self.record_size))
+            lines_size = os.fstat(self.lines.fileno()).st_size
+
+        # Records we knew about were cut back: read them all again
+        first = self.count if count >= self.count else 0
+        with open(self.records_path, 'rb') as f:
+            f.seek(first * self.record_size)
+            data = f.read((count - first) * self.record_size)
+
+        self.count = count
+        self._lines_size = lines_size
+        return first, data
+
+
+def _write_all(f, data):
+    """Write all of data to an unbuffered file."""
+    view = memoryview(data)
+    while view:
+        view = view[f.write(view):]
+
+
+def _single_line(text):
+    return ' '.join((text or '').split())
+
+
+def _align_files(*files):
+    """
+    Cut parallel append-only files back to the records all of them contain.
+
+    Args:
+        *files: (path, record size) pairs; record size None = newline-terminated lines
+
+    Returns:
+        int: Number of complete records
+    """
+    counts = []
+    for path, record_size in files:
+        if not path.exists():
+            counts.append(0)
+        elif record_size is None:
+            with open(path, 'rb') as f:
+                counts.append(sum(1 for line in f if line.endswith(b'\n')))
+        else:
+            counts.append(path.stat().st_size // record_size)
+
+    count = min(counts)
+    for (path, record_size), found in zip(files, counts):
+        if not path.exists():
+            continue
+        if record_size is None:
+            size = 0
+            with open(path, 'rb') as f:
+                for _ in range(count):
+                    size += len(f.readline())
+        else:
+            size = count * record_size
+        if path.stat().st_size != size:
+            logger.warning(f"Truncating {path} from {found} to {count} complete records")
+            with open(path, 'rb+') as f:
+                f.truncate(size)
+
+    return count
+
+
+def iter_edge_pairs(path, count=None, chunk_records=65536):
+    """
+    Iterate over (source ID, target ID) pairs of an edges.bin file.
+
+    Args:
+        path: edges.bin path
+        count: Number of records to read (None = all)
+        chunk_records: Records read per chunk
+
+    Yields:
+        tuple: (source ID, target ID)
+    """
+    if not os.path.exists(path):
+        return
+
+    remaining = count if count is not None else os.path.getsize(path) // EDGE_RECORD.size
+    with open(path, 'rb') as f:
+        while remaining > 0:
+            records = min(chunk_records, remaining)
+            data = f.read(records * EDGE_RECORD.size)
+            if len(data) < EDGE_RECORD.size:
+                break
+            yield from _edge_pairs(data[:len(data) - len(data) % EDGE_RECORD.size])
+            remaining -= len(data) // EDGE_RECORD.size
+
+
+def _edge_pairs(data):
+    ids = array('I')
+    ids.frombytes(data)
+    if sys.byteorder == 'big':
+        ids.byteswap()
+    return zip(ids[0::2], ids[1::2])
+
+
+def read_urls(directory) -> list:
+    """
+    Load the URL dictionary of a link graph.
+
+    Args:
+        directory: Graph directory
+
+    Returns:
+        list: URLs indexed by URL ID
+    """
+    path = Path(directory) / 'urls.txt'
+    if not path.exists():
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        return [line.rstrip('\n') for line in f]
+
+
+def iter_edges(directory, language_code):
+    """
+    Iterate over the edges of one language with their anchor texts.
+
+    Args:
+        directory: Graph directory
+        language_code: Language code
+
+    Yields:
+        tuple: (source ID, target ID, anchor text)
+    """
+    lang_dir = Path(directory) / language_code
+    if not (lang_dir / 'anchors.txt').exists():
+        return
+
+    with open(lang_dir / 'anchors.txt', 'r', encoding='utf-8') as anchors:
+        for (source_id, target_id), anchor in zip(iter_edge_pairs(lang_dir / 'edges.bin'), anchors):
+            yield source_id, target_id, anchor.rstrip('\n')
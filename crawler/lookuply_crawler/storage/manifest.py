@@ -0,0 +1,230 @@
+"""
+Storage Manifest Module
+Incrementally maintained page counts and sizes for page storage.
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows: saves are not locked
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+class StorageManifest:
+    """
+    Per-language, per-day page counts and byte totals in a small JSON file.
+
+    Storages update it on every write and delete, so statistics never have
+    to walk the stored pages. The file is rewritten atomically at most every
+    save_interval seconds and on save(). If it is lost or drifts (e.g. after
+    a crash), storages can recompute it from disk.
+
+    Several crawler processes can share one storage directory: each keeps
+    the changes it made since its last save, and save() merges them into
+    the file on disk under an exclusive lock (<manifest>.lock). A missing
+    manifest is created with create(), so only the first process counts
+    pages from disk.
+    """
+
+    def __init__(self, path, save_interval: float = 5.0):
+        """
+        Load (or create) manifest.
+
+        Args:
+            path: Manifest JSON file
+            save_interval: Minimum seconds between automatic saves
+        """
+        self.path = Path(path)
+        self.save_interval = save_interval
+        self.languages = {}
+        self.exists = False
+
+        # Changes since the last save, merged into the file by save()
+        self._deltas = {}
+        self._removed_days = set()
+        self._replaced = False
+
+        self._dirty = False
+        self._last_save = time.monotonic()
+        self._lock = threading.RLock()
+
+        if self.path.exists():
+            languages = self._read()
+            if languages is not None:
+                self.languages = languages
+                self.exists = True
+
+    def add(self, language_code: str, date_str: str, pages: int, size_bytes: int):
+        """
+        Count pages written (negative values count removals).
+
+        Args:
+            language_code: Language code
+            date_str: Storage day (YYYY-MM-DD)
+            pages: Number of pages
+            size_bytes: Bytes on disk
+        """
+        with self._lock:
+            for languages in (self.languages, self._deltas):
+                _add_day(languages, language_code, date_str, pages, size_bytes)
+            self._changed()
+
+    def remove_day(self, language_code: str, date_str: str):
+        """
+        Forget a deleted day.
+
+        Args:
+            language_code: Language code
+            date_str: Storage day (YYYY-MM-DD)
+        """
+        with self._lock:
+            self._deltas.get(language_code, {}).pop(date_str, None)
+            self._removed_days.add((language_code, date_str))
+            self.languages.get(language_code, {}).pop(date_str, None)
+            self._changed()
+
+    def replace(self, languages: dict):
+        """
+        Replace all counters (after recomputing them from disk) and save.
+
+        Args:
+            languages: {language_code: {date_str: {'pages': n, 'size_bytes': n}}}
+        """
+        with self._lock:
+            self.languages = languages
+            self._deltas = {}
+            self._removed_days = set()
+            self._replaced = True
+            self._changed()
+        self.save()
+
+    def create(self, count):
+        """
+        Write the manifest with counters from disk, unless another process already has.
+
+        Storages call this when they open, before writing pages, and count
+        under the lock: the count cannot include pages that another process
+        wrote but has not merged into the manifest yet.
+
+        Args:
+            count: Function returning counters recomputed from disk
+                (must not save this manifest)
+        """
+        with self._lock:
+            try:
+                with self._file_lock():
+                    languages = self._read() if self.path.exists() else None
+                    if languages is None:
+                        languages = count()
+                        self._write(languages)
+
+                self.languages = languages
+                self.exists = True
+            except Exception as e:
+                logger.error(f"Failed to create storage manifest {self.path}: {e}")
+
+    def get_stats(self) -> dict:
+        """
+        Get storage statistics.
+
+        Returns:
+            dict: Totals, plus per-language totals with per-day breakdown
+        """
+        stats = {
+            'total_pages': 0,
+            'by_language': {},
+            'total_size_bytes': 0,
+        }
+
+        with self._lock:
+            for language_code, days in self.languages.items():
+                pages = sum(day['pages'] for day in days.values())
+                size_bytes = sum(day['size_bytes'] for day in days.values())
+                stats['by_language'][language_code] = {
+                    'pages': pages,
+                    'size_bytes': size_bytes,
+                    'days': {date_str: dict(day) for date_str, day in days.items()},
+                }
+                stats['total_pages'] += pages
+                stats['total_size_bytes'] += size_bytes
+
+        return stats
+
+    def save(self):
+        """Merge changes into the manifest on disk if anything changed."""
+        with self._lock:
+            if not self._dirty:
+                return
+
+            try:
+                with self._file_lock():
+                    languages = self._merge()
+                    self._write(languages)
+
+                self.languages = languages
+                self._deltas = {}
+                self._removed_days = set()
+                self._replaced = False
+                self.exists = True
+                self._dirty = False
+            except Exception as e:
+                logger.error(f"Failed to save storage manifest {self.path}: {e}")
+
+            self._last_save = time.monotonic()
+
+    def _merge(self) -> dict:
+        """Counters on disk (written by any process) with this process's changes applied."""
+        if self._replaced or not self.path.exists():
+            return self.languages
+
+        languages = self._read()
+        if languages is None:
+            return self.languages
+
+        for language_code, date_str in self._removed_days:
+            languages.get(language_code, {}).pop(date_str, None)
+        for language_code, days in self._deltas.items():
+            for date_str, day in days.items():
+                _add_day(languages, language_code, date_str, day['pages'], day['size_bytes'])
+        return languages
+
+    @contextmanager
+    def _file_lock(self):
+        with open(f"{self.path}.lock", 'a') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            yield
+
+    def _write(self, languages):
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'languages': languages, 'updated_at': time.time()}, f)
+        os.replace(tmp_path, self.path)
+
+    def _read(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f).get('languages', {})
+        except Exception as e:
+            logger.error(f"Failed to load storage manifest {self.path}: {e}")
+            return None
+
+    def _changed(self):
+        self._dirty = True
+        if time.monotonic() - self._last_save >= self.save_interval:
+            self.save()
+
+
+def _add_day(languages: dict, language_code: str, date_str: str, pages: int, size_bytes: int):
+    day = languages.setdefault(language_code, {}).setdefault(date_str, {'pages': 0, 'size_bytes': 0})
+    day['pages'] += pages
+    day['size_bytes'] += size_bytes
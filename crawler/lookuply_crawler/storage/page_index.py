@@ -0,0 +1,240 @@
+"""
+Page Index Module
+Persistent URL hash -> storage location index for page lookups.
+"""
+
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    url_hash BLOB NOT NULL,
+    language_code TEXT NOT NULL,
+    location TEXT NOT NULL,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    PRIMARY KEY (url_hash, language_code)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS pages_location ON pages (location);
+CREATE TABLE IF NOT EXISTS segments (
+    location TEXT PRIMARY KEY,
+    entries INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class PageIndex:
+    """
+    SQLite index mapping URL hashes to where a page is stored.
+
+    A location is a path relative to the storage directory, plus an offset
+    and length for pages stored inside segment files. The newest save of a
+    URL (per language) wins. The index is a cache of what is on disk:
+    storages can always rebuild it.
+
+    Added entries and segment counts are buffered and written in batches,
+    every commit_every additions, before reads and on commit(). Every write
+    is its own short transaction, so crawlers sharing a storage directory
+    only wait (up to timeout) for each other's batches. Buffered changes
+    that fail to be written are kept and retried on the next write.
+    """
+
+    def __init__(self, path, commit_every: int = 1000, timeout: float = 30.0):
+        """
+        Open (or create) index.
+
+        Args:
+            path: SQLite database file
+            commit_every: Write after this many buffered additions
+            timeout: Seconds to wait for another process's write to finish
+        """
+        self.path = Path(path)
+        self.commit_every = commit_every
+        self._rows = []
+        self._segments = {}
+        self._lock = threading.Lock()
+
+        self.conn = sqlite3.connect(str(self.path), timeout=timeout, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+
+    def add(self, entries: Iterable[Tuple[str, str, str, int, int]]):
+        """
+        Add or replace page locations.
+
+        Args:
+            entries: (url_hash hex, language_code, location, offset, length) tuples
+        """
+        rows = [(bytes.fromhex(h), lang, loc, off, length) for h, lang, loc, off, length in entries]
+        with self._lock:
+            self._rows.extend(rows)
+            if len(self._rows) >= self.commit_every:
+                self._write()
+
+    def get(self, url_hash: str, language_code: Optional[str] = None) -> Optional[Tuple[str, str, int, int]]:
+        """
+        Look up a page location.
+
+        Args:
+            url_hash: URL hash
+            language_code: Restrict to a language (None = any)
+
+        Returns:
+            tuple: (language_code, location, offset, length) or None
+        """
+        found = self.get_many([url_hash], language_code)
+        return found.get(url_hash)
+
+    def get_many(self, url_hashes: List[str],
+                 language_code: Optional[str] = None) -> Dict[str, Tuple[str, str, int, int]]:
+        """
+        Look up many page locations at once.
+
+        Args:
+            url_hashes: URL hashes
+            language_code: Restrict to a language (None = any)
+
+        Returns:
+            dict: url_hash -> (language_code, location, offset, length) for found pages
+        """
+        found = {}
+        keys = [bytes.fromhex(h) for h in url_hashes]
+
+        with self._lock:
+            self._write()
+            # Stay well below SQLite's bound parameter limit
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                query = (
+                    'SELECT url_hash, language_code, location, offset, length FROM pages '
+                    f'WHERE url_hash IN ({",".join("?" * len(chunk))})'
+                )
+                params = list(chunk)
+                if language_code is not None:
+                    query += ' AND language_code = ?'
+                    params.append(language_code)
+
+                for key, lang, location, offset, length in self.conn.execute(query, params):
+                    found[key.hex()] = (lang, location, offset, length)
+
+        return found
+
+    def remove_location(self, location: str):
+        """
+        Remove all pages stored at a location.
+
+        Args:
+            location: Location (segment or file path)
+        """
+        self._execute(
+            ('DELETE FROM pages WHERE location = ?', (location,)),
+            ('DELETE FROM segments WHERE location = ?', (location,)),
+        )
+
+    def remove_prefix(self, prefix: str):
+        """
+        Remove all pages stored under a location prefix (e.g., a directory).
+
+        Args:
+            prefix: Location prefix
+        """
+        # Range query so the location index is used
+        bounds = (prefix, prefix + '\uffff')
+        self._execute(
+            ('DELETE FROM pages WHERE location >= ? AND location < ?', bounds),
+            ('DELETE FROM segments WHERE location >= ? AND location < ?', bounds),
+        )
+
+    def segment_entries(self) -> Dict[str, int]:
+        """
+        Get the number of indexed entries per segment.
+
+        Returns:
+            dict: Segment location -> entries indexed
+        """
+        with self._lock:
+            self._write()
+            return dict(self.conn.execute('SELECT location, entries FROM segments'))
+
+    def set_segment_entries(self, location: str, entries: int):
+        """
+        Record how many entries of a segment are indexed.
+
+        Written together with the buffered page locations.
+
+        Args:
+            location: Segment location
+            entries: Number of indexed entries
+        """
+        with self._lock:
+            self._segments[location] = entries
+
+    def get_meta(self, key: str, default=None):
+        """Get a metadata value."""
+        with self._lock:
+            row = self.conn.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, key: str, value):
+        """Set a metadata value."""
+        self._execute(('INSERT OR REPLACE INTO meta VALUES (?, ?)', (key, str(value))))
+
+    def count(self) -> int:
+        """Number of indexed pages."""
+        with self._lock:
+            self._write()
+            return self.conn.execute('SELECT COUNT(*) FROM pages').fetchone()[0]
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._rows = []
+            self._segments = {}
+        self._execute(
+            ('DELETE FROM pages', ()),
+            ('DELETE FROM segments', ()),
+            ('DELETE FROM meta', ()),
+        )
+
+    def commit(self):
+        """Write buffered changes."""
+        with self._lock:
+            self._write()
+
+    def close(self):
+        """Commit and close the database."""
+        self.commit()
+        self.conn.close()
+
+    def _execute(self, *statements):
+        """Write buffered changes, then run statements, in one transaction."""
+        with self._lock:
+            self._write(statements)
+
+    def _write(self, statements=()):
+        if not self._rows and not self._segments and not statements:
+            return
+
+        # The connection context manager commits, or rolls back on error
+        # (buffers are then kept for the next write)
+        with self.conn:
+            if self._rows:
+                self.conn.executemany('INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?)', self._rows)
+            if self._segments:
+                self.conn.executemany('INSERT OR REPLACE INTO segments VALUES (?, ?)', self._segments.items())
+            for sql, params in statements:
+                self.conn.execute(sql, params)
+
+        self._rows = []
+        self._segments = {}
@@ -0,0 +1,245 @@
+"""
+Parquet Writer Module
+Columnar Parquet output for crawled pages, partitioned by language and date.
+"""
+
+import logging
+import threading
+from datetime import datetime
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Low-cardinality columns stored with dictionary encoding
+DICTIONARY_COLUMNS = ['domain', 'language_code', 'language_name', 'content_type', 'encoding']
+
+
+def page_schema():
+    """
+    Get the Arrow schema for WebPageItem records.
+
+    Returns:
+        pyarrow.Schema
+    """
+    import pyarrow as pa
+
+    dictionary = pa.dictionary(pa.int32(), pa.string())
+    string_map = pa.map_(pa.string(), pa.string())
+
+    return pa.schema([
+        ('url', pa.string()),
+        ('domain', dictionary),
+        ('canonical_url', pa.string()),
+        ('title', pa.string()),
+        ('description', pa.string()),
+        ('text', pa.string()),
+        ('text_length', pa.int64()),
+        ('paragraphs', pa.list_(pa.string())),
+        ('headings', pa.list_(pa.struct([('level', pa.int8()), ('text', pa.string())]))),
+        ('paragraph_spans', pa.list_(pa.list_(pa.int32()))),
+        ('heading_spans', pa.list_(pa.list_(pa.int32()))),
+        ('simhash', pa.string()),
+        ('near_duplicate_of', pa.string()),
+        ('language_code', dictionary),
+        ('language_confidence', pa.float64()),
+        ('language_name', dictionary),
+        ('keywords', pa.list_(pa.string())),
+        ('author', pa.string()),
+        ('published_date', pa.string()),
+        ('modified_date', pa.string()),
+        ('og_metadata', string_map),
+        ('twitter_metadata', string_map),
+        ('links', pa.list_(pa.struct([
+            ('url', pa.string()), ('text', pa.string()), ('domain', pa.string()), ('internal', pa.bool_()),
+        ]))),
+        ('internal_links_count', pa.int32()),
+        ('external_links_count', pa.int32()),
+        ('status_code', pa.int16()),
+        ('content_type', dictionary),
+        ('encoding', dictionary),
+        ('favicon', pa.string()),
+        ('crawled_at', pa.string()),
+        ('crawl_depth', pa.int16()),
+        ('referrer', pa.string()),
+        ('is_valid', pa.bool_()),
+        ('is_eu_language', pa.bool_()),
+        ('parse_degraded', dictionary),
+    ])
+
+
+class ParquetDatasetWriter:
+    """
+    Write page records into a Hive-partitioned Parquet dataset.
+
+    Layout: <directory>/language_code=<lang>/crawl_date=<YYYY-MM-DD>/part-<NNNNN>.parquet
+
+    Records are buffered per partition and written as one row group every
+    row_group_size records. A file is finished (footer written) after
+    rows_per_file records, when its day ends and on close(); only finished
+    files are readable, so rows_per_file bounds what a crash can lose.
+
+    Records that do not fit the schema are dropped and counted in
+    records_dropped; the rest of their row group is written.
+
+    Read back with e.g. `pyarrow.parquet.read_table(directory, columns=[...])`.
+    """
+
+    def __init__(self, directory: str, row_group_size: int = 1000,
+                 rows_per_file: int = 100000, compression: str = 'zstd'):
+        """
+        Initialize writer.
+
+        Args:
+            directory: Dataset root directory
+            row_group_size: Records per row group
+            rows_per_file: Records per file before starting a new one
+            compression: Parquet compression codec (e.g., 'zstd', 'snappy', 'none')
+        """
+        try:
+            import pyarrow  # noqa: F401
+            import pyarrow.parquet  # noqa: F401
+        except ImportError:
+            logger.error("pyarrow not installed. Run: pip install pyarrow")
+            raise
+
+        self.directory = Path(directory)
+        self.row_group_size = row_group_size
+        self.rows_per_file = rows_per_file
+        self.compression = compression
+        self.schema = page_schema()
+
+        self.rows_written = 0
+        self.records_dropped = 0
+        self._partitions = {}
+        self._lock = threading.Lock()
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def write(self, record: dict):
+        """
+        Buffer one page record.
+
+        Args:
+            record: WebPageItem fields
+        """
+        language_code = record.get('language_code') or 'unknown'
+        crawl_date = (record.get('crawled_at') or datetime.utcnow().isoformat())[:10]
+
+        with self._lock:
+            partition = self._partitions.get(language_code)
+
+            # A new day finishes the previous day's file
+            if partition is not None and partition.crawl_date != crawl_date:
+                partition.close()
+                partition = None
+
+            if partition is None:
+                partition = _Partition(self, language_code, crawl_date)
+                self._partitions[language_code] = partition
+
+            partition.rows.append(record)
+            if len(partition.rows) >= self.row_group_size:
+                partition.write_row_group()
+
+    def flush(self):
+        """Write buffered records as row groups (files stay open)."""
+        with self._lock:
+            for partition in self._partitions.values():
+                partition.write_row_group()
+
+    def close(self):
+        """Write buffered records and finish all files."""
+        with self._lock:
+            for partition in self._partitions.values():
+                partition.close()
+            self._partitions = {}
+
+
+class _Partition:
+    """Open Parquet file and buffered rows for one language and day."""
+
+    def __init__(self, writer, language_code, crawl_date):
+        self.writer = writer
+        self.crawl_date = crawl_date
+        self.directory = writer.directory / f"language_code={language_code}" / f"crawl_date={crawl_date}"
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        self.rows = []
+        self.file = None
+        self.file_rows = 0
+
+    def write_row_group(self):
+        if not self.rows:
+            return
+
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        rows, self.rows = self.rows, []
+        try:
+            table = pa.Table.from_pylist([_normalize(row) for row in rows], schema=self.writer.schema)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            # Find the offending records: convert one at a time
+            table = self._convert_each(rows)
+            if table is None:
+                return
+
+        if self.file is None:
+            path = self._next_path()
+            self.file = pq.ParquetWriter(
+                str(path), self.writer.schema,
+                compression=self.writer.compression,
+                use_dictionary=DICTIONARY_COLUMNS,
+            )
+            logger.debug(f"Opened Parquet file {path}")
+
+        self.file.write_table(table, row_group_size=table.num_rows)
+        self.file_rows += table.num_rows
+        self.writer.rows_written += table.num_rows
+
+        if self.file_rows >= self.writer.rows_per_file:
+            self._finish_file()
+
+    def close(self):
+        self.write_row_group()
+        self._finish_file()
+
+    def _convert_each(self, rows):
+        """Convert rows one by one, dropping those that fail; None if all do."""
+        import pyarrow as pa
+
+        tables = []
+        for row in rows:
+            try:
+                tables.append(pa.Table.from_pylist([_normalize(row)], schema=self.writer.schema))
+            except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+                self.writer.records_dropped += 1
+                logger.error(f"Dropped record {row.get('url')} that does not fit the Parquet schema: {e}")
+
+        return pa.concat_tables(tables) if tables else None
+
+    def _finish_file(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+            self.file_rows = 0
+
+    def _next_path(self):
+        numbers = [int(p.stem.split('-')[1]) for p in self.directory.glob('part-*.parquet')]
+        return self.directory / f"part-{max(numbers, default=0) + 1:05d}.parquet"
+
+
+def _normalize(record):
+    """Coerce loosely typed item fields to the schema's types."""
+    row = dict(record)
+
+    keywords = row.get('keywords')
+    if isinstance(keywords, str):
+        row['keywords'] = [k.strip() for k in keywords.split(',') if k.strip()]
+
+    for field in ('og_metadata', 'twitter_metadata'):
+        value = row.get(field)
+        if value:
+            row[field] = {str(k): str(v) for k, v in value.items()}
+
+    return row
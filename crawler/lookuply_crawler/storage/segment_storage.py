@@ -0,0 +1,706 @@
+"""
+Segment Storage Module
+Store crawled pages in large append-only segment files.
+"""
+
+import os
+import re
+import shutil
+import sqlite3
+import struct
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows: appends are not locked
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_PATTERN = re.compile(r'^(\d{4}-\d{2}-\d{2})\.(\d{5})\.jsonl$')
+
+# Index entry: SHA256 URL hash, record offset, record length
+INDEX_RECORD = struct.Struct('<32sQI')
+
+
+class SegmentStorage:
+    """
+    Local segment storage for crawled pages.
+
+    Pages are appended as compact JSON lines to segment files per language
+    and day, each with a fixed-size offset index:
+
+        <base_dir>/<lang>/<YYYY-MM-DD>.<NNNNN>.jsonl  - one page per line
+        <base_dir>/<lang>/<YYYY-MM-DD>.<NNNNN>.idx    - (url hash, offset, length)
+
+    A new segment is started when the day changes or the current one reaches
+    segment_bytes. Retention deletes whole segments, and since segments are
+    plain JSON Lines, export is a file copy. Same API as FileStorage.
+
+    Several crawler processes can share base_dir: appends to a segment are
+    serialized with a file lock and continue at the current end of the file,
+    and a segment left inconsistent by a crashed writer is recovered under
+    the same lock (see _Segment).
+
+    With index enabled, a PageIndex (<base_dir>/index.sqlite) maps URL hashes
+    to segment offsets for constant-time lookups. It is brought up to date
+    from the segment .idx files when storage is opened. Page counts and sizes
+    are kept in a StorageManifest (<base_dir>/manifest.json).
+    """
+
+    def __init__(self, base_dir='./data/pages', segment_bytes=256 * 1024 * 1024, fsync=False, index=True,
+                 serializer=None):
+        """
+        Initialize segment storage.
+
+        Args:
+            base_dir: Base directory for storage
+            segment_bytes: Start a new segment after this many bytes
+            fsync: fsync segment and index on flush
+            index: Maintain a page lookup index
+            serializer: Compact serializer from get_serializer() (default: fastest installed)
+        """
+        from ..serialization import get_serializer
+
+        self.base_dir = Path(base_dir)
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+        self.segment_bytes = segment_bytes
+        self.fsync = fsync
+        self.serializer = serializer or get_serializer()
+
+        self._segments = {}
+        self._lock = threading.RLock()
+
+        self.index = None
+        if index:
+            from .page_index import PageIndex
+            self.index = PageIndex(self.base_dir / 'index.sqlite')
+            self._sync_index()
+
+        from .manifest import StorageManifest
+        self.manifest = StorageManifest(self.base_dir / 'manifest.json')
+        if not self.manifest.exists:
+            self.manifest.create(self._count_pages)
+
+    def save_page(self, page_data, language_code):
+        """
+        Append page data to the current segment.
+
+        Args:
+            page_data: Dictionary containing page data
+            language_code: Language code (e.g., 'en', 'de')
+
+        Returns:
+            str: Path to segment file (None on failure)
+        """
+        segment, _ = self._append([page_data], language_code)
+        return str(segment.data_path) if segment else None
+
+    def save_batch(self, pages, language_code):
+        """
+        Append multiple pages with a single write.
+
+        Args:
+            pages: List of page data dictionaries
+            language_code: Language code
+
+        Returns:
+            int: Number of pages saved successfully
+        """
+        _, saved_count = self._append(pages, language_code)
+        return saved_count
+
+    def load_page(self, language_code, url_hash):
+        """
+        Load the most recently saved version of a page.
+
+        Args:
+            language_code: Language code
+            url_hash: URL hash
+
+        Returns:
+            dict: Page data or None if not found
+        """
+        try:
+            self.flush()
+
+            if self.index is not None:
+                found = self.index.get(url_hash, language_code)
+                if found is None:
+                    return None
+                _, location, offset, length = found
+                return _read_record(self.base_dir / location, offset, length, self.serializer.loads)
+
+            return self._scan_for_page(language_code, url_hash)
+
+        except Exception as e:
+            logger.error(f"Failed to load page {url_hash}: {e}")
+            return None
+
+    def load_pages(self, url_hashes, language_code=None):
+        """
+        Load many pages at once, reading each segment in offset order.
+
+        Args:
+            url_hashes: List of URL hashes
+            language_code: Restrict to a language (None = any)
+
+        Returns:
+            dict: url_hash -> page data for the pages found
+        """
+        pages = {}
+
+        try:
+            self.flush()
+
+            if self.index is None:
+                languages = [language_code] if language_code else self._languages()
+                for url_hash in url_hashes:
+                    for lang in languages:
+                        page = self._scan_for_page(lang, url_hash)
+                        if page is not None:
+                            pages[url_hash] = page
+                            break
+                return pages
+
+            by_location = {}
+            for url_hash, (_, location, offset, length) in self.index.get_many(url_hashes, language_code).items():
+                by_location.setdefault(location, []).append((offset, length, url_hash))
+
+            for location, records in by_location.items():
+                with open(self.base_dir / location, 'rb') as f:
+                    for offset, length, url_hash in sorted(records):
+                        f.seek(offset)
+                        pages[url_hash] = self.serializer.loads(f.read(length))
+
+        except Exception as e:
+            logger.error(f"Failed to load {len(url_hashes)} pages: {e}")
+
+        return pages
+
+    def rebuild_index(self):
+        """
+        Rebuild the page lookup index from the segment files.
+
+        Returns:
+            int: Number of indexed pages
+        """
+        if self.index is None:
+            return 0
+
+        with self._lock:
+            self.flush()
+            self.index.clear()
+            self._sync_index()
+
+        count = self.index.count()
+        logger.info(f"Rebuilt page index: {count} pages")
+        return count
+
+    def get_stats(self):
+        """
+        Get storage statistics from the manifest.
+
+        Returns:
+            dict: Statistics about stored pages
+        """
+        return self.manifest.get_stats()
+
+    def rebuild_stats(self):
+        """
+        Recompute the statistics manifest from the segment files.
+
+        Returns:
+            dict: Statistics about stored pages
+        """
+        try:
+            with self._lock:
+                self.flush()
+                self.manifest.replace(self._count_pages())
+
+        except Exception as e:
+            logger.error(f"Failed to rebuild storage stats: {e}")
+
+        return self.manifest.get_stats()
+
+    def cleanup_old_files(self, days=30):
+        """
+        Delete segments older than specified days.
+
+        Args:
+            days: Number of days to keep
+
+        Returns:
+            int: Number of pages deleted
+        """
+        cutoff_date = (datetime.utcnow() - timedelta(days=days)).strftime('%Y-%m-%d')
+        deleted_count = 0
+
+        try:
+            with self._lock:
+                for lang_dir in self.base_dir.iterdir():
+                    if not lang_dir.is_dir():
+                        continue
+
+                    for data_path in self._segment_paths(lang_dir.name):
+                        if SEGMENT_PATTERN.match(data_path.name).group(1) >= cutoff_date:
+                            continue
+
+                        segment = self._segments.get(lang_dir.name)
+                        if segment is not None and segment.data_path == data_path:
+                            self._segments.pop(lang_dir.name).close()
+
+                        if self.index is not None:
+                            self.index.remove_location(self._location(data_path))
+                        self.manifest.remove_day(lang_dir.name, SEGMENT_PATTERN.match(data_path.name).group(1))
+
+                        index_path = data_path.with_suffix('.idx')
+                        if index_path.exists():
+                            deleted_count += index_path.stat().st_size // INDEX_RECORD.size
+                            index_path.unlink()
+                        data_path.unlink()
+                        logger.info(f"Deleted old segment: {data_path}")
+
+        except Exception as e:
+            logger.error(f"Failed to cleanup old files: {e}")
+
+        return deleted_count
+
+    def export_to_jsonl(self, language_code, output_file):
+        """
+        Export all pages for a language to JSON Lines format.
+
+        Args:
+            language_code: Language code
+            output_file: Output file path
+
+        Returns:
+            int: Number of pages exported
+        """
+        exported_count = 0
+
+        try:
+            segments = self._segment_paths(language_code)
+
+            if not segments:
+                logger.warning(f"No data found for language: {language_code}")
+                return 0
+
+            self.flush()
+
+            with open(output_file, 'wb') as outfile:
+                for data_path in segments:
+                    with open(data_path, 'rb') as f:
+                        shutil.copyfileobj(f, outfile)
+                    exported_count += data_path.with_suffix('.idx').stat().st_size // INDEX_RECORD.size
+
+            logger.info(f"Exported {exported_count} pages to {output_file}")
+            return exported_count
+
+        except Exception as e:
+            logger.error(f"Failed to export to JSONL: {e}")
+            return 0
+
+    def flush(self):
+        """Write buffered pages of all open segments to disk."""
+        with self._lock:
+            for segment in self._segments.values():
+                segment.flush(self.fsync)
+            self._commit_index()
+            self.manifest.save()
+
+    def close(self):
+        """Flush and close all open segments."""
+        with self._lock:
+            for segment in self._segments.values():
+                segment.flush(self.fsync)
+                segment.close()
+            self._segments = {}
+            self._commit_index()
+            self.manifest.save()
+
+    def _append(self, pages, language_code):
+        from ..utils import get_url_hash
+
+        records = []
+        for page_data in pages:
+            try:
+                line = self.serializer.dumps(page_data) + b'\n'
+                records.append((bytes.fromhex(get_url_hash(page_data['url'])), line))
+            except Exception as e:
+                logger.error(f"Failed to save page {page_data.get('url')}: {e}")
+
+        if not records:
+            return None, 0
+
+        try:
+            with self._lock:
+                segment = self._current_segment(language_code)
+                entries, other_entries = segment.append(records)
+
+                if self.index is not None:
+                    # Pages other processes appended since our last write, then ours
+                    self._index_entries(language_code, segment, other_entries + entries)
+
+                self.manifest.add(
+                    language_code, segment.date_str, len(entries),
+                    sum(length for _, _, length in entries) + len(entries) * INDEX_RECORD.size,
+                )
+
+                logger.debug(f"Saved {len(records)} pages to {segment.data_path}")
+                return segment, len(records)
+
+        except Exception as e:
+            logger.error(f"Failed to save {len(records)} pages for {language_code}: {e}")
+            return None, 0
+
+    def _index_entries(self, language_code, segment, entries):
+        """Index appended entries; failures do not fail the save."""
+        try:
+            self.index.add(
+                (url_hash.hex(), language_code, segment.location, offset, length)
+                for url_hash, offset, length in entries
+            )
+            self.index.set_segment_entries(segment.location, segment.entries)
+        except sqlite3.Error as e:
+            # The pages are stored: their entries stay buffered for the next
+            # index write, and are reindexed from the segment when storage opens
+            logger.warning(f"Failed to index {len(entries)} pages in {segment.location}: {e}")
+
+    def _commit_index(self):
+        """Write buffered index changes, logging failures."""
+        if self.index is None:
+            return
+        try:
+            self.index.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to write page index: {e}")
+
+    def _current_segment(self, language_code):
+        date_str = datetime.utcnow().strftime('%Y-%m-%d')
+        segment = self._segments.get(language_code)
+
+        if segment is not None and segment.date_str == date_str and segment.size < self.segment_bytes:
+            return segment
+
+        if segment is not None:
+            segment.flush(self.fsync)
+            segment.close()
+
+        lang_dir = self.base_dir / language_code
+        lang_dir.mkdir(exist_ok=True)
+
+        # Continue today's last segment if it has room, otherwise start a new one
+        numbers = [
+            int(SEGMENT_PATTERN.match(path.name).group(2))
+            for path in self._segment_paths(language_code)
+            if path.name.startswith(date_str)
+        ]
+        number = max(numbers, default=1)
+        data_path = lang_dir / f"{date_str}.{number:05d}.jsonl"
+        if data_path.exists() and data_path.stat().st_size >= self.segment_bytes:
+            data_path = lang_dir / f"{date_str}.{number + 1:05d}.jsonl"
+
+        segment = _Segment(data_path, self._location(data_path), date_str, self.serializer.loads)
+        self._segments[language_code] = segment
+
+        # Opening may have recovered unindexed pages
+        if self.index is not None:
+            self._sync_segment(language_code, data_path, self.index.segment_entries().get(segment.location, 0))
+
+        return segment
+
+    def _count_pages(self):
+        """Page counts and sizes per language and day, from the segment files."""
+        languages = {}
+
+        for language_code in self._languages():
+            days = languages.setdefault(language_code, {})
+            for data_path in self._segment_paths(language_code):
+                index_path = data_path.with_suffix('.idx')
+                index_size = index_path.stat().st_size if index_path.exists() else 0
+                day = days.setdefault(SEGMENT_PATTERN.match(data_path.name).group(1), {'pages': 0, 'size_bytes': 0})
+                day['pages'] += index_size // INDEX_RECORD.size
+                day['size_bytes'] += data_path.stat().st_size + index_size
+
+        return languages
+
+    def _segment_paths(self, language_code):
+        lang_dir = self.base_dir / language_code
+        if not lang_dir.is_dir():
+            return []
+        return sorted(p for p in lang_dir.iterdir() if SEGMENT_PATTERN.match(p.name))
+
+    def _languages(self):
+        return sorted(p.name for p in self.base_dir.iterdir() if p.is_dir())
+
+    def _location(self, data_path):
+        return data_path.relative_to(self.base_dir).as_posix()
+
+    def _scan_for_page(self, language_code, url_hash):
+        key = bytes.fromhex(url_hash)
+
+        for data_path in reversed(self._segment_paths(language_code)):
+            index = data_path.with_suffix('.idx').read_bytes()
+            count = len(index) // INDEX_RECORD.size
+
+            for position in range(count - 1, -1, -1):
+                entry_hash, offset, length = INDEX_RECORD.unpack_from(index, position * INDEX_RECORD.size)
+                if entry_hash == key:
+                    return _read_record(data_path, offset, length, self.serializer.loads)
+
+        return None
+
+    def _sync_index(self):
+        """Index segment entries added since the index was last updated."""
+        indexed = self.index.segment_entries()
+        present = set()
+
+        for language_code in self._languages():
+            for data_path in self._segment_paths(language_code):
+                location = self._location(data_path)
+                present.add(location)
+                self._sync_segment(language_code, data_path, indexed.get(location, 0))
+
+        # Segments deleted outside this storage
+        for location in set(indexed) - present:
+            self.index.remove_location(location)
+
+        self.index.commit()
+
+    def _sync_segment(self, language_code, data_path, indexed):
+        index_path = data_path.with_suffix('.idx')
+        entries = index_path.stat().st_size // INDEX_RECORD.size if index_path.exists() else 0
+        location = self._location(data_path)
+
+        if indexed > entries:
+            # Segment was truncated by crash recovery: reindex it
+            self.index.remove_location(location)
+            indexed = 0
+
+        if indexed == entries:
+            return
+
+        with open(index_path, 'rb') as f:
+            f.seek(indexed * INDEX_RECORD.size)
+            data = f.read((entries - indexed) * INDEX_RECORD.size)
+
+        self.index.add(
+            (url_hash.hex(), language_code, location, offset, length)
+            for url_hash, offset, length in INDEX_RECORD.iter_unpack(data)
+        )
+        self.index.set_segment_entries(location, entries)
+
+
+class _Segment:
+    """
+    Open segment data file and its index, both opened for appending.
+
+    Other processes may append to the same segment. Each append takes an
+    exclusive lock on the data file, continues at the current end of the
+    files and writes data and index unbuffered before releasing it, so
+    offsets stay correct and no other process sees a half-written batch.
+    When the files changed since our last append, they are checked (and
+    recovered after a crashed writer) under the same lock.
+    """
+
+    def __init__(self, data_path, location, date_str, loads):
+        self.data_path = data_path
+        self.location = location
+        self.index_path = data_path.with_suffix('.idx')
+        self.date_str = date_str
+        self.loads = loads
+
+        self.data = open(self.data_path, 'ab', buffering=0)
+        self.index_file = open(self.index_path, 'ab', buffering=0)
+        self.size = 0
+        self.entries = 0
+        with self._locked():
+            self._sync(force=True)
+
+    def append(self, records):
+        """
+        Append (url hash, data) records.
+
+        Returns:
+            tuple: ([(url hash, offset, length)] of the records,
+            [(url hash, offset, length)] appended by other processes since our last append)
+        """
+        with self._locked():
+            other_entries = self._sync()
+
+            entries = []
+            offset = self.size
+            for url_hash, data in records:
+                entries.append((url_hash, offset, len(data)))
+                offset += len(data)
+
+            # Data before index, so the index never points past the data
+            _write_all(self.data, b''.join(data for _, data in records))
+            _write_all(self.index_file, b''.join(INDEX_RECORD.pack(*entry) for entry in entries))
+            self.size = offset
+            self.entries += len(entries)
+
+        return entries, other_entries
+
+    def flush(self, fsync=False):
+        # Writes are unbuffered: only fsync is left to do
+        if fsync:
+            for f in (self.data, self.index_file):
+                os.fsync(f.fileno())
+
+    def close(self):
+        self.data.close()
+        self.index_file.close()
+
+    @contextmanager
+    def _locked(self):
+        if fcntl is None:
+            yield
+            return
+        fcntl.flock(self.data.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self.data.fileno(), fcntl.LOCK_UN)
+
+    def _sync(self, force=False):
+        """
+        Catch up with the files (call with the lock held).
+
+        Returns:
+            list: (url hash, offset, length) entries appended by others since our last append
+        """
+        data_size = os.fstat(self.data.fileno()).st_size
+        index_size = os.fstat(self.index_file.fileno()).st_size
+        if not force and data_size == self.size and index_size == self.entries * INDEX_RECORD.size:
+            return []
+
+        self.size = _recover_segment(self.data_path, self.index_path, self.loads)
+        entries = os.fstat(self.index_file.fileno()).st_size // INDEX_RECORD.size
+
+        known = self.entries if entries >= self.entries else 0
+        other_entries = []
+        if not force and entries > known:
+            with open(self.index_path, 'rb') as f:
+                f.seek(known * INDEX_RECORD.size)
+                other_entries = list(INDEX_RECORD.iter_unpack(f.read((entries - known) * INDEX_RECORD.size)))
+
+        self.entries = entries
+        return other_entries
+
+
+def _write_all(f, data):
+    """Write all of data to an unbuffered file."""
+    view = memoryview(data)
+    while view:
+        view = view[f.write(view):]
+
+
+def _read_record(data_path, offset, length, loads):
+    with open(data_path, 'rb') as f:
+        f.seek(offset)
+        return loads(f.read(length))
+
+
+def _recover_segment(data_path, index_path, loads):
+    """
+    Make a segment and its index consistent after a crash
+    (with the segment's lock held, see _Segment).
+
+    Drops a partial index entry, indexes complete lines written after the
+    last index entry and truncates a partial last line.
+
+    Returns:
+        int: Size of the segment data
+    """
+    from ..utils import get_url_hash
+
+    if not data_path.exists():
+        index_path.unlink(missing_ok=True)
+        return 0
+
+    index_size = index_path.stat().st_size if index_path.exists() else 0
+    index_size -= index_size % INDEX_RECORD.size
+
+    end = 0
+    if index_size:
+        with open(index_path, 'rb') as f:
+            f.seek(index_size - INDEX_RECORD.size)
+            _, offset, length = INDEX_RECORD.unpack(f.read(INDEX_RECORD.size))
+            end = offset + length
+
+    data_size = data_path.stat().st_size
+    if end > data_size:
+        # Index points past the data: reindex the whole segment
+        index_size = end = 0
+    entries = []
+
+    if data_size > end:
+        with open(data_path, 'rb') as f:
+            f.seek(end)
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                try:
+                    url_hash = get_url_hash(loads(line)['url'])
+                except (ValueError, KeyError):
+                    break
+                entries.append(INDEX_RECORD.pack(bytes.fromhex(url_hash), end, len(line)))
+                end += len(line)
+
+    with open(index_path, 'ab') as f:
+        f.truncate(index_size)
+        f.write(b''.join(entries))
+
+    if data_size != end:
+        with open(data_path, 'rb+') as f:
+            f.truncate(end)
+
+    if entries or data_size != end:
+        logger.warning(
+            f"Recovered segment {data_path}: indexed {len(entries)} pages, "
+            f"truncated {max(data_size - end, 0)} bytes"
+        )
+
+    return end
+
+
+def create_storage(settings):
+    """
+    Create page storage from Scrapy settings.
+
+    Args:
+        settings: Scrapy settings
+
+    Returns:
+        SegmentStorage or FileStorage
+    """
+    from ..serialization import get_serializer
+
+    base_dir = settings.get('STORAGE_DIR', './data/pages')
+    backend = settings.get('STORAGE_BACKEND', 'segments')
+    serializer_name = settings.get('SERIALIZER', 'auto')
+
+    if backend == 'files':
+        from .file_storage import FileStorage
+        return FileStorage(
+            base_dir,
+            index=settings.getbool('STORAGE_INDEX', True),
+            serializer=get_serializer(serializer_name, pretty=settings.getbool('STORAGE_PRETTY_JSON', False)),
+        )
+
+    if backend != 'segments':
+        raise ValueError(f"Unknown storage backend: {backend}")
+
+    return SegmentStorage(
+        base_dir,
+        segment_bytes=settings.getint('STORAGE_SEGMENT_BYTES', 256 * 1024 * 1024),
+        fsync=settings.getbool('STORAGE_FSYNC', False),
+        index=settings.getbool('STORAGE_INDEX', True),
+        serializer=get_serializer(serializer_name),
+    )
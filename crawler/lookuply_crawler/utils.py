@@ -4,12 +4,17 @@ Utility Functions for Lookuply Crawler
 
 import hashlib
 import os
+import re
 import logging
 from urllib.parse import urlparse, urljoin
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# End of the document head (or start of the body when </head> is omitted)
+HEAD_END_PATTERN = re.compile(r'</head\s*>|<body[\s>]', re.IGNORECASE)
+HEAD_END_PATTERN_BYTES = re.compile(HEAD_END_PATTERN.pattern.encode(), re.IGNORECASE)
+
 
 def normalize_url(url):
     """
@@ -148,6 +153,102 @@ def truncate_text(text, max_length=1000):
     return text[:max_length] + '...'
 
 
+def find_text_spans(text, parts, ordered=True):
+    """
+    Locate pieces of a page (paragraphs, headings) in its cleaned text.
+
+    Parts are whitespace-normalized with clean_text() before searching.
+    With ordered, each part is searched after the previous match first, so
+    repeated parts map to successive occurrences.
+
+    Args:
+        text: Page text (as cleaned by the content extractor)
+        parts: Strings to locate
+        ordered: Parts appear in document order
+
+    Returns:
+        list: (start, end) offsets into text, or None for parts not found
+    """
+    spans = []
+    position = 0
+
+    for part in parts:
+        needle = clean_text(part)
+        start = text.find(needle, position) if needle else -1
+        if start == -1 and needle and position:
+            start = text.find(needle)
+
+        if start == -1:
+            spans.append(None)
+            continue
+
+        spans.append((start, start + len(needle)))
+        if ordered:
+            position = start + len(needle)
+
+    return spans
+
+
+def parse_html(html, encoding=None):
+    """
+    Parse HTML with BeautifulSoup and lxml.
+
+    Bytes are handed to lxml with their encoding, which decodes them in C
+    instead of first building a str of the whole document.
+
+    Args:
+        html: HTML as str, or bytes (e.g., response.body)
+        encoding: Encoding of bytes input (None = detect)
+
+    Returns:
+        BeautifulSoup: Parsed document
+    """
+    from bs4 import BeautifulSoup
+
+    if isinstance(html, bytes):
+        return BeautifulSoup(html, 'lxml', from_encoding=encoding)
+    return BeautifulSoup(html, 'lxml')
+
+
+def get_declared_encoding(response):
+    """
+    Get the encoding a response declares, without decoding its body.
+
+    Checks the byte order mark, the Content-Type header and the <meta>
+    charset in the start of the body (unlike response.encoding, which
+    decodes the whole body to infer an undeclared encoding).
+
+    Args:
+        response: Scrapy response
+
+    Returns:
+        str: Encoding name, or None if undeclared
+    """
+    from w3lib.encoding import html_body_declared_encoding, http_content_type_encoding, read_bom
+
+    content_type = response.headers.get(b'Content-Type', b'').decode('latin-1')
+    return (
+        read_bom(response.body)[0]
+        or http_content_type_encoding(content_type)
+        or html_body_declared_encoding(response.body)
+    )
+
+
+def get_html_head(html):
+    """
+    Get the head of an HTML document, e.g. for head-only metadata.
+
+    Args:
+        html: HTML as str or bytes
+
+    Returns:
+        Start of the document up to the end of its head (same type as html)
+    """
+    pattern = HEAD_END_PATTERN_BYTES if isinstance(html, bytes) else HEAD_END_PATTERN
+    match = pattern.search(html)
+    return html[:match.start()] if match else html
+
+
 def ensure_dir(directory):
     """
     Ensure directory exists.
@@ -224,6 +325,29 @@ def estimate_time_remaining(pages_done, pages_total, duration_seconds):
     return pages_remaining / rate
 
 
+def calculate_percentiles(values, percentiles=(50, 90, 99)):
+    """
+    Calculate percentiles of a sequence of values (nearest-rank method).
+
+    Args:
+        values: Sequence of numbers
+        percentiles: Percentiles to calculate (0-100)
+
+    Returns:
+        dict: Percentile -> value (e.g., {50: 0.012, 90: 0.030, 99: 0.120})
+    """
+    if not values:
+        return {pct: 0.0 for pct in percentiles}
+
+    ordered = sorted(values)
+    result = {}
+    for pct in percentiles:
+        rank = max(int(round(pct / 100.0 * len(ordered))) - 1, 0)
+        result[pct] = ordered[min(rank, len(ordered) - 1)]
+
+    return result
+
+
 def format_duration(seconds):
     """
     Format duration in seconds to human-readable format.
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Lookuply Bytes Parsing Benchmark
+
+Compare parsing large pages from response.text (decoded str) with
+parsing response.body bytes plus the declared encoding (lxml decodes):
+per-page time of content, metadata and HTML language detection, and
+peak RSS growth. Each mode runs in its own process so peak RSS is
+measured separately.
+"""
+
+import sys
+import os
+import argparse
+import json
+import logging
+import resource
+import subprocess
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lookuply_crawler.utils import calculate_percentiles, format_bytes
+from html_fixtures import LANGUAGES, make_large_html, make_response
+
+
+def run_mode(mode, pages, size):
+    """Extract large pages in this process; print timings and RSS growth as JSON."""
+    logging.disable(logging.INFO)
+    from lookuply_crawler.extractors import ContentExtractor, MetadataExtractor, get_detector
+    from lookuply_crawler.utils import get_declared_encoding
+
+    detector = get_detector()
+    bodies = [make_large_html(i, LANGUAGES[i % len(LANGUAGES)], size) for i in range(pages)]
+    bodies = [(url, html.encode('utf-8')) for url, html in bodies]
+
+    # Warm up (imports, model) before taking the RSS baseline
+    warmup = make_response(*make_large_html(pages, 'en', 10000))
+    ContentExtractor().extract(warmup.text, warmup.url)
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    timings = []
+    for url, body in bodies:
+        response = make_response(url, body.decode('utf-8'))
+        started = time.perf_counter()
+        if mode == 'text':
+            html = response.text
+            ContentExtractor().extract(html, url)
+            MetadataExtractor().extract(html, url)
+            detector.detect_from_html(html)
+        else:
+            encoding = get_declared_encoding(response)
+            ContentExtractor().extract(response.body, url, encoding)
+            MetadataExtractor().extract(response.body, url, encoding)
+            detector.detect_from_html(response.body, encoding)
+        timings.append(time.perf_counter() - started)
+        del response
+
+    rss_growth = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before) * 1024
+    print(json.dumps({'timings': timings, 'rss_growth': rss_growth, 'bytes': sum(len(body) for _, body in bodies)}))
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Benchmark parsing response bytes against response.text')
+
+    parser.add_argument(
+        '--pages',
+        type=int,
+        help='Number of large pages per mode',
+        default=12
+    )
+
+    parser.add_argument(
+        '--size',
+        type=int,
+        help='Page size in bytes',
+        default=2 * 1024 * 1024
+    )
+
+    parser.add_argument(
+        '--run-mode',
+        choices=['text', 'bytes'],
+        help=argparse.SUPPRESS
+    )
+
+    args = parser.parse_args()
+
+    if args.run_mode:
+        run_mode(args.run_mode, args.pages, args.size)
+        return 0
+
+    results = {}
+    for mode in ('text', 'bytes'):
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--run-mode', mode,
+             '--pages', str(args.pages), '--size', str(args.size)],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        results[mode] = json.loads(output.strip().splitlines()[-1])
+
+    print("=" * 72)
+    print(f"BYTES PARSING BENCHMARK - {args.pages} pages of {format_bytes(args.size)}, "
+          f"{len(LANGUAGES)} languages")
+    print("=" * 72)
+    print(f"{'Input':<10} {'p50 ms':<10} {'p90 ms':<10} {'Mean ms':<10} {'MB/s':<10} {'Peak RSS growth':<16}")
+    print("-" * 72)
+    for mode, result in results.items():
+        timings = result['timings']
+        percentiles = calculate_percentiles(timings)
+        print(
+            f"{mode:<10} {percentiles[50] * 1000:<10.0f} {percentiles[90] * 1000:<10.0f} "
+            f"{sum(timings) / len(timings) * 1000:<10.0f} {result['bytes'] / sum(timings) / 1e6:<10.2f} "
+            f"{format_bytes(result['rss_growth']):<16}"
+        )
+    print("=" * 72)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
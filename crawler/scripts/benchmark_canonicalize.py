@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Lookuply URL Canonicalization Benchmark
+
+Canonicalize a million-URL link sample (hot navigation URLs repeated
+across pages, article URLs with tracking and session parameters,
+unsorted queries, index files, host case, default port and escape
+variants) with utils.normalize_url and with UrlCanonicalizer, without
+and with the memo: throughput and distinct URLs left to crawl.
+"""
+
+import sys
+import os
+import argparse
+import gc
+import logging
+import random
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lookuply_crawler.canonicalize import UrlCanonicalizer
+from lookuply_crawler.utils import normalize_url
+
+
+def article_url(rng, host, article):
+    """One of the URL variants of an article page."""
+    path = f'/news/{article}/story-{article}.html'
+    query = [f'id={article}', f'lang={"en" if article % 2 else "de"}']
+    kind = rng.random()
+    if kind < 0.3:
+        query.append(f'utm_source={rng.choice(["twitter", "newsletter", "rss"])}')
+        query.append('utm_medium=social')
+    elif kind < 0.4:
+        query.append(f'fbclid=IwAR{rng.getrandbits(64):x}')
+    elif kind < 0.5:
+        query.append(f'PHPSESSID={rng.getrandbits(64):x}')
+    elif kind < 0.55:
+        host = host.upper()
+    elif kind < 0.6:
+        host += ':443'
+    elif kind < 0.65:
+        path = path.replace('story', '%73tory')
+    if rng.random() < 0.5:
+        query.reverse()
+    return f'https://{host}{path}?{"&".join(query)}'
+
+
+def make_sample(rng, urls, hosts, nav_links, articles):
+    """Link URLs found on crawled pages (articles numbered per site)."""
+    sample = []
+    for _ in range(urls):
+        host = f'www.site{rng.randrange(hosts)}.example'
+        if rng.random() < 0.6:
+            section = rng.randrange(nav_links)
+            sample.append(f'https://{host}/section/{section}/' if section else f'https://{host}/index.html')
+        else:
+            sample.append(article_url(rng, host, rng.randrange(articles)))
+    return sample
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Benchmark URL canonicalization throughput')
+
+    parser.add_argument(
+        '--urls',
+        type=int,
+        help='Number of URLs in the sample',
+        default=1_000_000
+    )
+
+    parser.add_argument(
+        '--hosts',
+        type=int,
+        help='Number of sites',
+        default=500
+    )
+
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    rng = random.Random(42)
+    sample = make_sample(rng, args.urls, args.hosts, nav_links=40, articles=200)
+
+    # Keep collections of the sample out of the timings
+    gc.collect()
+    gc.freeze()
+
+    canonicalizers = [
+        ('UrlCanonicalizer, no memo', UrlCanonicalizer(memo_size=0)),
+        ('UrlCanonicalizer, memo', UrlCanonicalizer()),
+    ]
+    results = []
+
+    started = time.perf_counter()
+    normalized = [normalize_url(url) for url in sample]
+    results.append(('utils.normalize_url', time.perf_counter() - started, len(set(normalized))))
+
+    for name, canonicalizer in canonicalizers:
+        started = time.perf_counter()
+        canonical = [canonicalizer.canonicalize(url) for url in sample]
+        results.append((name, time.perf_counter() - started, len(set(canonical))))
+
+    memo = canonicalizers[1][1]
+    print("=" * 78)
+    print(f"URL CANONICALIZATION - {args.urls:,} URLs ({len(set(sample)):,} distinct) on {args.hosts} sites")
+    print("=" * 78)
+    print(f"{'Method':<28} {'Seconds':<9} {'URLs/s':<12} {'us/URL':<8} {'Distinct URLs':<14}")
+    print("-" * 78)
+    for name, seconds, distinct in results:
+        print(f"{name:<28} {seconds:<9.2f} {args.urls / seconds:<12,.0f} {seconds / args.urls * 1e6:<8.2f} {distinct:<14,}")
+    print("-" * 78)
+    print(f"Memo hit rate:      {memo.stats['memo_hits'] / memo.stats['urls']:.1%}")
+    print(f"Canonicalizer stats: {memo.stats}")
+    print("=" * 78)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
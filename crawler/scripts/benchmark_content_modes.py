@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Lookuply Content Extraction Mode Benchmark
+
+Compare ContentExtractor main content detection modes ('heuristic'
+containers with body fallback, 'density' block scoring) on the
+multi-language fixture corpora: extraction time per page, text size, and
+how much of the text is outside the fixture's real content container
+(noise) or missing from it.
+"""
+
+import sys
+import os
+import argparse
+import logging
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+
+from lookuply_crawler.extractors import ContentExtractor
+from lookuply_crawler.utils import calculate_percentiles
+from html_fixtures import make_corpus
+
+
+def reference_lines(extractor, html, url):
+    """Text lines of the fixture's content container (the parent of its h1)."""
+    soup = BeautifulSoup(html, 'lxml')
+    extractor._remove_boilerplate(soup, url)
+    return set(extractor._extract_text(soup.find('h1').parent).splitlines())
+
+
+def run_corpus(name, corpus):
+    """Extract a corpus in every mode (interleaved per page) and print one row per mode."""
+    extractors = {mode: ContentExtractor(mode=mode) for mode in ContentExtractor.MODES}
+    # Mode -> [timings, text chars, noise chars, missing chars]
+    results = {mode: [[], 0, 0, 0] for mode in extractors}
+
+    for _, url, html in corpus:
+        reference = reference_lines(extractors['heuristic'], html, url)
+        for mode, extractor in extractors.items():
+            started = time.perf_counter()
+            content = extractor.extract(html, url)
+            elapsed = time.perf_counter() - started
+
+            lines = content['text'].splitlines()
+            row = results[mode]
+            row[0].append(elapsed)
+            row[1] += content['text_length']
+            row[2] += sum(len(line) for line in lines if line not in reference)
+            row[3] += sum(len(line) for line in reference.difference(lines))
+
+    pages = len(corpus)
+    for mode, (timings, text, noise, missing) in results.items():
+        percentiles = calculate_percentiles(timings)
+        print(
+            f"{name:<11} {mode:<10} {percentiles[50] * 1000:<9.2f} {percentiles[90] * 1000:<9.2f} "
+            f"{text / pages:<11,.0f} {noise / pages:<11,.0f} {noise / text:<8.1%} {missing / pages:<10,.0f}"
+        )
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Benchmark main content detection modes')
+
+    parser.add_argument(
+        '--pages',
+        type=int,
+        help='Number of fixture pages per corpus',
+        default=600
+    )
+
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    print("=" * 84)
+    print(f"CONTENT EXTRACTION MODES - {args.pages:,} fixture pages per corpus, per page averages")
+    print("=" * 84)
+    print(f"{'Corpus':<11} {'Mode':<10} {'p50 ms':<9} {'p90 ms':<9} {'Text chars':<11} {'Noise':<11} {'Noise %':<8} {'Missing':<10}")
+    print("-" * 84)
+    run_corpus('article', make_corpus(args.pages))
+    run_corpus('templated', make_corpus(args.pages, sites=60, templated=True))
+    print("=" * 84)
+    print("article: <article> on every page; templated: per-site containers and untagged toolbar")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
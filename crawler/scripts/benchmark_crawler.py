@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Lookuply Crawler Benchmark
+
+Measure end-to-end crawl throughput (pages/sec) against a local test site,
+comparing reactor and pipeline write modes.
+"""
+
+import sys
+import os
+import argparse
+import json
+import shutil
+import subprocess
+import tempfile
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+ASYNCIO_REACTOR = 'twisted.internet.asyncioreactor.AsyncioSelectorReactor'
+
+# Benchmark modes: name -> (reactor, pipeline write mode)
+# Write modes: 'inline' (reactor thread), 'async' (thread pool), 'background' (writer thread)
+MODES = {
+    'default': (None, 'inline'),
+    'default+async-writes': (None, 'async'),
+    'default+background-writer': (None, 'background'),
+    'asyncio': (ASYNCIO_REACTOR, 'inline'),
+    'asyncio+async-writes': (ASYNCIO_REACTOR, 'async'),
+}
+
+PARAGRAPH = (
+    'Privacy is a fundamental right and our search engine respects your privacy. '
+    'Open source software lets everyone inspect how their data is handled, '
+    'and independent search helps people find information without being tracked. '
+)
+
+LINKS_PER_PAGE = 10
+
+
+class TestSiteHandler(BaseHTTPRequestHandler):
+    """Serve an endless site of English article pages linking to each other."""
+
+    def do_GET(self):
+        if self.path == '/robots.txt':
+            self._send(b'User-agent: *\nAllow: /\n', 'text/plain')
+            return
+
+        try:
+            page = int(self.path.rstrip('/').rsplit('/', 1)[-1])
+        except ValueError:
+            page = 0
+
+        links = ''.join(
+            f'<li><a href="/page/{page * LINKS_PER_PAGE + i}">Article {page * LINKS_PER_PAGE + i}</a></li>'
+            for i in range(1, LINKS_PER_PAGE + 1)
+        )
+        paragraphs = ''.join(f'<p>{PARAGRAPH * 2}</p>' for _ in range(8))
+        html = (
+            f'<html lang="en"><head><title>Article {page}</title>'
+            f'<meta name="description" content="Benchmark article {page}"></head><body>'
+            f'<nav><a href="/page/0">Home</a> <a href="/page/1">News</a></nav>'
+            f'<article><h1>Article {page}</h1>{paragraphs}<ul>{links}</ul></article>'
+            f'<footer>Footer</footer></body></html>'
+        )
+        self._send(html.encode('utf-8'), 'text/html; charset=utf-8')
+
+    def _send(self, body, content_type):
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_test_site():
+    """Start local test site in a background thread and return its port."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), TestSiteHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server.server_address[1]
+
+
+def run_crawl(port, pages, reactor, write_mode, output_dir):
+    """Run one crawl in this process and print its results as JSON."""
+    os.environ.setdefault('SCRAPY_SETTINGS_MODULE', 'lookuply_crawler.settings')
+
+    import scrapy
+    from scrapy.crawler import CrawlerProcess
+    from scrapy.utils.project import get_project_settings
+    from lookuply_crawler.spiders.web_spider import WebSpider
+
+    class BenchmarkSpider(WebSpider):
+        name = 'benchmark_spider'
+
+        def start_requests(self):
+            yield scrapy.Request(
+                url=f'http://127.0.0.1:{port}/page/0',
+                callback=self.parse,
+                errback=self.errback_httpbin,
+                meta={'depth': 0},
+            )
+
+    settings = get_project_settings()
+    overrides = {
+        'TWISTED_REACTOR': reactor,
+        'PIPELINE_ASYNC_WRITES': write_mode == 'async',
+        'PIPELINE_BACKGROUND_WRITER': write_mode == 'background',
+        'OUTPUT_DIR': output_dir,
+        'STORAGE_DIR': os.path.join(output_dir, 'pages'),
+        'CLOSESPIDER_ITEMCOUNT': pages,
+        'DOWNLOAD_DELAY': 0,
+        'AUTOTHROTTLE_ENABLED': False,
+        'CONCURRENT_REQUESTS': 32,
+        'CONCURRENT_REQUESTS_PER_DOMAIN': 32,
+        'DEPTH_LIMIT': 100,
+        'HTTPCACHE_ENABLED': False,
+        'ROBOTSTXT_CACHE_BACKEND': None,
+        'ROBOTSTXT_PREFETCH': False,
+        'DNSCACHE_FILE': None,
+        'LOG_LEVEL': 'WARNING',
+    }
+    for key, value in overrides.items():
+        # 'cmdline' priority overrides the spider's custom_settings
+        settings.set(key, value, priority='cmdline')
+
+    process = CrawlerProcess(settings)
+    crawler = process.create_crawler(BenchmarkSpider)
+    process.crawl(crawler, languages='en')
+    process.start()
+
+    stats = crawler.stats.get_stats()
+    elapsed = stats.get('elapsed_time_seconds', 0)
+    items = stats.get('item_scraped_count', 0)
+    print(json.dumps({
+        'items': items,
+        'responses': stats.get('response_received_count', 0),
+        'elapsed': elapsed,
+        'pages_per_sec': items / elapsed if elapsed else 0.0,
+    }))
+
+
+def run_mode(mode, port, pages):
+    """Run a benchmark mode in a subprocess (a reactor can only be installed once)."""
+    reactor, write_mode = MODES[mode]
+    output_dir = tempfile.mkdtemp(prefix='lookuply_bench_')
+
+    cmd = [
+        sys.executable, os.path.abspath(__file__), '--child',
+        '--port', str(port), '--pages', str(pages), '--output-dir', output_dir,
+        '--reactor', reactor or '', '--write-mode', write_mode,
+    ]
+
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        return json.loads(result.stdout.strip().splitlines()[-1])
+    finally:
+        shutil.rmtree(output_dir, ignore_errors=True)
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Benchmark Lookuply crawler throughput')
+
+    parser.add_argument(
+        '--pages',
+        type=int,
+        help='Number of pages to crawl per run',
+        default=500
+    )
+
+    parser.add_argument(
+        '--modes',
+        type=str,
+        help=f'Comma-separated modes to compare ({", ".join(MODES)})',
+        default=','.join(MODES)
+    )
+
+    # Internal arguments used for the per-mode subprocess
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--port', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--reactor', type=str, help=argparse.SUPPRESS)
+    parser.add_argument('--write-mode', type=str, default='inline', help=argparse.SUPPRESS)
+    parser.add_argument('--output-dir', type=str, help=argparse.SUPPRESS)
+
+    args = parser.parse_args()
+
+    if args.child:
+        run_crawl(args.port, args.pages, args.reactor or None, args.write_mode, args.output_dir)
+        return 0
+
+    port = start_test_site()
+
+    print("=" * 70)
+    print(f"CRAWLER BENCHMARK - {args.pages} pages per run")
+    print("=" * 70)
+    print(f"{'Mode':<28} {'Pages':<10} {'Seconds':<10} {'Pages/sec':<10}")
+    print("-" * 70)
+
+    for mode in args.modes.split(','):
+        mode = mode.strip()
+        if mode not in MODES:
+            print(f"Unknown mode: {mode}")
+            return 1
+
+        result = run_mode(mode, port, args.pages)
+        print(f"{mode:<28} {result['items']:<10} {result['elapsed']:<10.2f} {result['pages_per_sec']:<10.1f}")
+
+    print("=" * 70)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Lookuply Domain Filter Benchmark
+
+Load a blocklist of a million random domains into DomainFilter and
+filter page-sized batches of links (internal links, links to blocked
+domains' subdomains, other external links, file links): load time,
+memory, time per batch and per URL, and the old linear substring scan
+over the same blocklist for comparison.
+"""
+
+import sys
+import os
+import argparse
+import gzip
+import logging
+import random
+import string
+import tempfile
+import time
+import resource
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lookuply_crawler.config import BLOCKED_EXTENSIONS, DomainFilter
+from lookuply_crawler.utils import calculate_percentiles, format_bytes
+
+TLDS = ['com', 'net', 'org', 'info', 'xyz', 'de', 'fr', 'pl', 'ru', 'co.uk']
+
+
+def random_domain(rng):
+    """Random registrable domain."""
+    return ''.join(rng.choices(string.ascii_lowercase + string.digits, k=rng.randint(5, 16))) + '.' + rng.choice(TLDS)
+
+
+def linear_is_allowed(url, blocked_domains, blocked_extensions):
+    """The previous is_domain_allowed: substring scan of every blocked domain and extension."""
+    from urllib.parse import urlparse
+
+    parsed = urlparse(url)
+    domain = parsed.netloc.lower()
+    for blocked in blocked_domains:
+        if blocked in domain:
+            return False
+    path = parsed.path.lower()
+    for ext in blocked_extensions:
+        if path.endswith(f'.{ext}'):
+            return False
+    return True
+
+
+def allowed_domain(rng, blocked_set):
+    """Random domain that is not blocked."""
+    while True:
+        domain = random_domain(rng)
+        if domain not in blocked_set:
+            return domain
+
+
+def make_batch(rng, blocked, blocked_set, links):
+    """Links of one page: (url, expected allowed) pairs."""
+    host = allowed_domain(rng, blocked_set)
+    batch = []
+    for i in range(links):
+        kind = rng.random()
+        if kind < 0.6:
+            batch.append((f'https://www.{host}/section/{i}', True))
+        elif kind < 0.7:
+            batch.append((f'https://cdn{i}.{rng.choice(blocked)}/page', False))
+        elif kind < 0.75:
+            batch.append((f'https://{host}/files/report{i}.{rng.choice(BLOCKED_EXTENSIONS)}', False))
+        else:
+            batch.append((f'https://{allowed_domain(rng, blocked_set)}/article/{i}', True))
+    return batch
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Benchmark the compiled outlink domain filter')
+
+    parser.add_argument(
+        '--domains',
+        type=int,
+        help='Number of blocked domains',
+        default=1_000_000
+    )
+
+    parser.add_argument(
+        '--pages',
+        type=int,
+        help='Number of link batches (pages)',
+        default=2000
+    )
+
+    parser.add_argument(
+        '--links',
+        type=int,
+        help='Links per page',
+        default=60
+    )
+
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    rng = random.Random(42)
+    blocked_set = {random_domain(rng) for _ in range(args.domains)}
+    blocked = sorted(blocked_set)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'blocklist.txt.gz')
+        with gzip.open(path, 'wt', encoding='utf-8') as f:
+            f.write('# Benchmark blocklist\n')
+            for i, domain in enumerate(blocked):
+                f.write(f'0.0.0.0 {domain}\n' if i % 2 else f'{domain}\n')
+        file_size = os.path.getsize(path)
+
+        rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        started = time.perf_counter()
+        domain_filter = DomainFilter(extensions=BLOCKED_EXTENSIONS)
+        domain_filter.load(path)
+        load_seconds = time.perf_counter() - started
+        rss_growth = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before) * 1024
+
+    batches = [make_batch(rng, blocked, blocked_set, args.links) for _ in range(args.pages)]
+
+    timings = []
+    errors = 0
+    for batch in batches:
+        urls = [url for url, _ in batch]
+        started = time.perf_counter()
+        allowed = domain_filter.filter(urls)
+        timings.append(time.perf_counter() - started)
+        errors += sum(result != expected for result, (_, expected) in zip(allowed, batch))
+
+    single = []
+    for url, _ in batches[0][:200]:
+        started = time.perf_counter()
+        domain_filter.allows(url)
+        single.append(time.perf_counter() - started)
+
+    # The linear scan takes a while per URL at this size: time a sample
+    sample = [url for url, _ in batches[1][:20]]
+    started = time.perf_counter()
+    for url in sample:
+        linear_is_allowed(url, blocked, BLOCKED_EXTENSIONS)
+    linear_per_url = (time.perf_counter() - started) / len(sample)
+
+    urls = args.pages * args.links
+    percentiles = calculate_percentiles(timings)
+    print("=" * 72)
+    print(f"DOMAIN FILTER BENCHMARK - {len(blocked):,} blocked domains, {args.pages:,} pages x {args.links} links")
+    print("=" * 72)
+    print(f"Blocklist file:        {format_bytes(file_size)} (gzip)")
+    print(f"Load + compile:        {load_seconds:.2f} s, filter {format_bytes(domain_filter._hashes.nbytes)} "
+          f"(peak RSS growth {format_bytes(rss_growth)} while loading)")
+    print(f"Batch per page:        p50 {percentiles[50] * 1e6:.0f} us, p90 {percentiles[90] * 1e6:.0f} us")
+    print(f"Per URL (batched):     {sum(timings) / urls * 1e6:.2f} us ({urls / sum(timings):,.0f} URLs/s)")
+    print(f"Per URL (single):      {calculate_percentiles(single)[50] * 1e6:.2f} us p50")
+    print(f"Per URL (linear scan): {linear_per_url * 1e6:,.0f} us (previous is_domain_allowed)")
+    print(f"Wrong decisions:       {errors}")
+    print(f"Filter stats:          {domain_filter.stats}")
+    print("=" * 72)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Lookuply Item Schema Benchmark
+
+Extract items from a multi-language fixture corpus and report serialized
+bytes per item for the full schema and the compact schema
+(CompactItemPipeline): page record, edge output and total.
+"""
+
+import sys
+import os
+import argparse
+import copy
+import logging
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from itemadapter import ItemAdapter
+
+from lookuply_crawler import settings as project_settings
+from lookuply_crawler.pipelines import CompactItemPipeline
+from lookuply_crawler.serialization import get_serializer
+from lookuply_crawler.spiders.web_spider import WebSpider
+from lookuply_crawler.utils import format_bytes
+from html_fixtures import LANGUAGES, make_corpus, make_response
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Report bytes per item for the full and compact item schemas')
+
+    parser.add_argument(
+        '--pages',
+        type=int,
+        help='Number of fixture pages',
+        default=600
+    )
+
+    parser.add_argument(
+        '--no-caps',
+        action='store_true',
+        help='Compact schema without ITEM_FIELD_MAX_LENGTHS caps'
+    )
+
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    serializer = get_serializer()
+    spider = WebSpider()
+    pipeline = CompactItemPipeline(
+        links_dir=None,
+        max_lengths={} if args.no_caps else project_settings.ITEM_FIELD_MAX_LENGTHS,
+        serializer=serializer,
+    )
+
+    # Language -> [pages, html, full, compact page, compact edges]
+    totals = {lang: [0, 0, 0, 0, 0] for lang in LANGUAGES}
+    spans = matched = 0
+
+    for language_code, url, html in make_corpus(args.pages):
+        item = spider.extract_content(make_response(url, html))
+        item.pop('page_links')
+        full = serializer.dumps(item)
+
+        adapter = ItemAdapter(copy.deepcopy(item))
+        spans += len(item['paragraphs']) + len(item['headings'])
+        edges = pipeline.compact(adapter)
+        matched += len(adapter['paragraph_spans']) + len(adapter['heading_spans'])
+
+        row = totals[language_code]
+        row[0] += 1
+        row[1] += len(html.encode('utf-8'))
+        row[2] += len(full)
+        row[3] += len(serializer.dumps(adapter.asdict()))
+        row[4] += sum(len(serializer.dumps(edge)) + 1 for edge in edges)
+
+    print("=" * 86)
+    print(f"ITEM SCHEMA BENCHMARK - {args.pages:,} fixture pages, bytes per item ({serializer.name})")
+    print("=" * 86)
+    print(f"{'Language':<10} {'HTML':<10} {'Full':<10} {'Compact':<10} {'Edges':<10} {'Compact+edges':<15} {'Page record':<12}")
+    print("-" * 86)
+
+    for language_code, (pages, html, full, page, edges) in list(totals.items()) + [('total', [
+        sum(row[i] for row in totals.values()) for i in range(5)
+    ])]:
+        if not pages:
+            continue
+        print(
+            f"{language_code:<10} {html / pages:<10,.0f} {full / pages:<10,.0f} {page / pages:<10,.0f} "
+            f"{edges / pages:<10,.0f} {(page + edges) / pages:<15,.0f} {full / page:<.2f}x smaller"
+        )
+
+    full, page, edges = (sum(row[i] for row in totals.values()) for i in (2, 3, 4))
+    print("-" * 86)
+    print(f"Full schema:    {format_bytes(full)}")
+    print(f"Compact schema: {format_bytes(page)} pages + {format_bytes(edges)} edges")
+    print(f"Spans located:  {matched:,} of {spans:,} paragraphs and headings")
+    print("=" * 86)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Lookuply Link Graph Benchmark
+
+Compare storing page links as JSON Lines edges (compact item schema edge
+output) with the binary link graph (LinkGraphPipeline): bytes per edge,
+write throughput and the time to load all (source, target) pairs.
+"""
+
+import sys
+import os
+import argparse
+import random
+import shutil
+import tempfile
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lookuply_crawler.serialization import get_serializer
+from lookuply_crawler.storage import JsonLinesWriter, LinkGraphWriter, find_jsonl_files, open_jsonl, read_urls
+from lookuply_crawler.storage.link_graph import iter_edge_pairs
+from lookuply_crawler.utils import format_bytes
+from benchmark_storage import LANGUAGES, disk_usage, make_page
+
+
+def write_jsonl_edges(pages, directory):
+    """Write one LinkItem-shaped JSON line per link (duplicates included)."""
+    serializer = get_serializer()
+    writers = {}
+    for page in pages:
+        lang = page['language_code']
+        if lang not in writers:
+            writers[lang] = JsonLinesWriter(directory, lang)
+        for link in page['links']:
+            writers[lang].write(serializer.dumps({
+                'source_url': page['url'],
+                'target_url': link['url'],
+                'anchor_text': link['text'],
+                'link_type': 'internal' if link['domain'] == page['domain'] else 'external',
+                'discovered_at': page['crawled_at'],
+            }))
+    for writer in writers.values():
+        writer.close()
+
+
+def write_graph(pages, directory):
+    """Add all pages' links to a link graph; return the writer."""
+    graph = LinkGraphWriter(directory)
+    for page in pages:
+        graph.add_links(page['url'], [(link['url'], link['text']) for link in page['links']], page['language_code'])
+    graph.close()
+    return graph
+
+
+def load_jsonl_pairs(directory):
+    """Load (source URL, target URL) pairs from JSON Lines edges."""
+    serializer = get_serializer()
+    pairs = []
+    for lang in LANGUAGES:
+        for path in find_jsonl_files(directory, lang):
+            with open_jsonl(path) as f:
+                for line in f:
+                    edge = serializer.loads(line)
+                    pairs.append((edge['source_url'], edge['target_url']))
+    return len(pairs)
+
+
+def load_graph_pairs(directory):
+    """Load (source ID, target ID) pairs and the URL dictionary from the link graph."""
+    urls = read_urls(directory)
+    pairs = []
+    for lang in LANGUAGES:
+        pairs.extend(iter_edge_pairs(os.path.join(directory, lang, 'edges.bin')))
+    return len(pairs) if urls else 0
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Benchmark the binary link graph against JSON Lines edges')
+
+    parser.add_argument(
+        '--pages',
+        type=int,
+        help='Number of pages',
+        default=20000
+    )
+
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    pages = [make_page(i, rng.choice(LANGUAGES), rng) for i in range(args.pages)]
+    links = sum(len(page['links']) for page in pages)
+
+    base_dir = tempfile.mkdtemp(prefix='lookuply_graph_')
+    jsonl_dir = os.path.join(base_dir, 'jsonl')
+    graph_dir = os.path.join(base_dir, 'graph')
+
+    try:
+        started = time.perf_counter()
+        write_jsonl_edges(pages, jsonl_dir)
+        jsonl_write = time.perf_counter() - started
+
+        started = time.perf_counter()
+        graph = write_graph(pages, graph_dir)
+        graph_write = time.perf_counter() - started
+
+        started = time.perf_counter()
+        jsonl_edges = load_jsonl_pairs(jsonl_dir)
+        jsonl_load = time.perf_counter() - started
+
+        started = time.perf_counter()
+        graph_edges = load_graph_pairs(graph_dir)
+        graph_load = time.perf_counter() - started
+
+        jsonl_bytes = disk_usage(jsonl_dir)[1]
+        graph_bytes = disk_usage(graph_dir)[1]
+        edge_bytes = sum(
+            os.path.getsize(os.path.join(graph_dir, lang, 'edges.bin'))
+            for lang in LANGUAGES if os.path.exists(os.path.join(graph_dir, lang, 'edges.bin'))
+        )
+
+        print("=" * 78)
+        print(f"LINK GRAPH BENCHMARK - {args.pages:,} pages, {links:,} links")
+        print("=" * 78)
+        print(f"{'Format':<14} {'Edges':<12} {'Size':<12} {'Bytes/edge':<12} {'Write links/s':<15} {'Load s':<8}")
+        print("-" * 78)
+        print(
+            f"{'jsonl':<14} {jsonl_edges:<12,} {format_bytes(jsonl_bytes):<12} {jsonl_bytes / jsonl_edges:<12,.1f} "
+            f"{links / jsonl_write:<15,.0f} {jsonl_load:<8.3f}"
+        )
+        print(
+            f"{'graph':<14} {graph_edges:<12,} {format_bytes(graph_bytes):<12} {graph_bytes / graph_edges:<12,.1f} "
+            f"{links / graph_write:<15,.0f} {graph_load:<8.3f}"
+        )
+        print("-" * 78)
+        print(f"Graph: {graph.url_count:,} URLs, {graph.duplicate_edges:,} duplicate edges skipped, "
+              f"edge lists {format_bytes(edge_bytes)} ({edge_bytes / graph_edges:.0f} bytes/edge)")
+        print("=" * 78)
+
+    finally:
+        shutil.rmtree(base_dir, ignore_errors=True)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
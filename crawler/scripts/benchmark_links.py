@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Lookuply Link Extraction Benchmark
+
+Compare following links found by Scrapy's LinkExtractor (a second parse
+of every page) with the page links ContentExtractor collects in its one
+pass over the already parsed page: time per page, links per page and
+whether both give the same URLs to follow.
+"""
+
+import sys
+import os
+import argparse
+import logging
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scrapy.linkextractors import LinkExtractor
+
+from lookuply_crawler.config import BLOCKED_EXTENSIONS
+from lookuply_crawler.extractors import ContentExtractor
+from lookuply_crawler.spiders.base_spider import BaseSpider
+from lookuply_crawler.utils import calculate_percentiles, parse_html
+from html_fixtures import make_corpus, make_response
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Benchmark unified link extraction against LinkExtractor')
+
+    parser.add_argument(
+        '--pages',
+        type=int,
+        help='Number of fixture pages',
+        default=1200
+    )
+
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    spider = BaseSpider()
+    extractor = ContentExtractor()
+    link_extractor = LinkExtractor(deny_extensions=BLOCKED_EXTENSIONS, unique=True)
+
+    scrapy_timings, unified_timings = [], []
+    page_links = content_links = same = 0
+    for _, url, html in make_corpus(args.pages, sites=60, templated=True):
+        response = make_response(url, html)
+
+        started = time.perf_counter()
+        scrapy_urls = {link.url for link in link_extractor.extract_links(response)}
+        scrapy_timings.append(time.perf_counter() - started)
+
+        # Parsing, boilerplate removal and main content detection are part of
+        # content extraction, so only the link work is timed
+        soup = parse_html(response.body, 'utf-8')
+        started = time.perf_counter()
+        links, anchors = extractor._collect_links(soup, url)
+        elapsed = time.perf_counter() - started
+        extractor._remove_boilerplate(soup, url)
+        main_content = extractor._find_main_content(soup)
+        started = time.perf_counter()
+        extractor._mark_content_links(main_content, anchors)
+        follow = spider.extract_links(response, links)
+        unified_timings.append(elapsed + time.perf_counter() - started)
+
+        page_links += len(links)
+        content_links += sum(link['in_content'] for link in links)
+        same += {link['url'] for link in follow} == scrapy_urls
+
+    print("=" * 72)
+    print(f"LINK EXTRACTION - {args.pages:,} templated fixture pages")
+    print("=" * 72)
+    print(f"{'Method':<34} {'p50 ms':<9} {'p90 ms':<9} {'Mean ms':<9}")
+    print("-" * 72)
+    for name, timings in (
+        ('LinkExtractor (second parse)', scrapy_timings),
+        ('Unified (on the parsed page)', unified_timings),
+    ):
+        percentiles = calculate_percentiles(timings)
+        print(f"{name:<34} {percentiles[50] * 1000:<9.3f} {percentiles[90] * 1000:<9.3f} "
+              f"{sum(timings) / len(timings) * 1000:<9.3f}")
+    print("-" * 72)
+    print(f"Links per page:     {page_links / args.pages:.1f} ({content_links / args.pages:.1f} in main content)")
+    print(f"Same URLs to follow: {same / args.pages:.1%} of pages")
+    print("=" * 72)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Lookuply Near-Duplicate Benchmark
+
+Measure the SimHash near-duplicate detector (NearDuplicatePipeline):
+fingerprint time per page and detection / false positive rates on
+extracted fixture pages with lightly edited copies, then insert rate,
+lookup latency and memory of a SimHashIndex holding millions of
+fingerprints.
+"""
+
+import sys
+import os
+import argparse
+import gc
+import logging
+import random
+import resource
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lookuply_crawler.dedupe import SimHashIndex, get_hash64, simhash
+from lookuply_crawler.spiders.web_spider import WebSpider
+from lookuply_crawler.utils import calculate_percentiles, format_bytes
+from html_fixtures import VOCABULARY, make_corpus, make_response
+
+
+def edit_text(text, language_code, rng, edits):
+    """Replace, insert or delete a few words, as on a reprinted or slightly updated page."""
+    words = text.split()
+    for _ in range(edits):
+        position = rng.randrange(len(words))
+        action = rng.random()
+        if action < 0.4:
+            words[position] = rng.choice(VOCABULARY[language_code])
+        elif action < 0.8:
+            words.insert(position, rng.choice(VOCABULARY[language_code]))
+        elif len(words) > 1:
+            del words[position]
+    return ' '.join(words)
+
+
+def run_detection(pages, distance, edits):
+    """Fingerprint fixture pages and edited copies; return result row."""
+    spider = WebSpider()
+    rng = random.Random(7)
+    hash_func = get_hash64()
+
+    texts = []
+    for language_code, url, html in make_corpus(pages):
+        item = spider.extract_content(make_response(url, html))
+        texts.append((language_code, url, item['text']))
+
+    indexes = {}
+    timings = []
+    false_positives = detected = 0
+
+    for language_code, url, text in texts:
+        index = indexes.setdefault(language_code, SimHashIndex(distance))
+        started = time.perf_counter()
+        fingerprint = simhash(text, hash_func=hash_func)
+        timings.append(time.perf_counter() - started)
+        if index.find(fingerprint) is not None:
+            false_positives += 1
+        else:
+            index.add(fingerprint, url)
+
+    for language_code, url, text in texts:
+        fingerprint = simhash(edit_text(text, language_code, rng, edits), hash_func=hash_func)
+        match = indexes[language_code].find(fingerprint)
+        if match is not None and match[1] == url:
+            detected += 1
+
+    words = sum(len(text.split()) for _, _, text in texts) / len(texts)
+    return timings, words, detected, false_positives
+
+
+def run_index(size, distance, lookups):
+    """Fill an index with random fingerprints; return insert rate, lookup timings, memory."""
+    rng = random.Random(42)
+    fingerprints = [rng.getrandbits(64) for _ in range(size)]
+
+    gc.collect()
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    index = SimHashIndex(distance, maxsize=size)
+    started = time.perf_counter()
+    for i, fingerprint in enumerate(fingerprints):
+        index.add(fingerprint, i)
+    insert_seconds = time.perf_counter() - started
+    memory = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before) * 1024
+
+    hits = []
+    misses = []
+    found = 0
+    for _ in range(lookups):
+        # Stored fingerprint with up to `distance` bits flipped
+        query = rng.choice(fingerprints)
+        for bit in rng.sample(range(64), rng.randint(0, distance)):
+            query ^= 1 << bit
+        started = time.perf_counter()
+        found += index.find(query) is not None
+        hits.append(time.perf_counter() - started)
+
+        query = rng.getrandbits(64)
+        started = time.perf_counter()
+        index.find(query)
+        misses.append(time.perf_counter() - started)
+
+    return size / insert_seconds, hits, misses, found, memory
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Benchmark SimHash near-duplicate detection')
+
+    parser.add_argument(
+        '--pages',
+        type=int,
+        help='Number of fixture pages',
+        default=600
+    )
+
+    parser.add_argument(
+        '--index-size',
+        type=int,
+        help='Number of fingerprints in the index benchmark',
+        default=1000000
+    )
+
+    parser.add_argument(
+        '--lookups',
+        type=int,
+        help='Number of index lookups',
+        default=100000
+    )
+
+    parser.add_argument(
+        '--distance',
+        type=int,
+        help='Maximum differing bits (NEAR_DUPLICATE_DISTANCE)',
+        default=5
+    )
+
+    parser.add_argument(
+        '--edits',
+        type=int,
+        help='Word edits per near-duplicate copy',
+        default=3
+    )
+
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    timings, words, detected, false_positives = run_detection(args.pages, args.distance, args.edits)
+    fingerprint = calculate_percentiles([t * 1e6 for t in timings])
+
+    insert_rate, hits, misses, found, memory = run_index(args.index_size, args.distance, args.lookups)
+    hit = calculate_percentiles([t * 1e6 for t in hits])
+    miss = calculate_percentiles([t * 1e6 for t in misses])
+
+    print("=" * 72)
+    print(f"NEAR-DUPLICATE BENCHMARK - distance {args.distance}, hash {get_hash64().__name__}")
+    print("=" * 72)
+    print(f"Fixture pages:      {args.pages:,} ({words:,.0f} words of text on average)")
+    print(f"Fingerprint:        p50 {fingerprint[50]:.0f} µs, p99 {fingerprint[99]:.0f} µs per page")
+    print(f"Detected:           {detected:,} of {args.pages:,} copies with {args.edits} word edits")
+    print(f"False positives:    {false_positives:,} of {args.pages:,} distinct pages")
+    print("-" * 72)
+    print(f"Index:              {args.index_size:,} fingerprints, {format_bytes(memory)} "
+          f"({memory / args.index_size:.0f} bytes each)")
+    print(f"Insert:             {insert_rate:,.0f} fingerprints/s")
+    print(f"Lookup (near hit):  p50 {hit[50]:.1f} µs, p99 {hit[99]:.1f} µs "
+          f"({found:,} of {args.lookups:,} found)")
+    print(f"Lookup (miss):      p50 {miss[50]:.1f} µs, p99 {miss[99]:.1f} µs")
+    print("=" * 72)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
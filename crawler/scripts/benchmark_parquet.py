@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Lookuply Parquet Benchmark
+
+Compare reading column subsets from the Parquet dataset (ParquetPipeline)
+with reading the same pages from per-language JSON Lines files
+(JsonLinesPipeline), which must parse every field of every record.
+"""
+
+import sys
+import os
+import argparse
+import random
+import shutil
+import tempfile
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lookuply_crawler.serialization import get_serializer
+from lookuply_crawler.storage import JsonLinesWriter, ParquetDatasetWriter, find_jsonl_files, open_jsonl
+from lookuply_crawler.utils import format_bytes
+from benchmark_storage import LANGUAGES, disk_usage, make_page
+
+# Query name -> columns (None = all columns)
+QUERIES = {
+    'url+title': ['url', 'title'],
+    'domain+language': ['domain', 'language_code'],
+    'links (nested)': ['url', 'links'],
+    'text': ['text'],
+    'all columns': None,
+}
+
+
+def write_jsonl(pages, directory, compression=None):
+    """Write pages as per-language JSON Lines files."""
+    serializer = get_serializer()
+    writers = {}
+    for page in pages:
+        lang = page['language_code']
+        if lang not in writers:
+            writers[lang] = JsonLinesWriter(directory, lang, compression=compression)
+        writers[lang].write(serializer.dumps(page))
+    for writer in writers.values():
+        writer.close()
+
+
+def write_parquet(pages, directory, row_group_size):
+    """Write pages as a partitioned Parquet dataset."""
+    writer = ParquetDatasetWriter(directory, row_group_size=row_group_size)
+    for page in pages:
+        writer.write(page)
+    writer.close()
+
+
+def scan_jsonl(directory, columns):
+    """Read selected fields from all JSON Lines files; return row count."""
+    serializer = get_serializer()
+    rows = 0
+    for lang in LANGUAGES:
+        for path in find_jsonl_files(directory, lang):
+            with open_jsonl(path) as f:
+                for line in f:
+                    record = serializer.loads(line)
+                    if columns is not None:
+                        record = {column: record.get(column) for column in columns}
+                    rows += 1
+    return rows
+
+
+def scan_parquet(directory, columns):
+    """Read selected columns from the Parquet dataset; return row count."""
+    import pyarrow.parquet as pq
+
+    return pq.read_table(directory, columns=columns).num_rows
+
+
+def timed(func, *args, repeat=3):
+    """Return (best seconds, result) over repeat runs."""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func(*args)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Benchmark Parquet column scans against JSON Lines')
+
+    parser.add_argument(
+        '--pages',
+        type=int,
+        help='Number of pages to write',
+        default=20000
+    )
+
+    parser.add_argument(
+        '--row-group-size',
+        type=int,
+        help='Parquet records per row group',
+        default=1000
+    )
+
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    pages = [make_page(i, rng.choice(LANGUAGES), rng) for i in range(args.pages)]
+
+    base_dir = tempfile.mkdtemp(prefix='lookuply_parquet_')
+    jsonl_dir = os.path.join(base_dir, 'jsonl')
+    jsonl_zst_dir = os.path.join(base_dir, 'jsonl_zst')
+    parquet_dir = os.path.join(base_dir, 'parquet')
+
+    try:
+        write_seconds = {}
+        write_seconds['jsonl'], _ = timed(write_jsonl, pages, jsonl_dir, repeat=1)
+        write_seconds['jsonl.zst'], _ = timed(write_jsonl, pages, jsonl_zst_dir, 'zstd', repeat=1)
+        write_seconds['parquet'], _ = timed(write_parquet, pages, parquet_dir, args.row_group_size, repeat=1)
+
+        print("=" * 78)
+        print(f"PARQUET BENCHMARK - {args.pages:,} pages")
+        print("=" * 78)
+        print(f"{'Format':<14} {'On disk':<12} {'Write pages/sec':<16}")
+        print("-" * 78)
+        for name, directory in (('jsonl', jsonl_dir), ('jsonl.zst', jsonl_zst_dir), ('parquet', parquet_dir)):
+            allocated, _, _ = disk_usage(directory)
+            print(f"{name:<14} {format_bytes(allocated):<12} {args.pages / write_seconds[name]:<16,.0f}")
+
+        print()
+        print(f"{'Query':<18} {'JSONL s':<10} {'JSONL.zst s':<12} {'Parquet s':<10} {'Speedup':<8}")
+        print("-" * 78)
+        for name, columns in QUERIES.items():
+            jsonl_seconds, jsonl_rows = timed(scan_jsonl, jsonl_dir, columns)
+            zst_seconds, _ = timed(scan_jsonl, jsonl_zst_dir, columns)
+            parquet_seconds, parquet_rows = timed(scan_parquet, parquet_dir, columns)
+            assert jsonl_rows == parquet_rows == args.pages
+            print(
+                f"{name:<18} {jsonl_seconds:<10.3f} {zst_seconds:<12.3f} {parquet_seconds:<10.3f} "
+                f"{jsonl_seconds / parquet_seconds:<8.1f}x"
+            )
+
+        print("=" * 78)
+
+    finally:
+        shutil.rmtree(base_dir, ignore_errors=True)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Lookuply Parse Budget Benchmark
+
+Run BaseSpider.extract_content over normal and pathological pages (very
+large, very many elements, deeply nested) without and with a
+ParseBudget: extraction time per page, how the budgeted pages were
+degraded, and what text and metadata they kept.
+"""
+
+import sys
+import os
+import argparse
+import logging
+import time
+from collections import Counter
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lookuply_crawler.extractors import ParseBudget
+from lookuply_crawler.spiders.base_spider import BaseSpider
+from lookuply_crawler.utils import calculate_percentiles, format_bytes
+from html_fixtures import LANGUAGES, make_large_html, make_response
+
+HEAD = '<html><head><title>Pathological page {i}</title><meta name="description" content="Fixture"></head><body>'
+
+
+def make_pages(kind, count):
+    """Build `count` (url, html) pages of one kind."""
+    pages = []
+    for i in range(count):
+        url = f'https://budget{i}.example.com/{kind}'
+        if kind == 'normal':
+            pages.append(make_large_html(i, LANGUAGES[i % len(LANGUAGES)], 30000))
+        elif kind == 'large':
+            pages.append(make_large_html(i, LANGUAGES[i % len(LANGUAGES)], 3 * 1024 * 1024))
+        elif kind == 'many nodes':
+            pages.append((url, HEAD.format(i=i) + '<p>' + '<i>w</i> ' * 80000 + '</p></body></html>'))
+        else:
+            depth = 15000
+            pages.append((url, HEAD.format(i=i) + '<div>' * depth + '<p>' + 'nested text ' * 40 + '</p>'
+                          + '</div>' * depth + '</body></html>'))
+    return pages
+
+
+def run(spider, pages):
+    """Extract pages; return timings and items."""
+    timings, items = [], []
+    for url, html in pages:
+        response = make_response(url, html)
+        started = time.perf_counter()
+        items.append(spider.extract_content(response))
+        timings.append(time.perf_counter() - started)
+    return timings, items
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Benchmark extraction of pathological pages with parse budgets')
+
+    parser.add_argument(
+        '--pages',
+        type=int,
+        help='Number of pages per kind',
+        default=6
+    )
+
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    spider = BaseSpider()
+    budget = ParseBudget()
+
+    print("=" * 92)
+    print(f"PARSE BUDGET BENCHMARK - {args.pages} pages per kind, budget {format_bytes(budget.max_bytes)} / "
+          f"{budget.max_nodes:,} elements / {budget.max_seconds:g} s")
+    print("=" * 92)
+    print(f"{'Pages':<12} {'Size':<10} {'Full p50 ms':<12} {'Budget p50 ms':<14} {'Max ms':<8} "
+          f"{'Degraded':<22} {'Text chars':<11} {'Title':<5}")
+    print("-" * 92)
+    for kind in ('normal', 'large', 'many nodes', 'deep nesting'):
+        pages = make_pages(kind, args.pages)
+        size = sum(len(html.encode('utf-8')) for _, html in pages) / len(pages)
+
+        spider.parse_budget = None
+        full_timings, _ = run(spider, pages)
+        spider.parse_budget = budget
+        timings, items = run(spider, pages)
+
+        reasons = Counter(item['parse_degraded'] for item in items if item['parse_degraded'])
+        degraded = ', '.join(f'{reason} {count}' for reason, count in reasons.items()) or '-'
+        text = sum(item['text_length'] for item in items) / len(items)
+        titles = sum(bool(item['title']) for item in items)
+        print(
+            f"{kind:<12} {format_bytes(size):<10} {calculate_percentiles(full_timings)[50] * 1000:<12.0f} "
+            f"{calculate_percentiles(timings)[50] * 1000:<14.0f} {max(timings) * 1000:<8.0f} "
+            f"{degraded:<22} {text:<11,.0f} {titles}/{len(items)}"
+        )
+    print("-" * 92)
+    print("Budget stats: " + ', '.join(f'{key} {value}' for key, value in budget.stats.items()))
+    print("=" * 92)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Lookuply Extraction Profile Benchmark
+
+Run BaseSpider.extract_content with each extraction profile ('minimal',
+'search', 'full') on the multi-language fixture corpus, interleaved per
+page: extraction time per page, fields per item and serialized item
+size.
+"""
+
+import sys
+import os
+import argparse
+import logging
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lookuply_crawler.extractors import EXTRACTION_PROFILES, get_profile_fields
+from lookuply_crawler.serialization import get_serializer
+from lookuply_crawler.spiders.base_spider import BaseSpider
+from lookuply_crawler.utils import calculate_percentiles, format_bytes
+from html_fixtures import make_corpus, make_response
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Benchmark extraction profiles')
+
+    parser.add_argument(
+        '--pages',
+        type=int,
+        help='Number of fixture pages',
+        default=1200
+    )
+
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    spiders = {}
+    for profile in EXTRACTION_PROFILES:
+        spiders[profile] = BaseSpider()
+        spiders[profile].extraction_fields = get_profile_fields(profile)
+
+    serializer = get_serializer()
+    # Profile -> [timings, fields, serialized bytes]
+    results = {profile: [[], 0, 0] for profile in spiders}
+    for _, url, html in make_corpus(args.pages):
+        for profile, spider in spiders.items():
+            response = make_response(url, html)
+            started = time.perf_counter()
+            data = spider.extract_content(response)
+            elapsed = time.perf_counter() - started
+            data.pop('page_links')
+
+            row = results[profile]
+            row[0].append(elapsed)
+            row[1] += len(data)
+            row[2] += len(serializer.dumps(data))
+
+    full_mean = sum(results['full'][0]) / args.pages
+    print("=" * 78)
+    print(f"EXTRACTION PROFILES - {args.pages:,} fixture pages, per page")
+    print("=" * 78)
+    print(f"{'Profile':<10} {'p50 ms':<9} {'p90 ms':<9} {'Mean ms':<9} {'vs full':<9} {'Fields':<8} {'Item size':<10}")
+    print("-" * 78)
+    for profile, (timings, fields, size) in results.items():
+        percentiles = calculate_percentiles(timings)
+        mean = sum(timings) / len(timings)
+        print(
+            f"{profile:<10} {percentiles[50] * 1000:<9.2f} {percentiles[90] * 1000:<9.2f} {mean * 1000:<9.2f} "
+            f"{mean / full_mean:<9.0%} {fields / args.pages:<8.0f} {format_bytes(size / args.pages):<10}"
+        )
+    print("=" * 78)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
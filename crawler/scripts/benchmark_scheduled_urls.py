@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Lookuply Scheduled URL Cache Benchmark
+
+Follow the links of simulated site pages (repeated navigation links plus
+article links) the way WebSpider.parse does: build a Request for every
+link and let Scrapy's dupefilter drop the duplicates, or check
+ScheduledUrlCache first and build Requests only for links not scheduled
+recently. Reports time per page, Requests built and how many URLs the
+dupefilter lets through with each (they must match).
+"""
+
+import sys
+import os
+import argparse
+import logging
+import random
+import time
+import warnings
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scrapy
+from scrapy.dupefilters import RFPDupeFilter
+from scrapy.exceptions import ScrapyDeprecationWarning
+from scrapy.utils.request import RequestFingerprinter
+
+from lookuply_crawler.cache import ScheduledUrlCache
+from lookuply_crawler.utils import calculate_percentiles
+
+
+def make_pages(rng, pages, hosts, nav_links, article_links, articles):
+    """Link lists of crawled pages, interleaved across hosts: [(page url, [(url, host)])]."""
+    sites = []
+    for h in range(hosts):
+        host = f'www.site{h}.example'
+        nav = [(f'https://{host}/section/{i}', host) for i in range(nav_links)]
+        sites.append((host, nav))
+
+    result = []
+    for p in range(pages):
+        host, nav = sites[rng.randrange(hosts)]
+        links = list(nav)
+        for _ in range(article_links):
+            links.append((f'https://{host}/article/{rng.randrange(articles)}', host))
+        result.append((f'https://{host}/page/{p}', links))
+    return result
+
+
+def follow(pages, cache=None):
+    """Build follow-up Requests for every page; returns (timings, built, scheduled URLs)."""
+    dupefilter = RFPDupeFilter(fingerprinter=RequestFingerprinter())
+    timings = []
+    built = 0
+    scheduled = []
+    for page_url, links in pages:
+        started = time.perf_counter()
+        for url, host in links:
+            if cache is not None and not cache.schedule(url, host):
+                continue
+
+            request = scrapy.Request(
+                url=url,
+                meta={
+                    'depth': 1,
+                    'referrer': page_url,
+                },
+            )
+            built += 1
+            if not dupefilter.request_seen(request):
+                scheduled.append(url)
+        timings.append(time.perf_counter() - started)
+    return timings, built, scheduled
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Benchmark skipping recently scheduled links before building Requests')
+
+    parser.add_argument(
+        '--pages',
+        type=int,
+        help='Number of crawled pages',
+        default=5000
+    )
+
+    parser.add_argument(
+        '--hosts',
+        type=int,
+        help='Number of sites',
+        default=50
+    )
+
+    parser.add_argument(
+        '--nav-links',
+        type=int,
+        help='Navigation links repeated on every page of a site',
+        default=40
+    )
+
+    parser.add_argument(
+        '--article-links',
+        type=int,
+        help='Article links per page',
+        default=20
+    )
+
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+    # The default fingerprinter warns about its implementation without a crawler
+    warnings.filterwarnings('ignore', category=ScrapyDeprecationWarning)
+
+    rng = random.Random(42)
+    pages = make_pages(rng, args.pages, args.hosts, args.nav_links, args.article_links, articles=5000)
+    links = sum(len(page_links) for _, page_links in pages)
+
+    cache = ScheduledUrlCache()
+    results = [
+        ('Request + dupefilter', follow(pages)),
+        ('ScheduledUrlCache first', follow(pages, cache)),
+    ]
+
+    print("=" * 78)
+    print(f"SCHEDULED URL CACHE - {args.pages:,} pages on {args.hosts} sites, {links / args.pages:.0f} links per page")
+    print("=" * 78)
+    print(f"{'Method':<26} {'p50 ms':<9} {'p90 ms':<9} {'Total s':<9} {'Requests':<10} {'Scheduled':<10}")
+    print("-" * 78)
+    for name, (timings, built, scheduled) in results:
+        percentiles = calculate_percentiles(timings)
+        print(f"{name:<26} {percentiles[50] * 1000:<9.3f} {percentiles[90] * 1000:<9.3f} "
+              f"{sum(timings):<9.2f} {built:<10,} {len(scheduled):<10,}")
+    print("-" * 78)
+    avoided = results[0][1][1] - results[1][1][1]
+    print(f"Requests avoided:   {avoided:,} ({avoided / results[0][1][1]:.1%})")
+    print(f"Same URLs scheduled: {results[0][1][2] == results[1][1][2]}")
+    print(f"Cache:              {len(cache):,} URL hashes, stats {cache.stats}")
+    print("=" * 78)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
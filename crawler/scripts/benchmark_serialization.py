@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Lookuply Serialization Benchmark
+
+Compare the SERIALIZER choices on realistic page items: encode and decode
+throughput and encoded size, against the previous json.dumps() layouts
+(default separators for JSON Lines, indent=2 for page files).
+"""
+
+import sys
+import os
+import argparse
+import json
+import random
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lookuply_crawler.serialization import SERIALIZERS, get_serializer
+from lookuply_crawler.utils import format_bytes
+from benchmark_storage import LANGUAGES, make_page
+
+
+def previous_dumps(indent=None):
+    """Encoder used before SERIALIZER existed (str output, encoded when written)."""
+    return lambda obj: json.dumps(obj, ensure_ascii=False, indent=indent).encode('utf-8')
+
+
+def timed(func, items, repeat=3):
+    """Return (best seconds, results) of applying func to every item."""
+    best = None
+    results = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        results = [func(item) for item in items]
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, results
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Benchmark Lookuply item serializers')
+
+    parser.add_argument(
+        '--items',
+        type=int,
+        help='Number of page items to encode',
+        default=5000
+    )
+
+    parser.add_argument(
+        '--repeat',
+        type=int,
+        help='Runs per measurement (best is reported)',
+        default=3
+    )
+
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    items = [make_page(i, rng.choice(LANGUAGES), rng) for i in range(args.items)]
+
+    candidates = {
+        'json (previous)': (previous_dumps(), json.loads),
+        'json indent=2 (previous)': (previous_dumps(indent=2), json.loads),
+    }
+    for name in SERIALIZERS:
+        try:
+            serializer = get_serializer(name)
+        except ImportError:
+            print(f"Skipping {name} (not installed)")
+            continue
+        candidates[name] = (serializer.dumps, serializer.loads)
+
+    print("=" * 82)
+    print(f"SERIALIZATION BENCHMARK - {args.items:,} items, 'auto' = {get_serializer().name}")
+    print("=" * 82)
+    print(f"{'Serializer':<26} {'Encode/sec':<12} {'Encode MB/s':<12} {'Decode/sec':<12} {'Bytes/item':<12} {'Total':<10}")
+    print("-" * 82)
+
+    for name, (dumps, loads) in candidates.items():
+        encode_seconds, encoded = timed(dumps, items, args.repeat)
+        decode_seconds, decoded = timed(loads, encoded, args.repeat)
+        assert decoded[0] == items[0]
+
+        total = sum(len(data) for data in encoded)
+        print(
+            f"{name:<26} {args.items / encode_seconds:<12,.0f} {total / encode_seconds / 1e6:<12,.1f} "
+            f"{args.items / decode_seconds:<12,.0f} {total / args.items:<12,.0f} {format_bytes(total):<10}"
+        )
+
+    print("=" * 82)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Lookuply Storage Benchmark
+
+Compare page storage layouts: write throughput (pages/sec), disk usage,
+file count and load_page latency for a synthetic multi-language crawl.
+"""
+
+import sys
+import os
+import argparse
+import random
+import shutil
+import tempfile
+import time
+from datetime import datetime
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lookuply_crawler.storage import FileStorage, SegmentStorage
+from lookuply_crawler.utils import format_bytes, get_url_hash
+
+LANGUAGES = ['en', 'de', 'fr', 'es', 'pl']
+LANGUAGE_NAMES = {'en': 'English', 'de': 'German', 'fr': 'French', 'es': 'Spanish', 'pl': 'Polish'}
+
+WORDS = (
+    'privacy search engine open source independent information people data '
+    'europe language crawler index content web page article news research '
+    'community project software network public service quality result'
+).split()
+
+
+def make_page(i, language_code='en', rng=None):
+    """
+    Build a realistic WebPageItem-like page dictionary.
+
+    Args:
+        i: Page number (makes the URL unique)
+        language_code: Language code
+        rng: random.Random instance (for reproducible content)
+
+    Returns:
+        dict: Page data
+    """
+    rng = rng or random.Random(i)
+    domain = f'site{i % 500}.example.{language_code}'
+
+    def sentence(words):
+        return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize() + '.'
+
+    paragraphs = [' '.join(sentence(rng.randint(8, 20)) for _ in range(rng.randint(2, 6)))
+                  for _ in range(rng.randint(4, 12))]
+    text = '\n\n'.join(paragraphs)
+    links = []
+    for _ in range(rng.randint(20, 80)):
+        link_domain = domain if rng.random() < 0.7 else f'other{rng.randint(0, 50)}.example.com'
+        links.append({
+            'url': f'https://{link_domain}/page/{rng.randint(0, 10 ** 6)}',
+            'text': sentence(rng.randint(1, 4)),
+            'domain': link_domain,
+        })
+
+    return {
+        'url': f'https://{domain}/articles/{i}',
+        'domain': domain,
+        'canonical_url': f'https://{domain}/articles/{i}',
+        'title': sentence(6),
+        'description': sentence(20),
+        'text': text,
+        'text_length': len(text),
+        'paragraphs': paragraphs,
+        'headings': [{'level': 1, 'text': sentence(5)}] + [{'level': 2, 'text': sentence(4)} for _ in range(3)],
+        'language_code': language_code,
+        'language_confidence': round(rng.uniform(0.8, 1.0), 4),
+        'language_name': LANGUAGE_NAMES.get(language_code, language_code),
+        'keywords': rng.sample(WORDS, 5),
+        'author': '',
+        'published_date': '',
+        'modified_date': '',
+        'og_metadata': {'title': sentence(6), 'type': 'article', 'url': f'https://{domain}/articles/{i}'},
+        'twitter_metadata': {},
+        'links': links,
+        'internal_links_count': sum(1 for link in links if link['domain'] == domain),
+        'external_links_count': sum(1 for link in links if link['domain'] != domain),
+        'status_code': 200,
+        'content_type': 'text/html; charset=utf-8',
+        'encoding': 'utf-8',
+        'favicon': f'https://{domain}/favicon.ico',
+        'crawled_at': datetime.utcnow().isoformat(),
+        'crawl_depth': rng.randint(0, 3),
+        'referrer': f'https://{domain}/',
+        'is_valid': True,
+        'is_eu_language': True,
+    }
+
+
+def disk_usage(directory):
+    """Return (allocated bytes, apparent bytes, file count) for a directory tree."""
+    allocated = apparent = files = 0
+    for root, _, filenames in os.walk(directory):
+        for filename in filenames:
+            st = os.stat(os.path.join(root, filename))
+            allocated += st.st_blocks * 512
+            apparent += st.st_size
+            files += 1
+    return allocated, apparent, files
+
+
+def run_backend(name, storage_factory, pages, batch_size, lookups):
+    """Write pages with one backend and measure it."""
+    directory = tempfile.mkdtemp(prefix=f'lookuply_storage_{name}_')
+
+    try:
+        storage = storage_factory(directory)
+
+        started = time.perf_counter()
+        for start in range(0, len(pages), batch_size):
+            batch = pages[start:start + batch_size]
+            for language_code in LANGUAGES:
+                lang_pages = [p for p in batch if p['language_code'] == language_code]
+                if batch_size == 1:
+                    for page in lang_pages:
+                        storage.save_page(page, language_code)
+                elif lang_pages:
+                    storage.save_batch(lang_pages, language_code)
+        storage.close()
+        write_seconds = time.perf_counter() - started
+
+        allocated, apparent, files = disk_usage(directory)
+
+        sample = random.Random(0).sample(pages, min(lookups, len(pages)))
+        started = time.perf_counter()
+        for page in sample:
+            storage.load_page(page['language_code'], get_url_hash(page['url']))
+        lookup_ms = (time.perf_counter() - started) / max(len(sample), 1) * 1000
+
+        return {
+            'pages_per_sec': len(pages) / write_seconds if write_seconds else 0.0,
+            'allocated': allocated,
+            'apparent': apparent,
+            'files': files,
+            'lookup_ms': lookup_ms,
+        }
+
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Benchmark Lookuply page storage layouts')
+
+    parser.add_argument(
+        '--pages',
+        type=int,
+        help='Number of pages to write',
+        default=20000
+    )
+
+    parser.add_argument(
+        '--batch-size',
+        type=int,
+        help='Pages per save_batch call (1 = save_page per page)',
+        default=1
+    )
+
+    parser.add_argument(
+        '--lookups',
+        type=int,
+        help='Number of load_page lookups to time',
+        default=200
+    )
+
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    pages = [make_page(i, rng.choice(LANGUAGES), rng) for i in range(args.pages)]
+
+    backends = {
+        'files': lambda d: FileStorage(d, index=False),
+        'files+index': FileStorage,
+        'segments': lambda d: SegmentStorage(d, index=False),
+        'segments+index': SegmentStorage,
+    }
+
+    print("=" * 82)
+    print(f"STORAGE BENCHMARK - {args.pages:,} pages, batch size {args.batch_size}")
+    print("=" * 82)
+    print(f"{'Backend':<16} {'Pages/sec':<12} {'On disk':<12} {'Apparent':<12} {'Files':<10} {'Lookup ms':<10}")
+    print("-" * 82)
+
+    for name, factory in backends.items():
+        result = run_backend(name, factory, pages, args.batch_size, args.lookups)
+        print(
+            f"{name:<16} {result['pages_per_sec']:<12,.0f} {format_bytes(result['allocated']):<12} "
+            f"{format_bytes(result['apparent']):<12} {result['files']:<10,} {result['lookup_ms']:<10.3f}"
+        )
+
+    print("=" * 82)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Lookuply Host Cache Benchmark
+
+Extract a templated multi-site fixture corpus with the generic
+boilerplate and main content heuristics, with learned per-host
+templates (TemplateCache), remembered content containers
+(SelectorCache) and both: extraction time per page, extracted text and
+how often it agrees with the generic extractor, then the size of the
+persisted caches.
+"""
+
+import sys
+import os
+import argparse
+import logging
+import tempfile
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lookuply_crawler.extractors import ContentExtractor, SelectorCache, TemplateCache
+from lookuply_crawler.utils import calculate_percentiles, format_bytes
+from html_fixtures import make_corpus
+
+
+def run_extractors(extractors, corpus):
+    """Extract all pages with each extractor in turn; return {name: (timings, texts)}."""
+    results = {name: ([], []) for name in extractors}
+    for _, url, html in corpus:
+        for name, extractor in extractors.items():
+            started = time.perf_counter()
+            content = extractor.extract(html, url)
+            results[name][0].append(time.perf_counter() - started)
+            results[name][1].append(content['text'])
+    return results
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Benchmark per-host extraction caches against the generic heuristics')
+
+    parser.add_argument(
+        '--pages',
+        type=int,
+        help='Number of fixture pages',
+        default=1200
+    )
+
+    parser.add_argument(
+        '--sites',
+        type=int,
+        help='Number of sites the pages are spread over',
+        default=24
+    )
+
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    corpus = make_corpus(args.pages, sites=args.sites, templated=True)
+    # Pages extracted after every host was seen min_pages times
+    learned = list(range(args.sites * TemplateCache().min_pages, len(corpus)))
+
+    modes = {
+        'generic': {},
+        'template': {'template_cache': TemplateCache()},
+        'selector': {'selector_cache': SelectorCache()},
+        'both': {'template_cache': TemplateCache(), 'selector_cache': SelectorCache()},
+    }
+    results = run_extractors({name: ContentExtractor(**caches) for name, caches in modes.items()}, corpus)
+    generic_texts = results['generic'][1]
+
+    print("=" * 86)
+    print(f"HOST CACHE BENCHMARK - {args.pages:,} pages on {args.sites} sites")
+    print("=" * 86)
+    print(f"{'Mode':<10} {'p50 ms':<9} {'p90 ms':<9} {'Mean ms':<9} {'Learned p50':<12} {'Text chars':<11} {'Same text':<10}")
+    print("-" * 86)
+    for name, (timings, texts) in results.items():
+        percentiles = calculate_percentiles(timings)
+        learned_p50 = calculate_percentiles([timings[i] for i in learned])[50]
+        same = sum(generic_texts[i] == texts[i] for i in learned)
+        print(
+            f"{name:<10} {percentiles[50] * 1000:<9.2f} {percentiles[90] * 1000:<9.2f} "
+            f"{sum(timings) / len(timings) * 1000:<9.2f} {learned_p50 * 1000:<12.2f} "
+            f"{sum(map(len, texts)) / len(texts):<11,.0f} {same / len(learned):<10.1%}"
+        )
+    print("-" * 86)
+
+    template_cache = modes['both']['template_cache']
+    selector_cache = modes['both']['selector_cache']
+    print(f"Template applied:  {template_cache.stats['applied']:,} pages, "
+          f"{template_cache.stats['blocks_removed']:,} blocks removed, {template_cache.stats['fallbacks']:,} fallbacks")
+    print(f"Selector hits:     {selector_cache.stats['hits']:,} ({selector_cache.hit_rate:.1%}), "
+          f"{selector_cache.stats['invalid']:,} invalidated")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for cache_class, cache, name in (
+            (TemplateCache, template_cache, 'templates.json'),
+            (SelectorCache, selector_cache, 'selectors.json'),
+        ):
+            cache.cache_file = os.path.join(tmp_dir, name)
+            cache.save()
+            reloaded = len(cache_class(cache_file=cache.cache_file).hosts)
+            print(f"Persisted {name + ':':<16} {format_bytes(os.path.getsize(cache.cache_file))} for {reloaded} hosts")
+    print("=" * 86)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Lookuply HTML Fixtures
+
+Synthetic multi-language article pages for extraction and item size
+benchmarks: boilerplate (navigation, sidebar, footer), headings,
+paragraphs, in-content and navigation links.
+"""
+
+import random
+
+# Language code -> vocabulary of common words
+VOCABULARY = {
+    'en': (
+        'the people search engine privacy information about their data open source independent '
+        'community project public service research news article language europe quality result '
+        'and with from this that which because many every important new'
+    ).split(),
+    'de': (
+        'die der das und mit von für eine nicht auch werden suchmaschine datenschutz informationen '
+        'menschen daten offene quellen unabhängige gemeinschaft projekt öffentliche forschung '
+        'nachrichten artikel sprache europa qualität ergebnis wichtig neue'
+    ).split(),
+    'fr': (
+        'le la les des une pour avec dans sur qui est pas moteur recherche vie privée informations '
+        'personnes données logiciel libre indépendant communauté projet service public article '
+        'langue europe qualité résultat important nouveau'
+    ).split(),
+    'es': (
+        'el la los las una para con por que del motor búsqueda privacidad información personas '
+        'datos software libre independiente comunidad proyecto servicio público investigación '
+        'noticias artículo idioma europa calidad resultado importante nuevo también porque muy '
+        'cuando donde según están hacia ciudadanos nuestro puede hay sobre entre gobierno'
+    ).split(),
+    'pl': (
+        'się nie jest oraz dla przez które wyszukiwarka prywatność informacje ludzie dane otwarte '
+        'oprogramowanie niezależna społeczność projekt usługa publiczna badania wiadomości artykuł '
+        'język europa jakość wynik ważne nowe że jak już tylko może przed bardzo które także '
+        'jego został będzie między rząd obywatele naszych gdzie'
+    ).split(),
+    'it': (
+        'il la gli delle una per con che non sono motore ricerca privacy informazioni persone dati '
+        'software libero indipendente comunità progetto servizio pubblico notizie articolo lingua '
+        'europa qualità risultato importante nuovo anche perché della degli questo sono stato '
+        'essere molto nella alla cittadini governo nostro può dove tra'
+    ).split(),
+}
+
+LANGUAGES = list(VOCABULARY)
+
+# Main content containers of templated sites; the last one is not matched
+# by ContentExtractor's heuristics (falls back to body)
+CONTAINERS = [
+    ('article', ''),
+    ('main', ''),
+    ('div', ' class="content"'),
+    ('div', ' class="post"'),
+    ('div', ' class="story-body"'),
+]
+
+
+def make_html(i, language_code='en', rng=None, sites=200, templated=False):
+    """
+    Build a realistic article page.
+
+    Args:
+        i: Page number (makes the URL unique)
+        language_code: Language code (key of VOCABULARY)
+        rng: random.Random instance (for reproducible content)
+        sites: Number of sites pages are spread over
+        templated: Same navigation, toolbar, sidebar, cookie banner, footer and content
+            container (see CONTAINERS) on all pages of a site
+
+    Returns:
+        tuple: (url, html)
+    """
+    rng = rng or random.Random(i)
+    words = VOCABULARY[language_code]
+    domain = f'site{i % sites}.example.{language_code}'
+    url = f'https://{domain}/articles/{i}'
+    page_rng = rng
+    if templated:
+        rng = random.Random(domain)
+
+    def sentence(count):
+        return ' '.join(rng.choice(words) for _ in range(count)).capitalize() + '.'
+
+    def link(internal=True):
+        host = domain if internal else f'other{rng.randint(0, 50)}.example.com'
+        return f'<a href="https://{host}/page/{rng.randint(0, 10 ** 6)}">{sentence(rng.randint(1, 4))}</a>'
+
+    nav = ''.join(f'<li><a href="/section/{n}">{sentence(1)}</a></li>' for n in range(rng.randint(8, 20)))
+    sidebar = ''.join(f'<li>{link()}</li>' for _ in range(rng.randint(5, 15)))
+    footer = ' '.join(link(internal=False) for _ in range(rng.randint(3, 8)))
+    cookie_banner = sentence(12) if templated else None
+    container, attributes = rng.choice(CONTAINERS) if templated else ('article', '')
+    toolbar = ''
+    if templated:
+        # Site chrome without nav/menu/sidebar markup, which the class/id patterns miss
+        toolbar = (
+            f'<div class="toolbar"><p>{sentence(10)}</p><ul>'
+            + ''.join(f'<li>{link()}</li>' for _ in range(rng.randint(6, 12)))
+            + '</ul></div>'
+        )
+    rng = page_rng
+
+    sections = []
+    for _ in range(rng.randint(2, 5)):
+        paragraphs = []
+        for _ in range(rng.randint(2, 5)):
+            body = ' '.join(sentence(rng.randint(8, 20)) for _ in range(rng.randint(2, 6)))
+            if rng.random() < 0.5:
+                body += ' ' + link(internal=rng.random() < 0.7)
+            paragraphs.append(f'<p>{body}</p>')
+        sections.append(f'<h2>{sentence(4)}</h2>' + ''.join(paragraphs))
+
+    related = ''.join(f'<li>{link(internal=rng.random() < 0.7)}</li>' for _ in range(rng.randint(5, 30)))
+
+    html = (
+        f'<!DOCTYPE html><html lang="{language_code}"><head><meta charset="utf-8">'
+        f'<title>{sentence(6)}</title>'
+        f'<meta name="description" content="{sentence(20)}">'
+        f'<meta name="keywords" content="{", ".join(rng.sample(words, 5))}">'
+        f'<meta property="og:title" content="{sentence(6)}"><meta property="og:type" content="article">'
+        f'<link rel="canonical" href="{url}"><link rel="icon" href="/favicon.ico">'
+        f'<script>var analytics = {{"page": {i}}};</script><style>body {{ margin: 0; }}</style></head>'
+        f'<body><header><nav><ul>{nav}</ul></nav></header>'
+        f'{toolbar}<div class="layout"><aside class="sidebar"><ul>{sidebar}</ul></aside>'
+        f'<{container}{attributes}><h1>{sentence(5)}</h1>{"".join(sections)}<ul>{related}</ul></{container}></div>'
+        f'<div class="cookie-banner">{cookie_banner or sentence(12)}</div>'
+        f'<footer>{footer}</footer></body></html>'
+    )
+    return url, html
+
+
+def make_corpus(pages, seed=42, sites=200, templated=False):
+    """
+    Build a multi-language fixture corpus.
+
+    Args:
+        pages: Number of pages
+        seed: Random seed
+        sites: Number of sites pages are spread over
+        templated: Per-site templates (see make_html)
+
+    Returns:
+        list: (language_code, url, html) tuples, languages in rotation
+    """
+    rng = random.Random(seed)
+    corpus = []
+    for i in range(pages):
+        language_code = LANGUAGES[i % len(LANGUAGES)]
+        url, html = make_html(i, language_code, rng, sites, templated)
+        corpus.append((language_code, url, html))
+    return corpus
+
+
+def make_large_html(i, language_code, size):
+    """
+    Build a fixture page whose article is padded to about `size` bytes.
+
+    Args:
+        i: Page number (seeds the page)
+        language_code: Language of the page
+        size: Target size in bytes (UTF-8)
+
+    Returns:
+        tuple: (url, html)
+    """
+    rng = random.Random(i)
+    url, html = make_html(i, language_code, rng)
+    sections = []
+    padding = 0
+    while len(html.encode('utf-8')) + padding < size:
+        _, other = make_html(i, language_code, rng)
+        start = other.index('<h2>')
+        section = other[start:other.index('<ul>', start)]
+        sections.append(section)
+        padding += len(section.encode('utf-8'))
+    return url, html.replace('</article>', ''.join(sections) + '</article>')
+
+
+def make_response(url, html):
+    """Wrap fixture HTML in a Scrapy HtmlResponse."""
+    from scrapy.http import HtmlResponse, Request
+
+    return HtmlResponse(
+        url=url,
+        body=html.encode('utf-8'),
+        encoding='utf-8',
+        headers={'Content-Type': 'text/html; charset=utf-8'},
+        request=Request(url, meta={'depth': 1}),
+    )
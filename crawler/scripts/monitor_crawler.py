@@ -17,7 +17,7 @@ from datetime import datetime
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from lookuply_crawler.config import LANGUAGES
-from lookuply_crawler.storage import FileStorage
+from lookuply_crawler.storage import FileStorage, SegmentStorage, find_jsonl_files, open_jsonl
 from lookuply_crawler.utils import format_bytes, format_duration
 
 
@@ -27,13 +27,13 @@ def clear_screen():
 
 
 def count_pages_in_jsonl(jsonl_file):
-    """Count pages in a JSONL file."""
+    """Count pages in a (possibly compressed) JSONL file."""
     if not os.path.exists(jsonl_file):
         return 0
 
     count = 0
     try:
-        with open(jsonl_file, 'r', encoding='utf-8') as f:
+        with open_jsonl(jsonl_file) as f:
             for line in f:
                 if line.strip():
                     count += 1
@@ -64,11 +64,12 @@ def monitor_jsonl(output_dir, watch=False, interval=5):
         lang_stats = []
 
         for lang_code in LANGUAGES.keys():
-            jsonl_file = output_path / f"{lang_code}.jsonl"
-            page_count = count_pages_in_jsonl(jsonl_file)
+            # Plain file or rotated/compressed segments
+            jsonl_files = find_jsonl_files(output_path, lang_code)
+            page_count = sum(count_pages_in_jsonl(f) for f in jsonl_files)
 
             if page_count > 0:
-                file_size = jsonl_file.stat().st_size if jsonl_file.exists() else 0
+                file_size = sum(f.stat().st_size for f in jsonl_files)
                 lang_stats.append({
                     'code': lang_code,
                     'name': LANGUAGES[lang_code]['name'],
@@ -105,10 +106,19 @@ def monitor_jsonl(output_dir, watch=False, interval=5):
             break
 
 
-def monitor_storage(base_dir):
-    """Monitor file storage."""
-    storage = FileStorage(base_dir)
-    stats = storage.get_stats()
+def monitor_storage(base_dir, backend='segments', rebuild=False):
+    """Monitor page storage."""
+    storage = FileStorage(base_dir) if backend == 'files' else SegmentStorage(base_dir)
+
+    if rebuild:
+        print("Rebuilding storage statistics and page index from disk...")
+        started = time.time()
+        stats = storage.rebuild_stats()
+        indexed = storage.rebuild_index()
+        print(f"Rebuilt in {time.time() - started:.1f}s ({indexed:,} pages indexed)")
+        print()
+    else:
+        stats = storage.get_stats()
 
     print("=" * 70)
     print("STORAGE STATISTICS")
@@ -154,14 +164,28 @@ def main():
     parser.add_argument(
         '--storage',
         action='store_true',
-        help='Monitor file storage instead of JSONL files'
+        help='Monitor page storage instead of JSONL files'
+    )
+
+    parser.add_argument(
+        '--storage-backend',
+        type=str,
+        choices=['segments', 'files'],
+        help='Page storage layout (for --storage)',
+        default='segments'
+    )
+
+    parser.add_argument(
+        '--rebuild',
+        action='store_true',
+        help='Recompute storage statistics and page index from disk (for --storage)'
     )
 
     args = parser.parse_args()
 
     try:
         if args.storage:
-            monitor_storage(args.output_dir)
+            monitor_storage(args.output_dir, args.storage_backend, args.rebuild)
         else:
             monitor_jsonl(args.output_dir, args.watch, args.interval)
     except KeyboardInterrupt:
@@ -25,6 +25,8 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+ASYNCIO_REACTOR = 'twisted.internet.asyncioreactor.AsyncioSelectorReactor'
+
 
 def main():
     """Main entry point for crawler."""
@@ -68,6 +70,30 @@ def main():
         default=None
     )
 
+    parser.add_argument(
+        '--asyncio',
+        action='store_true',
+        help='Run on the asyncio reactor (enables asyncio-native clients in pipelines)'
+    )
+
+    parser.add_argument(
+        '--async-writes',
+        action='store_true',
+        help='Perform pipeline disk writes in a thread pool instead of the reactor thread'
+    )
+
+    parser.add_argument(
+        '--background-writer',
+        action='store_true',
+        help='Perform pipeline disk writes on a dedicated writer thread (pauses the crawl when it falls behind)'
+    )
+
+    parser.add_argument(
+        '--serializer',
+        choices=['auto', 'json', 'orjson', 'msgspec'],
+        help='JSON encoder for items and stored pages (default: SERIALIZER setting)'
+    )
+
     parser.add_argument(
         '--list-languages',
         action='store_true',
@@ -111,6 +137,19 @@ def main():
     if args.log_file:
         settings.set('LOG_FILE', args.log_file)
 
+    if args.asyncio:
+        settings.set('TWISTED_REACTOR', ASYNCIO_REACTOR)
+        logger.info("Using asyncio reactor")
+
+    if args.async_writes:
+        settings.set('PIPELINE_ASYNC_WRITES', True)
+
+    if args.background_writer:
+        settings.set('PIPELINE_BACKGROUND_WRITER', True)
+
+    if args.serializer:
+        settings.set('SERIALIZER', args.serializer)
+
     # Test mode
     if args.test:
         args.max_pages = 10
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Tests for the bounded background writer (lookuply_crawler.storage.background_writer)
+whose watermarks pause and unpause the crawl engine.
+"""
+
+import threading
+import time
+
+import pytest
+from scrapy.settings import Settings
+from scrapy.spiders import Spider
+from scrapy.statscollectors import MemoryStatsCollector
+from scrapy.utils.test import get_crawler
+
+from lookuply_crawler.pipelines import report_background_writer
+from lookuply_crawler.storage import BackgroundWriter
+
+
+class Backpressure:
+    """Records on_full/on_drained calls, like the engine pause/unpause."""
+
+    def __init__(self):
+        self.events = []
+        self.drained = threading.Event()
+
+    def on_full(self):
+        self.events.append('full')
+
+    def on_drained(self):
+        self.events.append('drained')
+        self.drained.set()
+
+
+def make_writer(backpressure, maxsize=10):
+    writer = BackgroundWriter('test', maxsize=maxsize, on_full=backpressure.on_full,
+                              on_drained=backpressure.on_drained)
+    writer.start()
+    return writer
+
+
+def block(writer):
+    """Occupy the writer thread until the returned event is set."""
+    started = threading.Event()
+    release = threading.Event()
+
+    def wait():
+        started.set()
+        release.wait(10)
+
+    writer.submit(wait)
+    assert started.wait(10)
+    return release
+
+
+def test_high_watermark_pauses_and_low_watermark_unpauses():
+    backpressure = Backpressure()
+    writer = make_writer(backpressure)
+    assert (writer.high_watermark, writer.low_watermark) == (8, 5)
+
+    release = block(writer)
+    depths = []
+    for _ in range(7):
+        writer.submit(lambda: depths.append(writer.depth))
+    assert backpressure.events == []
+    assert not writer.paused
+
+    writer.submit(lambda: depths.append(writer.depth))
+    assert backpressure.events == ['full']
+    assert writer.paused
+
+    # Already paused: no second call
+    writer.submit(lambda: depths.append(writer.depth))
+    assert backpressure.events == ['full']
+
+    release.set()
+    assert backpressure.drained.wait(10)
+    writer.close()
+
+    assert backpressure.events == ['full', 'drained']
+    assert not writer.paused
+    assert writer.max_depth == 9
+    assert writer.writes == 10
+
+
+def test_pauses_again_after_draining():
+    backpressure = Backpressure()
+    writer = make_writer(backpressure)
+
+    for _ in range(2):
+        backpressure.drained.clear()
+        release = block(writer)
+        for _ in range(8):
+            writer.submit(lambda: None)
+        release.set()
+        assert backpressure.drained.wait(10)
+
+    writer.close()
+    assert backpressure.events == ['full', 'drained', 'full', 'drained']
+
+
+def test_close_writes_everything_queued_in_order():
+    writer = BackgroundWriter('test', maxsize=1000)
+    written = []
+    writer.start()
+    for i in range(500):
+        writer.submit(written.append, i)
+    writer.close()
+
+    assert written == list(range(500))
+    assert writer.writes == 500
+    assert writer.depth == 0
+    assert not writer._thread.is_alive()
+
+    # Closing again, or a writer that never started, does not block
+    writer.close()
+    BackgroundWriter('idle').close()
+
+
+def test_failed_writes_are_counted_and_do_not_stop_the_writer(caplog):
+    writer = BackgroundWriter('test')
+    written = []
+
+    def fail(i):
+        raise OSError(f'disk full {i}')
+
+    writer.start()
+    writer.submit(written.append, 1)
+    writer.submit(fail, 2)
+    writer.submit(fail, 3)
+    writer.submit(written.append, 4)
+    writer.close()
+
+    assert written == [1, 4]
+    assert writer.errors == 2
+    assert writer.writes == 4
+    assert 'test background write failed: disk full 2' in caplog.text
+
+
+def test_latency_percentiles():
+    writer = BackgroundWriter('test')
+    assert writer.latency_percentiles() == {50: 0.0, 90: 0.0, 99: 0.0}
+
+    writer.latencies.extend(i / 1000 for i in range(1, 101))
+    assert writer.latency_percentiles() == pytest.approx({50: 50.0, 90: 90.0, 99: 99.0})
+
+
+def test_write_latency_is_measured():
+    writer = BackgroundWriter('test')
+    writer.start()
+    for _ in range(3):
+        writer.submit(time.sleep, 0.02)
+    writer.close()
+
+    assert len(writer.latencies) == 3
+    assert writer.latency_percentiles()[50] >= 20
+
+
+def test_report_background_writer():
+    writer = BackgroundWriter('pages')
+    writer.start()
+    writer.submit(lambda: None)
+    writer.submit(lambda: 1 / 0)
+    writer.close()
+
+    stats = MemoryStatsCollector(get_crawler(Spider, Settings()))
+    report_background_writer(stats, writer)
+    assert stats.get_value('writer/pages/writes') == 2
+    assert stats.get_value('writer/pages/errors') == 1
+    assert stats.get_value('writer/pages/queue_max_depth') >= 1
+    assert stats.get_value('writer/pages/write_latency_p99_ms') >= 0
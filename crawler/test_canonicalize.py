@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Tests for URL canonicalization (lookuply_crawler.canonicalize).
+"""
+
+import pytest
+from scrapy.settings import Settings
+
+from lookuply_crawler.canonicalize import UrlCanonicalizer, canonicalize_url, create_url_canonicalizer
+from lookuply_crawler.extractors import ContentExtractor
+
+
+@pytest.mark.parametrize('url, canonical', [
+    # Scheme, host, default port, trailing dot, fragment
+    ('HTTPS://Example.COM:443/Path#section', 'https://example.com/Path'),
+    ('http://example.com.:80', 'http://example.com/'),
+    ('http://example.com:8080/', 'http://example.com:8080/'),
+    ('https://example.com:80/', 'https://example.com:80/'),
+    ('https://User@Example.com/', 'https://User@example.com/'),
+    # Tracking and session parameters, sorted query
+    ('https://example.com/a?utm_source=x&b=2&a=1&fbclid=abc', 'https://example.com/a?a=1&b=2'),
+    ('https://example.com/a?UTM_Medium=x&GCLID=1&PHPSESSID=s&id=7', 'https://example.com/a?id=7'),
+    ('https://example.com/a?utm%5Fsource=x&q=1', 'https://example.com/a?q=1'),
+    ('https://example.com/a?utm_source=x', 'https://example.com/a'),
+    ('https://example.com/a?&&q=1&', 'https://example.com/a?q=1'),
+    ('https://example.com/shop;jsessionid=ABC123/item;JSESSIONID=x', 'https://example.com/shop/item'),
+    # Percent-encoding
+    ('https://example.com/%7euser/%41b%2fc', 'https://example.com/~user/Ab%2Fc'),
+    ('https://example.com/café menu', 'https://example.com/caf%C3%A9%20menu'),
+    ('https://example.com/a?q=café&x=%3d', 'https://example.com/a?q=caf%C3%A9&x=%3D'),
+    # Index files
+    ('https://example.com/docs/index.html', 'https://example.com/docs/'),
+    ('https://example.com/Default.ASPX?utm_source=x', 'https://example.com/'),
+    # A script with a query is not the directory
+    ('https://example.com/Default.ASPX?x=1', 'https://example.com/Default.ASPX?x=1'),
+    ('https://en.wikipedia.org/w/index.php?title=Special:Search&search=x',
+     'https://en.wikipedia.org/w/index.php?search=x&title=Special:Search'),
+    ('https://example.com/docs/index.html.bak', 'https://example.com/docs/index.html.bak'),
+])
+def test_default_rules(url, canonical):
+    assert UrlCanonicalizer().canonicalize(url) == canonical
+
+
+@pytest.mark.parametrize('rule, url, canonical', [
+    ('keep', 'https://example.com/docs/', 'https://example.com/docs/'),
+    ('keep', 'https://example.com/docs', 'https://example.com/docs'),
+    ('strip', 'https://example.com/docs/', 'https://example.com/docs'),
+    ('strip', 'https://example.com/', 'https://example.com/'),
+    ('strip', 'https://example.com/docs/index.html', 'https://example.com/docs/'),
+    ('add', 'https://example.com/docs', 'https://example.com/docs/'),
+    ('add', 'https://example.com/docs/page.html', 'https://example.com/docs/page.html'),
+    ('add', 'https://example.com/docs?q=1', 'https://example.com/docs/?q=1'),
+])
+def test_trailing_slash_rules(rule, url, canonical):
+    assert UrlCanonicalizer(trailing_slash=rule).canonicalize(url) == canonical
+
+
+def test_unknown_trailing_slash_rule():
+    with pytest.raises(ValueError):
+        UrlCanonicalizer(trailing_slash='remove')
+
+
+def test_options_can_be_turned_off():
+    canonicalizer = UrlCanonicalizer(sort_query=False, normalize_encoding=False, strip_index=False)
+    assert canonicalizer.canonicalize('https://example.com/%7e/index.html?b=2&a=1') == \
+        'https://example.com/%7e/index.html?b=2&a=1'
+
+
+def test_extra_strip_params():
+    canonicalizer = UrlCanonicalizer(strip_params=['Sort'], strip_param_prefixes=['ITM_'])
+    assert canonicalizer.canonicalize('https://example.com/?sort=asc&itm_campaign=x&page=2') == \
+        'https://example.com/?page=2'
+    assert canonicalizer.stats['params_stripped'] == 2
+
+
+def test_host_params_whitelist_subdomains():
+    canonicalizer = UrlCanonicalizer(host_params={'YouTube.com': ['V']})
+    assert canonicalizer.canonicalize('https://www.youtube.com/watch?v=abc&list=x&t=10') == \
+        'https://www.youtube.com/watch?v=abc'
+    assert canonicalizer.canonicalize('https://youtube.com/watch?feature=share') == 'https://youtube.com/watch'
+    # Other hosts keep the default rules
+    assert canonicalizer.canonicalize('https://notyoutube.com/watch?v=abc&list=x&utm_source=y') == \
+        'https://notyoutube.com/watch?list=x&v=abc'
+
+
+def test_memo_hits_and_stats():
+    canonicalizer = UrlCanonicalizer(memo_size=10)
+    for _ in range(3):
+        assert canonicalizer.canonicalize('https://Example.com/a?utm_source=x') == 'https://example.com/a'
+    canonicalizer.canonicalize('https://example.com/b')
+
+    assert canonicalizer.stats == {'urls': 4, 'memo_hits': 2, 'rewritten': 1, 'params_stripped': 1}
+
+    canonicalizer = UrlCanonicalizer(memo_size=0)
+    canonicalizer.canonicalize('https://example.com/a')
+    canonicalizer.canonicalize('https://example.com/a')
+    assert canonicalizer.memo is None
+    assert canonicalizer.stats['memo_hits'] == 0
+
+
+def test_invalid_url_is_returned_unchanged():
+    canonicalizer = UrlCanonicalizer()
+    assert canonicalizer.canonicalize('http://[::1/page?utm_source=x') == 'http://[::1/page?utm_source=x'
+    assert canonicalizer.stats['rewritten'] == 0
+    assert len(canonicalizer.memo) == 0
+
+
+def test_canonicalize_url_uses_default_rules():
+    assert canonicalize_url('https://example.com/index.php?utm_source=x') == 'https://example.com/'
+
+
+def test_create_url_canonicalizer():
+    assert create_url_canonicalizer(Settings({'URL_CANONICALIZATION_ENABLED': False})) is None
+
+    canonicalizer = create_url_canonicalizer(Settings({
+        'CANONICAL_TRAILING_SLASH': 'strip',
+        'CANONICAL_HOST_PARAMS': {'example.com': ['id']},
+        'CANONICAL_MEMO_SIZE': 0,
+    }))
+    assert canonicalizer.memo is None
+    assert canonicalizer.canonicalize('https://example.com/item/?id=1&ref=x') == 'https://example.com/item?id=1'
+
+
+def test_extractor_links_are_canonicalized():
+    html = (
+        '<html><body><article><p>Text of the article with links to other pages of the site.</p>'
+        '<a href="/story?utm_source=home&id=1">Story</a> '
+        '<a href="/story?id=1#comments">Story comments</a> '
+        '<a href="https://Example.com:443/docs/index.html">Docs</a>'
+        '</article></body></html>'
+    )
+    result = ContentExtractor(canonicalizer=UrlCanonicalizer()).extract(html, 'https://example.com/')
+
+    # The two story links are one page
+    assert [link['url'] for link in result['page_links']] == [
+        'https://example.com/story?id=1',
+        'https://example.com/docs/',
+    ]
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Tests for exact duplicate response skipping (ContentDedupeMiddleware).
+"""
+
+import pytest
+from scrapy.exceptions import IgnoreRequest, NotConfigured
+from scrapy.http import HtmlResponse, Request, TextResponse
+from scrapy.settings import Settings
+from scrapy.spiders import Spider
+from scrapy.statscollectors import MemoryStatsCollector
+from scrapy.utils.test import get_crawler
+
+from lookuply_crawler.middleware import ContentDedupeMiddleware
+
+SPIDER = Spider('test')
+PAGE = b'<html><body><p>Same page under two URLs</p></body></html>'
+
+
+def make_middleware(**kwargs):
+    stats = MemoryStatsCollector(get_crawler(Spider, Settings()))
+    return ContentDedupeMiddleware(stats, **kwargs)
+
+
+def process(middleware, url, body=PAGE, status=200, meta=None, response_class=HtmlResponse):
+    request = Request(url, meta=meta or {})
+    response = response_class(url, body=body, status=status, request=request)
+    return middleware.process_response(request, response, SPIDER)
+
+
+def test_identical_bodies_are_ignored():
+    middleware = make_middleware(hash_name='blake2b')
+    assert process(middleware, 'https://example.com/a') is not None
+
+    with pytest.raises(IgnoreRequest):
+        process(middleware, 'https://example.com/a?print=1')
+    assert middleware.stats.get_value('contentdedupe/skipped') == 1
+    assert middleware.stats.get_value('contentdedupe/skipped_bytes') == len(PAGE)
+
+
+def test_different_bodies_pass():
+    middleware = make_middleware()
+    process(middleware, 'https://example.com/a')
+    assert process(middleware, 'https://example.com/b', body=PAGE + b' ') is not None
+    assert middleware.stats.get_value('contentdedupe/skipped') is None
+
+
+def test_only_successful_html_responses_are_checked():
+    middleware = make_middleware()
+    for _ in range(2):
+        assert process(middleware, 'https://example.com/missing', status=404) is not None
+        assert process(middleware, 'https://example.com/data.txt', response_class=TextResponse) is not None
+        assert process(middleware, 'https://example.com/a', meta={'dont_dedupe_content': True}) is not None
+    assert process(middleware, 'https://example.com/a') is not None
+
+
+def test_oldest_hashes_are_forgotten():
+    middleware = make_middleware(maxsize=2)
+    for i in range(3):
+        process(middleware, f'https://example.com/{i}', body=PAGE + str(i).encode())
+
+    # Page 0 was evicted, page 2 is still remembered
+    assert process(middleware, 'https://example.com/0-again', body=PAGE + b'0') is not None
+    with pytest.raises(IgnoreRequest):
+        process(middleware, 'https://example.com/2-again', body=PAGE + b'2')
+
+
+def test_disabled_by_setting():
+    crawler = get_crawler(Spider, {'CONTENT_DEDUPE_ENABLED': False})
+    with pytest.raises(NotConfigured):
+        ContentDedupeMiddleware.from_crawler(crawler)
+
+
+def test_saved_cpu_is_estimated():
+    middleware = make_middleware()
+    process(middleware, 'https://example.com/a')
+    with pytest.raises(IgnoreRequest):
+        process(middleware, 'https://example.com/b')
+    middleware.stats.set_value('extraction/pages', 4)
+    middleware.stats.set_value('extraction/cpu_seconds', 2.0)
+
+    middleware.spider_closed(SPIDER)
+    assert middleware.stats.get_value('contentdedupe/saved_cpu_seconds_est') == 0.5
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Tests for per-host extraction knowledge (lookuply_crawler.extractors.host_cache)
+as used by ContentExtractor.
+"""
+
+from lookuply_crawler.extractors import ContentExtractor, SelectorCache, TemplateCache
+
+HOST = 'https://news.example'
+
+NAVIGATION = (
+    '<div class="site-links"><a href="/">Home</a> <a href="/world">World news and analysis</a> '
+    '<a href="/sport">Sport results and fixtures</a></div>'
+)
+PROMO = '<div class="promo-box"><p>Subscribe to our newsletter for daily updates from the newsroom.</p></div>'
+STORY = (
+    'The council approved the new budget on Tuesday after a long debate about '
+    'school funding, road repairs and the future of the public library.'
+)
+
+
+def article_page(i):
+    """Article page of the host: shared template, unique story, comments and related links."""
+    return (
+        f'<html><body>{NAVIGATION}<main>{PROMO}'
+        f'<h1>Story {i}</h1><p>Story number {i} reports on the events of day {i} in detail, '
+        f'with quotes from the people involved and background on why it matters to readers.</p>'
+        f'<div class="comments"><p>Reader comment {i}: I completely disagree with this story and its sources.</p></div>'
+        f'<div class="related"><p>Related story {i + 100}: more coverage of similar events this week.</p></div>'
+        f'</main></body></html>'
+    )
+
+
+def test_template_blocks_are_removed_after_min_pages():
+    cache = TemplateCache(min_pages=5)
+    extractor = ContentExtractor(template_cache=cache)
+
+    for i in range(6):
+        extractor.extract(article_page(i), f'{HOST}/story/{i}')
+
+    assert cache.stats['applied'] == 2
+    assert cache.stats['blocks_removed'] >= 4
+
+
+def test_patterns_still_remove_page_specific_blocks_with_a_template():
+    cache = TemplateCache(min_pages=5)
+    extractor = ContentExtractor(template_cache=cache)
+
+    for i in range(8):
+        result = extractor.extract(article_page(i), f'{HOST}/story/{i}')
+        assert f'Story number {i}' in result['text']
+        assert f'Reader comment {i}' not in result['text']
+        assert f'Related story {i + 100}' not in result['text']
+    assert cache.stats['applied'] == 4
+
+
+def test_template_is_not_applied_when_too_little_text_would_remain():
+    cache = TemplateCache(min_pages=2)
+    extractor = ContentExtractor(min_text_length=50, template_cache=cache)
+
+    for i in range(3):
+        extractor.extract(article_page(i), f'{HOST}/story/{i}')
+
+    # A page that is nothing but the template
+    page = f'<html><body>{NAVIGATION}<main>{PROMO}</main></body></html>'
+    fallbacks = cache.stats['fallbacks']
+    result = extractor.extract(page, f'{HOST}/about')
+    assert 'Subscribe to our newsletter' in result['text']
+    assert cache.stats['fallbacks'] == fallbacks + 1
+
+
+def test_templates_are_learned_per_host():
+    cache = TemplateCache(min_pages=2)
+    extractor = ContentExtractor(template_cache=cache)
+
+    for i in range(3):
+        extractor.extract(article_page(i), f'{HOST}/story/{i}')
+    result = extractor.extract(article_page(3), 'https://other.example/story/3')
+
+    assert 'Subscribe to our newsletter' in result['text']
+    assert cache.stats['applied'] == 1
+
+
+def test_template_cache_persists(tmp_path):
+    cache_file = str(tmp_path / 'templates.json')
+    cache = TemplateCache(min_pages=2, cache_file=cache_file)
+    extractor = ContentExtractor(template_cache=cache)
+    for i in range(2):
+        extractor.extract(article_page(i), f'{HOST}/story/{i}')
+    cache.save()
+
+    cache = TemplateCache(min_pages=2, cache_file=cache_file)
+    ContentExtractor(template_cache=cache).extract(article_page(2), f'{HOST}/story/2')
+    assert cache.stats['applied'] == 1
+
+
+def test_body_fallback_is_not_remembered():
+    cache = SelectorCache()
+    extractor = ContentExtractor(selector_cache=cache)
+
+    # Home page without a content container: the heuristics return body
+    extractor.extract(f'<html><body>{NAVIGATION}{PROMO}</body></html>', f'{HOST}/')
+    assert 'news.example' not in cache.hosts
+
+    result = extractor.extract(f'<html><body>{PROMO}<article><p>{STORY}</p></article></body></html>', f'{HOST}/story')
+    assert result['text'] == STORY
+    assert cache.hosts.get('news.example') == [['article', []]]
+
+
+def test_stored_body_path_is_dropped():
+    cache = SelectorCache()
+    cache.hosts.set('news.example', [])
+    extractor = ContentExtractor(selector_cache=cache)
+
+    result = extractor.extract(f'<html><body>{PROMO}<article><p>{STORY}</p></article></body></html>', f'{HOST}/story')
+    assert result['text'] == STORY
+    assert cache.stats['misses'] == 1
+    assert cache.hosts.get('news.example') == [['article', []]]
+
+
+def test_path_is_replaced_when_heuristics_find_a_better_container():
+    cache = SelectorCache(verify_pages=1, verify_every=0)
+    extractor = ContentExtractor(selector_cache=cache)
+
+    extractor.extract(f'<html><body><div class="post"><p>{STORY}</p></div></body></html>', f'{HOST}/a')
+    assert cache.hosts.get('news.example') == [['div', ['post']]]
+
+    teaser = f'<div class="post"><p>Teaser: {STORY}</p></div>'
+    page = f'<html><body>{teaser}<article><p>{STORY}</p></article></body></html>'
+    result = extractor.extract(page, f'{HOST}/b')
+    assert result['text'] == STORY
+    assert cache.stats['replaced'] == 1
+    assert cache.hosts.get('news.example') == [['article', []]]
+
+
+def test_path_is_verified_on_first_and_every_nth_use():
+    cache = SelectorCache(verify_pages=2, verify_every=3)
+    assert [cache.should_verify('news.example') for _ in range(7)] == [True, True, True, False, False, True, False]
+    assert cache.stats['verified'] == 4
+
+    # A new path is checked again
+    cache = SelectorCache(verify_pages=1, verify_every=0)
+    extractor = ContentExtractor(selector_cache=cache)
+    for i in range(3):
+        extractor.extract(f'<html><body><article><p>{STORY}</p></article></body></html>', f'{HOST}/{i}')
+    assert cache.stats == {'hits': 2, 'misses': 1, 'invalid': 0, 'verified': 1, 'replaced': 0}
+
+
+def test_invalid_path_is_forgotten():
+    cache = SelectorCache()
+    extractor = ContentExtractor(selector_cache=cache)
+    extractor.extract(f'<html><body><div class="post"><p>{STORY}</p></div></body></html>', f'{HOST}/a')
+
+    # The remembered container is empty on this page
+    page = f'<html><body><div class="post"></div><article><p>{STORY}</p></article></body></html>'
+    result = extractor.extract(page, f'{HOST}/b')
+    assert result['text'] == STORY
+    assert cache.stats['invalid'] == 1
+    assert cache.hosts.get('news.example') == [['article', []]]
+
+
+def test_selector_cache_persists(tmp_path):
+    cache_file = str(tmp_path / 'selectors.json')
+    cache = SelectorCache(cache_file=cache_file)
+    ContentExtractor(selector_cache=cache).extract(
+        f'<html><body><main><p>{STORY}</p></main></body></html>', f'{HOST}/a')
+    cache.save()
+
+    assert SelectorCache(cache_file=cache_file).hosts.get('news.example') == [['main', []]]
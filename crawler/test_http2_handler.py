@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Tests for the HTTP/2 download mode (lookuply_crawler.handlers).
+Crawls a local HTTP/2 server and local TLS servers that do not offer HTTP/2
+over ALPN (fallback to HTTP/1.1). Crawls and the HTTP/2 server run in
+subprocesses (one reactor per run).
+"""
+
+import datetime
+import json
+import os
+import ssl
+import subprocess
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from scrapy.crawler import Crawler
+from scrapy.http import Request
+from scrapy.settings import Settings
+from scrapy.spiders import Spider
+from twisted.internet.error import ConnectionLost
+from twisted.python.failure import Failure
+from twisted.web.client import ResponseFailed
+
+from lookuply_crawler.handlers import HTTP2DownloadHandler, HTTP2NotNegotiated
+
+pytest.importorskip('h2')
+
+CRAWLER_DIR = os.path.dirname(os.path.abspath(__file__))
+
+CRAWL_SCRIPT = """
+import json, sys
+import scrapy
+from scrapy.crawler import CrawlerProcess
+from lookuply_crawler import settings as project_settings
+
+urls = sys.argv[1:]
+
+class FallbackSpider(scrapy.Spider):
+    name = 'http2_fallback'
+
+    def start_requests(self):
+        for url in urls:
+            yield scrapy.Request(url, dont_filter=True)
+
+    def parse(self, response):
+        self.crawler.stats.inc_value('test/' + response.text)
+
+process = CrawlerProcess({
+    'ADDONS': project_settings.ADDONS,
+    'DOWNLOAD_HTTP2_ENABLED': True,
+    'LOG_LEVEL': 'ERROR',
+    'TELNETCONSOLE_ENABLED': False,
+})
+crawler = process.create_crawler(FallbackSpider)
+process.crawl(crawler)
+process.start()
+stats = crawler.stats.get_stats()
+print(json.dumps({key: value for key, value in stats.items() if isinstance(value, int)}))
+"""
+
+H2_SERVER_SCRIPT = """
+import sys
+from twisted.internet import reactor, ssl
+from twisted.web import resource, server
+
+class Version(resource.Resource):
+    isLeaf = True
+
+    def render_GET(self, request):
+        request.setHeader(b'content-type', b'text/plain')
+        return request.clientproto
+
+cert_path, key_path = sys.argv[1:3]
+with open(cert_path) as cert_file, open(key_path) as key_file:
+    certificate = ssl.PrivateCertificate.loadPEM(cert_file.read() + key_file.read())
+options = ssl.CertificateOptions(
+    privateKey=certificate.privateKey.original,
+    certificate=certificate.original,
+    acceptableProtocols=[b'h2', b'http/1.1'],
+)
+port = reactor.listenSSL(0, server.Site(Version()), options, interface='127.0.0.1')
+print(port.getHost().port, flush=True)
+reactor.run()
+"""
+
+
+class VersionHandler(BaseHTTPRequestHandler):
+    """Answers with the HTTP version of the request."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        body = self.request_version.encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class HTTP11Stub:
+    """Stands in for the pooled HTTP/1.1 handler."""
+
+    def download_request(self, request, spider):
+        return 'HTTP/1.1'
+
+
+def write_certificate(directory):
+    """Self-signed certificate for localhost: (cert path, key path)."""
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import ec
+    from cryptography.x509.oid import NameOID
+
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, 'localhost')])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    certificate = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(days=1))
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .add_extension(x509.SubjectAlternativeName([x509.DNSName('localhost')]), critical=False)
+        .sign(key, hashes.SHA256())
+    )
+
+    cert_path = os.path.join(directory, 'cert.pem')
+    key_path = os.path.join(directory, 'key.pem')
+    with open(cert_path, 'wb') as f:
+        f.write(certificate.public_bytes(serialization.Encoding.PEM))
+    with open(key_path, 'wb') as f:
+        f.write(key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        ))
+    return cert_path, key_path
+
+
+@pytest.fixture
+def tls_servers(tmp_path):
+    """HTTPS servers offering only http/1.1 over ALPN, and no ALPN at all: [port]."""
+    cert_path, key_path = write_certificate(str(tmp_path))
+    servers = []
+    for alpn in (['http/1.1'], None):
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(cert_path, key_path)
+        if alpn:
+            context.set_alpn_protocols(alpn)
+
+        server = ThreadingHTTPServer(('127.0.0.1', 0), VersionHandler)
+        server.socket = context.wrap_socket(server.socket, server_side=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+
+    yield [server.server_address[1] for server in servers]
+
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def h2_server(tmp_path):
+    """Twisted HTTPS server offering h2 over ALPN: port."""
+    cert_path, key_path = write_certificate(str(tmp_path))
+    server = subprocess.Popen(
+        [sys.executable, '-c', H2_SERVER_SCRIPT, cert_path, key_path],
+        stdout=subprocess.PIPE, text=True,
+    )
+    try:
+        yield int(server.stdout.readline())
+    finally:
+        server.terminate()
+        server.wait(10)
+
+
+def crawl(urls):
+    """Crawl urls in HTTP/2 mode: integer stats of the run."""
+    result = subprocess.run(
+        [sys.executable, '-c', CRAWL_SCRIPT, *urls],
+        cwd=CRAWLER_DIR, capture_output=True, text=True, timeout=120,
+    )
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def download_handlers(**settings):
+    """DOWNLOAD_HANDLERS after the project add-ons are applied."""
+    project = Settings()
+    project.setmodule('lookuply_crawler.settings', priority='project')
+    project.setdict(settings, priority='cmdline')
+    crawler = Crawler(Spider, project)
+    crawler._apply_settings()
+    return crawler.settings.getdict('DOWNLOAD_HANDLERS')
+
+
+def test_stock_handlers_are_kept_when_http2_is_disabled():
+    assert download_handlers() == {}
+    assert download_handlers(DOWNLOAD_HTTP2_ENABLED=False) == {}
+
+
+def test_handlers_are_installed_when_http2_is_enabled():
+    handlers = download_handlers(DOWNLOAD_HTTP2_ENABLED=True)
+    assert handlers['http'] == 'lookuply_crawler.handlers.PooledHTTPDownloadHandler'
+    assert handlers['https'] == 'lookuply_crawler.handlers.HTTP2DownloadHandler'
+
+
+def test_hosts_without_http2_fall_back_to_http11(tls_servers):
+    urls = [f'https://localhost:{port}/page{i}' for port in tls_servers for i in range(5)]
+    stats = crawl(urls)
+
+    assert stats.get('test/HTTP/1.1') == len(urls)
+    assert stats.get('downloader/http2/fallback_hosts') == len(tls_servers)
+    assert stats.get('downloader/connections/new', 0) >= len(tls_servers)
+    assert 'log_count/ERROR' not in stats
+
+
+def test_concurrent_requests_share_one_http2_connection(h2_server):
+    urls = [f'https://localhost:{h2_server}/page{i}' for i in range(20)]
+    stats = crawl(urls)
+
+    assert stats.get('test/HTTP/2') == len(urls)
+    assert stats.get('downloader/http2/connections/new') == 1
+    assert stats.get('downloader/http2/streams') == len(urls)
+    assert 'downloader/http2/fallback_hosts' not in stats
+    assert 'log_count/ERROR' not in stats
+
+
+def test_transient_failures_keep_the_host_on_http2():
+    handler = HTTP2DownloadHandler(Settings({'DOWNLOAD_HTTP2_ENABLED': True}))
+    handler.http11 = HTTP11Stub()
+    request = Request('https://example.com/')
+
+    # Connection lost after h2 was negotiated: returned for retrying
+    failure = Failure(ResponseFailed([Failure(ConnectionLost())]))
+    assert handler._fallback_to_http11(failure, 'example.com', request, None) is failure
+    assert handler.http11_hosts == set()
+
+    # Connection lost without h2 negotiated: HTTP/1.1 from now on
+    failure = Failure(ResponseFailed([HTTP2NotNegotiated(), Failure(ConnectionLost())]))
+    assert handler._fallback_to_http11(failure, 'example.com', request, None) == 'HTTP/1.1'
+    assert handler.http11_hosts == {'example.com'}
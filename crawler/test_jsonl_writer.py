@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Tests for buffered, rotating and compressed JSON Lines output
+(lookuply_crawler.storage.jsonl_writer).
+"""
+
+import gzip
+import json
+import zlib
+
+import pytest
+
+from lookuply_crawler.storage import JsonLinesWriter, find_jsonl_files, open_jsonl
+from lookuply_crawler.storage import jsonl_writer
+from lookuply_crawler.storage.jsonl_writer import _truncate_torn_line
+
+
+def record(i):
+    return json.dumps({'url': f'https://example.com/{i}', 'title': f'Page {i}'})
+
+
+def read_all(directory, name='en'):
+    """Records of all files written for a name, in segment order."""
+    records = []
+    for path in find_jsonl_files(directory, name):
+        with open_jsonl(path) as f:
+            records.extend(json.loads(line) for line in f)
+    return records
+
+
+def crash(writer):
+    """Stop a writer without finishing its file, as a killed process would."""
+    writer._raw.close()
+
+
+@pytest.mark.parametrize('compression', [None, 'gzip', 'zstd'])
+def test_lines_are_read_back(tmp_path, compression):
+    if compression == 'zstd':
+        pytest.importorskip('zstandard')
+    writer = JsonLinesWriter(tmp_path, 'en', compression=compression)
+    for i in range(100):
+        writer.write(record(i))
+    writer.close()
+
+    assert [page['title'] for page in read_all(tmp_path)] == [f'Page {i}' for i in range(100)]
+    assert writer.lines_written == 100
+
+
+@pytest.mark.parametrize('compression', ['gzip', 'zstd'])
+def test_restart_after_crash_keeps_compressed_data_readable(tmp_path, compression):
+    if compression == 'zstd':
+        pytest.importorskip('zstandard')
+    first = JsonLinesWriter(tmp_path, 'en', compression=compression)
+    first.write(record(0))
+    first.write(record(1))
+    first.flush()
+    first.write(record(2))  # Buffered only: lost in the crash
+    crash(first)
+
+    second = JsonLinesWriter(tmp_path, 'en', compression=compression)
+    second.write(record(3))
+    second.close()
+
+    # The unfinished file is never appended to
+    assert second.path != first.path
+    assert [path.name for path in find_jsonl_files(tmp_path, 'en')] == [first.path.name, second.path.name]
+    assert [page['title'] for page in read_all(tmp_path)] == ['Page 0', 'Page 1', 'Page 3']
+
+
+def test_gzip_members_are_read_in_turn(tmp_path):
+    path = tmp_path / 'en.jsonl.gz'
+    with open(path, 'wb') as raw:
+        for i in range(2):
+            with gzip.GzipFile(fileobj=raw, mode='ab') as stream:
+                stream.write(record(i).encode('utf-8') + b'\n')
+
+    assert [page['title'] for page in read_all(tmp_path)] == ['Page 0', 'Page 1']
+
+
+def test_file_appended_after_a_crash_is_read_up_to_the_crash(tmp_path, caplog):
+    # Written by earlier versions: a new member after an unfinished one
+    path = tmp_path / 'en.jsonl.gz'
+    with open(path, 'wb') as raw:
+        stream = gzip.GzipFile(fileobj=raw, mode='ab')
+        stream.write(record(0).encode('utf-8') + b'\n')
+        stream.flush(zlib.Z_SYNC_FLUSH)
+        with gzip.GzipFile(fileobj=raw, mode='ab') as stream:
+            stream.write(record(1).encode('utf-8') + b'\n')
+
+    assert [page['title'] for page in read_all(tmp_path)] == ['Page 0']
+    assert 'Stopped reading' in caplog.text
+
+
+def test_uncompressed_restart_appends_after_removing_torn_line(tmp_path):
+    path = tmp_path / 'en.jsonl'
+    path.write_text(record(0) + '\n' + record(1)[:10])
+
+    writer = JsonLinesWriter(tmp_path, 'en')
+    writer.write(record(2))
+    writer.close()
+
+    assert writer.path == path
+    assert [page['title'] for page in read_all(tmp_path)] == ['Page 0', 'Page 2']
+
+
+def test_truncate_torn_line(tmp_path):
+    path = tmp_path / 'en.jsonl'
+    _truncate_torn_line(path)  # Missing file
+    assert not path.exists()
+
+    path.write_bytes(b'')
+    _truncate_torn_line(path)
+    assert path.read_bytes() == b''
+
+    path.write_bytes(b'{"a": 1}\n')
+    _truncate_torn_line(path)
+    assert path.read_bytes() == b'{"a": 1}\n'
+
+    path.write_bytes(b'{"a": 1')
+    _truncate_torn_line(path)
+    assert path.read_bytes() == b''
+
+    # Last newline more than one scan chunk before the end
+    path.write_bytes(b'{"a": 1}\n' + b'x' * 200000)
+    _truncate_torn_line(path)
+    assert path.read_bytes() == b'{"a": 1}\n'
+
+
+def test_lines_are_buffered_until_flush(tmp_path):
+    writer = JsonLinesWriter(tmp_path, 'en', buffer_size=1 << 20, flush_interval=0)
+    writer.write(record(0).encode('utf-8'))
+    writer.maybe_flush()
+    assert writer.path.read_bytes() == b''
+
+    writer.flush()
+    assert writer.path.read_bytes() == record(0).encode('utf-8') + b'\n'
+    assert writer.bytes_written == len(record(0)) + 1
+
+    # A full buffer is written at once
+    writer.buffer_size = 1
+    writer.write(record(1) + '\n')
+    assert len(writer.path.read_bytes().splitlines()) == 2
+    writer.close()
+
+
+def test_size_rotation(tmp_path):
+    line_size = len(record(0)) + 1
+    writer = JsonLinesWriter(tmp_path, 'en', rotate_bytes=2 * line_size)
+    for i in range(5):
+        writer.write(record(i))
+    writer.close()
+
+    files = find_jsonl_files(tmp_path, 'en')
+    assert [path.name for path in files] == ['en.00001.jsonl', 'en.00002.jsonl', 'en.00003.jsonl']
+    assert [len(path.read_text().splitlines()) for path in files] == [2, 2, 1]
+
+    # A restarted writer starts a new segment
+    writer = JsonLinesWriter(tmp_path, 'en', rotate_bytes=2 * line_size)
+    writer.write(record(5))
+    writer.close()
+    assert writer.path.name == 'en.00004.jsonl'
+    assert [page['title'] for page in read_all(tmp_path)] == [f'Page {i}' for i in range(6)]
+
+
+def test_time_rotation(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(jsonl_writer.time, 'time', lambda: now[0])
+
+    writer = JsonLinesWriter(tmp_path, 'en', rotate_seconds=60, compression='gzip')
+    writer.write(record(0))
+    now[0] += 59
+    writer.write(record(1))
+    now[0] += 1
+    writer.write(record(2))
+    writer.close()
+
+    assert [path.name for path in find_jsonl_files(tmp_path, 'en')] == ['en.00001.jsonl.gz', 'en.00002.jsonl.gz']
+    assert [page['title'] for page in read_all(tmp_path)] == ['Page 0', 'Page 1', 'Page 2']
+
+
+def test_find_jsonl_files_orders_segments_numerically(tmp_path):
+    for name in ['en.00010.jsonl.gz', 'en.00002.jsonl', 'en.jsonl', 'de.jsonl', 'en.txt', 'en.00001.jsonl.zst']:
+        (tmp_path / name).write_bytes(b'')
+
+    assert [path.name for path in find_jsonl_files(tmp_path, 'en')] == [
+        'en.jsonl', 'en.00001.jsonl.zst', 'en.00002.jsonl', 'en.00010.jsonl.gz',
+    ]
+    assert find_jsonl_files(tmp_path / 'missing', 'en') == []
+
+
+def test_unknown_compression(tmp_path):
+    with pytest.raises(ValueError):
+        JsonLinesWriter(tmp_path, 'en', compression='bzip2')
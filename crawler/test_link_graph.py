@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Tests for the binary link graph (lookuply_crawler.storage.link_graph),
+including several crawler processes sharing one graph directory.
+"""
+
+import multiprocessing
+
+from lookuply_crawler.storage import LinkGraphWriter, iter_edges, read_urls
+from lookuply_crawler.storage.link_graph import EDGE_RECORD, FINGERPRINT_RECORD, _align_files, iter_edge_pairs
+
+
+def url(i):
+    return f'https://example.com/{i}'
+
+
+def edges(directory, language_code='en'):
+    """Stored edges as (source URL, target URL, anchor text)."""
+    urls = read_urls(directory)
+    return [(urls[source_id], urls[target_id], anchor) for source_id, target_id, anchor in iter_edges(directory, language_code)]
+
+
+def test_links_are_read_back(tmp_path):
+    graph = LinkGraphWriter(tmp_path)
+    assert graph.add_links(url(0), [(url(1), 'First'), (url(2), '  Second\n page ')], 'en') == 2
+    # Duplicate edges and self-links are skipped
+    assert graph.add_links(url(0), [(url(1), 'Again'), (url(0), 'Self'), (url(1), None)], 'en') == 0
+    assert graph.add_links(url(1), [(url(0), None)], 'de') == 1
+    graph.close()
+
+    assert read_urls(tmp_path) == [url(0), url(1), url(2)]
+    assert edges(tmp_path) == [(url(0), url(1), 'First'), (url(0), url(2), 'Second page')]
+    assert edges(tmp_path, 'de') == [(url(1), url(0), '')]
+    assert (graph.urls_added, graph.edges_added, graph.duplicate_edges) == (3, 3, 2)
+    assert list(iter_edge_pairs(tmp_path / 'en' / 'edges.bin', chunk_records=1)) == [(0, 1), (0, 2)]
+
+
+def test_reopened_graph_keeps_ids_and_edges(tmp_path):
+    graph = LinkGraphWriter(tmp_path)
+    graph.add_links(url(0), [(url(1), 'First')], 'en')
+    graph.close()
+
+    graph = LinkGraphWriter(tmp_path)
+    assert graph.url_count == 2
+    assert graph.add_links(url(0), [(url(1), 'Again'), (url(2), 'New')], 'en') == 1
+    graph.close()
+
+    assert read_urls(tmp_path) == [url(0), url(1), url(2)]
+    assert edges(tmp_path) == [(url(0), url(1), 'First'), (url(0), url(2), 'New')]
+    assert graph.urls_added == 1
+
+
+def test_edges_are_buffered_until_flush(tmp_path):
+    graph = LinkGraphWriter(tmp_path)
+    graph.add_links(url(0), [(url(1), 'First')], 'en')
+    # URL IDs are written as they are assigned
+    assert read_urls(tmp_path) == [url(0), url(1)]
+    assert edges(tmp_path) == []
+
+    graph.flush()
+    assert edges(tmp_path) == [(url(0), url(1), 'First')]
+
+    graph.buffer_size = 1
+    graph.add_links(url(1), [(url(2), 'Second')], 'en')
+    assert len(edges(tmp_path)) == 2
+    graph.close()
+
+
+def test_empty_graph(tmp_path):
+    assert read_urls(tmp_path / 'missing') == []
+    assert list(iter_edges(tmp_path / 'missing', 'en')) == []
+    assert list(iter_edge_pairs(tmp_path / 'missing' / 'edges.bin')) == []
+
+
+def test_align_files_cuts_back_to_common_records(tmp_path):
+    lines = tmp_path / 'urls.txt'
+    records = tmp_path / 'urls.fp'
+    assert _align_files((lines, None), (records, FINGERPRINT_RECORD.size)) == 0
+
+    lines.write_bytes(b'a\nb\nc\nd')
+    records.write_bytes(FINGERPRINT_RECORD.pack(1) * 3 + b'\x00' * 5)
+    assert _align_files((lines, None), (records, FINGERPRINT_RECORD.size)) == 3
+    assert lines.read_bytes() == b'a\nb\nc\n'
+    assert records.stat().st_size == 3 * FINGERPRINT_RECORD.size
+
+    records.write_bytes(FINGERPRINT_RECORD.pack(1))
+    assert _align_files((lines, None), (records, FINGERPRINT_RECORD.size)) == 1
+    assert lines.read_bytes() == b'a\n'
+
+
+def test_crashed_writes_are_cut_back_on_open(tmp_path):
+    graph = LinkGraphWriter(tmp_path)
+    graph.add_links(url(0), [(url(1), 'First'), (url(2), 'Second')], 'en')
+    graph.close()
+
+    # Crash between writing the URL and its fingerprint, and between anchors and edges
+    with open(tmp_path / 'urls.txt', 'ab') as f:
+        f.write(url(3).encode('utf-8') + b'\n')
+    with open(tmp_path / 'en' / 'anchors.txt', 'ab') as f:
+        f.write(b'Third\n')
+    with open(tmp_path / 'en' / 'edges.bin', 'ab') as f:
+        f.write(EDGE_RECORD.pack(0, 3)[:5])
+
+    graph = LinkGraphWriter(tmp_path)
+    graph.add_links(url(2), [(url(3), 'Fourth')], 'en')
+    graph.close()
+
+    assert read_urls(tmp_path) == [url(0), url(1), url(2), url(3)]
+    assert edges(tmp_path) == [(url(0), url(1), 'First'), (url(0), url(2), 'Second'), (url(2), url(3), 'Fourth')]
+
+
+def test_writers_sharing_a_directory_agree_on_url_ids(tmp_path):
+    first = LinkGraphWriter(tmp_path)
+    second = LinkGraphWriter(tmp_path)
+
+    first.add_links(url(0), [(url(1), 'A')], 'en')
+    second.add_links(url(2), [(url(1), 'B'), (url(0), 'C')], 'en')
+    first.add_links(url(2), [(url(3), 'D')], 'de')
+    # Also buffered by first: stored once
+    second.add_links(url(0), [(url(1), 'E')], 'en')
+    second.flush()
+    first.close()
+    second.close()
+
+    assert read_urls(tmp_path) == [url(0), url(1), url(2), url(3)]
+    assert edges(tmp_path) == [(url(2), url(1), 'B'), (url(2), url(0), 'C'), (url(0), url(1), 'E')]
+    assert edges(tmp_path, 'de') == [(url(2), url(3), 'D')]
+    assert (first.edges_added, first.duplicate_edges) == (1, 1)
+
+
+def _crawl(directory, worker):
+    graph = LinkGraphWriter(directory, buffer_size=256)
+    for i in range(200):
+        # Overlapping URLs and edges across the processes
+        graph.add_links(url(i), [(url(i + 1), f'Next {worker}'), (url(worker * 1000 + i), 'Own')], 'en')
+    graph.close()
+
+
+def test_concurrent_processes_share_one_dictionary(tmp_path):
+    context = multiprocessing.get_context('fork')
+    processes = [context.Process(target=_crawl, args=(tmp_path, worker)) for worker in range(1, 4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(60)
+        assert process.exitcode == 0
+
+    urls = read_urls(tmp_path)
+    assert len(urls) == len(set(urls)) == 201 + 3 * 200
+    assert (tmp_path / 'urls.fp').stat().st_size == len(urls) * FINGERPRINT_RECORD.size
+
+    stored = edges(tmp_path)
+    pairs = [(source, target) for source, target, _ in stored]
+    assert len(pairs) == len(set(pairs))
+    assert set(pairs) == {
+        (url(i), target) for worker in range(1, 4) for i in range(200)
+        for target in (url(i + 1), url(worker * 1000 + i))
+    }
+    # Anchors stayed with their edges
+    assert all((anchor == 'Own') == (int(target.rsplit('/', 1)[1]) >= 1000) for _, target, anchor in stored)
+
+    graph = LinkGraphWriter(tmp_path)
+    assert graph.url_count == len(urls)
+    assert graph.add_links(url(0), [(url(1), None)], 'en') == 0
+    graph.close()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Tests for the storage manifest shared by crawler processes
+(lookuply_crawler.storage.manifest).
+"""
+
+import json
+import multiprocessing
+
+from lookuply_crawler.storage.manifest import StorageManifest
+
+
+def read_languages(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)['languages']
+
+
+def test_saves_merge_changes_of_other_processes(tmp_path):
+    path = tmp_path / 'manifest.json'
+    english = StorageManifest(path)
+    german = StorageManifest(path)
+
+    english.add('en', '2025-01-01', 3, 300)
+    german.add('de', '2025-01-01', 2, 200)
+    german.add('en', '2025-01-01', 1, 100)
+    english.save()
+    german.save()
+    english.add('en', '2025-01-01', 1, 100)
+    english.save()
+
+    languages = read_languages(path)
+    assert languages['en']['2025-01-01'] == {'pages': 5, 'size_bytes': 500}
+    assert languages['de']['2025-01-01'] == {'pages': 2, 'size_bytes': 200}
+    # A save also picks up what the other processes wrote
+    assert english.get_stats()['total_pages'] == 7
+
+
+def test_removed_days_are_merged(tmp_path):
+    path = tmp_path / 'manifest.json'
+    first = StorageManifest(path)
+    first.add('en', '2025-01-01', 3, 300)
+    first.add('en', '2025-01-02', 1, 100)
+    first.save()
+
+    second = StorageManifest(path)
+    second.remove_day('en', '2025-01-01')
+    first.add('en', '2025-01-02', 1, 100)
+    first.save()
+    second.save()
+
+    assert read_languages(path) == {'en': {'2025-01-02': {'pages': 2, 'size_bytes': 200}}}
+
+
+def test_replace_overrides_the_file(tmp_path):
+    path = tmp_path / 'manifest.json'
+    first = StorageManifest(path)
+    first.add('en', '2025-01-01', 3, 300)
+    first.save()
+
+    second = StorageManifest(path)
+    second.replace({'en': {'2025-01-01': {'pages': 1, 'size_bytes': 10}}})
+    assert read_languages(path) == {'en': {'2025-01-01': {'pages': 1, 'size_bytes': 10}}}
+
+
+def test_only_the_first_process_creates_the_manifest(tmp_path):
+    path = tmp_path / 'manifest.json'
+    first = StorageManifest(path)
+    second = StorageManifest(path)
+
+    first.create(lambda: {'en': {'2025-01-01': {'pages': 3, 'size_bytes': 300}}})
+    assert first.exists
+    assert read_languages(path)['en']['2025-01-01']['pages'] == 3
+
+    # Pages the first process writes now are not counted again
+    first.add('en', '2025-01-01', 1, 100)
+    second.create(lambda: {'en': {'2025-01-01': {'pages': 4, 'size_bytes': 400}}})
+    first.save()
+    assert second.get_stats()['total_pages'] == 3
+    assert read_languages(path)['en']['2025-01-01'] == {'pages': 4, 'size_bytes': 400}
+
+
+def test_unchanged_manifest_is_not_written(tmp_path):
+    path = tmp_path / 'manifest.json'
+    manifest = StorageManifest(path)
+    manifest.save()
+    assert not path.exists()
+    assert not manifest.exists
+
+
+def _crawl(path, language_code, batches):
+    manifest = StorageManifest(path, save_interval=0)
+    for _ in range(batches):
+        manifest.add(language_code, '2025-01-01', 1, 10)
+    manifest.save()
+
+
+def test_concurrent_processes_keep_every_count(tmp_path):
+    path = tmp_path / 'manifest.json'
+    context = multiprocessing.get_context('fork')
+    processes = [
+        context.Process(target=_crawl, args=(path, language_code, 200))
+        for language_code in ('en', 'de', 'fr')
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(60)
+        assert process.exitcode == 0
+
+    languages = read_languages(path)
+    for language_code in ('en', 'de', 'fr'):
+        assert languages[language_code]['2025-01-01'] == {'pages': 200, 'size_bytes': 2000}
+    assert not list(tmp_path.glob('*.tmp'))
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Tests for the SQLite page index shared by crawlers on one storage directory
+(lookuply_crawler.storage.page_index) and its use by SegmentStorage.
+"""
+
+import sqlite3
+
+import pytest
+
+from lookuply_crawler.storage import SegmentStorage
+from lookuply_crawler.storage.page_index import PageIndex
+from lookuply_crawler.utils import get_url_hash
+
+
+def entry(i, location='en/2025-01-01.00001.jsonl'):
+    return (get_url_hash(f'https://example.com/{i}'), 'en', location, i * 100, 100)
+
+
+def lock_database(path):
+    """Another process's open write transaction on the index."""
+    conn = sqlite3.connect(str(path))
+    conn.execute('BEGIN IMMEDIATE')
+    return conn
+
+
+def test_writer_does_not_block_another_index(tmp_path):
+    path = tmp_path / 'index.sqlite'
+    first = PageIndex(path, timeout=0.1)
+    second = PageIndex(path, timeout=0.1)
+
+    # Buffered additions, segment counts and reads leave no transaction open
+    first.add([entry(i) for i in range(10)])
+    first.set_segment_entries('en/2025-01-01.00001.jsonl', 10)
+    assert first.count() == 10
+
+    second.add([entry(i, 'de/2025-01-01.00001.jsonl') for i in range(10, 15)])
+    second.set_meta('complete', 1)
+    second.commit()
+    assert first.count() == 15
+    assert first.get_meta('complete') == '1'
+    assert first.segment_entries() == {'en/2025-01-01.00001.jsonl': 10}
+
+
+def test_failed_writes_are_retried(tmp_path):
+    path = tmp_path / 'index.sqlite'
+    index = PageIndex(path, timeout=0.1)
+    index.add([entry(i) for i in range(3)])
+    index.set_segment_entries('en/2025-01-01.00001.jsonl', 3)
+
+    other = lock_database(path)
+    with pytest.raises(sqlite3.OperationalError):
+        index.commit()
+    other.rollback()
+    other.close()
+
+    index.commit()
+    assert index.count() == 3
+    assert index.get(entry(1)[0]) == ('en', 'en/2025-01-01.00001.jsonl', 100, 100)
+    assert index.segment_entries() == {'en/2025-01-01.00001.jsonl': 3}
+
+
+def test_remove_location_applies_after_buffered_entries(tmp_path):
+    index = PageIndex(tmp_path / 'index.sqlite')
+    index.add([entry(i) for i in range(3)])
+    index.add([entry(3, 'en/2025-01-02.00001.jsonl')])
+    index.remove_location('en/2025-01-01.00001.jsonl')
+
+    assert index.count() == 1
+    assert index.get(entry(3)[0])[1] == 'en/2025-01-02.00001.jsonl'
+
+
+def test_index_failure_does_not_fail_the_save(tmp_path, caplog):
+    storage = SegmentStorage(tmp_path / 'pages')
+    storage.index.close()
+    storage.index = PageIndex(tmp_path / 'pages' / 'index.sqlite', commit_every=1, timeout=0.1)
+
+    pages = [{'url': f'https://example.com/{i}', 'title': f'Page {i}'} for i in range(3)]
+    other = lock_database(tmp_path / 'pages' / 'index.sqlite')
+    assert storage.save_batch(pages, 'en') == 3
+    storage.flush()
+    assert 'Failed to index 3 pages' in caplog.text
+    assert 'Failed to save' not in caplog.text
+    other.rollback()
+    other.close()
+
+    # The buffered entries are written once the index is free again
+    storage.flush()
+    assert storage.index.count() == 3
+    assert storage.load_page('en', get_url_hash('https://example.com/2'))['title'] == 'Page 2'
+    storage.close()
+
+
+def test_unindexed_pages_are_indexed_when_storage_opens(tmp_path):
+    storage = SegmentStorage(tmp_path / 'pages')
+    storage.save_batch([{'url': f'https://example.com/{i}', 'title': f'Page {i}'} for i in range(3)], 'en')
+    # Crash before the index was written
+    storage.index._rows = []
+    storage.index._segments = {}
+    storage.close()
+
+    storage = SegmentStorage(tmp_path / 'pages')
+    assert storage.index.count() == 3
+    storage.close()
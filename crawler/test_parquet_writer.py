@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Tests for the partitioned Parquet dataset writer (lookuply_crawler.storage.parquet_writer)
+and ParquetPipeline.
+"""
+
+import asyncio
+
+import pytest
+from scrapy.spiders import Spider
+from scrapy.utils.test import get_crawler
+
+pq = pytest.importorskip('pyarrow.parquet')
+
+from lookuply_crawler.pipelines import ParquetPipeline  # noqa: E402
+from lookuply_crawler.storage import ParquetDatasetWriter  # noqa: E402
+
+
+def record(i, language_code='en', **fields):
+    return {
+        'url': f'https://example.com/{i}',
+        'title': f'Page {i}',
+        'text_length': i,
+        'keywords': 'a, b',
+        'language_code': language_code,
+        'crawled_at': '2025-01-01T12:00:00',
+        **fields,
+    }
+
+
+def read_urls(path):
+    return pq.read_table(path, columns=['url']).column('url').to_pylist()
+
+
+def test_records_are_partitioned_by_language_and_day(tmp_path):
+    writer = ParquetDatasetWriter(tmp_path, row_group_size=2, rows_per_file=4)
+    for i in range(5):
+        writer.write(record(i))
+    writer.write(record(5, 'de'))
+    writer.write(record(6, crawled_at='2025-01-02T00:00:00'))
+    writer.close()
+
+    day = tmp_path / 'language_code=en' / 'crawl_date=2025-01-01'
+    assert sorted(path.name for path in day.iterdir()) == ['part-00001.parquet', 'part-00002.parquet']
+    assert pq.ParquetFile(day / 'part-00001.parquet').metadata.num_row_groups == 2
+    assert read_urls(day) == [f'https://example.com/{i}' for i in range(5)]
+    assert read_urls(tmp_path / 'language_code=de') == ['https://example.com/5']
+    assert read_urls(tmp_path / 'language_code=en' / 'crawl_date=2025-01-02') == ['https://example.com/6']
+
+    table = pq.read_table(day / 'part-00001.parquet')
+    assert table.column('keywords').to_pylist()[0] == ['a', 'b']
+    assert writer.rows_written == 7
+    assert writer.records_dropped == 0
+
+
+def test_only_records_that_do_not_fit_the_schema_are_dropped(tmp_path, caplog):
+    writer = ParquetDatasetWriter(tmp_path, row_group_size=10)
+    for i in range(10):
+        writer.write(record(i, text_length='many' if i in (3, 7) else i))
+    writer.close()
+
+    path = tmp_path / 'language_code=en' / 'crawl_date=2025-01-01' / 'part-00001.parquet'
+    assert read_urls(path) == [f'https://example.com/{i}' for i in range(10) if i not in (3, 7)]
+    assert pq.ParquetFile(path).metadata.num_row_groups == 1
+    assert (writer.rows_written, writer.records_dropped) == (8, 2)
+    assert 'Dropped record https://example.com/3' in caplog.text
+
+
+def test_row_group_without_valid_records_writes_no_file(tmp_path):
+    writer = ParquetDatasetWriter(tmp_path)
+    writer.write(record(0, status_code='OK'))
+    writer.close()
+
+    assert not list(tmp_path.rglob('*.parquet'))
+    assert (writer.rows_written, writer.records_dropped) == (0, 1)
+
+
+def test_pipeline_reports_dropped_records(tmp_path):
+    crawler = get_crawler(Spider, {'PARQUET_DIR': str(tmp_path)})
+    crawler.stats.open_spider(None)
+    pipeline = ParquetPipeline.from_crawler(crawler)
+    spider = Spider('test')
+
+    pipeline.open_spider(spider)
+    for item in (record(0), record(1, text_length=[1])):
+        asyncio.run(pipeline.process_item(item, spider))
+    pipeline.close_spider(spider)
+
+    assert crawler.stats.get_value('parquet/rows_written') == 1
+    assert crawler.stats.get_value('parquet/dropped_records') == 1
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Tests for per-page parse budgets (lookuply_crawler.extractors.parse_budget)
+as used by ContentExtractor.
+"""
+
+import time
+
+from scrapy.settings import Settings
+
+from lookuply_crawler.extractors import ContentExtractor, ParseBudget, create_parse_budget
+
+PARAGRAPH = '<p>Paragraph of the article with enough words to count as real content text.</p>'
+
+
+def page(paragraphs=3, head='<title>Big page</title>'):
+    return (
+        f'<html><head>{head}</head><body><nav><a href="/">Home</a></nav>'
+        f'<article><h1>Heading</h1>{PARAGRAPH * paragraphs}<a href="/next">Next page</a></article>'
+        f'<div class="comments"><p>A reader comment on the article that should not be kept.</p></div>'
+        f'</body></html>'
+    )
+
+
+def test_pages_within_budget_are_parsed_in_full():
+    budget = ParseBudget(max_bytes=10000, max_nodes=100)
+    result = ContentExtractor(parse_budget=budget).extract(page(), 'https://example.com/a')
+
+    assert result['degraded'] is None
+    assert result['headings'] and result['paragraphs']
+    assert 'reader comment' not in result['text']
+    assert budget.stats == {'pages': 1, 'degraded': 0, 'max_bytes': 0, 'max_nodes': 0, 'max_seconds': 0}
+
+
+def test_size_budgets_are_checked_on_str_and_bytes():
+    budget = ParseBudget(max_bytes=100, max_nodes=5)
+    assert budget.check('<p>small</p>') is None
+    assert budget.check(b'<p>small</p>') is None
+    assert budget.check('x' * 101) == 'max_bytes'
+    assert budget.check(b'<b>' * 6) == 'max_nodes'
+    # End tags are not counted
+    assert budget.check('<b></b>' * 5) is None
+    assert budget.stats == {'pages': 5, 'degraded': 2, 'max_bytes': 1, 'max_nodes': 1, 'max_seconds': 0}
+
+
+def test_zero_disables_a_budget():
+    budget = ParseBudget(max_bytes=0, max_nodes=0, max_seconds=0)
+    html = page(paragraphs=1000)
+    assert budget.check(html) is None
+    assert budget.deadline() is None
+    assert not budget.expired(budget.deadline())
+    assert budget.truncate(html) == html
+
+
+def test_large_page_gets_truncated_text_without_structure():
+    budget = ParseBudget(max_bytes=2000, text_chars=300)
+    html = page(paragraphs=100).encode('utf-8')
+    result = ContentExtractor(parse_budget=budget).extract(html, 'https://example.com/a')
+
+    assert result['degraded'] == 'max_bytes'
+    assert result['text_length'] == 300
+    # Boilerplate tags are dropped
+    assert result['text'].startswith('Heading\nParagraph')
+    assert result['paragraphs'] == [] and result['headings'] == [] and result['links'] == []
+    # Links in the parsed part are still collected for following
+    assert [link['url'] for link in result['page_links']] == ['https://example.com/']
+
+
+def test_page_with_too_many_elements_is_degraded():
+    budget = ParseBudget(max_nodes=50)
+    result = ContentExtractor(parse_budget=budget).extract(page(paragraphs=100), 'https://example.com/a')
+
+    assert result['degraded'] == 'max_nodes'
+    assert budget.stats['max_nodes'] == 1
+
+
+def test_head_is_kept_for_metadata():
+    budget = ParseBudget(max_bytes=2000)
+    html = page(paragraphs=100, head='<title>Big page</title><meta name="description" content="About it">')
+
+    head = budget.get_head(html)
+    assert head.endswith('<meta name="description" content="About it">')
+    assert '<body>' not in head
+    assert budget.get_head(html.encode('utf-8')) == head.encode('utf-8')
+    # A head beyond max_bytes is cut at max_bytes
+    assert len(budget.get_head('<html><head>' + 'x' * 3000)) == 2000
+
+
+def test_expired_deadline_skips_the_remaining_stages():
+    budget = ParseBudget(text_chars=1000)
+    extractor = ContentExtractor(parse_budget=budget)
+    result = extractor.extract(page(), 'https://example.com/a', deadline=time.perf_counter() - 1)
+
+    # Boilerplate patterns and main content detection were skipped
+    assert result['degraded'] == 'max_seconds'
+    assert 'reader comment' in result['text']
+    assert result['paragraphs'] == []
+    assert budget.stats['max_seconds'] == 1
+    assert budget.stats['degraded'] == 1
+
+
+def test_no_budget_without_parse_budget():
+    result = ContentExtractor().extract(page(paragraphs=100), 'https://example.com/a', deadline=time.perf_counter() - 1)
+    assert result['degraded'] is None
+    assert len(result['paragraphs']) == 100
+
+
+def test_create_parse_budget():
+    assert create_parse_budget(Settings({'PARSE_BUDGET_ENABLED': False})) is None
+
+    budget = create_parse_budget(Settings({'PARSE_MAX_BYTES': 10, 'PARSE_MAX_NODES': 0, 'PARSE_MAX_SECONDS': 0.5}))
+    assert (budget.max_bytes, budget.max_nodes, budget.max_seconds, budget.text_chars) == (10, 0, 0.5, 20000)
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Tests for the caching DNS resolver (lookuply_crawler.resolver).
+Lookups go to a local stub, no network access.
+"""
+
+from twisted.internet import defer
+from twisted.internet.error import DNSLookupError
+from twisted.internet.task import Clock
+
+from lookuply_crawler.cache import lru
+from lookuply_crawler.resolver import CachingResolver
+
+
+class StubLookup:
+    """Lookup callable answering from a dict, counting queries per host."""
+
+    def __init__(self, answers):
+        self.answers = answers
+        self.calls = {}
+
+    def __call__(self, name):
+        self.calls[name] = self.calls.get(name, 0) + 1
+        answer = self.answers.get(name)
+        if answer is None:
+            raise DNSLookupError(name)
+        return answer
+
+
+def resolve(resolver, name):
+    """Result of getHostByName: the address, or the failure."""
+    results = []
+    resolver.getHostByName(name).addBoth(results.append)
+    assert results, "lookup did not complete"
+    return results[0]
+
+
+def make_resolver(lookup, **kwargs):
+    return CachingResolver(Clock(), lookup=lookup, **kwargs)
+
+
+def test_repeated_lookups_are_cached():
+    lookup = StubLookup({'example.com': '192.0.2.1'})
+    resolver = make_resolver(lookup)
+
+    assert resolve(resolver, 'example.com') == '192.0.2.1'
+    assert resolve(resolver, 'example.com') == '192.0.2.1'
+    assert lookup.calls == {'example.com': 1}
+    assert resolver.stats['misses'] == 1
+    assert resolver.stats['hits'] == 1
+
+
+def test_entries_expire_after_their_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(lru.time, 'time', lambda: now[0])
+    lookup = StubLookup({'default.example': '192.0.2.1', 'short.example': ('192.0.2.2', 5)})
+    resolver = make_resolver(lookup, ttl=60)
+
+    resolve(resolver, 'default.example')
+    resolve(resolver, 'short.example')
+
+    # The TTL returned by the lookup overrides the default
+    now[0] += 10
+    resolve(resolver, 'default.example')
+    resolve(resolver, 'short.example')
+    assert lookup.calls == {'default.example': 1, 'short.example': 2}
+
+    now[0] += 61
+    resolve(resolver, 'default.example')
+    assert lookup.calls['default.example'] == 2
+
+
+def test_failed_lookups_are_cached_for_the_negative_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(lru.time, 'time', lambda: now[0])
+    lookup = StubLookup({})
+    resolver = make_resolver(lookup, negative_ttl=30)
+
+    for _ in range(3):
+        result = resolve(resolver, 'missing.example')
+        assert result.check(DNSLookupError)
+    assert lookup.calls == {'missing.example': 1}
+    assert resolver.stats['failures'] == 1
+    assert resolver.stats['negative_hits'] == 2
+
+    now[0] += 31
+    assert resolve(resolver, 'missing.example').check(DNSLookupError)
+    assert lookup.calls == {'missing.example': 2}
+
+
+def test_other_errors_are_not_cached():
+    calls = []
+
+    def lookup(name):
+        calls.append(name)
+        raise RuntimeError("resolver unavailable")
+
+    resolver = make_resolver(lookup)
+    assert resolve(resolver, 'example.com').check(RuntimeError)
+    assert resolve(resolver, 'example.com').check(RuntimeError)
+    assert len(calls) == 2
+
+
+def test_concurrent_lookups_share_one_query():
+    pending = {}
+    calls = []
+
+    def lookup(name):
+        calls.append(name)
+        pending[name] = defer.Deferred()
+        return pending[name]
+
+    resolver = make_resolver(lookup)
+
+    results = []
+    for _ in range(3):
+        resolver.getHostByName('example.com').addBoth(results.append)
+    resolver.prefetch('example.com')
+    assert calls == ['example.com']
+    assert results == []
+
+    pending['example.com'].callback('192.0.2.1')
+    assert results == ['192.0.2.1'] * 3
+    assert resolver.stats['prefetches'] == 0
+
+
+def test_concurrent_lookups_share_a_failure():
+    pending = defer.Deferred()
+    resolver = make_resolver(lambda name: pending)
+
+    results = []
+    resolver.getHostByName('missing.example').addBoth(results.append)
+    resolver.getHostByName('missing.example').addBoth(results.append)
+    pending.errback(DNSLookupError('missing.example'))
+
+    assert len(results) == 2
+    assert all(result.check(DNSLookupError) for result in results)
+
+
+def test_prefetch_fills_the_cache():
+    lookup = StubLookup({'example.com': '192.0.2.1'})
+    resolver = make_resolver(lookup)
+
+    resolver.prefetch('example.com')
+    resolver.prefetch('192.0.2.7')
+    resolver.prefetch('missing.example')
+    assert resolver.stats['prefetches'] == 2
+
+    assert resolve(resolver, 'example.com') == '192.0.2.1'
+    assert lookup.calls == {'example.com': 1, 'missing.example': 1}
+    assert resolver.stats['hits'] == 1
+
+
+def test_cache_persists_across_runs(tmp_path):
+    cache_file = str(tmp_path / 'dns.json')
+    resolver = make_resolver(StubLookup({'example.com': '192.0.2.1'}), cache_file=cache_file)
+    resolve(resolver, 'example.com')
+    resolver.save()
+
+    lookup = StubLookup({})
+    resolver = make_resolver(lookup, cache_file=cache_file)
+    assert resolve(resolver, 'example.com') == '192.0.2.1'
+    assert lookup.calls == {}
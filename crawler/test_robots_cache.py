@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared robots.txt cache (lookuply_crawler.cache.robots_cache)
+and CachedRobotsTxtMiddleware.
+"""
+
+import time
+
+import pytest
+from scrapy.http import Request, Response
+from scrapy.settings import Settings
+from scrapy.spiders import Spider
+from scrapy.utils.test import get_crawler
+from twisted.internet.defer import Deferred
+
+from lookuply_crawler.cache import robots_cache
+from lookuply_crawler.cache.robots_cache import FileRobotsCache, RedisRobotsCache, RobotsCache, create_robots_cache
+from lookuply_crawler.middleware import CachedRobotsTxtMiddleware
+
+RULES = b'User-agent: *\nDisallow: /private/\n'
+SPIDER = Spider('test')
+
+
+class FakeRedis:
+    """In-memory stand-in for a Redis server (get, and set with expiry)."""
+
+    def __init__(self):
+        self.values = {}
+
+    def get(self, key):
+        value, expires = self.values.get(key, (None, 0))
+        return value if time.time() < expires else None
+
+    def set(self, key, value, ex=None):
+        self.values[key] = (value.encode('utf-8'), time.time() + ex)
+
+
+def redis_cache(ttl=86400):
+    cache = RedisRobotsCache.__new__(RedisRobotsCache)
+    RobotsCache.__init__(cache, ttl)
+    cache.client = FakeRedis()
+    return cache
+
+
+@pytest.fixture(params=['file', 'redis'])
+def cache(request, tmp_path):
+    if request.param == 'file':
+        return FileRobotsCache(str(tmp_path / 'robots'), ttl=60)
+    return redis_cache(ttl=60)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000000.0]
+    monkeypatch.setattr(robots_cache.time, 'time', lambda: now[0])
+    return now
+
+
+def test_entries_are_shared_until_they_expire(cache, clock):
+    assert cache.get('example.com') is None
+    assert cache.set('example.com:8080', RULES)
+
+    entry = cache.get('example.com:8080')
+    assert entry['status'] == 200
+    assert cache.rules(entry) == RULES
+    assert cache.get('example.com') is None
+
+    clock[0] += 61
+    assert cache.get('example.com:8080') is None
+
+
+def test_server_errors_are_not_cached(cache):
+    assert not cache.set('example.com', b'<html>Service unavailable</html>', 503)
+    assert cache.get('example.com') is None
+
+
+def test_client_errors_allow_everything(cache):
+    assert cache.set('example.com', b'<html>Not found</html>', 404)
+    assert cache.rules(cache.get('example.com')) == b''
+
+
+def test_cached_server_errors_are_ignored(tmp_path):
+    cache = FileRobotsCache(str(tmp_path))
+    cache._write('example.com', {'status': 500, 'body': 'Error', 'fetched_at': time.time()})
+    assert cache.get('example.com') is None
+
+
+def test_unreadable_file_entry_is_a_miss(tmp_path):
+    cache = FileRobotsCache(str(tmp_path))
+    (tmp_path / 'example.com.json').write_text('{"status": 200, "bo')
+    assert cache.get('example.com') is None
+
+    assert cache.set('example.com', RULES)
+    assert cache.get('example.com')['body'] == RULES.decode()
+    assert not list(tmp_path.glob('*.tmp'))
+
+
+def test_create_robots_cache(tmp_path):
+    assert create_robots_cache(Settings({'ROBOTSTXT_CACHE_BACKEND': None})) is None
+
+    cache = create_robots_cache(Settings({
+        'ROBOTSTXT_CACHE_BACKEND': 'file',
+        'ROBOTSTXT_CACHE_DIR': str(tmp_path / 'robots'),
+        'ROBOTSTXT_CACHE_TTL': 5,
+    }))
+    assert isinstance(cache, FileRobotsCache)
+    assert cache.ttl == 5
+    assert (tmp_path / 'robots').is_dir()
+
+    with pytest.raises(ValueError):
+        create_robots_cache(Settings({'ROBOTSTXT_CACHE_BACKEND': 'memcached'}))
+
+
+def make_middleware(tmp_path):
+    crawler = get_crawler(Spider, {
+        'ROBOTSTXT_OBEY': True,
+        'ROBOTSTXT_CACHE_BACKEND': 'file',
+        'ROBOTSTXT_CACHE_DIR': str(tmp_path),
+        'ROBOTSTXT_PREFETCH': False,
+    })
+    return CachedRobotsTxtMiddleware(crawler)
+
+
+def fetched(middleware, netloc, body, status):
+    """Deliver a downloaded robots.txt response to the middleware."""
+    middleware._parsers[netloc] = Deferred()
+    response = Response(f'https://{netloc}/robots.txt', body=body, status=status)
+    middleware._parse_robots(response, netloc, SPIDER)
+
+
+def test_middleware_uses_rules_of_other_processes(tmp_path):
+    fetched(make_middleware(tmp_path), 'example.com', RULES, 200)
+
+    middleware = make_middleware(tmp_path)
+    parser = middleware.robot_parser(Request('https://example.com/private/page'), SPIDER)
+    assert not parser.allowed('https://example.com/private/page', '*')
+    assert parser.allowed('https://example.com/public/page', '*')
+    assert middleware.crawler.stats.get_value('robotstxt/cache_hit') == 1
+
+
+def test_middleware_applies_cached_status(tmp_path):
+    fetched(make_middleware(tmp_path), 'example.com', b'User-agent: *\nDisallow: /\n', 404)
+
+    middleware = make_middleware(tmp_path)
+    parser = middleware.robot_parser(Request('https://example.com/page'), SPIDER)
+    assert parser.allowed('https://example.com/page', '*')
+
+
+def test_middleware_does_not_cache_server_errors(tmp_path):
+    middleware = make_middleware(tmp_path)
+    fetched(middleware, 'example.com', b'User-agent: *\nDisallow: /\n', 503)
+
+    assert middleware.cache.get('example.com') is None
+    assert middleware.crawler.stats.get_value('robotstxt/cache_not_stored') == 1
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Tests for append-only segment page storage (lookuply_crawler.storage.segment_storage),
+including several crawler processes sharing one storage directory.
+"""
+
+import json
+import multiprocessing
+from datetime import datetime
+
+import pytest
+
+from lookuply_crawler.storage import SegmentStorage
+from lookuply_crawler.storage import segment_storage
+from lookuply_crawler.storage.segment_storage import INDEX_RECORD
+from lookuply_crawler.utils import get_url_hash
+
+
+def page(i, title=None, lang='en'):
+    return {'url': f'https://example.com/{lang}/{i}', 'title': title or f'Page {i}', 'language': lang}
+
+
+def url_hash(i, lang='en'):
+    return get_url_hash(page(i, lang=lang)['url'])
+
+
+def segment_files(base_dir, lang='en'):
+    return sorted((base_dir / lang).glob('*.jsonl'))
+
+
+def read_lines(path):
+    with open(path, 'rb') as f:
+        return [json.loads(line) for line in f]
+
+
+@pytest.fixture(params=[True, False], ids=['index', 'no-index'])
+def index(request):
+    return request.param
+
+
+def test_saved_pages_are_loaded(tmp_path, index):
+    storage = SegmentStorage(tmp_path, index=index)
+    assert storage.save_page(page(0), 'en').endswith('.00001.jsonl')
+    assert storage.save_batch([page(i) for i in range(1, 5)], 'en') == 4
+    assert storage.save_batch([page(0, lang='de')], 'de') == 1
+    # A newer save of a URL replaces the older one
+    storage.save_page(page(2, title='Page 2, updated'), 'en')
+
+    assert storage.load_page('en', url_hash(1)) == page(1)
+    assert storage.load_page('en', url_hash(2))['title'] == 'Page 2, updated'
+    assert storage.load_page('de', url_hash(0, 'de')) == page(0, lang='de')
+    assert storage.load_page('en', url_hash(0, 'de')) is None
+    assert storage.load_page('en', url_hash(99)) is None
+    storage.close()
+
+    # Reopened
+    storage = SegmentStorage(tmp_path, index=index)
+    assert storage.load_page('en', url_hash(4)) == page(4)
+    assert storage.get_stats()['total_pages'] == 7
+    storage.close()
+
+
+def test_load_pages(tmp_path, index):
+    storage = SegmentStorage(tmp_path, index=index)
+    storage.save_batch([page(i) for i in range(10)], 'en')
+    storage.save_batch([page(i, lang='de') for i in range(3)], 'de')
+
+    hashes = [url_hash(i) for i in (7, 2, 5)] + [url_hash(1, 'de'), url_hash(99)]
+    assert storage.load_pages(hashes) == {
+        url_hash(7): page(7), url_hash(2): page(2), url_hash(5): page(5), url_hash(1, 'de'): page(1, lang='de'),
+    }
+    assert set(storage.load_pages(hashes, 'de')) == {url_hash(1, 'de')}
+    storage.close()
+
+
+def test_segments_rotate_by_size(tmp_path):
+    storage = SegmentStorage(tmp_path, segment_bytes=200)
+    for i in range(10):
+        storage.save_page(page(i), 'en')
+    storage.close()
+
+    files = segment_files(tmp_path)
+    assert len(files) > 1
+    assert [record['title'] for path in files for record in read_lines(path)] == [f'Page {i}' for i in range(10)]
+
+    storage = SegmentStorage(tmp_path, segment_bytes=200)
+    assert all(storage.load_page('en', url_hash(i)) == page(i) for i in range(10))
+    storage.close()
+
+
+def test_torn_line_is_removed_on_open(tmp_path):
+    storage = SegmentStorage(tmp_path)
+    storage.save_batch([page(i) for i in range(3)], 'en')
+    storage.close()
+
+    # Crash in the middle of writing a line
+    data_path = segment_files(tmp_path)[0]
+    with open(data_path, 'ab') as f:
+        f.write(b'{"url": "https://example.com/en/3", "ti')
+
+    storage = SegmentStorage(tmp_path)
+    storage.save_page(page(4), 'en')
+    storage.close()
+
+    assert [record['title'] for record in read_lines(data_path)] == ['Page 0', 'Page 1', 'Page 2', 'Page 4']
+    storage = SegmentStorage(tmp_path)
+    assert storage.load_page('en', url_hash(4)) == page(4)
+    storage.close()
+
+
+def test_pages_behind_the_index_are_recovered(tmp_path, index):
+    storage = SegmentStorage(tmp_path, index=index)
+    storage.save_batch([page(i) for i in range(5)], 'en')
+    storage.close()
+
+    # Crash after writing the data, before its index entries
+    index_path = segment_files(tmp_path)[0].with_suffix('.idx')
+    with open(index_path, 'rb+') as f:
+        f.truncate(2 * INDEX_RECORD.size + 7)
+
+    storage = SegmentStorage(tmp_path, index=index)
+    storage.save_page(page(5), 'en')
+    assert index_path.stat().st_size == 6 * INDEX_RECORD.size
+    assert storage.load_pages([url_hash(i) for i in range(6)]) == {url_hash(i): page(i) for i in range(6)}
+    storage.close()
+
+
+def test_cleanup_deletes_whole_old_segments(tmp_path, monkeypatch):
+    class OldDatetime(datetime):
+        @classmethod
+        def utcnow(cls):
+            return datetime(2020, 1, 1, 12)
+
+    storage = SegmentStorage(tmp_path)
+    monkeypatch.setattr(segment_storage, 'datetime', OldDatetime)
+    storage.save_batch([page(i) for i in range(3)], 'en')
+    storage.save_batch([page(0, lang='de')], 'de')
+    monkeypatch.undo()
+    storage.save_batch([page(i) for i in range(3, 5)], 'en')
+
+    assert storage.cleanup_old_files(days=30) == 4
+    assert [path.name[:10] for path in segment_files(tmp_path)] == [datetime.utcnow().strftime('%Y-%m-%d')]
+    assert segment_files(tmp_path, 'de') == []
+    assert not list(tmp_path.glob('*/2020-01-01.*'))
+
+    assert storage.load_page('en', url_hash(0)) is None
+    assert storage.load_page('en', url_hash(4)) == page(4)
+    assert storage.index.count() == 2
+    assert storage.get_stats()['total_pages'] == 2
+    assert storage.cleanup_old_files(days=30) == 0
+    storage.close()
+
+
+def test_export_to_jsonl(tmp_path):
+    storage = SegmentStorage(tmp_path / 'pages', segment_bytes=200)
+    storage.save_batch([page(i) for i in range(6)], 'en')
+
+    output = tmp_path / 'en.jsonl'
+    assert storage.export_to_jsonl('en', output) == 6
+    assert read_lines(output) == [page(i) for i in range(6)]
+    assert storage.export_to_jsonl('fr', tmp_path / 'fr.jsonl') == 0
+    storage.close()
+
+
+def test_storages_sharing_a_directory_append_to_one_segment(tmp_path):
+    first = SegmentStorage(tmp_path)
+    second = SegmentStorage(tmp_path)
+
+    for i in range(0, 20, 2):
+        first.save_page(page(i), 'en')
+        second.save_batch([page(i + 1)], 'en')
+
+    # One segment, every offset valid for both. Pages of another storage
+    # are in the index once it has flushed.
+    assert len(segment_files(tmp_path)) == 1
+    second.flush()
+    for storage in (first, second):
+        assert storage.load_pages([url_hash(i) for i in range(20)]) == {url_hash(i): page(i) for i in range(20)}
+        assert storage.load_page('en', url_hash(19)) == page(19)
+
+    # Opening the segment while another storage has it open loses nothing
+    third = SegmentStorage(tmp_path)
+    third.save_page(page(20), 'en')
+    first.save_page(page(21), 'en')
+    for storage in (first, second, third):
+        storage.close()
+
+    assert [record['title'] for record in read_lines(segment_files(tmp_path)[0])] == [f'Page {i}' for i in range(22)]
+    storage = SegmentStorage(tmp_path, index=False)
+    assert storage.load_pages([url_hash(i) for i in range(22)]) == {url_hash(i): page(i) for i in range(22)}
+    storage.close()
+
+
+def _crawl(base_dir, worker, count):
+    storage = SegmentStorage(base_dir)
+    for i in range(count):
+        storage.save_batch([page(worker * 1000 + i * 2), page(worker * 1000 + i * 2 + 1)], 'en')
+    storage.close()
+
+
+def test_concurrent_processes_keep_every_page(tmp_path):
+    context = multiprocessing.get_context('fork')
+    processes = [context.Process(target=_crawl, args=(tmp_path, worker, 100)) for worker in range(3)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(60)
+        assert process.exitcode == 0
+
+    expected = {url_hash(worker * 1000 + i): page(worker * 1000 + i) for worker in range(3) for i in range(200)}
+    data_path = segment_files(tmp_path)[0]
+    assert len(read_lines(data_path)) == 600
+    assert data_path.with_suffix('.idx').stat().st_size == 600 * INDEX_RECORD.size
+
+    storage = SegmentStorage(tmp_path)
+    assert storage.load_pages(list(expected)) == expected
+    assert storage.get_stats()['total_pages'] == 600
+    storage.close()